@@ -7,7 +7,6 @@ from apispec.ext.marshmallow import MarshmallowPlugin
 from flask import Flask, jsonify
 from flask.typing import ResponseReturnValue
 from flask_apispec import FlaskApiSpec
-from flask_jwt_extended import JWTManager
 from flask_marshmallow import Marshmallow
 from flask_migrate import Migrate
 from sqlalchemy.pool import NullPool
@@ -59,14 +58,18 @@ from app.controllers.user_controller import register_user_dependencies, user_bp
 from app.controllers.wallet_controller import register_wallet_dependencies, wallet_bp
 from app.docs.api_documentation import API_INFO, TAGS
 from app.docs.schema_name_resolver import resolve_openapi_schema_name
+from app.extensions.analytics_cli import register_analytics_commands
 from app.extensions.audit_retention_cli import register_audit_retention_commands
 from app.extensions.audit_trail import register_audit_trail
 from app.extensions.billing_webhooks_cli import register_billing_webhooks_commands
 from app.extensions.database import db
 from app.extensions.email_dlq_cli import register_email_dlq_commands
 from app.extensions.error_handlers import register_error_handlers
+from app.extensions.exports_cli import register_exports_commands
 from app.extensions.http_observability import register_http_observability
 from app.extensions.integration_metrics_cli import register_integration_metrics_commands
+from app.extensions.jwt_manager import RequestMemoizedJWTManager
+from app.extensions.market_cli import register_market_commands
 from app.extensions.otel import init_otel
 from app.extensions.prometheus_metrics import register_prometheus_middleware
 from app.extensions.reminders_cli import register_reminders_commands
@@ -86,6 +89,7 @@ from app.models.budget import Budget  # noqa: F401
 from app.models.consent import Consent  # noqa: F401
 from app.models.credit_card import CreditCard  # noqa: F401
 from app.models.entitlement import Entitlement  # noqa: F401
+from app.models.export_job import ExportJob  # noqa: F401
 from app.models.fiscal import (  # noqa: F401
     FiscalAdjustment,
     FiscalDocument,
@@ -102,9 +106,16 @@ from app.models.sharing_audit import SharingAuditEvent  # noqa: F401
 from app.models.simulation import Simulation  # noqa: F401
 from app.models.subscription import Subscription  # noqa: F401
 from app.models.tag import Tag  # noqa: F401
+from app.models.ticker_daily_price import (  # noqa: F401
+    TickerDailyPrice,
+    TickerPriceCoverage,
+)
+from app.models.transaction_daily_rollup import TransactionDailyRollup  # noqa: F401
+from app.models.wallet_history_event import WalletHistoryEvent  # noqa: F401
 from app.models.webhook_event import WebhookEvent  # noqa: F401
+from app.services.transaction_rollup_service import install_transaction_rollup_listener
 
-jwt = JWTManager()
+jwt = RequestMemoizedJWTManager()
 ma = Marshmallow()
 DOCS_CLASS_REGISTRATION_FALLBACK_ENDPOINTS = {
     "goal.goal_collection",
@@ -234,6 +245,8 @@ def create_app(*, enable_http_runtime: bool = True) -> Flask:
 
     # PERF-3 — slow query log listeners on the default SQLAlchemy engine.
     install_slow_query_log(app)
+    # Keeps transaction_daily_rollups in sync with every ORM transaction write.
+    install_transaction_rollup_listener()
 
     # OTel tracing — no-op when OTEL_EXPORTER_OTLP_ENDPOINT is unset.
     # Must be called after db.init_app() so SQLAlchemy instrumentation can
@@ -299,6 +312,9 @@ def create_app(*, enable_http_runtime: bool = True) -> Flask:
     register_integration_metrics_commands(app)
     register_billing_webhooks_commands(app)
     register_reminders_commands(app)
+    register_analytics_commands(app)
+    register_exports_commands(app)
+    register_market_commands(app)
     register_ai_insights_commands(app)
     register_email_dlq_commands(app)
     app.cli.add_command(features_cli_group, "features")
@@ -13,6 +13,10 @@ to its :class:`~app.lgpd.DeletionStrategy`:
 - ``RETAIN`` → leave rows intact (fiscal documents — Brazilian tax law
   obligation; tallied in the report)
 
+Rows that point at stored objects (export job files) are deleted with the
+rest of the transaction; the objects themselves are removed from export
+storage after the commit, so a rollback never leaves rows without files.
+
 The service returns an audit report consumed by the controller; the
 controller is responsible for persisting an :class:`AuditEvent` of type
 ``lgpd.account_deletion_started`` *before* calling this function, and an
@@ -40,6 +44,10 @@ from werkzeug.security import generate_password_hash
 from app.extensions.database import db
 from app.lgpd import REGISTRY, DeletionStrategy, EntityRule
 from app.models.user import User
+from app.services.export_job_service import (
+    delete_stored_exports,
+    stored_export_keys,
+)
 
 # Sentinel UUID used in tables where ``user_id`` is ``NOT NULL`` and so
 # cannot be anonymised by nulling. The sharing-audit table is the only
@@ -266,6 +274,7 @@ def delete_user_account(user_id: UUID) -> dict[str, Any]:
     Returns the audit report dict — see module docstring for shape.
     """
     now = _format_now()
+    export_keys = stored_export_keys(user_id)
 
     deleted_counts = _pass_delete(user_id)
     anonymised_counts = _pass_anonymize(user_id)
@@ -274,6 +283,7 @@ def delete_user_account(user_id: UUID) -> dict[str, Any]:
     _finalise_user_row(user_id, now)
 
     db.session.commit()
+    delete_stored_exports(export_keys)
 
     return {
         "user_id": str(user_id),
@@ -5,6 +5,8 @@ Responsibilities:
 - Rotate a refresh token: validate, detect theft, create new record.
 - Revoke a specific session or all sessions for a user.
 - List active sessions for a user.
+- Keep the per-user session state cache (``session_state_cache``) in step:
+  issued access JTIs are added to it and revoked ones are denylisted.
 """
 
 from __future__ import annotations
@@ -12,11 +14,13 @@ from __future__ import annotations
 import hashlib
 import os
 import uuid
+from collections.abc import Iterable
 from datetime import datetime, timedelta
 from typing import TypedDict
 from uuid import UUID
 
 from app.extensions.database import db
+from app.extensions.session_state_cache import SessionState, get_session_state_cache
 from app.models.refresh_token import _MAX_SESSIONS_PER_USER, RefreshToken
 from app.utils.datetime_utils import utc_now_naive
 
@@ -94,8 +98,11 @@ def create_session(
         .all()
     )
     overflow = len(active) - (_MAX_SESSIONS - 1)
-    for old in active[: max(0, overflow)]:
+    evicted = active[: max(0, overflow)]
+    for old in evicted:
         old.revoke()
+    if evicted:
+        _deny_access_jtis(user_id, evicted)
 
     session = RefreshToken(
         user_id=user_id,
@@ -108,6 +115,7 @@ def create_session(
     )
     db.session.add(session)
     db.session.flush()
+    get_session_state_cache().add_access_jti(str(user_id), access_jti)
     return session
 
 
@@ -153,6 +161,7 @@ def rotate_session(
     device_info = _build_device_info(user_agent=user_agent, remote_addr=remote_addr)
 
     existing.revoke()
+    _deny_access_jtis(user_id, [existing])
 
     new_hash = _hash_token(new_raw_refresh_token)
     new_session = RefreshToken(
@@ -166,6 +175,7 @@ def rotate_session(
     )
     db.session.add(new_session)
     db.session.flush()
+    get_session_state_cache().add_access_jti(str(user_id), new_access_jti)
     return new_session
 
 
@@ -201,6 +211,7 @@ def rotate_session_by_jti(
     user_id = existing.user_id
     device_info = _build_device_info(user_agent=user_agent, remote_addr=remote_addr)
     existing.revoke()
+    _deny_access_jtis(user_id, [existing])
 
     new_hash = _hash_token(new_raw_refresh_token)
     new_session = RefreshToken(
@@ -214,6 +225,7 @@ def rotate_session_by_jti(
     )
     db.session.add(new_session)
     db.session.flush()
+    get_session_state_cache().add_access_jti(str(user_id), new_access_jti)
     return new_session
 
 
@@ -245,6 +257,25 @@ def revoke_session(*, session_id: UUID, user_id: UUID) -> None:
         raise SessionNotFoundError("Session not found.")
     session.revoke()
     db.session.commit()
+    _deny_access_jtis(user_id, [session])
+
+
+def revoke_session_by_access_jti(*, user_id: UUID, access_jti: str) -> bool:
+    """Revoke the active session that issued *access_jti* (logout).
+
+    The JTI is denylisted even when no session row matches, so legacy
+    single-session tokens are covered too. Returns whether a row was revoked.
+    Does not commit; the caller owns the transaction.
+    """
+    session: RefreshToken | None = (
+        RefreshToken.query.filter_by(user_id=user_id, current_access_jti=access_jti)
+        .filter(RefreshToken.revoked_at.is_(None))
+        .first()
+    )
+    if session is not None:
+        session.revoke()
+    get_session_state_cache().deny(str(user_id), [access_jti])
+    return session is not None
 
 
 def revoke_all_sessions(*, user_id: UUID) -> int:
@@ -259,6 +290,7 @@ def revoke_all_sessions(*, user_id: UUID) -> int:
     for s in active:
         s.revoke()
     db.session.commit()
+    _deny_access_jtis(user_id, active)
     return len(active)
 
 
@@ -299,6 +331,24 @@ def has_any_session(*, user_id: UUID) -> bool:
     )
 
 
+def load_session_state(*, user_id: UUID) -> SessionState:
+    """Load the access JTIs of *user_id*'s active sessions in one query.
+
+    ``has_any_session`` is only queried when no session is active.
+    """
+    now = utc_now_naive()
+    jtis = frozenset(
+        jti
+        for (jti,) in db.session.query(RefreshToken.current_access_jti)
+        .filter_by(user_id=user_id)
+        .filter(RefreshToken.revoked_at.is_(None))
+        .filter(RefreshToken.expires_at > now)
+        if jti
+    )
+    has_sessions = bool(jtis) or has_any_session(user_id=user_id)
+    return SessionState(has_sessions, jtis)
+
+
 def is_access_jti_active(*, user_id: UUID, jti: str) -> bool:
     """Return True if *jti* belongs to an active session for *user_id*.
 
@@ -329,6 +379,15 @@ def _revoke_family(family_id: uuid.UUID) -> None:
     )
     for m in members:
         m.revoked_at = now
+    if members:
+        # A family descends from a single login, so it has a single owner.
+        _deny_access_jtis(members[0].user_id, members)
+
+
+def _deny_access_jtis(user_id: UUID, sessions: Iterable[RefreshToken]) -> None:
+    get_session_state_cache().deny(
+        str(user_id), [s.current_access_jti for s in sessions]
+    )
 
 
 def _fmt(dt: datetime) -> str:
@@ -344,8 +403,10 @@ __all__ = [
     "has_any_session",
     "is_access_jti_active",
     "list_sessions",
+    "load_session_state",
     "revoke_all_sessions",
     "revoke_session",
+    "revoke_session_by_access_jti",
     "rotate_session",
     "rotate_session_by_jti",
 ]
@@ -0,0 +1,105 @@
+"""Opaque keyset cursors for transaction list queries.
+
+Cursors encode the sort key ``(due_date, id)`` of the last row of a page plus
+the direction the list is ordered in, as url-safe base64 JSON. Both columns
+are non-null and ``id`` is unique, so the next page is a single row-value
+comparison that seeks on ``ix_transactions_user_deleted_due_date_id``.
+Clients must treat cursors as opaque; a cursor from one list cannot be
+replayed against a list ordered the other way.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import date
+from typing import Any, Literal
+from uuid import UUID
+
+from sqlalchemy import tuple_
+
+from app.application.services.transaction.validators import _validation_error
+from app.models.transaction import Transaction
+
+CursorDirection = Literal["asc", "desc"]
+
+_INVALID_CURSOR_MESSAGE = "Parâmetro 'cursor' inválido."
+
+
+def keyset_ordering(direction: CursorDirection) -> list[Any]:
+    columns = [Transaction.due_date, Transaction.id]
+    if direction == "desc":
+        return [column.desc() for column in columns]
+    return [column.asc() for column in columns]
+
+
+def encode_cursor(transaction: Transaction, direction: CursorDirection) -> str:
+    payload = {
+        "o": direction,
+        "d": transaction.due_date.isoformat(),
+        "i": str(transaction.id),
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, direction: CursorDirection) -> tuple[date, UUID]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if payload["o"] != direction:
+            raise ValueError("cursor direction mismatch")
+        return date.fromisoformat(payload["d"]), UUID(payload["i"])
+    except (
+        binascii.Error,
+        KeyError,
+        TypeError,
+        UnicodeError,
+        ValueError,
+    ) as exc:
+        raise _validation_error(_INVALID_CURSOR_MESSAGE) from exc
+
+
+def apply_keyset(query: Any, cursor: str, direction: CursorDirection) -> Any:
+    """Restrict *query* to rows strictly after *cursor* in *direction* order.
+
+    An empty cursor selects the first page.
+    """
+    if not cursor:
+        return query
+    due_date, transaction_id = decode_cursor(cursor, direction)
+    key = tuple_(Transaction.due_date, Transaction.id)
+    if direction == "desc":
+        return query.filter(key < (due_date, transaction_id))
+    return query.filter(key > (due_date, transaction_id))
+
+
+def fetch_keyset_page(
+    query: Any,
+    *,
+    cursor: str,
+    per_page: int,
+    direction: CursorDirection,
+) -> tuple[list[Transaction], str | None]:
+    """Return one page of rows and the cursor for the next one (if any)."""
+    rows: list[Transaction] = (
+        apply_keyset(query, cursor, direction)
+        .order_by(*keyset_ordering(direction))
+        .limit(per_page + 1)
+        .all()
+    )
+    if len(rows) <= per_page:
+        return rows, None
+    page = rows[:per_page]
+    return page, encode_cursor(page[-1], direction)
+
+
+__all__ = [
+    "CursorDirection",
+    "apply_keyset",
+    "decode_cursor",
+    "encode_cursor",
+    "fetch_keyset_page",
+    "keyset_ordering",
+]
@@ -11,6 +11,9 @@ from datetime import date
 from typing import Any
 from uuid import UUID
 
+from sqlalchemy import case, func
+
+from app.application.services.transaction.cursor import fetch_keyset_page
 from app.application.services.transaction.mutations import (
     apply_active_transaction_filters,
 )
@@ -27,6 +30,10 @@ from app.application.services.transaction.validators import (
 from app.models.credit_card import CreditCard
 from app.models.transaction import Transaction, TransactionType
 
+_CURSOR_ORDER_MESSAGE = (
+    "Paginação por cursor suporta apenas order_by=date (due_date, id)."
+)
+
 
 def fetch_active_transactions(
     *,
@@ -40,6 +47,8 @@ def fetch_active_transactions(
     tag_id: UUID | None,
     account_id: UUID | None,
     credit_card_id: UUID | None,
+    cursor: str | None = None,
+    include_total: bool = True,
 ) -> dict[str, Any]:
     query = Transaction.query.filter_by(user_id=user_id, deleted=False)
     query = apply_active_transaction_filters(
@@ -53,8 +62,19 @@ def fetch_active_transactions(
         credit_card_id=credit_card_id,
     )
 
-    total = query.count()
-    pages = (total + per_page - 1) // per_page if total else 0
+    total = query.count() if include_total else None
+    if cursor is not None:
+        transactions, next_cursor = fetch_keyset_page(
+            query, cursor=cursor, per_page=per_page, direction="desc"
+        )
+        return {
+            "items": [_serialize_transaction(item) for item in transactions],
+            "pagination": {
+                **_pagination(total, page, per_page),
+                "next_cursor": next_cursor,
+            },
+        }
+
     transactions = (
         query.order_by(Transaction.due_date.desc(), Transaction.created_at.desc())
         .offset((page - 1) * per_page)
@@ -64,12 +84,7 @@ def fetch_active_transactions(
 
     return {
         "items": [_serialize_transaction(item) for item in transactions],
-        "pagination": {
-            "total": total,
-            "page": page,
-            "per_page": per_page,
-            "pages": pages,
-        },
+        "pagination": _pagination(total, page, per_page),
     }
 
 
@@ -81,6 +96,8 @@ def fetch_due_transactions(
     page: int,
     per_page: int,
     order_by: str = "overdue_first",
+    cursor: str | None = None,
+    include_total: bool = True,
 ) -> dict[str, Any]:
     parsed_start_date = coerce_date(start_date, field_name="start_date", required=False)
     parsed_end_date = coerce_date(end_date, field_name="end_date", required=False)
@@ -89,9 +106,10 @@ def fetch_due_transactions(
     if parsed_start_date and parsed_end_date and parsed_start_date > parsed_end_date:
         raise _validation_error(_START_END_DATE_ORDER_MESSAGE)
 
-    order_clauses = _resolve_due_ordering(
-        str(order_by or "overdue_first").strip().lower()
-    )
+    normalized_order_by = str(order_by or "overdue_first").strip().lower()
+    if cursor is not None and normalized_order_by != "date":
+        raise _validation_error(_CURSOR_ORDER_MESSAGE)
+    order_clauses = _resolve_due_ordering(normalized_order_by)
 
     base_query = Transaction.query.filter_by(user_id=user_id, deleted=False)
     if parsed_start_date:
@@ -99,14 +117,21 @@ def fetch_due_transactions(
     if parsed_end_date:
         base_query = base_query.filter(Transaction.due_date <= parsed_end_date)
 
-    total_transactions = base_query.count()
-    income_transactions = base_query.filter(
-        Transaction.type == TransactionType.INCOME
-    ).count()
-    expense_transactions = base_query.filter(
-        Transaction.type == TransactionType.EXPENSE
-    ).count()
-    pages = (total_transactions + per_page - 1) // per_page if total_transactions else 0
+    counts = _due_counts(base_query) if include_total else None
+    total = counts["total_transactions"] if counts is not None else None
+
+    if cursor is not None:
+        transactions, next_cursor = fetch_keyset_page(
+            base_query, cursor=cursor, per_page=per_page, direction="asc"
+        )
+        return {
+            "items": [_serialize_transaction(item) for item in transactions],
+            "counts": counts,
+            "pagination": {
+                **_pagination(total, page, per_page),
+                "next_cursor": next_cursor,
+            },
+        }
 
     transactions = (
         base_query.outerjoin(CreditCard, Transaction.credit_card_id == CreditCard.id)
@@ -118,17 +143,37 @@ def fetch_due_transactions(
 
     return {
         "items": [_serialize_transaction(item) for item in transactions],
-        "counts": {
-            "total_transactions": total_transactions,
-            "income_transactions": income_transactions,
-            "expense_transactions": expense_transactions,
-        },
-        "pagination": {
-            "total": total_transactions,
-            "page": page,
-            "per_page": per_page,
-            "pages": pages,
-        },
+        "counts": counts,
+        "pagination": _pagination(total, page, per_page),
+    }
+
+
+def _due_counts(base_query: Any) -> dict[str, int]:
+    """Total/income/expense counts in a single conditional-aggregate query."""
+    total, income, expense = base_query.with_entities(
+        func.count(Transaction.id),
+        func.coalesce(
+            func.sum(case((Transaction.type == TransactionType.INCOME, 1), else_=0)),
+            0,
+        ),
+        func.coalesce(
+            func.sum(case((Transaction.type == TransactionType.EXPENSE, 1), else_=0)),
+            0,
+        ),
+    ).one()
+    return {
+        "total_transactions": int(total),
+        "income_transactions": int(income),
+        "expense_transactions": int(expense),
+    }
+
+
+def _pagination(total: int | None, page: int, per_page: int) -> dict[str, Any]:
+    return {
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "pages": None if total is None else (total + per_page - 1) // per_page,
     }
 
 
@@ -10,7 +10,7 @@ dependency graph.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Callable, Literal, TypedDict
+from typing import Callable, Literal, NotRequired, TypedDict
 from uuid import UUID
 
 from app.application.services.transaction_application_service import (
@@ -27,6 +27,20 @@ class TransactionPaginationPayload(TypedDict):
     pages: int
 
 
+class TransactionCursorPaginationPayload(TypedDict):
+    """Pagination block of list queries that accept ``cursor``/``include_total``.
+
+    ``total``/``pages`` are ``None`` when the caller opted out of counting;
+    ``next_cursor`` is only present in cursor mode.
+    """
+
+    total: int | None
+    page: int
+    per_page: int
+    pages: int | None
+    next_cursor: NotRequired[str | None]
+
+
 class TransactionCountsPayload(TypedDict):
     total_transactions: int
     income_transactions: int
@@ -35,7 +49,7 @@ class TransactionCountsPayload(TypedDict):
 
 class TransactionListResult(TypedDict):
     items: list[TransactionPayload]
-    pagination: TransactionPaginationPayload
+    pagination: TransactionCursorPaginationPayload
 
 
 class TransactionSummaryPaginationPayload(TypedDict):
@@ -102,8 +116,8 @@ class SurvivalIndexResult(TypedDict):
 
 class TransactionDueRangeResult(TypedDict):
     items: list[TransactionPayload]
-    counts: TransactionCountsPayload
-    pagination: TransactionPaginationPayload
+    counts: TransactionCountsPayload | None
+    pagination: TransactionCursorPaginationPayload
 
 
 class TransactionExpensePeriodResult(TypedDict):
@@ -159,6 +173,7 @@ __all__ = [
     "SurvivalClassification",
     "SurvivalIndexResult",
     "TransactionCountsPayload",
+    "TransactionCursorPaginationPayload",
     "TransactionDashboardCategoryPayload",
     "TransactionDashboardCountsPayload",
     "TransactionDashboardResult",
@@ -71,7 +71,9 @@ class TransactionLedgerService:
         )
 
     def _invalidate_dashboard_cache(self) -> None:
-        get_cache_service().invalidate_pattern(f"dashboard:overview:{self._user_id}:*")
+        # One INCR on the user's "transactions" version retires every
+        # dependent dashboard key (overview, trends, survival, weekly).
+        get_cache_service().invalidate_domain("transactions", self._user_id)
 
     # ------------------------------------------------------------------
     # Mutations
@@ -146,6 +148,8 @@ class TransactionLedgerService:
         tag_id: UUID | None,
         account_id: UUID | None,
         credit_card_id: UUID | None,
+        cursor: str | None = None,
+        include_total: bool = True,
     ) -> dict[str, Any]:
         return fetch_active_transactions(
             user_id=self._user_id,
@@ -158,6 +162,8 @@ class TransactionLedgerService:
             tag_id=tag_id,
             account_id=account_id,
             credit_card_id=credit_card_id,
+            cursor=cursor,
+            include_total=include_total,
         )
 
     def get_due_transactions(
@@ -168,6 +174,8 @@ class TransactionLedgerService:
         page: int,
         per_page: int,
         order_by: str = "overdue_first",
+        cursor: str | None = None,
+        include_total: bool = True,
     ) -> dict[str, Any]:
         return fetch_due_transactions(
             user_id=self._user_id,
@@ -176,6 +184,8 @@ class TransactionLedgerService:
             page=page,
             per_page=per_page,
             order_by=order_by,
+            cursor=cursor,
+            include_total=include_total,
         )
 
     # ------------------------------------------------------------------
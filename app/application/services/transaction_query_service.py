@@ -86,6 +86,8 @@ class TransactionQueryService:
         tag_id: UUID | None,
         account_id: UUID | None,
         credit_card_id: UUID | None,
+        cursor: str | None = None,
+        include_total: bool = True,
     ) -> TransactionListResult:
         return cast(
             TransactionListResult,
@@ -99,6 +101,8 @@ class TransactionQueryService:
                 tag_id=tag_id,
                 account_id=account_id,
                 credit_card_id=credit_card_id,
+                cursor=cursor,
+                include_total=include_total,
             ),
         )
 
@@ -135,6 +139,8 @@ class TransactionQueryService:
         page: int,
         per_page: int,
         order_by: str,
+        cursor: str | None = None,
+        include_total: bool = True,
     ) -> TransactionDueRangeResult:
         return cast(
             TransactionDueRangeResult,
@@ -144,6 +150,8 @@ class TransactionQueryService:
                 page=page,
                 per_page=per_page,
                 order_by=order_by,
+                cursor=cursor,
+                include_total=include_total,
             ),
         )
 
@@ -1,16 +1,31 @@
+"""Due-date reminder dispatch for pending transactions.
+
+Eligible transactions are streamed in keyset-paginated chunks of
+``REMINDER_DISPATCH_CHUNK_SIZE`` rows (served by the partial index
+``ix_transactions_due_date_id_active``). For each chunk, existing
+alerts, alert preferences, entitlements and recipient users are prefetched
+with one query per table, emails are handed to the outbound queue in one
+batch, and the chunk's alerts are committed before the next one is read.
+
+With the RQ adapter, emails are delivered by workers (failures go to the
+email DLQ from the job); without Redis they are sent inline and a provider
+error pushes the message to the DLQ right away.
+"""
+
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
 from decimal import Decimal
-from typing import Sequence, cast
+from typing import Any, Iterator, Sequence
 from uuid import UUID
 
 from app.extensions.database import db
 from app.models.alert import Alert, AlertStatus
 from app.models.transaction import Transaction, TransactionStatus
 from app.models.user import User
-from app.services.alert_service import _is_dispatch_allowed
+from app.services.alert_service import _dispatch_allowed_user_ids
 from app.services.email_dlq import get_email_dlq
 from app.services.email_provider import (
     EmailMessage,
@@ -18,10 +33,12 @@ from app.services.email_provider import (
     get_default_email_provider,
 )
 from app.services.email_templates.base import render_due_soon_email
-from app.services.entitlement_service import has_entitlement
+from app.services.entitlement_service import user_ids_with_entitlement
+from app.services.outbound_queue import SyncOutboundQueue, get_default_outbound_queue
 from app.utils.datetime_utils import utc_now_naive
 
 _EMAIL_REMINDERS_FEATURE = "email_reminders"
+_DEFAULT_CHUNK_SIZE = 500
 
 _REMINDER_WINDOWS = {
     7: "due_soon_7_days",
@@ -35,6 +52,7 @@ class ReminderDispatchResult:
     sent: int
     skipped: int
     queued: int = 0
+    enqueued: int = 0
 
 
 def _start_of_day(day: date) -> datetime:
@@ -45,24 +63,38 @@ def _end_of_day(day: date) -> datetime:
     return datetime.combine(day, datetime.max.time())
 
 
-def _existing_alert_for_window(
+def _chunk_size() -> int:
+    try:
+        return max(1, int(os.getenv("REMINDER_DISPATCH_CHUNK_SIZE", "")))
+    except ValueError:
+        return _DEFAULT_CHUNK_SIZE
+
+
+def _alerted_transaction_ids(
     *,
-    user_id: UUID,
-    transaction_id: UUID,
+    transaction_ids: Sequence[UUID],
     category: str,
     day: date,
-) -> Alert | None:
-    return cast(
-        Alert | None,
-        Alert.query.filter(
-            Alert.user_id == user_id,
+) -> set[UUID]:
+    rows = (
+        db.session.query(Alert.entity_id)
+        .filter(
             Alert.category == category,
             Alert.entity_type == "transaction",
-            Alert.entity_id == transaction_id,
+            Alert.entity_id.in_(transaction_ids),
             Alert.triggered_at >= _start_of_day(day),
             Alert.triggered_at <= _end_of_day(day),
-        ).first(),
+        )
+        .all()
     )
+    return {row[0] for row in rows}
+
+
+def _recipient_emails(user_ids: set[UUID]) -> dict[UUID, str]:
+    if not user_ids:
+        return {}
+    rows = db.session.query(User.id, User.email).filter(User.id.in_(user_ids)).all()
+    return {row[0]: str(row[1]) for row in rows}
 
 
 def _serialize_amount(value: Decimal | float | int | object) -> str:
@@ -88,16 +120,55 @@ def _send_or_queue(message: EmailMessage) -> AlertStatus:
         return AlertStatus.PENDING
 
 
-def _eligible_transactions(*, target_date: date) -> Sequence[Transaction]:
-    return cast(
-        Sequence[Transaction],
-        Transaction.query.filter(
+def _eligible_chunks(*, target_date: date, chunk_size: int) -> Iterator[list[Any]]:
+    """Yield eligible ``(id, user_id, title, amount)`` rows, *chunk_size* at a time.
+
+    Keyset pagination on ``id`` over the ``(due_date, id)`` index makes every
+    page an index range scan starting after the previous page, and lets the
+    caller commit between pages.
+    """
+    last_id: UUID | None = None
+    while True:
+        query = db.session.query(
+            Transaction.id,
+            Transaction.user_id,
+            Transaction.title,
+            Transaction.amount,
+        ).filter(
             Transaction.deleted.is_(False),
             Transaction.due_date == target_date,
             Transaction.status.in_(
                 [TransactionStatus.PENDING, TransactionStatus.POSTPONED]
             ),
-        ).all(),
+        )
+        if last_id is not None:
+            query = query.filter(Transaction.id > last_id)
+        rows = query.order_by(Transaction.id).limit(chunk_size).all()
+        if not rows:
+            return
+        yield rows
+        if len(rows) < chunk_size:
+            return
+        last_id = rows[-1][0]
+
+
+def _build_message(
+    *, to_email: str, title: str, amount: object, days_before_due: int, tag: str
+) -> EmailMessage:
+    amount_str = _serialize_amount(amount)
+    email_html, email_text = render_due_soon_email(
+        title=title,
+        amount_formatted=amount_str,
+        days_before_due=days_before_due,
+    )
+    return EmailMessage(
+        to_email=to_email,
+        subject=_build_subject(
+            days_before_due=days_before_due, title=title, amount_str=amount_str
+        ),
+        html=email_html,
+        text=email_text,
+        tag=tag,
     )
 
 
@@ -110,77 +181,86 @@ def dispatch_due_transaction_reminders(
 
     reference_day = today or date.today()
     target_date = reference_day + timedelta(days=days_before_due)
+    outbound_queue = get_default_outbound_queue()
+    send_inline = isinstance(outbound_queue, SyncOutboundQueue)
     scanned = 0
     sent = 0
     skipped = 0
     queued = 0
+    enqueued = 0
 
-    for transaction in _eligible_transactions(target_date=target_date):
-        scanned += 1
-        if _existing_alert_for_window(
-            user_id=transaction.user_id,
-            transaction_id=transaction.id,
+    for rows in _eligible_chunks(target_date=target_date, chunk_size=_chunk_size()):
+        scanned += len(rows)
+        alerted = _alerted_transaction_ids(
+            transaction_ids=[row[0] for row in rows],
             category=category,
             day=reference_day,
-        ):
-            skipped += 1
-            continue
-        if not _is_dispatch_allowed(transaction.user_id, category):
-            skipped += 1
-            continue
-
-        if not has_entitlement(transaction.user_id, _EMAIL_REMINDERS_FEATURE):
-            skipped += 1
-            continue
-
-        user = cast(User | None, db.session.get(User, transaction.user_id))
-        if user is None:
-            skipped += 1
-            continue
-
-        amount_str = _serialize_amount(transaction.amount)
-        email_html, email_text = render_due_soon_email(
-            title=transaction.title,
-            amount_formatted=amount_str,
-            days_before_due=days_before_due,
         )
-        subject = _build_subject(
-            days_before_due=days_before_due,
-            title=transaction.title,
-            amount_str=amount_str,
-        )
-        alert_status = _send_or_queue(
-            EmailMessage(
-                to_email=str(user.email),
-                subject=subject,
-                html=email_html,
-                text=email_text,
-                tag=category,
+        pending = [row for row in rows if row[0] not in alerted]
+        user_ids = {row[1] for row in pending}
+        allowed = _dispatch_allowed_user_ids(user_ids, category)
+        entitled = user_ids_with_entitlement(allowed, _EMAIL_REMINDERS_FEATURE)
+        emails = _recipient_emails(entitled)
+
+        deliveries: list[tuple[UUID, UUID, EmailMessage]] = []
+        for transaction_id, user_id, title, amount in pending:
+            to_email = emails.get(user_id)
+            if to_email is None:
+                continue
+            deliveries.append(
+                (
+                    transaction_id,
+                    user_id,
+                    _build_message(
+                        to_email=to_email,
+                        title=title,
+                        amount=amount,
+                        days_before_due=days_before_due,
+                        tag=category,
+                    ),
+                )
             )
-        )
-        if alert_status == AlertStatus.SENT:
-            sent += 1
-            sent_at = utc_now_naive()
+        skipped += len(rows) - len(deliveries)
+
+        if send_inline:
+            statuses = [_send_or_queue(message) for _, _, message in deliveries]
         else:
-            queued += 1
-            sent_at = None
-
-        db.session.add(
-            Alert(
-                user_id=transaction.user_id,
-                category=category,
-                status=alert_status,
-                entity_type="transaction",
-                entity_id=transaction.id,
-                # Anchor triggered_at to reference_day so idempotency checks that
-                # filter by _start_of_day(day)//_end_of_day(day) always match,
-                # even when the caller passes a synthetic `today` (e.g. in tests).
-                triggered_at=_start_of_day(reference_day),
-                sent_at=sent_at,
+            outbound_queue.enqueue_send_email_batch(
+                [message for _, _, message in deliveries]
             )
-        )
+            statuses = [AlertStatus.SENT] * len(deliveries)
+            enqueued += len(deliveries)
+
+        for (transaction_id, user_id, _), alert_status in zip(
+            deliveries, statuses, strict=True
+        ):
+            if alert_status == AlertStatus.SENT:
+                if send_inline:
+                    sent += 1
+                sent_at = utc_now_naive()
+            else:
+                queued += 1
+                sent_at = None
+            db.session.add(
+                Alert(
+                    user_id=user_id,
+                    category=category,
+                    status=alert_status,
+                    entity_type="transaction",
+                    entity_id=transaction_id,
+                    # Anchor triggered_at to reference_day so idempotency checks
+                    # that filter by _start_of_day(day)//_end_of_day(day) always
+                    # match, even when the caller passes a synthetic `today`.
+                    triggered_at=_start_of_day(reference_day),
+                    sent_at=sent_at,
+                )
+            )
+        db.session.commit()
 
-    db.session.commit()
     return ReminderDispatchResult(
-        scanned=scanned, sent=sent, skipped=skipped, queued=queued
+        scanned=scanned,
+        sent=sent,
+        skipped=skipped,
+        queued=queued,
+        enqueued=enqueued,
     )
@@ -10,9 +10,15 @@ from marshmallow import ValidationError
 
 from app.extensions.database import db
 from app.models.wallet import Wallet
+from app.models.wallet_history_event import WalletHistoryEvent
 from app.schemas.wallet_schema import WalletSchema
+from app.services.cache_service import get_cache_service
 from app.services.investment_service import InvestmentService
-from app.utils.datetime_utils import iso_utc_now_naive
+from app.utils.datetime_utils import utc_now_naive
+
+# Latest history events echoed back in the update response, newest first.
+# The full history is paginated by ``GET /wallet/<id>/history``.
+_UPDATE_RESPONSE_HISTORY_SIZE = 20
 
 
 @dataclass(frozen=True)
@@ -75,6 +81,7 @@ class WalletApplicationService:
             )
             db.session.add(wallet)
             db.session.commit()
+            self._invalidate_wallet_caches()
         except Exception as exc:
             db.session.rollback()
             raise WalletApplicationError(
@@ -117,7 +124,7 @@ class WalletApplicationService:
         page: int,
         per_page: int,
     ) -> dict[str, Any]:
-        investment = self._get_owned_wallet(
+        self._get_owned_wallet(
             investment_id,
             forbidden_message=(
                 "Você não tem permissão para ver o histórico deste investimento."
@@ -130,16 +137,7 @@ class WalletApplicationService:
                 status_code=400,
             )
 
-        history = cast(list[dict[str, Any]], investment.history or [])
-
-        def _sort_key(item: dict[str, Any]) -> tuple[Any, str]:
-            return (item.get("originalQuantity", 0) or 0, item.get("changeDate", ""))
-
-        sorted_history = sorted(history, key=_sort_key, reverse=True)
-        total = len(sorted_history)
-        start = (page - 1) * per_page
-        end = start + per_page
-        items = sorted_history[start:end]
+        items, total = self._history_page(investment_id, page=page, per_page=per_page)
         pages = (total + per_page - 1) // per_page if per_page and total else 0
         return {
             "items": items,
@@ -149,7 +147,7 @@ class WalletApplicationService:
                 "per_page": per_page,
                 "page_size": per_page,
                 "pages": pages,
-                "has_next_page": end < total,
+                "has_next_page": page * per_page < total,
             },
         }
 
@@ -173,11 +171,12 @@ class WalletApplicationService:
                 details={"messages": exc.messages},
             ) from exc
 
-        self._update_investment_history(investment, validated_data)
+        self._record_history_event(investment, validated_data)
         self._apply_validated_fields(investment, validated_data)
 
         try:
             db.session.commit()
+            self._invalidate_wallet_caches()
         except Exception as exc:
             db.session.rollback()
             raise WalletApplicationError(
@@ -187,7 +186,9 @@ class WalletApplicationService:
             ) from exc
 
         investment_data = self._serialize_wallet_item(investment)
-        investment_data["history"] = investment.history
+        investment_data["history"], _ = self._history_page(
+            investment_id, page=1, per_page=_UPDATE_RESPONSE_HISTORY_SIZE
+        )
         return investment_data
 
     def delete_entry(
@@ -212,6 +213,7 @@ class WalletApplicationService:
                 actor_id=str(self._user_id),
             )
             db.session.commit()
+            self._invalidate_wallet_caches()
         except Exception as exc:
             db.session.rollback()
             raise WalletApplicationError(
@@ -220,6 +222,9 @@ class WalletApplicationService:
                 status_code=500,
             ) from exc
 
+    def _invalidate_wallet_caches(self) -> None:
+        get_cache_service().invalidate_domain("wallets", self._user_id)
+
     def _get_owned_wallet(
         self,
         investment_id: UUID,
@@ -241,7 +246,25 @@ class WalletApplicationService:
             )
         return wallet
 
-    def _update_investment_history(
+    @staticmethod
+    def _history_page(
+        investment_id: UUID, *, page: int, per_page: int
+    ) -> tuple[list[dict[str, Any]], int]:
+        # Served by the (wallet_id, recorded_at) index; only one page of
+        # events is read instead of the wallet's whole change log.
+        query = WalletHistoryEvent.query.filter_by(wallet_id=investment_id)
+        total = query.count()
+        events = (
+            query.order_by(
+                WalletHistoryEvent.recorded_at.desc(), WalletHistoryEvent.id.desc()
+            )
+            .offset((page - 1) * per_page)
+            .limit(per_page)
+            .all()
+        )
+        return [dict(event.payload) for event in events], total
+
+    def _record_history_event(
         self,
         investment: Wallet,
         validated_data: dict[str, Any],
@@ -249,12 +272,13 @@ class WalletApplicationService:
         old_quantity = investment.quantity
         old_estimated = investment.estimated_value_on_create_date
         old_value = investment.value
+        recorded_at = utc_now_naive()
 
         changes: dict[str, Any] = {}
         if "quantity" in validated_data and validated_data["quantity"] != old_quantity:
             price = self._get_market_price(investment.ticker)
             changes = {
-                "changeDate": iso_utc_now_naive(),
+                "changeDate": recorded_at.isoformat(),
                 "originalQuantity": old_quantity,
                 "estimated_value_on_create_date": (
                     float(old_estimated)
@@ -270,13 +294,19 @@ class WalletApplicationService:
                 "originalValue": (
                     float(old_value) if isinstance(old_value, Decimal) else old_value
                 ),
-                "changeDate": iso_utc_now_naive(),
+                "changeDate": recorded_at.isoformat(),
             }
 
         if changes:
-            history = cast(list[dict[str, Any]], investment.history or [])
-            history.append(changes)
-            investment.history = history
+            # Appended as its own row: an edit never rewrites earlier history.
+            db.session.add(
+                WalletHistoryEvent(
+                    wallet_id=investment.id,
+                    user_id=investment.user_id,
+                    recorded_at=recorded_at,
+                    payload=changes,
+                )
+            )
 
     def _apply_validated_fields(
         self,
@@ -37,4 +37,5 @@ def run_worker(queue: str, burst: bool) -> None:
     rq_queue = rq.Queue(queue, connection=conn)
     worker = rq.Worker([rq_queue], connection=conn)
     click.echo(f"Starting RQ worker — queue={queue} burst={burst} redis={redis_url}")
-    worker.work(burst=burst)
+    # The scheduler runs delayed jobs such as the Expo push receipt check.
+    worker.work(burst=burst, with_scheduler=True)
@@ -4,7 +4,8 @@ from flask import Response
 from flask_apispec.views import MethodResource
 from flask_jwt_extended import unset_jwt_cookies
 
-from app.auth import current_user_id
+from app.application.services.session_service import revoke_session_by_access_jti
+from app.auth import current_token_jti, current_user_id
 from app.docs.openapi_helpers import (
     contract_header_param,
     json_success_response,
@@ -47,6 +48,10 @@ class LogoutResource(MethodResource):
             # so a leaked refresh cookie cannot be reused after logout.
             user.current_jti = None
             user.refresh_token_jti = None
+            access_jti = current_token_jti(optional=True)
+            if access_jti:
+                # Multi-device sessions: end the session that issued this token.
+                revoke_session_by_access_jti(user_id=user.id, access_jti=access_jti)
             db.session.commit()
             get_jwt_revocation_cache().invalidate(str(identity))
         response = compat_success(
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import IO, Any
 from uuid import UUID
 
 from flask import request
@@ -24,24 +24,15 @@ def _current_user_id() -> UUID:
     return current_user_id()
 
 
-def _decode_uploaded_text() -> str:
+def _uploaded_stream() -> IO[bytes]:
     upload = request.files.get("file")
     if upload is None:
         raise ValueError("Field 'file' is required")
+    # Parsed incrementally by the service (UTF-8 with Latin-1 fallback).
+    return upload.stream
 
-    raw = bytes(upload.read())
-    if not raw:
-        raise ValueError("Uploaded file is empty")
 
-    for encoding in ("utf-8", "latin-1"):
-        try:
-            return raw.decode(encoding)
-        except UnicodeDecodeError:
-            continue
-    raise ValueError("Uploaded file must be a text-based OFX or CSV")
-
-
-def _extract_preview_request() -> tuple[str, str]:
+def _extract_preview_request() -> tuple[str, str | IO[bytes]]:
     bank_name = ""
     if request.is_json:
         payload = request.get_json(silent=True) or {}
@@ -56,7 +47,7 @@ def _extract_preview_request() -> tuple[str, str]:
     bank_name = (request.form.get("bank") or "").strip()
     if not bank_name:
         raise ValueError("Field 'bank' is required")
-    return bank_name, _decode_uploaded_text()
+    return bank_name, _uploaded_stream()
 
 
 def _serialize_preview(preview: BankImportPreview) -> dict[str, Any]:
@@ -35,7 +35,7 @@ class BudgetCollectionResource(MethodResource):
     def get(self) -> Any:
         service = _get_service()
         budgets = service.list_budgets()
-        items = [service.serialize_with_spent(b) for b in budgets]
+        items = service.serialize_many_with_spent(budgets)
         return compat_success(
             legacy_payload={"items": items},
             status_code=200,
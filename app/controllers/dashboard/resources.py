@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Callable
 from datetime import date
 from typing import Any
+from uuid import UUID
 
 from flask import Response, request
 from flask_apispec.views import MethodResource
@@ -23,7 +25,12 @@ from app.schemas.openapi.dashboard.docs import (
     DASHBOARD_TRENDS_DOC,
     DASHBOARD_WEEKLY_SUMMARY_DOC,
 )
-from app.services.cache_service import DASHBOARD_CACHE_TTL, get_cache_service
+from app.services.cache_service import (
+    DASHBOARD_CACHE_TTL,
+    DASHBOARD_STALE_TTL,
+    CacheLookup,
+    get_cache_service,
+)
 from app.utils.typed_decorators import typed_doc as doc
 from app.utils.typed_decorators import typed_jwt_required as jwt_required
 
@@ -34,6 +41,72 @@ _DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
 _VALID_PERIODS = {"1m", "3m", "6m"}
 
 
+def _cached_dashboard(cache_key: str, compute: Callable[[], Any]) -> CacheLookup:
+    """Single-flight, stale-while-revalidate read of a dashboard payload.
+
+    *compute* must only need an app context: it may run in a background
+    refresh thread after the request has finished.
+    """
+    return get_cache_service().get_or_compute(
+        cache_key, compute, ttl=DASHBOARD_CACHE_TTL, stale_ttl=DASHBOARD_STALE_TTL
+    )
+
+
+def _compute_overview(user_uuid: UUID, month: str) -> dict[str, Any]:
+    dependencies = get_transaction_dependencies()
+    query_service = dependencies.transaction_query_service_factory(user_uuid)
+    result = query_service.get_dashboard_overview(month=month)
+    legacy = {
+        "month": result["month"],
+        "income_total": result["income_total"],
+        "expense_total": result["expense_total"],
+        "balance": result["balance"],
+        "counts": result["counts"],
+        "top_expense_categories": result["top_expense_categories"],
+        "top_income_categories": result["top_income_categories"],
+    }
+    data = {
+        "month": result["month"],
+        "totals": {
+            "income_total": result["income_total"],
+            "expense_total": result["expense_total"],
+            "balance": result["balance"],
+        },
+        "counts": result["counts"],
+        "top_categories": {
+            "expense": result["top_expense_categories"],
+            "income": result["top_income_categories"],
+        },
+    }
+    return {"legacy": legacy, "data": data}
+
+
+def _compute_trends(user_uuid: UUID, months: int) -> dict[str, Any]:
+    dependencies = get_transaction_dependencies()
+    query_service = dependencies.transaction_query_service_factory(user_uuid)
+    return dict(query_service.get_dashboard_trends(months=months))
+
+
+def _compute_survival_index(user_uuid: UUID) -> dict[str, Any]:
+    dependencies = get_transaction_dependencies()
+    query_service = dependencies.transaction_query_service_factory(user_uuid)
+    return dict(query_service.get_survival_index())
+
+
+def _compute_weekly_summary(
+    user_uuid: UUID, period: str, start_date: date | None, end_date: date | None
+) -> dict[str, Any]:
+    dependencies = get_transaction_dependencies()
+    query_service = dependencies.transaction_query_service_factory(user_uuid)
+    return dict(
+        query_service.get_weekly_summary(
+            period=period,
+            start_date=start_date,
+            end_date=end_date,
+        )
+    )
+
+
 class DashboardOverviewResource(MethodResource):
     @doc(**DASHBOARD_OVERVIEW_DOC)
     @jwt_required()
@@ -46,25 +119,14 @@ class DashboardOverviewResource(MethodResource):
         month_raw = str(request.args.get("month", ""))
         # Sanitise: only allow YYYY-MM to prevent log-injection (S5145)
         month = month_raw if _MONTH_RE.match(month_raw) else ""
-        cache = get_cache_service()
-        cache_key = f"dashboard:overview:{user_uuid}:{month}"
-
-        cached = cache.get(cache_key)
-        if cached is not None:
-            resp = compat_success_response(
-                legacy_payload=cached["legacy"],
-                status_code=200,
-                message="Overview do dashboard calculado com sucesso",
-                data=cached["data"],
-            )
-            resp.headers["X-Cache"] = "HIT"
-            return resp
-
-        dependencies = get_transaction_dependencies()
-        query_service = dependencies.transaction_query_service_factory(user_uuid)
+        cache_key = get_cache_service().versioned_key(
+            "dashboard:overview", user_uuid, month
+        )
 
         try:
-            result = query_service.get_dashboard_overview(month=month)
+            lookup = _cached_dashboard(
+                cache_key, lambda: _compute_overview(user_uuid, month)
+            )
         except TransactionApplicationError as exc:
             return compat_error_response(
                 legacy_payload={"error": exc.message, "details": exc.details},
@@ -81,36 +143,13 @@ class DashboardOverviewResource(MethodResource):
                 error_code="INTERNAL_ERROR",
             )
 
-        legacy = {
-            "month": result["month"],
-            "income_total": result["income_total"],
-            "expense_total": result["expense_total"],
-            "balance": result["balance"],
-            "counts": result["counts"],
-            "top_expense_categories": result["top_expense_categories"],
-            "top_income_categories": result["top_income_categories"],
-        }
-        data = {
-            "month": result["month"],
-            "totals": {
-                "income_total": result["income_total"],
-                "expense_total": result["expense_total"],
-                "balance": result["balance"],
-            },
-            "counts": result["counts"],
-            "top_categories": {
-                "expense": result["top_expense_categories"],
-                "income": result["top_income_categories"],
-            },
-        }
-        cache.set(cache_key, {"legacy": legacy, "data": data}, ttl=DASHBOARD_CACHE_TTL)
         resp = compat_success_response(
-            legacy_payload=legacy,
+            legacy_payload=lookup.value["legacy"],
             status_code=200,
             message="Overview do dashboard calculado com sucesso",
-            data=data,
+            data=lookup.value["data"],
         )
-        resp.headers["X-Cache"] = "MISS"
+        resp.headers["X-Cache"] = lookup.status.upper()
         return resp
 
 
@@ -139,25 +178,14 @@ class DashboardTrendsResource(MethodResource):
             )
 
         user_uuid = current_user_id()
-        cache = get_cache_service()
-        cache_key = f"dashboard:trends:{user_uuid}:{months}"
-
-        cached = cache.get(cache_key)
-        if cached is not None:
-            resp = compat_success_response(
-                legacy_payload=cached,
-                status_code=200,
-                message="Tendências calculadas com sucesso",
-                data=cached,
-            )
-            resp.headers["X-Cache"] = "HIT"
-            return resp
-
-        dependencies = get_transaction_dependencies()
-        query_service = dependencies.transaction_query_service_factory(user_uuid)
+        cache_key = get_cache_service().versioned_key(
+            "dashboard:trends", user_uuid, str(months)
+        )
 
         try:
-            result = query_service.get_dashboard_trends(months=months)
+            lookup = _cached_dashboard(
+                cache_key, lambda: _compute_trends(user_uuid, months)
+            )
         except TransactionApplicationError as exc:
             return compat_error_response(
                 legacy_payload={"error": exc.message, "details": exc.details},
@@ -174,15 +202,13 @@ class DashboardTrendsResource(MethodResource):
                 error_code="INTERNAL_ERROR",
             )
 
-        result_dict: dict[str, Any] = dict(result)
-        cache.set(cache_key, result_dict, ttl=DASHBOARD_CACHE_TTL)
         resp = compat_success_response(
-            legacy_payload=result_dict,
+            legacy_payload=lookup.value,
             status_code=200,
             message="Tendências calculadas com sucesso",
-            data=result_dict,
+            data=lookup.value,
         )
-        resp.headers["X-Cache"] = "MISS"
+        resp.headers["X-Cache"] = lookup.status.upper()
         return resp
 
 
@@ -195,25 +221,14 @@ class DashboardSurvivalIndexResource(MethodResource):
             return token_error
 
         user_uuid = current_user_id()
-        cache = get_cache_service()
-        cache_key = f"dashboard:survival-index:{user_uuid}"
-
-        cached = cache.get(cache_key)
-        if cached is not None:
-            resp = compat_success_response(
-                legacy_payload=cached,
-                status_code=200,
-                message="Índice de sobrevivência calculado com sucesso",
-                data=cached,
-            )
-            resp.headers["X-Cache"] = "HIT"
-            return resp
-
-        dependencies = get_transaction_dependencies()
-        query_service = dependencies.transaction_query_service_factory(user_uuid)
+        cache_key = get_cache_service().versioned_key(
+            "dashboard:survival-index", user_uuid
+        )
 
         try:
-            result = query_service.get_survival_index()
+            lookup = _cached_dashboard(
+                cache_key, lambda: _compute_survival_index(user_uuid)
+            )
         except Exception:
             return compat_error_response(
                 legacy_payload={"error": "Erro ao calcular índice de sobrevivência"},
@@ -222,15 +237,13 @@ class DashboardSurvivalIndexResource(MethodResource):
                 error_code="INTERNAL_ERROR",
             )
 
-        payload: dict[str, Any] = dict(result)
-        cache.set(cache_key, payload, ttl=DASHBOARD_CACHE_TTL)
         resp = compat_success_response(
-            legacy_payload=payload,
+            legacy_payload=lookup.value,
             status_code=200,
             message="Índice de sobrevivência calculado com sucesso",
-            data=payload,
+            data=lookup.value,
         )
-        resp.headers["X-Cache"] = "MISS"
+        resp.headers["X-Cache"] = lookup.status.upper()
         return resp
 
 
@@ -291,29 +304,16 @@ class DashboardWeeklySummaryResource(MethodResource):
                 )
             period = period_raw
 
-        cache = get_cache_service()
-        cache_key = (
-            f"dashboard:weekly-summary:{user_uuid}:{period}:{start_raw}:{end_raw}"
+        cache_key = get_cache_service().versioned_key(
+            "dashboard:weekly-summary", user_uuid, period, start_raw, end_raw
         )
-        cached = cache.get(cache_key)
-        if cached is not None:
-            resp = compat_success_response(
-                legacy_payload=cached,
-                status_code=200,
-                message="Resumo semanal calculado com sucesso",
-                data=cached,
-            )
-            resp.headers["X-Cache"] = "HIT"
-            return resp
-
-        dependencies = get_transaction_dependencies()
-        query_service = dependencies.transaction_query_service_factory(user_uuid)
 
         try:
-            result = query_service.get_weekly_summary(
-                period=period,
-                start_date=start_date,
-                end_date=end_date,
+            lookup = _cached_dashboard(
+                cache_key,
+                lambda: _compute_weekly_summary(
+                    user_uuid, period, start_date, end_date
+                ),
             )
         except Exception:
             return compat_error_response(
@@ -323,15 +323,13 @@ class DashboardWeeklySummaryResource(MethodResource):
                 error_code="INTERNAL_ERROR",
             )
 
-        payload: dict[str, Any] = dict(result)
-        cache.set(cache_key, payload, ttl=DASHBOARD_CACHE_TTL)
         resp = compat_success_response(
-            legacy_payload=payload,
+            legacy_payload=lookup.value,
             status_code=200,
             message="Resumo semanal calculado com sucesso",
-            data=payload,
+            data=lookup.value,
         )
-        resp.headers["X-Cache"] = "MISS"
+        resp.headers["X-Cache"] = lookup.status.upper()
         return resp
 
 
@@ -16,15 +16,20 @@ from app.schemas.openapi.fiscal.response import (
 from app.schemas.openapi.fiscal.response import (
     serialize_entry as _serialise_entry,
 )
+from app.schemas.openapi.fiscal.response import (
+    serialize_import as _serialise_import,
+)
 from app.schemas.openapi.fiscal.response import (
     serialize_row as _serialise_row,
 )
 from app.services.csv_ingestion_service import (
+    ASYNC_IMPORT_THRESHOLD_BYTES,
     ParseResult,
     create_import_batch,
-    finalize_import_batch,
-    ingest_as_receivables,
+    enqueue_csv_import,
+    get_import_batch,
     parse_csv_generic,
+    run_csv_import,
 )
 from app.services.fiscal_service import (
     create_fiscal_document,
@@ -134,23 +139,21 @@ def csv_confirm() -> tuple[dict[str, Any], int]:
         }
 
     batch = create_import_batch(user_id, filename=filename)
-    result: ParseResult = parse_csv_generic(content, column_map)
-    created_docs = ingest_as_receivables(user_id, result.rows, import_id=str(batch.id))
-    finalize_import_batch(
-        batch,
-        total_rows=len(result.rows) + len(result.errors),
-        valid_rows=len(result.rows),
-        error_rows=len(result.errors),
-        confirmed=True,
+    run_async = bool(payload.get("async")) or (
+        len(content) >= ASYNC_IMPORT_THRESHOLD_BYTES
     )
-
-    data = {
-        "import_id": str(batch.id),
-        "imported_count": len(created_docs),
-        "skipped_duplicates": len(result.rows) - len(created_docs),
-        "error_rows": len(result.errors),
-        "errors": result.errors,
-    }
+    if run_async:
+        data = enqueue_csv_import(batch, content, column_map)
+    else:
+        data = run_csv_import(str(batch.id), content, column_map)
+
+    if data.get("queued"):
+        return compat_success_tuple(
+            legacy_payload={"message": "Importação enfileirada", **data},
+            status_code=202,
+            message="Importação enfileirada",
+            data=data,
+        )
     return compat_success_tuple(
         legacy_payload={"message": "Importação confirmada com sucesso", **data},
         status_code=201,
@@ -159,6 +162,28 @@ def csv_confirm() -> tuple[dict[str, Any], int]:
     )
 
 
+@fiscal_bp.route("/csv/imports/<import_id>", methods=["GET"])
+@jwt_required()
+def get_csv_import(import_id: str) -> tuple[dict[str, Any], int]:
+    """Return the status and progress of a CSV import batch."""
+    user_id = str(current_user_id())
+    batch = get_import_batch(user_id, import_id)
+    if batch is None:
+        return compat_error_tuple(
+            legacy_payload={"error": "Importação não encontrada"},
+            status_code=404,
+            message="Importação não encontrada",
+            error_code="NOT_FOUND",
+        )
+    data = {"import": _serialise_import(batch)}
+    return compat_success_tuple(
+        legacy_payload=data,
+        status_code=200,
+        message="Importação encontrada",
+        data=data,
+    )
+
+
 # ---------------------------------------------------------------------------
 # Receivable endpoints
 # ---------------------------------------------------------------------------
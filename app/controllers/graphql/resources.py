@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, cast
 
 from flask import current_app, g, request
 
@@ -11,22 +11,32 @@ from app.controllers.graphql.utils import (
     build_graphql_result_response,
     graphql_error_response,
     parse_graphql_payload,
+    parse_persisted_query_hash,
 )
 from app.extensions.integration_metrics import increment_metric
-from app.graphql import schema
 from app.graphql.authorization import (
     GraphQLAuthorizationPolicy,
     GraphQLAuthorizationViolation,
     enforce_graphql_authorization,
 )
+from app.graphql.document_cache import (
+    PERSISTED_QUERY_HASH_MISMATCH,
+    PERSISTED_QUERY_NOT_FOUND,
+    CachedDocument,
+    get_document_cache,
+    lookup_persisted_query,
+    query_sha256,
+    register_persisted_query,
+)
 from app.graphql.errors import PUBLIC_GRAPHQL_ERROR_CODES
+from app.graphql.schema import schema
 from app.graphql.security import (
     GraphQLQueryMetrics,
     GraphQLSecurityPolicy,
     GraphQLSecurityViolation,
     analyze_graphql_query,
 )
-from graphql import GraphQLError
+from graphql import ExecutionResult, GraphQLError, execute_sync
 
 from .dependencies import get_graphql_authorization_policy, get_graphql_security_policy
 
@@ -203,19 +213,34 @@ def _record_graphql_query_metrics(metrics: GraphQLQueryMetrics) -> None:
         )
 
 
+def _load_cached_document(
+    query: str, policy: GraphQLSecurityPolicy
+) -> CachedDocument | None:
+    # Oversized or unparsable queries are left to the security layer, which
+    # rejects them with the usual error codes; they are never cached.
+    if len(query.encode("utf-8")) > policy.max_query_bytes:
+        return None
+    try:
+        return get_document_cache().get_or_parse(query)
+    except GraphQLError:
+        return None
+
+
 def _enforce_graphql_policies(
     *,
     query: str,
     parsed_variables: dict[str, Any] | None,
     parsed_operation_name: str | None,
+    security_policy: GraphQLSecurityPolicy,
+    cached: CachedDocument | None,
 ) -> tuple[dict[str, Any], int] | None:
-    security_policy = _get_security_policy()
     try:
         metrics = analyze_graphql_query(
             query=query,
             operation_name=parsed_operation_name,
             variable_values=parsed_variables,
             policy=security_policy,
+            cached=cached,
         )
     except GraphQLSecurityViolation as exc:
         increment_metric(GRAPHQL_REQUEST_REJECTED_METRIC)
@@ -236,6 +261,7 @@ def _enforce_graphql_policies(
             query=query,
             operation_name=parsed_operation_name,
             policy=authorization_policy,
+            cached=cached,
         )
     except GraphQLAuthorizationViolation as exc:
         increment_metric(GRAPHQL_REQUEST_REJECTED_METRIC)
@@ -254,12 +280,92 @@ def _enforce_graphql_policies(
     return None
 
 
+def _resolve_persisted_query(
+    raw_payload: Any,
+) -> tuple[Any, str | None, tuple[dict[str, Any], int] | None]:
+    """Apply the APQ protocol; return ``(payload, hash_to_register, error)``."""
+    persisted_hash = parse_persisted_query_hash(raw_payload)
+    if persisted_hash is None:
+        return raw_payload, None, None
+    query = raw_payload.get("query")
+    if isinstance(query, str) and query.strip():
+        if query_sha256(query) != persisted_hash:
+            increment_metric(GRAPHQL_REQUEST_REJECTED_METRIC)
+            return (
+                raw_payload,
+                None,
+                graphql_error_response(
+                    message="provided sha does not match query",
+                    code=PERSISTED_QUERY_HASH_MISMATCH,
+                    status_code=400,
+                ),
+            )
+        increment_metric("graphql.apq.registered")
+        return raw_payload, persisted_hash, None
+
+    stored = lookup_persisted_query(persisted_hash)
+    if stored is None:
+        increment_metric("graphql.apq.miss")
+        # Apollo clients retry with the full query on this exact message.
+        return (
+            raw_payload,
+            None,
+            graphql_error_response(
+                message="PersistedQueryNotFound",
+                code=PERSISTED_QUERY_NOT_FOUND,
+                status_code=200,
+            ),
+        )
+    increment_metric("graphql.apq.hit")
+    return {**raw_payload, "query": stored}, None, None
+
+
+def execute_graphql_document(
+    *,
+    query: str,
+    cached: CachedDocument | None,
+    variable_values: dict[str, Any] | None,
+    operation_name: str | None,
+) -> ExecutionResult:
+    """Single execution entry point for ``/graphql``.
+
+    Cached documents skip parsing and reuse their memoised validation;
+    anything else goes through ``schema.execute``. Error sanitisation is
+    applied by the caller to whatever this returns.
+    """
+    if cached is None:
+        return cast(
+            ExecutionResult,
+            schema.execute(
+                query,
+                variable_values=variable_values,
+                operation_name=operation_name,
+                context_value={"request": request},
+            ),
+        )
+    validation_errors = cached.validation_errors(schema.graphql_schema)
+    if validation_errors:
+        return ExecutionResult(data=None, errors=validation_errors)
+    return execute_sync(
+        schema.graphql_schema,
+        cached.document,
+        variable_values=variable_values,
+        operation_name=operation_name,
+        context_value={"request": request},
+    )
+
+
 def execute_graphql() -> tuple[dict[str, Any], int]:
     increment_metric("graphql.request.total")
     g.graphql_operation_name = None
     g.graphql_root_fields = ()
     try:
-        parsed_payload = parse_graphql_payload(request.get_json(silent=True))
+        raw_payload, hash_to_register, apq_error = _resolve_persisted_query(
+            request.get_json(silent=True)
+        )
+        if apq_error is not None:
+            return apq_error
+        parsed_payload = parse_graphql_payload(raw_payload)
     except ValueError as exc:
         increment_metric(GRAPHQL_REQUEST_REJECTED_METRIC)
         increment_metric("graphql.payload.invalid")
@@ -275,19 +381,25 @@ def execute_graphql() -> tuple[dict[str, Any], int]:
         )
     query, parsed_variables, parsed_operation_name = parsed_payload
     g.graphql_operation_name = parsed_operation_name
+    security_policy = _get_security_policy()
+    cached = _load_cached_document(query, security_policy)
     policy_error = _enforce_graphql_policies(
         query=query,
         parsed_variables=parsed_variables,
         parsed_operation_name=parsed_operation_name,
+        security_policy=security_policy,
+        cached=cached,
     )
     if policy_error is not None:
         return policy_error
+    if hash_to_register is not None:
+        register_persisted_query(hash_to_register, query)
 
-    result = schema.execute(
-        query,
+    result = execute_graphql_document(
+        query=query,
+        cached=cached,
         variable_values=parsed_variables,
         operation_name=parsed_operation_name,
-        context_value={"request": request},
     )
     return build_graphql_result_response(
         result,
@@ -43,6 +43,25 @@ def parse_graphql_payload(
     return query, parsed_variables, parsed_operation_name
 
 
+def parse_persisted_query_hash(raw_payload: Any) -> str | None:
+    """Return the APQ ``sha256Hash`` from ``extensions.persistedQuery``, if any."""
+    payload: dict[str, Any] = raw_payload if isinstance(raw_payload, dict) else {}
+    extensions = payload.get("extensions")
+    if not isinstance(extensions, dict) or "persistedQuery" not in extensions:
+        return None
+    persisted = extensions["persistedQuery"]
+    if not isinstance(persisted, dict) or persisted.get("version") != 1:
+        raise PublicValidationError("Versão de persistedQuery não suportada.")
+    sha256 = persisted.get("sha256Hash")
+    if (
+        not isinstance(sha256, str)
+        or len(sha256) != 64
+        or any(char not in "0123456789abcdef" for char in sha256)
+    ):
+        raise PublicValidationError("Campo 'sha256Hash' inválido.")
+    return sha256
+
+
 def build_graphql_result_response(
     result: Any,
     *,
@@ -63,5 +82,6 @@ def build_graphql_result_response(
 __all__ = [
     "graphql_error_response",
     "parse_graphql_payload",
+    "parse_persisted_query_hash",
     "build_graphql_result_response",
 ]
@@ -31,6 +31,7 @@ from .utils import (
     _compat_success,
     _guard_revoked_token,
     _internal_error_response,
+    _parse_bool_flag,
     _parse_optional_date,
     _parse_positive_int,
     _resolve_transaction_ordering,
@@ -94,6 +95,12 @@ def _parse_due_range_params() -> dict[str, Any]:
             request.args.get("per_page"), default=10, field_name="per_page"
         ),
         "order_by": str(request.args.get("order_by", "overdue_first")).strip().lower(),
+        "cursor": request.args.get("cursor"),
+        "include_total": _parse_bool_flag(
+            request.args.get("include_total"),
+            default=True,
+            field_name="include_total",
+        ),
     }
 
 
@@ -387,29 +394,27 @@ class TransactionDuePeriodResource(MethodResource):
                 page=params["page"],
                 per_page=params["per_page"],
                 order_by=params["order_by"],
+                cursor=params["cursor"],
+                include_total=params["include_total"],
             )
             pagination = result["pagination"]
             counts = result["counts"]
+            legacy_payload: dict[str, Any] = {
+                "transactions": result["items"],
+                "total": pagination["total"],
+                "page": pagination["page"],
+                "per_page": pagination["per_page"],
+                "counts": counts,
+            }
+            if "next_cursor" in pagination:
+                legacy_payload["next_cursor"] = pagination["next_cursor"]
 
             return _compat_success(
-                legacy_payload={
-                    "transactions": result["items"],
-                    "total": pagination["total"],
-                    "page": pagination["page"],
-                    "per_page": pagination["per_page"],
-                    "counts": counts,
-                },
+                legacy_payload=legacy_payload,
                 status_code=200,
                 message="Lista de vencimentos por período",
                 data={"transactions": result["items"], "counts": counts},
-                meta={
-                    "pagination": {
-                        "total": pagination["total"],
-                        "page": pagination["page"],
-                        "per_page": pagination["per_page"],
-                        "pages": pagination["pages"],
-                    }
-                },
+                meta={"pagination": dict(pagination)},
             )
         except TransactionApplicationError as exc:
             return _compat_error(
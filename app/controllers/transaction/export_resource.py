@@ -19,19 +19,38 @@ CSV exports are streamed via Flask ``stream_with_context`` — rows are flushed
 to the client as they are generated so peak memory usage stays constant
 regardless of dataset size.  There is no row-count limit.
 
-PDF exports are still materialised in memory (ReportLab requirement).
+Background jobs
+---------------
+``async=true`` queues an export job and answers ``202`` with the job payload;
+``async=auto`` does so for PDF exports and for CSV exports of at least
+``EXPORT_CSV_JOB_THRESHOLD_ROWS`` rows. Job CSV files are gzip-compressed.
+``GET /transactions/export/jobs/<job_id>`` reports progress and
+``GET /transactions/export/jobs/<job_id>/download`` serves the finished file
+with ``Range`` / ``If-Range`` support so interrupted downloads can resume.
 """
 
 from __future__ import annotations
 
+from collections.abc import Iterator
+from typing import Any
+
 from flask import Response, make_response, request, stream_with_context
 from flask_apispec.views import MethodResource
 
 from app.application.errors import PublicValidationError
 from app.auth import current_user_id
 from app.docs.openapi_helpers import json_error_response
+from app.models.export_job import ExportJob, ExportJobStatus
 from app.models.transaction import TransactionStatus, TransactionType
+from app.services.export_job_service import (
+    CSV_JOB_THRESHOLD_ROWS,
+    create_export_job,
+    get_export_job,
+    serialize_export_job,
+)
+from app.services.export_storage import get_export_storage
 from app.services.transaction_export_service import (
+    export_totals,
     generate_csv_stream,
     generate_pdf_export,
 )
@@ -47,11 +66,13 @@ from app.utils.typed_decorators import (
 
 from .utils import (
     _compat_error,
+    _compat_success,
     _internal_error_response,
     _parse_optional_date,
 )
 
 _SUPPORTED_FORMATS = frozenset({"csv", "pdf"})
+_ASYNC_MODES = frozenset({"false", "true", "auto"})
 _VALID_TYPES = {t.value: t for t in TransactionType}
 _VALID_STATUSES = {s.value: s for s in TransactionStatus}
 
@@ -61,6 +82,11 @@ def _parse_export_params() -> dict[str, object]:
     fmt = (request.args.get("format") or "csv").lower()
     if fmt not in _SUPPORTED_FORMATS:
         raise PublicValidationError("Parâmetro 'format' inválido. Use 'csv' ou 'pdf'.")
+    async_mode = (request.args.get("async") or "false").lower()
+    if async_mode not in _ASYNC_MODES:
+        raise PublicValidationError(
+            "Parâmetro 'async' inválido. Use 'true', 'false' ou 'auto'."
+        )
 
     start_date = _parse_optional_date(request.args.get("start_date"), "start_date")
     end_date = _parse_optional_date(request.args.get("end_date"), "end_date")
@@ -97,6 +123,7 @@ def _parse_export_params() -> dict[str, object]:
 
     return {
         "format": fmt,
+        "async": async_mode,
         "start_date": start_date,
         "end_date": end_date,
         "tx_type": tx_type,
@@ -105,6 +132,52 @@ def _parse_export_params() -> dict[str, object]:
     }
 
 
+def _export_filters(params: dict[str, object]) -> dict[str, Any]:
+    return {
+        "start_date": params["start_date"],
+        "end_date": params["end_date"],
+        "tx_type": params["tx_type"],
+        "status": params["tx_status"],
+    }
+
+
+def _should_queue_job(params: dict[str, object], user_id: Any) -> bool:
+    mode = params["async"]
+    if mode == "true":
+        return True
+    if mode != "auto":
+        return False
+    if params["format"] == "pdf":
+        return True
+    totals = export_totals(user_id=user_id, **_export_filters(params))
+    return totals.count >= CSV_JOB_THRESHOLD_ROWS
+
+
+def _queue_export_job(params: dict[str, object], user_id: Any) -> Response:
+    job = create_export_job(
+        user_id=user_id,
+        fmt=str(params["format"]),
+        month_label=str(params["month_label"]),
+        **_export_filters(params),
+    )
+    data = {"job": serialize_export_job(job)}
+    return _compat_success(
+        legacy_payload={"message": "Exportação enfileirada", **data},
+        status_code=202,
+        message="Exportação enfileirada",
+        data=data,
+    )
+
+
+def _job_not_found() -> Response:
+    return _compat_error(
+        legacy_payload={"error": "Exportação não encontrada"},
+        status_code=404,
+        message="Exportação não encontrada",
+        error_code="NOT_FOUND",
+    )
+
+
 class TransactionExportResource(MethodResource):
     @doc(
         summary="Exportar transações (CSV ou PDF)",
@@ -115,9 +188,11 @@ class TransactionExportResource(MethodResource):
             "- `format`: `csv` (padrão) ou `pdf`\n"
             "- `start_date` / `end_date`: intervalo de `due_date` (YYYY-MM-DD)\n"
             "- `type`: `income` | `expense`\n"
-            "- `status`: `paid` | `pending` | `cancelled` | `postponed` | `overdue`\n\n"
+            "- `status`: `paid` | `pending` | `cancelled` | `postponed` | `overdue`\n"
+            "- `async`: `false` (padrão), `true` ou `auto` — gera o arquivo em "
+            "segundo plano e responde 202 com o job\n\n"
             "CSV: streamed via chunked transfer — sem limite de linhas.\n"
-            "PDF: materializado em memória (limitado pela RAM do servidor)."
+            "PDF: desenhado página a página."
         ),
         tags=["Transações"],
         responses={
@@ -128,6 +203,7 @@ class TransactionExportResource(MethodResource):
                     "application/pdf": {},
                 },
             },
+            202: {"description": "Exportação enfileirada como job"},
             400: json_error_response(
                 description="Parâmetros inválidos",
                 message="Parâmetro 'format' inválido.",
@@ -165,15 +241,15 @@ class TransactionExportResource(MethodResource):
         fmt = str(params["format"])
         month_label = str(params["month_label"])
 
+        if _should_queue_job(params, user_id):
+            return _queue_export_job(params, user_id)
+
         if fmt == "pdf":
             try:
                 result = generate_pdf_export(
                     user_id=user_id,
-                    start_date=params["start_date"],  # type: ignore[arg-type]
-                    end_date=params["end_date"],  # type: ignore[arg-type]
-                    tx_type=params["tx_type"],  # type: ignore[arg-type]
-                    status=params["tx_status"],  # type: ignore[arg-type]
                     month_label=month_label,
+                    **_export_filters(params),
                 )
             except Exception:
                 return _internal_error_response(
@@ -191,14 +267,133 @@ class TransactionExportResource(MethodResource):
         filename = f"auraxis_transactions_{month_label or 'export'}.csv"
         return Response(
             stream_with_context(
-                generate_csv_stream(
-                    user_id=user_id,
-                    start_date=params["start_date"],  # type: ignore[arg-type]
-                    end_date=params["end_date"],  # type: ignore[arg-type]
-                    tx_type=params["tx_type"],  # type: ignore[arg-type]
-                    status=params["tx_status"],  # type: ignore[arg-type]
-                )
+                generate_csv_stream(user_id=user_id, **_export_filters(params))
             ),
             mimetype="text/csv; charset=utf-8",
             headers={"Content-Disposition": f'attachment; filename="{filename}"'},
         )
+
+
+_JOB_ERROR_RESPONSES = {
+    401: json_error_response(
+        description="Token ausente ou inválido",
+        message="Token ausente",
+        error_code="UNAUTHORIZED",
+        status_code=401,
+    ),
+    404: json_error_response(
+        description="Exportação não encontrada",
+        message="Exportação não encontrada",
+        error_code="NOT_FOUND",
+        status_code=404,
+    ),
+}
+
+
+class TransactionExportJobResource(MethodResource):
+    @doc(
+        summary="Consultar job de exportação",
+        description="Retorna o status de um job criado com `async`.",
+        tags=["Transações"],
+        responses={200: {"description": "Status do job"}, **_JOB_ERROR_RESPONSES},
+    )
+    @jwt_required()
+    @require_entitlement("export_pdf")
+    def get(self, job_id: str) -> Response:
+        job = get_export_job(current_user_id(), job_id)
+        if job is None:
+            return _job_not_found()
+        data = {"job": serialize_export_job(job)}
+        return _compat_success(
+            legacy_payload=data,
+            status_code=200,
+            message="Job de exportação",
+            data=data,
+        )
+
+
+def _job_etag(job: ExportJob) -> str:
+    return f'"{job.id}-{job.size_bytes}"'
+
+
+def _requested_range(job: ExportJob, size: int) -> tuple[int, int] | None:
+    """Return ``(start, stop)`` for a satisfiable single range, else ``None``.
+
+    Raises ``ValueError`` when a range was asked for but cannot be served.
+    """
+    if request.range is None:
+        return None
+    if_range = request.headers.get("If-Range")
+    if if_range and if_range != _job_etag(job):
+        return None
+    byte_range = request.range.range_for_length(size)
+    if byte_range is None:
+        raise ValueError("unsatisfiable range")
+    return byte_range
+
+
+def _stream_job_file(
+    job: ExportJob, start: int, stop: int, status_code: int
+) -> Response:
+    storage = get_export_storage()
+    key = str(job.storage_key)
+
+    def _body() -> Iterator[bytes]:
+        yield from storage.iter_range(key, start, stop)
+
+    response = Response(_body(), status=status_code, mimetype=job.content_type)
+    response.headers["Content-Length"] = str(stop - start)
+    response.headers["Accept-Ranges"] = "bytes"
+    response.headers["ETag"] = _job_etag(job)
+    response.headers["Content-Disposition"] = f'attachment; filename="{job.filename}"'
+    return response
+
+
+class TransactionExportDownloadResource(MethodResource):
+    @doc(
+        summary="Baixar arquivo de exportação",
+        description=(
+            "Entrega o arquivo de um job concluído. Suporta `Range` (206) e "
+            "`If-Range` para retomar downloads interrompidos."
+        ),
+        tags=["Transações"],
+        responses={
+            200: {"description": "Arquivo completo"},
+            206: {"description": "Intervalo de bytes solicitado"},
+            409: json_error_response(
+                description="Job ainda não concluído",
+                message="Exportação ainda não concluída",
+                error_code="CONFLICT",
+                status_code=409,
+            ),
+            416: {"description": "Intervalo não satisfazível"},
+            **_JOB_ERROR_RESPONSES,
+        },
+    )
+    @jwt_required()
+    @require_entitlement("export_pdf")
+    def get(self, job_id: str) -> Response:
+        job = get_export_job(current_user_id(), job_id)
+        if job is None:
+            return _job_not_found()
+        if job.status != ExportJobStatus.completed or not job.storage_key:
+            return _compat_error(
+                legacy_payload={"error": "Exportação ainda não concluída"},
+                status_code=409,
+                message="Exportação ainda não concluída",
+                error_code="CONFLICT",
+                details={"status": job.status.value},
+            )
+        size = int(job.size_bytes or 0)
+        try:
+            byte_range = _requested_range(job, size)
+        except ValueError:
+            response = Response(status=416)
+            response.headers["Content-Range"] = f"bytes */{size}"
+            return response
+        if byte_range is None:
+            return _stream_job_file(job, 0, size, 200)
+        start, stop = byte_range
+        response = _stream_job_file(job, start, stop, 206)
+        response.headers["Content-Range"] = f"bytes {start}-{stop - 1}/{size}"
+        return response
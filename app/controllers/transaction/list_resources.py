@@ -30,6 +30,7 @@ from .utils import (
     _compat_success,
     _guard_revoked_token,
     _internal_error_response,
+    _parse_bool_flag,
     _parse_optional_date,
     _parse_optional_uuid,
     _parse_positive_int,
@@ -102,6 +103,12 @@ def _parse_active_list_query_params() -> dict[str, Any]:
         "credit_card_id": _parse_optional_uuid(
             request.args.get("credit_card_id"), "credit_card_id"
         ),
+        "cursor": request.args.get("cursor"),
+        "include_total": _parse_bool_flag(
+            request.args.get("include_total"),
+            default=True,
+            field_name="include_total",
+        ),
     }
 
 
@@ -203,16 +210,21 @@ def _build_active_list_response(user_uuid: UUID) -> Response:
         tag_id=params["tag_id"],
         account_id=params["account_id"],
         credit_card_id=params["credit_card_id"],
+        cursor=params["cursor"],
+        include_total=params["include_total"],
     )
     pagination = result["pagination"]
     serialized = result["items"]
+    legacy_payload: dict[str, Any] = {
+        "transactions": serialized,
+        "total": pagination["total"],
+        "page": pagination["page"],
+        "per_page": pagination["per_page"],
+    }
+    if "next_cursor" in pagination:
+        legacy_payload["next_cursor"] = pagination["next_cursor"]
     return _compat_success(
-        legacy_payload={
-            "transactions": serialized,
-            "total": pagination["total"],
-            "page": pagination["page"],
-            "per_page": pagination["per_page"],
-        },
+        legacy_payload=legacy_payload,
         status_code=200,
         message="Lista de transações ativas",
         data={"transactions": serialized},
@@ -49,6 +49,23 @@ TRANSACTION_DELETED_LIST_DOC = {
     },
 }
 
+KEYSET_PAGINATION_PARAMS = {
+    "cursor": {
+        "description": (
+            "Ativa paginação por cursor em (due_date, id). Envie "
+            "vazio na primeira página e `meta.pagination.next_cursor` nas "
+            "seguintes; `page` é ignorado. Em vencimentos exige "
+            "`order_by=date`."
+        ),
+        "type": "string",
+    },
+    "include_total": {
+        "description": "Calcula total e contadores (padrão true)",
+        "type": "boolean",
+        "example": False,
+    },
+}
+
 TRANSACTION_ACTIVE_LIST_DOC = {
     "summary": "Listar transações",
     "description": (
@@ -89,6 +106,7 @@ TRANSACTION_ACTIVE_LIST_DOC = {
             "description": "Filtrar por cartão de crédito",
             "type": "string",
         },
+        **KEYSET_PAGINATION_PARAMS,
         **contract_header_param(supported_version="v2"),
     },
     "responses": {
@@ -399,6 +417,7 @@ TRANSACTION_DUE_PERIOD_DOC = {
             "type": "string",
             "example": "overdue_first",
         },
+        **KEYSET_PAGINATION_PARAMS,
         **contract_header_param(supported_version="v2"),
     },
     "responses": {
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 from .blueprint import transaction_bp
-from .export_resource import TransactionExportResource
+from .export_resource import (
+    TransactionExportDownloadResource,
+    TransactionExportJobResource,
+    TransactionExportResource,
+)
 from .report_resources import (
     TransactionCollectionResource,
     TransactionDeletedResource,
@@ -106,6 +110,18 @@ def register_transaction_routes() -> None:
         view_func=TransactionExportResource.as_view("transaction_export"),
         methods=["GET"],
     )
+    transaction_bp.add_url_rule(
+        "/export/jobs/<job_id>",
+        view_func=TransactionExportJobResource.as_view("transaction_export_job"),
+        methods=["GET"],
+    )
+    transaction_bp.add_url_rule(
+        "/export/jobs/<job_id>/download",
+        view_func=TransactionExportDownloadResource.as_view(
+            "transaction_export_download"
+        ),
+        methods=["GET"],
+    )
 
     _ROUTES_REGISTERED = True
 
@@ -111,6 +111,19 @@ def _parse_positive_int(value: str | None, *, default: int, field_name: str) ->
     return parsed
 
 
+def _parse_bool_flag(value: str | None, *, default: bool, field_name: str) -> bool:
+    if value is None:
+        return default
+    normalized = value.strip().lower()
+    if normalized in {"1", "true", "yes"}:
+        return True
+    if normalized in {"0", "false", "no"}:
+        return False
+    raise PublicValidationError(
+        f"Parâmetro '{field_name}' inválido. Use true ou false."
+    )
+
+
 def _parse_optional_uuid(value: str | None, field_name: str) -> UUID | None:
     if not value:
         return None
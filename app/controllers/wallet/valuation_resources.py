@@ -112,6 +112,14 @@ def get_portfolio_valuation() -> tuple[dict[str, Any], int]:
             "required": False,
             "deprecated": True,
         },
+        "granularity": {
+            "in": "query",
+            "description": (
+                "Agregação dos pontos: daily (padrão), weekly ou monthly. "
+                "Cada ponto representa o último dia do período."
+            ),
+            "required": False,
+        },
         "X-API-Contract": {
             "in": "header",
             "description": "Opcional. Envie 'v2' para o contrato padronizado.",
@@ -157,7 +165,11 @@ def get_portfolio_valuation_history() -> Response | tuple[dict[str, Any], int]:
 
     service = dependencies.portfolio_history_service_factory(user_id)
     try:
-        payload = service.get_history(start_date=start_date, end_date=final_date)
+        payload = service.get_history(
+            start_date=start_date,
+            end_date=final_date,
+            granularity=request.args.get("granularity", "daily"),
+        )
     except ValueError as exc:
         return validation_error_response(
             exc=exc,
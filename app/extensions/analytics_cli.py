@@ -0,0 +1,49 @@
+"""Flask CLI commands — dashboard analytics maintenance.
+
+    flask analytics rebuild [--user-id UUID]
+
+Backfills or repairs ``transaction_daily_rollups`` from the raw
+``transactions`` table. Normal writes keep the rollup in sync on their own
+(see ``app.services.transaction_rollup_service``); run this after the first
+deploy of the table, after bulk SQL maintenance, or when a drift is suspected.
+"""
+
+from __future__ import annotations
+
+from uuid import UUID
+
+import click
+from flask import Flask
+from flask.cli import AppGroup
+
+analytics_cli = AppGroup("analytics", help="Dashboard analytics maintenance.")
+
+
+@analytics_cli.command("rebuild")
+@click.option(
+    "--user-id",
+    type=click.UUID,
+    default=None,
+    help="Rebuild a single user's rollup (default: every user).",
+)
+def rebuild(user_id: UUID | None) -> None:
+    """Recompute the per-user daily ledger rollup from transactions."""
+    import sys
+
+    from app.services.transaction_rollup_service import rebuild_transaction_rollups
+
+    try:
+        written = rebuild_transaction_rollups(user_id=user_id)
+    except Exception as exc:  # noqa: BLE001
+        click.echo(
+            f"ERROR: analytics rebuild failed — {type(exc).__name__}: {exc}",
+            err=True,
+        )
+        sys.exit(1)
+    scope = str(user_id) if user_id is not None else "all"
+    click.echo(f"rollup_rows={written} scope={scope}")
+
+
+def register_analytics_commands(app: Flask) -> None:
+    """Register the ``analytics`` CLI group on *app*."""
+    app.cli.add_command(analytics_cli)
@@ -6,7 +6,12 @@ from typing import Optional
 import click
 from flask import Flask
 
+from app.extensions.database import db
 from app.services.audit_event_service import purge_expired_audit_events
+from app.services.audit_partition_service import (
+    DEFAULT_MONTHS_AHEAD,
+    ensure_audit_partitions,
+)
 
 
 def _is_audit_retention_enabled() -> bool:
@@ -50,6 +55,7 @@ def register_audit_retention_commands(app: Flask) -> None:
             return
 
         effective_retention_days = _resolve_retention_days(retention_days)
+        failed = False
         try:
             deleted = purge_expired_audit_events(
                 retention_days=effective_retention_days
@@ -58,8 +64,57 @@ def register_audit_retention_commands(app: Flask) -> None:
                 f"deleted={deleted} retention_days={effective_retention_days}",
             )
         except Exception as exc:
+            db.session.rollback()
             click.echo(
                 f"ERROR: purge-expired failed — {type(exc).__name__}: {exc}",
                 err=True,
             )
+            failed = True
+        # The scheduled purge also keeps future monthly partitions ahead; a
+        # failure here must not block the purge above, and vice versa.
+        try:
+            ensure_audit_partitions(
+                months_ahead=_read_int_env(
+                    "AUDIT_PARTITION_MONTHS_AHEAD", DEFAULT_MONTHS_AHEAD
+                )
+            )
+        except Exception as exc:
+            db.session.rollback()
+            click.echo(
+                f"ERROR: ensure-partitions failed — {type(exc).__name__}: {exc}",
+                err=True,
+            )
+            failed = True
+        if failed:
+            sys.exit(1)
+
+    @audit_events_group.command("ensure-partitions")
+    @click.option(
+        "--months-ahead",
+        type=int,
+        default=None,
+        help=(
+            "Future monthly partitions to keep created "
+            "(defaults to AUDIT_PARTITION_MONTHS_AHEAD)."
+        ),
+    )
+    def ensure_partitions_command(months_ahead: Optional[int]) -> None:
+        import sys
+
+        effective_months = (
+            _read_int_env("AUDIT_PARTITION_MONTHS_AHEAD", DEFAULT_MONTHS_AHEAD)
+            if months_ahead is None
+            else max(int(months_ahead), 0)
+        )
+        try:
+            created = ensure_audit_partitions(months_ahead=effective_months)
+        except Exception as exc:
+            click.echo(
+                f"ERROR: ensure-partitions failed — {type(exc).__name__}: {exc}",
+                err=True,
+            )
             sys.exit(1)
+        click.echo(
+            f"created={len(created)} months_ahead={effective_months} "
+            f"partitions={','.join(created) or '-'}"
+        )
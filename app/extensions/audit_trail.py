@@ -7,6 +7,12 @@ from typing import Any
 from flask import Flask, Response, current_app
 
 from app.auth import get_current_auth_context
+from app.extensions.audit_writer import (
+    AuditEventWriter,
+    build_audit_row,
+    init_audit_writer,
+    is_async_audit_writer_enabled,
+)
 from app.extensions.database import db
 from app.http.request_context import RequestContext, get_request_context
 from app.models.audit_event import AuditEvent
@@ -82,7 +88,12 @@ def _build_event_payload(
     }
 
 
-def _persist_audit_event(payload: dict[str, Any]) -> None:
+def _persist_audit_event(
+    payload: dict[str, Any], writer: AuditEventWriter | None = None
+) -> None:
+    if writer is not None:
+        writer.submit(build_audit_row(payload))
+        return
     try:
         event = AuditEvent(
             request_id=payload.get("request_id"),
@@ -166,6 +177,7 @@ def register_audit_trail(app: Flask) -> None:
         return
 
     prefixes = _load_path_prefixes()
+    writer = init_audit_writer(app) if is_async_audit_writer_enabled() else None
     retention_enabled = _is_audit_retention_enabled()
     _log_retention_strategy(
         app,
@@ -195,5 +207,5 @@ def register_audit_trail(app: Flask) -> None:
             request_context.request_id,
         )
         if _is_audit_persistence_enabled():
-            _persist_audit_event(payload)
+            _persist_audit_event(payload, writer)
         return response
@@ -0,0 +1,334 @@
+"""Background writer for HTTP audit events.
+
+Requests only enqueue their audit row; a daemon thread drains the bounded
+queue and bulk-inserts rows on its own connection every
+``AUDIT_WRITER_FLUSH_INTERVAL_MS`` or as soon as ``AUDIT_WRITER_BATCH_SIZE``
+rows are waiting. When the queue is full, or a batch cannot be written, rows
+are appended to a spill file (JSON lines) when ``AUDIT_WRITER_SPILL_PATH`` is
+configured and dropped otherwise. Every process spills to its own
+``<AUDIT_WRITER_SPILL_PATH>.<pid>`` file and holds an exclusive ``flock`` on
+it while it lives. A starting writer replays every spill file whose lock it
+can take — files of exited processes, plus a legacy shared file — so no two
+workers replay the same rows and a live worker's file is never read under it.
+The queue is flushed on interpreter shutdown.
+"""
+
+from __future__ import annotations
+
+import atexit
+import fcntl
+import glob
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import IO, Any
+
+from flask import Flask
+
+from app.extensions.database import db
+from app.extensions.integration_metrics import increment_metric, record_metric_sample
+from app.models.audit_event import AuditEvent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 10_000
+DEFAULT_BATCH_SIZE = 200
+DEFAULT_FLUSH_INTERVAL_MS = 500
+_SHUTDOWN_TIMEOUT_SECONDS = 5.0
+_EXTENSION_KEY = "audit_writer"
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def is_async_audit_writer_enabled() -> bool:
+    return os.getenv("AUDIT_WRITER_MODE", "async").strip().lower() != "sync"
+
+
+def build_audit_row(payload: dict[str, Any]) -> dict[str, Any]:
+    """Map an ``http.audit`` payload to an ``audit_events`` row.
+
+    ``id`` and ``created_at`` are fixed here so the row records the request
+    time, not the time the writer got to it.
+    """
+    return {
+        "id": uuid.uuid4(),
+        "request_id": payload.get("request_id"),
+        "method": str(payload.get("method", "")),
+        "path": str(payload.get("path", "")),
+        "status": int(payload.get("status", 0)),
+        "user_id": payload.get("user_id"),
+        "ip": payload.get("ip"),
+        "user_agent": payload.get("user_agent"),
+        "created_at": datetime.now(UTC),
+    }
+
+
+def _row_to_json(row: dict[str, Any]) -> str:
+    return json.dumps(
+        {**row, "id": str(row["id"]), "created_at": row["created_at"].isoformat()}
+    )
+
+
+def _row_from_json(line: str) -> dict[str, Any]:
+    row: dict[str, Any] = json.loads(line)
+    row["id"] = uuid.UUID(row["id"])
+    row["created_at"] = datetime.fromisoformat(row["created_at"])
+    return row
+
+
+class AuditEventWriter:
+    """Bounded queue of audit rows drained by one background thread."""
+
+    def __init__(
+        self,
+        app: Flask,
+        *,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval_ms: int = DEFAULT_FLUSH_INTERVAL_MS,
+        spill_path: Path | None = None,
+    ) -> None:
+        self._app = app
+        self._queue_size = queue_size
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval_ms / 1000
+        self._spill_path = spill_path
+        self._engine: Any = None
+        self._start_lock = threading.Lock()
+        self._reset_runtime()
+
+    @classmethod
+    def from_env(cls, app: Flask) -> AuditEventWriter:
+        spill = os.getenv("AUDIT_WRITER_SPILL_PATH", "").strip()
+        return cls(
+            app,
+            queue_size=_env_int("AUDIT_WRITER_QUEUE_SIZE", DEFAULT_QUEUE_SIZE),
+            batch_size=_env_int("AUDIT_WRITER_BATCH_SIZE", DEFAULT_BATCH_SIZE),
+            flush_interval_ms=_env_int(
+                "AUDIT_WRITER_FLUSH_INTERVAL_MS", DEFAULT_FLUSH_INTERVAL_MS
+            ),
+            spill_path=Path(spill) if spill else None,
+        )
+
+    def _reset_runtime(self) -> None:
+        # Threads and locks do not survive fork(); workers rebuild them lazily.
+        # Closing the inherited spill handle leaves the parent's lock intact.
+        inherited: IO[str] | None = getattr(self, "_spill_handle", None)
+        if inherited is not None:
+            inherited.close()
+        self._spill_handle: IO[str] | None = None
+        self._pid = os.getpid()
+        self._queue: queue.Queue[dict[str, Any]] = queue.Queue(self._queue_size)
+        self._write_lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def submit(self, row: dict[str, Any]) -> bool:
+        """Enqueue *row* without blocking. Returns ``False`` if it overflowed."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            increment_metric("audit.writer.queue_full")
+            self._spill([row])
+            return False
+        increment_metric("audit.writer.enqueued")
+        if self._queue.qsize() >= self._batch_size:
+            self._wake.set()
+        return True
+
+    def flush(self) -> int:
+        """Write every queued row now; returns how many rows were written."""
+        written = 0
+        with self._write_lock:
+            record_metric_sample("audit.writer.queue_depth", self._queue.qsize())
+            while batch := self._take(self._batch_size):
+                written += self._write(batch)
+        return written
+
+    def stop(self, timeout: float = _SHUTDOWN_TIMEOUT_SECONDS) -> None:
+        """Stop the writer thread after a final flush."""
+        thread = self._thread
+        if thread is None or self._pid != os.getpid():
+            return
+        self._stop.set()
+        self._wake.set()
+        thread.join(timeout)
+        self._thread = None
+        with self._spill_lock:
+            if self._spill_handle is not None:
+                self._spill_handle.close()
+                self._spill_handle = None
+
+    def _ensure_started(self) -> None:
+        if self._pid == os.getpid() and self._thread is not None:
+            return
+        with self._start_lock:
+            if self._pid != os.getpid():
+                self._reset_runtime()
+            if self._thread is not None:
+                return
+            with self._app.app_context():
+                self._engine = db.engine
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(self._claim_spill(),),
+                name="audit-event-writer",
+                daemon=True,
+            )
+            self._thread.start()
+            atexit.register(self.stop)
+
+    def _run(self, claimed: list[tuple[Path, IO[str]]]) -> None:
+        for replaying, handle in claimed:
+            try:
+                self._replay_spill(replaying, handle)
+            except Exception:
+                logger.exception("audit_writer_replay_failed path=%s", replaying)
+            finally:
+                handle.close()
+        while not self._stop.is_set():
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            self.flush()
+        self.flush()
+
+    def _take(self, limit: int) -> list[dict[str, Any]]:
+        batch: list[dict[str, Any]] = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, rows: list[dict[str, Any]]) -> int:
+        started = time.perf_counter()
+        try:
+            with self._engine.begin() as connection:
+                connection.execute(AuditEvent.__table__.insert(), rows)
+        except Exception:
+            logger.exception("audit_writer_flush_failed rows=%s", len(rows))
+            increment_metric("audit.writer.flush_failed")
+            self._spill(rows)
+            return 0
+        increment_metric("audit.writer.written", len(rows))
+        record_metric_sample(
+            "audit.writer.flush_ms", int((time.perf_counter() - started) * 1000)
+        )
+        return len(rows)
+
+    def _spill(self, rows: list[dict[str, Any]]) -> None:
+        if self._spill_path is None:
+            increment_metric("audit.writer.dropped", len(rows))
+            return
+        try:
+            with self._spill_lock:
+                handle = self._own_spill_handle(self._spill_path)
+                handle.writelines(_row_to_json(row) + "\n" for row in rows)
+                handle.flush()
+        except OSError:
+            logger.exception("audit_writer_spill_failed rows=%s", len(rows))
+            increment_metric("audit.writer.dropped", len(rows))
+            return
+        increment_metric("audit.writer.spilled", len(rows))
+
+    def _own_spill_handle(self, path: Path) -> IO[str]:
+        """Open and lock this process's spill file; the caller holds the lock."""
+        if self._spill_handle is not None:
+            return self._spill_handle
+        own = path.with_name(f"{path.name}.{os.getpid()}")
+        while True:
+            handle = own.open("a", encoding="utf-8")
+            # Blocks only if another worker is claiming a file left by an
+            # exited process with our pid; that file is then moved away.
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            if _is_same_file(handle, own):
+                self._spill_handle = handle
+                return handle
+            handle.close()
+
+    def _claim_spill(self) -> list[tuple[Path, IO[str]]]:
+        """Lock every spill file no live process holds, for replay.
+
+        A file stays locked until it is replayed and unlinked, so concurrent
+        starters skip it and its rows are written exactly once.
+        """
+        path = self._spill_path
+        if path is None:
+            return []
+        candidates = [path, *path.parent.glob(glob.escape(path.name) + ".*")]
+        claimed: list[tuple[Path, IO[str]]] = []
+        for candidate in candidates:
+            try:
+                handle = candidate.open(encoding="utf-8")
+            except OSError:
+                continue
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                handle.close()  # owned by a live process
+                continue
+            if not _is_same_file(handle, candidate):
+                handle.close()  # claimed and moved by another worker
+                continue
+            # The lock follows the inode, so the moved file stays claimed and
+            # a process reusing the pid starts a fresh spill file.
+            replaying = candidate.with_name(f"{path.name}.replay-{uuid.uuid4().hex}")
+            try:
+                candidate.replace(replaying)
+            except OSError:
+                handle.close()
+                continue
+            claimed.append((replaying, handle))
+        return claimed
+
+    def _replay_spill(self, replaying: Path, handle: IO[str]) -> None:
+        rows = [_row_from_json(line) for line in handle if line.strip()]
+        with self._write_lock:
+            for start in range(0, len(rows), self._batch_size):
+                # Failed batches are spilled again to this process's file.
+                self._write(rows[start : start + self._batch_size])
+        replaying.unlink()
+
+
+def _is_same_file(handle: IO[str], path: Path) -> bool:
+    try:
+        opened, current = os.fstat(handle.fileno()), path.stat()
+    except OSError:
+        return False
+    return (opened.st_dev, opened.st_ino) == (current.st_dev, current.st_ino)
+
+
+def init_audit_writer(app: Flask) -> AuditEventWriter:
+    writer = AuditEventWriter.from_env(app)
+    app.extensions[_EXTENSION_KEY] = writer
+    return writer
+
+
+def get_audit_writer(app: Flask) -> AuditEventWriter | None:
+    writer = app.extensions.get(_EXTENSION_KEY)
+    return writer if isinstance(writer, AuditEventWriter) else None
+
+
+__all__ = [
+    "AuditEventWriter",
+    "build_audit_row",
+    "get_audit_writer",
+    "init_audit_writer",
+    "is_async_audit_writer_enabled",
+]
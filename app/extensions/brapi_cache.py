@@ -5,6 +5,9 @@ no-op fallback otherwise so that a Redis outage never breaks pricing.
 
 Cache key: ``brapi:cache:{key}``
 TTL:       controlled by ``BRAPI_CACHE_TTL_SECONDS`` (default 60 s).
+
+``get_many``/``set_many`` serve batched quote lookups in one round trip
+(``MGET`` and a pipelined ``SETEX`` — plain ``MSET`` cannot carry a TTL).
 """
 
 from __future__ import annotations
@@ -35,6 +38,13 @@ class _NoOpBrapiCache:
     def set(self, key: str, value: Any, ttl_seconds: int) -> None:
         del key, value, ttl_seconds
 
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        del keys
+        return {}
+
+    def set_many(self, values: dict[str, Any], ttl_seconds: int) -> None:
+        del values, ttl_seconds
+
     def reset(self) -> None:
         # No in-memory state to clear when the cache is a no-op.
         return
@@ -72,6 +82,46 @@ class RedisBrapiCache:
         except Exception:
             logger.warning("brapi_cache: Redis SETEX failed key=%s", key, exc_info=True)
 
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """Return the cached entries among *keys* (misses are omitted)."""
+        if not keys:
+            return {}
+        try:
+            raws = self._client.mget([self._key(key) for key in keys])
+        except Exception:
+            logger.warning(
+                "brapi_cache: Redis MGET failed keys=%d — cache miss",
+                len(keys),
+                exc_info=True,
+            )
+            return {}
+        found: dict[str, Any] = {}
+        for key, raw in zip(keys, raws, strict=False):
+            if raw is None:
+                continue
+            if isinstance(raw, (bytes, bytearray)):
+                raw = raw.decode("utf-8")
+            try:
+                found[key] = json.loads(raw)
+            except ValueError:
+                continue
+        return found
+
+    def set_many(self, values: dict[str, Any], ttl_seconds: int) -> None:
+        if ttl_seconds <= 0 or not values:
+            return
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            for key, value in values.items():
+                pipe.setex(self._key(key), ttl_seconds, json.dumps(value))
+            pipe.execute()
+        except Exception:
+            logger.warning(
+                "brapi_cache: Redis pipelined SETEX failed keys=%d",
+                len(values),
+                exc_info=True,
+            )
+
     def reset(self) -> None:
         try:
             keys = self._client.keys(f"{self._key_prefix}:*")
@@ -130,6 +180,13 @@ class _MemoryBrapiCache:
         if ttl_seconds > 0:
             self._store[key] = value
 
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        return {key: self._store[key] for key in keys if key in self._store}
+
+    def set_many(self, values: dict[str, Any], ttl_seconds: int) -> None:
+        if ttl_seconds > 0:
+            self._store.update(values)
+
     def reset(self) -> None:
         self._store.clear()
 
@@ -1,3 +1,16 @@
+from typing import Any
+
 from flask_sqlalchemy import SQLAlchemy
 
 db: SQLAlchemy = SQLAlchemy()
+
+
+def dialect_insert(dialect_name: str) -> Any:
+    """Return the ``INSERT … ON CONFLICT``-capable insert for the dialect."""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects import postgresql
+
+        return postgresql.insert
+    from sqlalchemy.dialects import sqlite
+
+    return sqlite.insert
@@ -0,0 +1,39 @@
+"""Flask CLI commands — export job storage maintenance.
+
+    flask exports purge-expired
+
+Deletes the stored files of export jobs past their ``expires_at`` and then
+the job rows (see ``app.services.export_job_service``). Scheduled daily by
+the audit retention workflow; safe to run more often.
+"""
+
+from __future__ import annotations
+
+import click
+from flask import Flask
+from flask.cli import AppGroup
+
+exports_cli = AppGroup("exports", help="Export job storage maintenance.")
+
+
+@exports_cli.command("purge-expired")
+def purge_expired() -> None:
+    """Delete expired export files and their job rows."""
+    import sys
+
+    from app.services.export_job_service import purge_expired_export_jobs
+
+    try:
+        purged = purge_expired_export_jobs()
+    except Exception as exc:  # noqa: BLE001
+        click.echo(
+            f"ERROR: exports purge-expired failed — {type(exc).__name__}: {exc}",
+            err=True,
+        )
+        sys.exit(1)
+    click.echo(f"purged_jobs={purged}")
+
+
+def register_exports_commands(app: Flask) -> None:
+    """Register the ``exports`` CLI group on *app*."""
+    app.cli.add_command(exports_cli)
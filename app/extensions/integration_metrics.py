@@ -1,16 +1,49 @@
+"""In-process counters and latency sketches, optionally aggregated per fleet.
+
+Counters and latency distributions are sharded per thread: each thread
+writes to its own shard under an uncontended lock, and snapshots merge all
+shards. Shards of finished threads are folded into a retired shard when
+the next thread registers or the next snapshot is taken. Latency samples go
+into mergeable quantile sketches (fixed memory, 1% relative error), not raw
+sample lists.
+
+Counters are cumulative for the life of the process. Latency sketches rotate
+by time bucket of ``METRICS_WINDOW_SECONDS`` (default 300) and only the
+current and the previous bucket are kept, so percentiles describe the last
+one to two windows of traffic instead of everything since the process
+started.
+
+With ``METRICS_REDIS_URL`` set, every worker publishes its cumulative
+snapshot to the ``auraxis:metrics:workers`` Redis hash (one field per
+``host:pid``) every ``METRICS_PUBLISH_INTERVAL_SECONDS`` from a daemon
+thread. ``fleet=True`` snapshots, used by the payload builders behind
+``/ops`` and the CLI, merge every entry refreshed within three intervals so
+p50/p95/p99 reflect all workers. Without Redis, or when it is unreachable,
+the fleet view is the local one.
+"""
+
 from __future__ import annotations
 
+import importlib
 import json
+import logging
+import os
+import socket
 import threading
+import time
 from collections import Counter
-from math import ceil
 from pathlib import Path
 from typing import Any
 
-_lock = threading.Lock()
-_counters: Counter[str] = Counter()
-_samples: dict[str, list[int]] = {}
-_MAX_SAMPLES_PER_METRIC = 200
+from app.extensions.quantile_sketch import QuantileSketch
+
+logger = logging.getLogger(__name__)
+
+_FLEET_HASH_KEY = "auraxis:metrics:workers"
+_DEFAULT_PUBLISH_INTERVAL_SECONDS = 10.0
+_DEFAULT_WINDOW_SECONDS = 300.0
+# Fleet snapshots are reused briefly so one /ops export reads Redis once.
+_FLEET_READ_CACHE_SECONDS = 1.0
 _HTTP_LATENCY_BUDGETS_FILE = (
     Path(__file__).resolve().parents[2] / "config" / "http_latency_budgets.json"
 )
@@ -45,48 +78,349 @@ def _load_http_latency_budgets() -> dict[str, dict[str, Any]]:
 _HTTP_LATENCY_BUDGETS = _load_http_latency_budgets()
 
 
+def _load_window_seconds() -> float:
+    try:
+        return max(
+            1.0,
+            float(os.getenv("METRICS_WINDOW_SECONDS", str(_DEFAULT_WINDOW_SECONDS))),
+        )
+    except ValueError:
+        return _DEFAULT_WINDOW_SECONDS
+
+
+_WINDOW_SECONDS = _load_window_seconds()
+
+
+def _current_window() -> int:
+    return int(time.time() // _WINDOW_SECONDS)
+
+
+def _merge_sketches(
+    into: dict[str, QuantileSketch], source: dict[str, QuantileSketch]
+) -> None:
+    for name, sketch in source.items():
+        merged = into.get(name)
+        if merged is None:
+            into[name] = sketch.copy()
+        else:
+            merged.merge(sketch)
+
+
+class _Shard:
+    __slots__ = (
+        "counters",
+        "lock",
+        "owner",
+        "pid",
+        "previous_sketches",
+        "sketches",
+        "window",
+    )
+
+    def __init__(self, owner: threading.Thread | None) -> None:
+        self.lock = threading.Lock()
+        self.owner = owner
+        self.pid = os.getpid()
+        self.window = _current_window()
+        self.counters: Counter[str] = Counter()
+        self.sketches: dict[str, QuantileSketch] = {}
+        self.previous_sketches: dict[str, QuantileSketch] = {}
+
+    def clear(self) -> None:
+        with self.lock:
+            self.counters.clear()
+            self.sketches = {}
+            self.previous_sketches = {}
+
+    def rotate(self, window: int) -> None:
+        """Move the sketches to bucket ``window``; the caller holds ``lock``."""
+        if window == self.window:
+            return
+        self.previous_sketches = self.sketches if window == self.window + 1 else {}
+        self.sketches = {}
+        self.window = window
+
+    def absorb(self, other: _Shard, window: int) -> None:
+        """Fold ``other`` into this shard, sketches into matching buckets."""
+        with self.lock, other.lock:
+            self.rotate(window)
+            other.rotate(window)
+            self.counters.update(other.counters)
+            _merge_sketches(self.sketches, other.sketches)
+            _merge_sketches(self.previous_sketches, other.previous_sketches)
+
+    def merge_into(
+        self,
+        counters: Counter[str],
+        sketches: dict[str, QuantileSketch],
+        window: int,
+    ) -> None:
+        with self.lock:
+            self.rotate(window)
+            counters.update(self.counters)
+            _merge_sketches(sketches, self.previous_sketches)
+            _merge_sketches(sketches, self.sketches)
+
+
+_registry_lock = threading.Lock()
+_shards: list[_Shard] = []
+_retired = _Shard(None)
+_thread_state = threading.local()
+
+
+def _retire_finished_shards(window: int) -> None:
+    """Fold shards of finished threads into ``_retired``; caller holds the lock."""
+    live: list[_Shard] = []
+    for shard in _shards:
+        if shard.owner is not None and not shard.owner.is_alive():
+            _retired.absorb(shard, window)
+        else:
+            live.append(shard)
+    _shards[:] = live
+
+
+def _local_shard() -> _Shard:
+    shard: _Shard | None = getattr(_thread_state, "shard", None)
+    if shard is not None and shard.pid == os.getpid():
+        return shard
+    shard = _Shard(threading.current_thread())
+    with _registry_lock:
+        if _retired.pid != os.getpid():
+            # Forked worker: drop the parent's shards and counts.
+            _shards.clear()
+            _retired.clear()
+            _retired.pid = os.getpid()
+        else:
+            _retire_finished_shards(_current_window())
+        _shards.append(shard)
+    _thread_state.shard = shard
+    _ensure_publisher()
+    return shard
+
+
 def increment_metric(name: str, amount: int = 1) -> None:
     if amount <= 0:
         return
-    with _lock:
-        _counters[name] += amount
+    shard = _local_shard()
+    with shard.lock:
+        shard.counters[name] += amount
 
 
-def snapshot_metrics(prefix: str | None = None) -> dict[str, int]:
-    with _lock:
-        raw = dict(_counters)
-    if prefix is None:
-        return raw
-    return {key: value for key, value in raw.items() if key.startswith(prefix)}
+def record_metric_sample(name: str, value: int) -> None:
+    if value < 0:
+        return
+    shard = _local_shard()
+    with shard.lock:
+        shard.rotate(_current_window())
+        sketch = shard.sketches.get(name)
+        if sketch is None:
+            sketch = shard.sketches[name] = QuantileSketch()
+        sketch.add(value)
+
+
+def _collect_local() -> tuple[Counter[str], dict[str, QuantileSketch]]:
+    counters: Counter[str] = Counter()
+    sketches: dict[str, QuantileSketch] = {}
+    window = _current_window()
+    with _registry_lock:
+        _retire_finished_shards(window)
+        for shard in (_retired, *_shards):
+            shard.merge_into(counters, sketches, window)
+    return counters, sketches
+
+
+# ---------------------------------------------------------------------------
+# Fleet aggregation through Redis
+# ---------------------------------------------------------------------------
+
+_fleet_lock = threading.Lock()
+_fleet_client: Any | None = None
+_fleet_client_pid: int | None = None
+_fleet_cache: tuple[float, Counter[str], dict[str, QuantileSketch]] | None = None
+_publisher: threading.Thread | None = None
+_publisher_pid: int | None = None
+_publisher_stop = threading.Event()
+
+
+def _fleet_redis_url() -> str:
+    return os.getenv("METRICS_REDIS_URL", "").strip()
+
+
+def _publish_interval_seconds() -> float:
+    try:
+        return max(
+            1.0,
+            float(
+                os.getenv(
+                    "METRICS_PUBLISH_INTERVAL_SECONDS",
+                    str(_DEFAULT_PUBLISH_INTERVAL_SECONDS),
+                )
+            ),
+        )
+    except ValueError:
+        return _DEFAULT_PUBLISH_INTERVAL_SECONDS
 
 
-def record_metric_sample(
-    name: str,
-    value: int,
-    *,
-    max_samples: int = _MAX_SAMPLES_PER_METRIC,
-) -> None:
-    if value < 0:
+def _worker_field() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _get_fleet_client() -> Any | None:
+    global _fleet_client, _fleet_client_pid
+    redis_url = _fleet_redis_url()
+    if not redis_url:
+        return None
+    if _fleet_client is None or _fleet_client_pid != os.getpid():
+        try:
+            _fleet_client = importlib.import_module("redis").Redis.from_url(
+                redis_url, socket_timeout=0.5, socket_connect_timeout=0.5
+            )
+        except Exception:
+            logger.warning("integration_metrics: invalid METRICS_REDIS_URL")
+            return None
+        _fleet_client_pid = os.getpid()
+    return _fleet_client
+
+
+def _encode_snapshot(
+    counters: Counter[str], sketches: dict[str, QuantileSketch]
+) -> str:
+    return json.dumps(
+        {
+            "ts": time.time(),
+            "counters": dict(counters),
+            "sketches": {name: sketch.to_dict() for name, sketch in sketches.items()},
+        },
+        separators=(",", ":"),
+    )
+
+
+def publish_local_metrics() -> bool:
+    """Write this worker's snapshot to the fleet hash; ``False`` when skipped."""
+    client = _get_fleet_client()
+    if client is None:
+        return False
+    counters, sketches = _collect_local()
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.hset(
+            _FLEET_HASH_KEY, _worker_field(), _encode_snapshot(counters, sketches)
+        )
+        pipe.expire(_FLEET_HASH_KEY, int(_publish_interval_seconds() * 10))
+        pipe.execute()
+    except Exception:
+        logger.warning("integration_metrics: fleet publish failed", exc_info=True)
+        return False
+    return True
+
+
+def _publisher_loop() -> None:
+    while not _publisher_stop.wait(_publish_interval_seconds()):
+        publish_local_metrics()
+
+
+def _ensure_publisher() -> None:
+    global _publisher, _publisher_pid
+    if not _fleet_redis_url():
         return
-    with _lock:
-        bucket = _samples.setdefault(name, [])
-        bucket.append(value)
-        if max_samples > 0 and len(bucket) > max_samples:
-            del bucket[:-max_samples]
+    with _fleet_lock:
+        if _publisher is not None and _publisher_pid == os.getpid():
+            return
+        _publisher_stop.clear()
+        _publisher = threading.Thread(
+            target=_publisher_loop, name="metrics-publisher", daemon=True
+        )
+        _publisher_pid = os.getpid()
+        _publisher.start()
+
+
+def _read_fleet() -> tuple[Counter[str], dict[str, QuantileSketch]] | None:
+    client = _get_fleet_client()
+    if client is None or not publish_local_metrics():
+        return None
+    try:
+        entries = client.hgetall(_FLEET_HASH_KEY)
+    except Exception:
+        logger.warning("integration_metrics: fleet read failed", exc_info=True)
+        return None
+
+    oldest_fresh = time.time() - 3 * _publish_interval_seconds()
+    counters: Counter[str] = Counter()
+    sketches: dict[str, QuantileSketch] = {}
+    stale: list[Any] = []
+    for field, raw in entries.items():
+        try:
+            entry = json.loads(raw)
+        except (TypeError, ValueError):
+            stale.append(field)
+            continue
+        if float(entry.get("ts", 0)) < oldest_fresh:
+            stale.append(field)
+            continue
+        counters.update(entry.get("counters", {}))
+        for name, data in entry.get("sketches", {}).items():
+            sketch = QuantileSketch.from_dict(data)
+            merged = sketches.get(name)
+            if merged is None:
+                sketches[name] = sketch
+            else:
+                merged.merge(sketch)
+    if stale:
+        try:
+            client.hdel(_FLEET_HASH_KEY, *stale)
+        except Exception:
+            logger.debug("integration_metrics: stale entry cleanup failed")
+    return counters, sketches
+
+
+def _collect(*, fleet: bool) -> tuple[Counter[str], dict[str, QuantileSketch]]:
+    global _fleet_cache
+    if not fleet or not _fleet_redis_url():
+        return _collect_local()
+    with _fleet_lock:
+        cached = _fleet_cache
+    if cached is not None and time.monotonic() - cached[0] < _FLEET_READ_CACHE_SECONDS:
+        return cached[1], cached[2]
+    snapshot = _read_fleet()
+    if snapshot is None:
+        return _collect_local()
+    with _fleet_lock:
+        _fleet_cache = (time.monotonic(), *snapshot)
+    return snapshot
+
+
+def snapshot_metrics(
+    prefix: str | None = None, *, fleet: bool = False
+) -> dict[str, int]:
+    raw = dict(_collect(fleet=fleet)[0])
+    if prefix is None:
+        return raw
+    return {key: value for key, value in raw.items() if key.startswith(prefix)}
 
 
-def snapshot_metric_samples(prefix: str | None = None) -> dict[str, list[int]]:
-    with _lock:
-        raw = {key: list(values) for key, values in _samples.items()}
+def snapshot_metric_sketches(
+    prefix: str | None = None, *, fleet: bool = False
+) -> dict[str, QuantileSketch]:
+    raw = _collect(fleet=fleet)[1]
     if prefix is None:
         return raw
     return {key: value for key, value in raw.items() if key.startswith(prefix)}
 
 
 def reset_metrics() -> None:
-    with _lock:
-        _counters.clear()
-        _samples.clear()
+    """Clear this process's metrics and withdraw its fleet entry."""
+    global _fleet_cache
+    with _registry_lock:
+        for shard in (_retired, *_shards):
+            shard.clear()
+    with _fleet_lock:
+        _fleet_cache = None
+    client = _get_fleet_client()
+    if client is not None:
+        try:
+            client.hdel(_FLEET_HASH_KEY, _worker_field())
+        except Exception:
+            logger.debug("integration_metrics: fleet entry cleanup failed")
 
 
 def reset_metrics_for_tests() -> None:
@@ -94,7 +428,7 @@ def reset_metrics_for_tests() -> None:
 
 
 def build_brapi_metrics_payload() -> dict[str, Any]:
-    metrics = snapshot_metrics(prefix="brapi.")
+    metrics = snapshot_metrics(prefix="brapi.", fleet=True)
     return {
         "provider": "brapi",
         "counters": metrics,
@@ -107,7 +441,7 @@ def build_brapi_metrics_payload() -> dict[str, Any]:
 
 
 def build_rate_limit_metrics_payload() -> dict[str, Any]:
-    metrics = snapshot_metrics(prefix="rate_limit.")
+    metrics = snapshot_metrics(prefix="rate_limit.", fleet=True)
     return {
         "component": "rate_limit",
         "counters": metrics,
@@ -121,7 +455,7 @@ def build_rate_limit_metrics_payload() -> dict[str, Any]:
 
 
 def build_login_guard_metrics_payload() -> dict[str, Any]:
-    metrics = snapshot_metrics(prefix="login_guard.")
+    metrics = snapshot_metrics(prefix="login_guard.", fleet=True)
     return {
         "component": "login_guard",
         "counters": metrics,
@@ -135,7 +469,7 @@ def build_login_guard_metrics_payload() -> dict[str, Any]:
 
 
 def build_graphql_metrics_payload() -> dict[str, Any]:
-    metrics = snapshot_metrics(prefix="graphql.")
+    metrics = snapshot_metrics(prefix="graphql.", fleet=True)
     return {
         "component": "graphql",
         "counters": metrics,
@@ -156,7 +490,7 @@ def build_graphql_metrics_payload() -> dict[str, Any]:
 
 
 def build_http_observability_metrics_payload() -> dict[str, Any]:
-    metrics = snapshot_metrics(prefix="http.request.")
+    metrics = snapshot_metrics(prefix="http.request.", fleet=True)
     return {
         "component": "http_observability",
         "counters": metrics,
@@ -187,35 +521,40 @@ def build_http_observability_metrics_payload() -> dict[str, Any]:
     }
 
 
-def _nearest_rank_percentile(values: list[int], percentile: int) -> int:
-    if not values:
-        return 0
-    ordered = sorted(values)
-    rank = max(1, ceil((percentile / 100) * len(ordered)))
-    return ordered[rank - 1]
+def _latency_summary(sketch: QuantileSketch | None) -> dict[str, Any]:
+    if sketch is None or sketch.count == 0:
+        return {
+            "samples": 0,
+            "p50_ms": 0,
+            "p95_ms": 0,
+            "p99_ms": 0,
+            "max_ms": 0,
+            "avg_ms": 0.0,
+        }
+    return {
+        "samples": sketch.count,
+        "p50_ms": round(sketch.quantile(0.50)),
+        "p95_ms": round(sketch.quantile(0.95)),
+        "p99_ms": round(sketch.quantile(0.99)),
+        "max_ms": round(sketch.max),
+        "avg_ms": round(sketch.mean(), 2),
+    }
 
 
 def build_http_latency_budget_payload() -> dict[str, Any]:
+    sketches = snapshot_metric_sketches(prefix="http.route.duration_ms.", fleet=True)
     routes: dict[str, Any] = {}
     for route, metadata in _HTTP_LATENCY_BUDGETS.items():
-        metric_key = f"http.route.duration_ms.{route}"
-        samples = snapshot_metric_samples(prefix=metric_key).get(metric_key, [])
-        sample_count = len(samples)
+        summary = _latency_summary(sketches.get(f"http.route.duration_ms.{route}"))
         budget_ms = int(metadata["budget_ms"])
         routes[route] = {
             "path": metadata["path"],
             "method": metadata["method"],
             "budget_ms": budget_ms,
-            "samples": sample_count,
-            "p50_ms": _nearest_rank_percentile(samples, 50),
-            "p95_ms": _nearest_rank_percentile(samples, 95),
-            "max_ms": max(samples) if samples else 0,
-            "avg_ms": round(sum(samples) / sample_count, 2) if sample_count else 0.0,
+            **summary,
             "within_budget": (
-                samples and _nearest_rank_percentile(samples, 95) <= budget_ms
-            )
-            if sample_count
-            else None,
+                summary["p95_ms"] <= budget_ms if summary["samples"] else None
+            ),
         }
     return {"component": "http_latency_budget", "routes": routes}
 
@@ -223,7 +562,7 @@ def build_http_latency_budget_payload() -> dict[str, Any]:
 def build_observability_export_payload() -> dict[str, Any]:
     return {
         "component": "observability_export",
-        "counters_total": sum(snapshot_metrics().values()),
+        "counters_total": sum(snapshot_metrics(fleet=True).values()),
         "components": {
             "http": build_http_observability_metrics_payload(),
             "graphql": build_graphql_metrics_payload(),
@@ -251,15 +590,17 @@ def _emit_counter_metrics(lines: list[str], counters: dict[str, int]) -> None:
 
 
 def _emit_latency_sample_metrics(
-    lines: list[str], samples: dict[str, list[int]]
+    lines: list[str], sketches: dict[str, QuantileSketch]
 ) -> None:
-    for metric_name, values in sorted(samples.items()):
+    for metric_name, sketch in sorted(sketches.items()):
         exported_name = _prometheus_metric_name(metric_name)
+        summary = _latency_summary(sketch)
         lines.append(f"# TYPE {exported_name} gauge")
-        lines.append(f"{exported_name}_count {len(values)}")
-        lines.append(f"{exported_name}_p50 {_nearest_rank_percentile(values, 50)}")
-        lines.append(f"{exported_name}_p95 {_nearest_rank_percentile(values, 95)}")
-        lines.append(f"{exported_name}_max {max(values) if values else 0}")
+        lines.append(f"{exported_name}_count {summary['samples']}")
+        lines.append(f"{exported_name}_p50 {summary['p50_ms']}")
+        lines.append(f"{exported_name}_p95 {summary['p95_ms']}")
+        lines.append(f"{exported_name}_p99 {summary['p99_ms']}")
+        lines.append(f"{exported_name}_max {summary['max_ms']}")
 
 
 def _emit_latency_budget_route(
@@ -271,6 +612,7 @@ def _emit_latency_budget_route(
     lines.append(f"{exported_name}_samples {route_payload.get('samples', 0)}")
     lines.append(f"{exported_name}_p50_ms {route_payload.get('p50_ms', 0)}")
     lines.append(f"{exported_name}_p95_ms {route_payload.get('p95_ms', 0)}")
+    lines.append(f"{exported_name}_p99_ms {route_payload.get('p99_ms', 0)}")
     lines.append(f"{exported_name}_max_ms {route_payload.get('max_ms', 0)}")
     within_budget = route_payload.get("within_budget")
     if within_budget is not None:
@@ -279,9 +621,9 @@ def _emit_latency_budget_route(
 
 def build_prometheus_metrics_payload() -> str:
     lines: list[str] = []
-    _emit_counter_metrics(lines, snapshot_metrics())
+    _emit_counter_metrics(lines, snapshot_metrics(fleet=True))
     _emit_latency_sample_metrics(
-        lines, snapshot_metric_samples(prefix="http.route.duration_ms.")
+        lines, snapshot_metric_sketches(prefix="http.route.duration_ms.", fleet=True)
     )
     routes = build_http_latency_budget_payload().get("routes", {})
     if isinstance(routes, dict):
@@ -8,6 +8,7 @@ from flask_jwt_extended import JWTManager
 from app.auth import InvalidAuthContextError, current_user_id
 from app.extensions.database import db
 from app.extensions.jwt_revocation_cache import get_jwt_revocation_cache
+from app.extensions.session_state_cache import get_session_state_cache
 from app.models.user import User
 from app.utils.api_contract import is_v2_contract_request
 from app.utils.response_builder import error_payload
@@ -40,20 +41,28 @@ def is_token_revoked(jti: str) -> bool:
 def _is_access_token_revoked_multi_session(user_id: str, jti: str) -> bool | None:
     """Check multi-device access-token revocation via the RefreshToken table.
 
+    The user's active access JTIs come from ``session_state_cache``; the DB
+    is only read on a cold miss or for a JTI the cached state does not list.
+
     Returns None if the session predates the RefreshToken table (no row found),
     signalling to the caller to fall back to the user.current_jti path.
     """
-    from app.application.services.session_service import (
-        has_any_session,
-        is_access_jti_active,
-    )
+    from app.application.services.session_service import load_session_state
 
     try:
-        uid = UUID(user_id)
-        active = is_access_jti_active(user_id=uid, jti=jti)
-        if active:
+        cache = get_session_state_cache()
+        state, denied = cache.lookup(user_id, jti)
+        if denied:
+            return True
+        if state is not None and jti in state.active_access_jtis:
             return False  # Definitely active → not revoked.
-        if has_any_session(user_id=uid):
+        if state is None or state.has_sessions:
+            # Cold miss, or a JTI unknown to a possibly stale state.
+            state = load_session_state(user_id=UUID(user_id))
+            cache.store(user_id, state)
+        if jti in state.active_access_jtis:
+            return False
+        if state.has_sessions:
             return True  # Rows exist but this JTI is not among them → revoked.
         return None  # No rows — fall back to user.current_jti.
     except Exception:
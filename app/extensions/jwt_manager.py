@@ -0,0 +1,47 @@
+"""JWTManager that decodes each token once per request.
+
+The rate-limit guard reads the bearer token's subject before routing, and
+every ``verify_jwt_in_request`` call (``jwt_required``, ``current_user_id``,
+the idempotency guard, ...) decodes the same token again. Signature checks
+and claim validation are pure functions of the token, so successful decodes
+are memoised on ``g`` for the rest of the request. Revocation and token-type
+checks are not cached; they still run on every verification.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from flask import g, has_request_context
+from flask_jwt_extended import JWTManager
+
+_MEMO_ATTR = "_auraxis_decoded_jwts"
+
+
+class RequestMemoizedJWTManager(JWTManager):
+    def _decode_jwt_from_config(
+        self,
+        encoded_token: str,
+        csrf_value: Any = None,
+        allow_expired: bool = False,
+    ) -> dict[str, Any]:
+        if not has_request_context():
+            return dict(
+                super()._decode_jwt_from_config(
+                    encoded_token, csrf_value, allow_expired
+                )
+            )
+        memo: dict[tuple[str, Any, bool], dict[str, Any]] = g.setdefault(_MEMO_ATTR, {})
+        memo_key = (encoded_token, csrf_value, allow_expired)
+        decoded = memo.get(memo_key)
+        if decoded is None:
+            decoded = dict(
+                super()._decode_jwt_from_config(
+                    encoded_token, csrf_value, allow_expired
+                )
+            )
+            memo[memo_key] = decoded
+        return decoded
+
+
+__all__ = ["RequestMemoizedJWTManager"]
@@ -0,0 +1,78 @@
+"""Flask CLI commands — shared market data store maintenance.
+
+    flask market backfill [--ticker PETR4 ...] [--top 50] [--range 5y]
+
+Warms ``ticker_daily_prices`` from BRAPI so portfolio history reads stay
+local. Without ``--ticker`` the most widely held wallet tickers are used.
+Lookups fill missing ranges on their own (see
+``app.services.ticker_price_store``); run this after the first deploy of the
+table or on a schedule ahead of peak hours.
+"""
+
+from __future__ import annotations
+
+import click
+from flask import Flask
+from flask.cli import AppGroup
+
+from app.services.ticker_price_store import BRAPI_RANGES
+
+market_cli = AppGroup("market", help="Market data store maintenance.")
+
+
+@market_cli.command("backfill")
+@click.option(
+    "--ticker",
+    "tickers",
+    multiple=True,
+    help="Ticker to backfill (repeatable; default: most held tickers).",
+)
+@click.option(
+    "--top",
+    type=click.IntRange(min=1),
+    default=50,
+    show_default=True,
+    help="How many of the most held tickers to backfill without --ticker.",
+)
+@click.option(
+    "--range",
+    "brapi_range",
+    type=click.Choice([name for name, _ in BRAPI_RANGES]),
+    default="5y",
+    show_default=True,
+    help="BRAPI history range to fetch for each ticker.",
+)
+def backfill(tickers: tuple[str, ...], top: int, brapi_range: str) -> None:
+    """Fetch daily history for popular tickers into the shared price store."""
+    import sys
+
+    from app.services.investment_service import InvestmentService
+    from app.services.ticker_price_store import popular_tickers
+
+    selected = list(tickers) or popular_tickers(top)
+    failed = 0
+    for ticker in selected:
+        try:
+            rows = InvestmentService.backfill_historical_prices(
+                ticker, brapi_range=brapi_range
+            )
+        except Exception as exc:  # noqa: BLE001
+            click.echo(
+                f"ERROR ticker={ticker}: {type(exc).__name__}: {exc}",
+                err=True,
+            )
+            rows = None
+        if rows is None:
+            failed += 1
+            click.echo(f"ticker={ticker} status=failed", err=True)
+            continue
+        click.echo(f"ticker={ticker} rows={rows}")
+
+    click.echo(f"tickers={len(selected)} failed={failed} range={brapi_range}")
+    if failed:
+        sys.exit(1)
+
+
+def register_market_commands(app: Flask) -> None:
+    """Register the ``market`` CLI group on *app*."""
+    app.cli.add_command(market_cli)
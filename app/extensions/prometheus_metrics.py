@@ -45,6 +45,7 @@ _AUDIT_EVENTS_PURGED_TOTAL: Any = None
 _CACHE_HITS_TOTAL: Any = None
 _CACHE_MISSES_TOTAL: Any = None
 _CACHE_INVALIDATIONS_TOTAL: Any = None
+_CACHE_RECOMPUTE_TOTAL: Any = None
 _AI_INSIGHT_GENERATED_TOTAL: Any = None
 _AI_INSIGHT_TOKENS: Any = None
 _AI_INSIGHT_SNAPSHOT_BYTES: Any = None
@@ -138,6 +139,47 @@ def _init_ai_insight_metrics() -> None:
         )
 
 
+def _init_cache_metrics() -> None:
+    """Lazily initialise the cache_service instruments."""
+    global \
+        _CACHE_HITS_TOTAL, \
+        _CACHE_MISSES_TOTAL, \
+        _CACHE_INVALIDATIONS_TOTAL, \
+        _CACHE_RECOMPUTE_TOTAL
+
+    if _CACHE_HITS_TOTAL is None:
+        _CACHE_HITS_TOTAL = Counter(
+            "auraxis_cache_hits_total",
+            "Cache hits by key namespace and tier (l1 | redis)",
+            ["namespace", "tier"],
+        )
+
+    if _CACHE_MISSES_TOTAL is None:
+        _CACHE_MISSES_TOTAL = Counter(
+            "auraxis_cache_misses_total",
+            "Cache misses by key namespace and tier (l1 | redis)",
+            ["namespace", "tier"],
+        )
+
+    if _CACHE_INVALIDATIONS_TOTAL is None:
+        _CACHE_INVALIDATIONS_TOTAL = Counter(
+            "auraxis_cache_invalidations_total",
+            "Cache key invalidations by namespace",
+            ["namespace"],
+        )
+
+    if _CACHE_RECOMPUTE_TOTAL is None:
+        _CACHE_RECOMPUTE_TOTAL = Counter(
+            "auraxis_cache_recompute_total",
+            (
+                "get_or_compute outcomes by namespace: computed (this caller ran "
+                "the query), coalesced (served another caller's result) or "
+                "stale (stale value served while refreshing)"
+            ),
+            ["namespace", "outcome"],
+        )
+
+
 def _ensure_metrics_initialized() -> None:
     """Lazily initialise Prometheus metric objects (idempotent)."""
     global \
@@ -145,10 +187,7 @@ def _ensure_metrics_initialized() -> None:
         _HTTP_REQUEST_DURATION, \
         _AUTH_LOGINS_TOTAL, \
         _AUTH_LOGIN_COOKIE_ONLY_HEADER_TOTAL, \
-        _AUDIT_EVENTS_PURGED_TOTAL, \
-        _CACHE_HITS_TOTAL, \
-        _CACHE_MISSES_TOTAL, \
-        _CACHE_INVALIDATIONS_TOTAL
+        _AUDIT_EVENTS_PURGED_TOTAL
 
     if not _PROMETHEUS_AVAILABLE:
         return
@@ -199,27 +238,7 @@ def _ensure_metrics_initialized() -> None:
             "Total audit_events rows deleted by the retention job",
         )
 
-    if _CACHE_HITS_TOTAL is None:
-        _CACHE_HITS_TOTAL = Counter(
-            "auraxis_cache_hits_total",
-            "Cache hits by key namespace",
-            ["namespace"],
-        )
-
-    if _CACHE_MISSES_TOTAL is None:
-        _CACHE_MISSES_TOTAL = Counter(
-            "auraxis_cache_misses_total",
-            "Cache misses by key namespace",
-            ["namespace"],
-        )
-
-    if _CACHE_INVALIDATIONS_TOTAL is None:
-        _CACHE_INVALIDATIONS_TOTAL = Counter(
-            "auraxis_cache_invalidations_total",
-            "Cache key invalidations by namespace",
-            ["namespace"],
-        )
-
+    _init_cache_metrics()
     _init_ai_insight_metrics()
 
 
@@ -252,18 +271,18 @@ def record_audit_purge(count: int) -> None:
         _AUDIT_EVENTS_PURGED_TOTAL.inc(count)
 
 
-def record_cache_hit(namespace: str) -> None:
-    """Increment ``auraxis_cache_hits_total`` for the given namespace."""
+def record_cache_hit(namespace: str, *, tier: str = "redis") -> None:
+    """Increment ``auraxis_cache_hits_total`` for the given namespace and tier."""
     _ensure_metrics_initialized()
     if _CACHE_HITS_TOTAL is not None:
-        _CACHE_HITS_TOTAL.labels(namespace=namespace).inc()
+        _CACHE_HITS_TOTAL.labels(namespace=namespace, tier=tier).inc()
 
 
-def record_cache_miss(namespace: str) -> None:
-    """Increment ``auraxis_cache_misses_total`` for the given namespace."""
+def record_cache_miss(namespace: str, *, tier: str = "redis") -> None:
+    """Increment ``auraxis_cache_misses_total`` for the given namespace and tier."""
     _ensure_metrics_initialized()
     if _CACHE_MISSES_TOTAL is not None:
-        _CACHE_MISSES_TOTAL.labels(namespace=namespace).inc()
+        _CACHE_MISSES_TOTAL.labels(namespace=namespace, tier=tier).inc()
 
 
 def record_cache_invalidation(namespace: str) -> None:
@@ -273,6 +292,13 @@ def record_cache_invalidation(namespace: str) -> None:
         _CACHE_INVALIDATIONS_TOTAL.labels(namespace=namespace).inc()
 
 
+def record_cache_recompute(namespace: str, *, outcome: str) -> None:
+    """Increment ``auraxis_cache_recompute_total`` for a get_or_compute outcome."""
+    _ensure_metrics_initialized()
+    if _CACHE_RECOMPUTE_TOTAL is not None:
+        _CACHE_RECOMPUTE_TOTAL.labels(namespace=namespace, outcome=outcome).inc()
+
+
 def record_auth_login(*, status: str) -> None:
     """Increment ``auraxis_auth_logins_total`` with the given status label.
 
@@ -448,6 +474,7 @@ __all__ = [
     "record_cache_hit",
     "record_cache_invalidation",
     "record_cache_miss",
+    "record_cache_recompute",
     "record_http_request",
     "register_prometheus_middleware",
 ]
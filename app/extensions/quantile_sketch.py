@@ -0,0 +1,129 @@
+"""Fixed-memory, mergeable quantile sketch for latency metrics.
+
+A DDSketch-style log-bucketed histogram: a value ``v > 0`` lands in bucket
+``ceil(log(v) / log(gamma))`` with ``gamma = (1 + a) / (1 - a)``, so every
+quantile is reported within relative error ``a`` (``RELATIVE_ACCURACY``, 1%).
+Recording is O(1). Two sketches merge by adding bucket counts, which is what
+lets per-thread and per-worker sketches be combined into one fleet-wide
+distribution without losing accuracy.
+
+Memory is bounded by ``MAX_BINS``: when a sketch grows past it, the lowest
+buckets are folded together, trading accuracy on the smallest values (the
+ones nobody reads percentiles for) for a hard size limit. With 1% accuracy,
+1 ms .. 1 h spans roughly 760 buckets.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any
+
+RELATIVE_ACCURACY = 0.01
+MAX_BINS = 1024
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+# Values below this are counted in the zero bucket.
+_MIN_INDEXABLE_VALUE = 1e-9
+
+
+def _bucket_index(value: float) -> int:
+    return math.ceil(math.log(value) / _LOG_GAMMA)
+
+
+def _bucket_value(index: int) -> float:
+    return 2 * _GAMMA**index / (_GAMMA + 1)
+
+
+class QuantileSketch:
+    __slots__ = ("_bins", "_zero_count", "count", "max", "min", "sum")
+
+    def __init__(self) -> None:
+        self._bins: dict[int, int] = {}
+        self._zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        if value < 0:
+            return
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value < _MIN_INDEXABLE_VALUE:
+            self._zero_count += 1
+            return
+        index = _bucket_index(value)
+        self._bins[index] = self._bins.get(index, 0) + 1
+        if len(self._bins) > MAX_BINS:
+            self._collapse()
+
+    def merge(self, other: QuantileSketch) -> None:
+        if other.count == 0:
+            return
+        for index, count in other._bins.items():
+            self._bins[index] = self._bins.get(index, 0) + count
+        self._zero_count += other._zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if len(self._bins) > MAX_BINS:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        indexes = sorted(self._bins)
+        overflow = indexes[: len(indexes) - MAX_BINS + 1]
+        target = indexes[len(overflow)]
+        self._bins[target] += sum(self._bins.pop(index) for index in overflow)
+
+    def quantile(self, q: float) -> float:
+        """Nearest-rank quantile (``0 < q <= 1``); ``0.0`` when empty."""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        if rank <= self._zero_count:
+            return self.min
+        seen = self._zero_count
+        for index in sorted(self._bins):
+            seen += self._bins[index]
+            if seen >= rank:
+                return min(max(_bucket_value(index), self.min), self.max)
+        return self.max
+
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def copy(self) -> QuantileSketch:
+        clone = QuantileSketch()
+        clone.merge(self)
+        return clone
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "bins": {str(index): count for index, count in self._bins.items()},
+            "zero": self._zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else 0,
+            "max": self.max if self.count else 0,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> QuantileSketch:
+        sketch = cls()
+        sketch._bins = {int(index): int(count) for index, count in data["bins"].items()}
+        sketch._zero_count = int(data["zero"])
+        sketch.count = int(data["count"])
+        sketch.sum = float(data["sum"])
+        if sketch.count:
+            sketch.min = float(data["min"])
+            sketch.max = float(data["max"])
+        return sketch
+
+
+__all__ = ["MAX_BINS", "RELATIVE_ACCURACY", "QuantileSketch"]
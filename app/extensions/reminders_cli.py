@@ -46,7 +46,8 @@ def dispatch_due_soon(ctx: click.Context, dry_run: bool) -> None:
             click.echo(
                 f"{window}-day reminders: "
                 f"scanned={result.scanned} sent={result.sent} "
-                f"skipped={result.skipped} queued={result.queued}"
+                f"skipped={result.skipped} queued={result.queued} "
+                f"enqueued={result.enqueued}"
             )
         except Exception as exc:  # noqa: BLE001
             click.echo(
@@ -0,0 +1,271 @@
+"""Per-user session state cache for multi-device access-token checks.
+
+Caches, per user, the set of access JTIs that belong to active
+``RefreshToken`` rows and whether the user has any row at all, so the JWT
+revocation callback does not query ``refresh_tokens`` on every request.
+
+Two layers:
+
+- an in-process cache with a short TTL (``SESSION_STATE_LOCAL_TTL_SECONDS``,
+  default 5 s, ``0`` disables it) that answers most requests without I/O;
+- Redis (``jwt:sessions:{user_id}``, ``SESSION_STATE_CACHE_TTL`` seconds),
+  shared by every worker, when ``JWT_REVOCATION_REDIS_URL`` / ``REDIS_URL``
+  is reachable.
+
+Only positive answers are trusted: a JTI missing from a cached set is
+re-checked against the database, so a fresh login is never rejected by a
+stale entry. Revoked access JTIs are written to an explicit denylist
+(``jwt:denied:{jti}``) for the lifetime of an access token, which covers the
+race where a reader caches state loaded just before a revocation committed.
+Another process may keep accepting a revoked token for at most the local TTL.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KEY_PREFIX = "jwt:sessions"
+DEFAULT_DENYLIST_PREFIX = "jwt:denied"
+DEFAULT_TTL_SECONDS = 300
+DEFAULT_LOCAL_TTL_SECONDS = 5.0
+# Access tokens are issued with a one-hour lifetime.
+DEFAULT_DENYLIST_TTL_SECONDS = 3600
+_LOCAL_MAX_ENTRIES = 10_000
+
+
+@dataclass(frozen=True)
+class SessionState:
+    has_sessions: bool
+    active_access_jtis: frozenset[str]
+
+    def with_access_jti(self, jti: str) -> SessionState:
+        return SessionState(True, self.active_access_jtis | {jti})
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "has_sessions": self.has_sessions,
+                "active": sorted(self.active_access_jtis),
+            }
+        )
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> SessionState:
+        data = json.loads(raw)
+        return cls(bool(data["has_sessions"]), frozenset(data["active"]))
+
+
+class _LocalTtlCache:
+    """Small thread-safe LRU with per-entry expiry."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        if self._ttl <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: Any) -> None:
+        if self._ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class SessionStateCache:
+    """Session state per user plus an access-JTI denylist.
+
+    ``client`` is a Redis client or ``None`` for the in-process layer only.
+    Redis failures are logged and treated as cache misses.
+    """
+
+    def __init__(
+        self,
+        client: Any | None = None,
+        *,
+        key_prefix: str = DEFAULT_KEY_PREFIX,
+        denylist_prefix: str = DEFAULT_DENYLIST_PREFIX,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        local_ttl_seconds: float = DEFAULT_LOCAL_TTL_SECONDS,
+        denylist_ttl_seconds: int = DEFAULT_DENYLIST_TTL_SECONDS,
+    ) -> None:
+        self._client = client
+        self._key_prefix = key_prefix
+        self._denylist_prefix = denylist_prefix
+        self._ttl_seconds = ttl_seconds
+        self._denylist_ttl_seconds = denylist_ttl_seconds
+        self._states = _LocalTtlCache(local_ttl_seconds, _LOCAL_MAX_ENTRIES)
+        # Local denials must outlive the token, not the short state TTL.
+        self._denied = _LocalTtlCache(denylist_ttl_seconds, _LOCAL_MAX_ENTRIES)
+
+    def _key(self, user_id: str) -> str:
+        return f"{self._key_prefix}:{user_id}"
+
+    def _denied_key(self, jti: str) -> str:
+        return f"{self._denylist_prefix}:{jti}"
+
+    def lookup(self, user_id: str, jti: str) -> tuple[SessionState | None, bool]:
+        """Return the cached state of *user_id* and whether *jti* is denied."""
+        if self._denied.get(jti) is not None:
+            return None, True
+        state = self._states.get(user_id)
+        if state is not None or self._client is None:
+            return state, False
+        try:
+            pipe = self._client.pipeline()
+            pipe.get(self._key(user_id))
+            pipe.exists(self._denied_key(jti))
+            raw, denied = pipe.execute()
+        except Exception:
+            logger.warning(
+                "session_state_cache: Redis lookup failed for user_id=%s — cache miss",
+                user_id,
+                exc_info=True,
+            )
+            return None, False
+        if denied:
+            self._denied.set(jti, True)
+            return None, True
+        if raw is None:
+            return None, False
+        state = SessionState.from_json(raw)
+        self._states.set(user_id, state)
+        return state, False
+
+    def store(self, user_id: str, state: SessionState) -> None:
+        self._states.set(user_id, state)
+        if self._client is None:
+            return
+        try:
+            self._client.setex(self._key(user_id), self._ttl_seconds, state.to_json())
+        except Exception:
+            logger.warning(
+                "session_state_cache: Redis SETEX failed for user_id=%s",
+                user_id,
+                exc_info=True,
+            )
+
+    def add_access_jti(self, user_id: str, jti: str) -> None:
+        """Record a newly issued access JTI if the user's state is cached."""
+        state, _ = self.lookup(user_id, jti)
+        if state is not None:
+            self.store(user_id, state.with_access_jti(jti))
+
+    def invalidate(self, user_id: str) -> None:
+        self._states.pop(user_id)
+        if self._client is None:
+            return
+        try:
+            self._client.delete(self._key(user_id))
+        except Exception:
+            logger.warning(
+                "session_state_cache: Redis DELETE failed for user_id=%s",
+                user_id,
+                exc_info=True,
+            )
+
+    def deny(self, user_id: str, jtis: Iterable[str | None]) -> None:
+        """Denylist revoked access *jtis* and drop the user's cached state."""
+        denied = [jti for jti in jtis if jti]
+        for jti in denied:
+            self._denied.set(jti, True)
+        self.invalidate(user_id)
+        if self._client is None or not denied:
+            return
+        try:
+            pipe = self._client.pipeline()
+            for jti in denied:
+                pipe.setex(self._denied_key(jti), self._denylist_ttl_seconds, "1")
+            pipe.execute()
+        except Exception:
+            logger.warning(
+                "session_state_cache: Redis denylist write failed for user_id=%s",
+                user_id,
+                exc_info=True,
+            )
+
+
+# Module-level singleton — built once at first use.
+_cache_instance: SessionStateCache | None = None
+
+
+def _redis_client() -> Any | None:
+    redis_url = str(
+        os.getenv("JWT_REVOCATION_REDIS_URL", os.getenv("REDIS_URL", ""))
+    ).strip()
+    if not redis_url:
+        return None
+    try:
+        client = importlib.import_module("redis").Redis.from_url(redis_url)
+        client.ping()
+    except Exception:
+        logger.warning(
+            "session_state_cache: Redis unavailable — using in-process cache only"
+        )
+        return None
+    return client
+
+
+def _build_cache() -> SessionStateCache:
+    return SessionStateCache(
+        _redis_client(),
+        ttl_seconds=int(os.getenv("SESSION_STATE_CACHE_TTL", str(DEFAULT_TTL_SECONDS))),
+        local_ttl_seconds=float(
+            os.getenv("SESSION_STATE_LOCAL_TTL_SECONDS", str(DEFAULT_LOCAL_TTL_SECONDS))
+        ),
+        denylist_ttl_seconds=int(
+            os.getenv("SESSION_DENYLIST_TTL", str(DEFAULT_DENYLIST_TTL_SECONDS))
+        ),
+    )
+
+
+def get_session_state_cache() -> SessionStateCache:
+    """Return the module-level cache singleton (built lazily on first call)."""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = _build_cache()
+    return _cache_instance
+
+
+def reset_session_state_cache_for_tests() -> None:
+    """Reset the singleton so tests can inject a fresh instance."""
+    global _cache_instance
+    _cache_instance = None
+
+
+__all__ = [
+    "SessionState",
+    "SessionStateCache",
+    "get_session_state_cache",
+    "reset_session_state_cache_for_tests",
+]
@@ -2,13 +2,16 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from graphql import parse
 from graphql.language import ast
 
 from app.graphql.auth import get_current_user_optional
 
+if TYPE_CHECKING:
+    from app.graphql.document_cache import CachedDocument
+
 GRAPHQL_AUTH_REQUIRED = "GRAPHQL_AUTH_REQUIRED"
 GRAPHQL_AUTH_PARSE_ERROR = "GRAPHQL_AUTH_PARSE_ERROR"
 DEFAULT_GRAPHQL_PUBLIC_QUERIES = frozenset(
@@ -133,33 +136,59 @@ def _is_operation_public(
     return False
 
 
-def enforce_graphql_authorization(
-    *,
-    query: str,
+def _requires_authentication(
+    document: ast.DocumentNode,
     operation_name: str | None,
     policy: GraphQLAuthorizationPolicy,
-) -> None:
-    try:
-        document = parse(query)
-    except (
-        Exception
-    ) as exc:  # pragma: no cover - parse errors handled by security layer
-        raise GraphQLAuthorizationViolation(
-            code=GRAPHQL_AUTH_PARSE_ERROR,
-            message="Query GraphQL inválida.",
-            details={},
-        ) from exc
-
+) -> bool:
     operations = _collect_operations(document)
     selected_operations = _select_operations(
         operations,
         operation_name,
         allow_unnamed_operations=policy.allow_unnamed_operations,
     )
-
-    has_private_operation = any(
+    return any(
         not _is_operation_public(operation, policy) for operation in selected_operations
     )
+
+
+def enforce_graphql_authorization(
+    *,
+    query: str,
+    operation_name: str | None,
+    policy: GraphQLAuthorizationPolicy,
+    cached: CachedDocument | None = None,
+) -> None:
+    if cached is None:
+        try:
+            document = parse(query)
+        except (
+            Exception
+        ) as exc:  # pragma: no cover - parse errors handled by security layer
+            raise GraphQLAuthorizationViolation(
+                code=GRAPHQL_AUTH_PARSE_ERROR,
+                message="Query GraphQL inválida.",
+                details={},
+            ) from exc
+        has_private_operation = _requires_authentication(
+            document, operation_name, policy
+        )
+    else:
+        # The decision only depends on the document, the operation and the
+        # policy; the user check below still runs on every request.
+        memo_key = (
+            "requires_auth",
+            operation_name,
+            frozenset(policy.public_queries),
+            frozenset(policy.public_mutations),
+            policy.allow_unnamed_operations,
+        )
+        memoized = cached.memo_get(memo_key)
+        if memoized is None:
+            memoized = _requires_authentication(cached.document, operation_name, policy)
+            cached.memo_set(memo_key, memoized)
+        has_private_operation = bool(memoized)
+
     if not has_private_operation:
         return
 
@@ -0,0 +1,173 @@
+"""Parsed GraphQL document cache and Automatic Persisted Queries (APQ).
+
+Clients send the same few dozen documents over and over. ``/graphql`` keeps a
+bounded LRU of parsed ``DocumentNode``s keyed by the SHA-256 of the query
+text, together with the schema validation result and a small memo for the
+per-request analysis that only depends on the document (complexity metrics,
+authorization decision). A cache hit skips parse, validate and analysis.
+
+APQ follows the Apollo protocol: a request carrying
+``extensions.persistedQuery.sha256Hash`` without ``query`` is resolved from
+the registry; unknown hashes answer ``PersistedQueryNotFound`` so the client
+retries once with the full text, which registers it. Registrations live in
+the shared cache service (Redis when available) so every worker learns them.
+
+Env:
+    GRAPHQL_DOCUMENT_CACHE_SIZE   max cached documents (default 512)
+    GRAPHQL_APQ_TTL_SECONDS       registry TTL (default 7 days)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+from graphql import GraphQLError, GraphQLSchema, parse, validate
+from graphql.language import ast
+
+from app.services.cache_service import get_cache_service
+
+PERSISTED_QUERY_NOT_FOUND = "PERSISTED_QUERY_NOT_FOUND"
+PERSISTED_QUERY_HASH_MISMATCH = "PERSISTED_QUERY_HASH_MISMATCH"
+
+_DEFAULT_MAX_DOCUMENTS = 512
+_DEFAULT_APQ_TTL_SECONDS = 7 * 86_400
+_MAX_MEMO_ENTRIES = 64
+_APQ_KEY_PREFIX = "graphql:apq"
+
+
+def query_sha256(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+class CachedDocument:
+    """A parsed document plus everything derived from it alone."""
+
+    def __init__(self, *, sha256: str, query: str, document: ast.DocumentNode):
+        self.sha256 = sha256
+        self.query = query
+        self.document = document
+        self._validation_errors: list[GraphQLError] | None = None
+        self._memo: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def validation_errors(self, schema: GraphQLSchema) -> list[GraphQLError]:
+        if self._validation_errors is None:
+            self._validation_errors = list(validate(schema, self.document))
+        return self._validation_errors
+
+    def memo_get(self, key: Hashable) -> Any | None:
+        with self._lock:
+            value = self._memo.get(key)
+            if value is not None:
+                self._memo.move_to_end(key)
+            return value
+
+    def memo_set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._memo[key] = value
+            self._memo.move_to_end(key)
+            while len(self._memo) > _MAX_MEMO_ENTRIES:
+                self._memo.popitem(last=False)
+
+
+class GraphQLDocumentCache:
+    """Thread-safe LRU of ``CachedDocument`` keyed by query SHA-256."""
+
+    def __init__(self, max_entries: int = _DEFAULT_MAX_DOCUMENTS) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, CachedDocument] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, sha256: str) -> CachedDocument | None:
+        with self._lock:
+            entry = self._entries.get(sha256)
+            if entry is not None:
+                self._entries.move_to_end(sha256)
+            return entry
+
+    def get_or_parse(self, query: str) -> CachedDocument:
+        """Return the cached entry for *query*, parsing it on a miss.
+
+        Raises ``GraphQLError`` for syntax errors; those are never cached.
+        """
+        sha256 = query_sha256(query)
+        entry = self.get(sha256)
+        if entry is not None:
+            return entry
+        entry = CachedDocument(sha256=sha256, query=query, document=parse(query))
+        with self._lock:
+            self._entries[sha256] = entry
+            self._entries.move_to_end(sha256)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = str(os.getenv(name, "")).strip()
+    try:
+        value = int(raw) if raw else default
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+_document_cache: GraphQLDocumentCache | None = None
+
+
+def get_document_cache() -> GraphQLDocumentCache:
+    global _document_cache
+    if _document_cache is None:
+        _document_cache = GraphQLDocumentCache(
+            _env_int("GRAPHQL_DOCUMENT_CACHE_SIZE", _DEFAULT_MAX_DOCUMENTS)
+        )
+    return _document_cache
+
+
+def reset_document_cache_for_tests() -> None:
+    global _document_cache
+    _document_cache = None
+
+
+def lookup_persisted_query(sha256: str) -> str | None:
+    """Return the query text registered under *sha256*, if any."""
+    entry = get_document_cache().get(sha256)
+    if entry is not None:
+        return entry.query
+    stored = get_cache_service().get(f"{_APQ_KEY_PREFIX}:{sha256}")
+    if isinstance(stored, str) and query_sha256(stored) == sha256:
+        return stored
+    return None
+
+
+def register_persisted_query(sha256: str, query: str) -> None:
+    get_cache_service().set(
+        f"{_APQ_KEY_PREFIX}:{sha256}",
+        query,
+        ttl=_env_int("GRAPHQL_APQ_TTL_SECONDS", _DEFAULT_APQ_TTL_SECONDS),
+    )
+
+
+__all__ = [
+    "PERSISTED_QUERY_HASH_MISMATCH",
+    "PERSISTED_QUERY_NOT_FOUND",
+    "CachedDocument",
+    "GraphQLDocumentCache",
+    "get_document_cache",
+    "lookup_persisted_query",
+    "query_sha256",
+    "register_persisted_query",
+    "reset_document_cache_for_tests",
+]
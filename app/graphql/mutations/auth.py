@@ -25,6 +25,7 @@ from app.application.services.password_reset_service import (
 from app.application.services.password_verification_service import (
     verify_password_with_timing_protection,
 )
+from app.application.services.session_service import revoke_session_by_access_jti
 from app.application.services.user_profile_service import update_user_profile
 from app.extensions.database import db
 from app.extensions.integration_metrics import increment_metric
@@ -281,7 +282,11 @@ class LogoutMutation(graphene.Mutation):
     def mutate(self, info: graphene.ResolveInfo) -> "LogoutMutation":
         user = get_current_user_required()
         user_id = str(user.id)
+        # GraphQL auth only accepts the token whose JTI is user.current_jti.
+        access_jti = user.current_jti
         user.current_jti = None
+        if access_jti:
+            revoke_session_by_access_jti(user_id=user.id, access_jti=access_jti)
         db.session.commit()
         get_jwt_revocation_cache().invalidate(user_id)
         return LogoutMutation(ok=True, message="Logout successful")
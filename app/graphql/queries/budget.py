@@ -69,7 +69,9 @@ class BudgetQueryMixin:
         user = get_current_user_required()
         service = BudgetService(UUID(str(user.id)))
         budgets = service.list_budgets()
-        items = [_to_budget_type(service.serialize_with_spent(b)) for b in budgets]
+        items = [
+            _to_budget_type(data) for data in service.serialize_many_with_spent(budgets)
+        ]
         return BudgetListPayloadType(items=items)
 
     def resolve_budget(
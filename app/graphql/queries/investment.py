@@ -70,6 +70,7 @@ class InvestmentQueryMixin:
         PortfolioHistoryPayloadType,
         start_date=graphene.String(),
         final_date=graphene.String(),
+        granularity=graphene.String(default_value="daily"),
     )
 
     def resolve_investment_operations(
@@ -168,6 +169,7 @@ class InvestmentQueryMixin:
         _info: graphene.ResolveInfo,
         start_date: str | None = None,
         final_date: str | None = None,
+        granularity: str = "daily",
     ) -> PortfolioHistoryPayloadType:
         user = get_current_user_required()
         parsed_start_date = _parse_optional_date(start_date, "start_date")
@@ -175,7 +177,9 @@ class InvestmentQueryMixin:
         service = PortfolioHistoryService(user.id)
         try:
             payload = service.get_history(
-                start_date=parsed_start_date, end_date=parsed_final_date
+                start_date=parsed_start_date,
+                end_date=parsed_final_date,
+                granularity=granularity,
             )
         except ValueError as exc:
             raise from_mapped_validation_exception(
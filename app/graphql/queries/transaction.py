@@ -5,6 +5,9 @@ from uuid import UUID
 import graphene
 from graphene import Argument
 
+from app.application.services.transaction.query_types import (
+    TransactionCursorPaginationPayload,
+)
 from app.application.services.transaction_application_service import (
     TransactionApplicationError,
 )
@@ -21,6 +24,7 @@ from app.graphql.schema_utils import (
     _validate_pagination_values,
 )
 from app.graphql.types import (
+    TransactionCursorPaginationType,
     TransactionDashboardPayloadType,
     TransactionDueCountsType,
     TransactionDueRangePayloadType,
@@ -30,6 +34,17 @@ from app.graphql.types import (
 )
 
 
+def _cursor_pagination(
+    pagination: TransactionCursorPaginationPayload,
+) -> TransactionCursorPaginationType:
+    return TransactionCursorPaginationType(
+        total=pagination["total"],
+        page=pagination["page"],
+        per_page=pagination["per_page"],
+        pages=pagination["pages"],
+    )
+
+
 class TransactionQueryMixin:
     transactions = graphene.Field(
         TransactionListPayloadType,
@@ -42,6 +57,8 @@ class TransactionQueryMixin:
         tag_id=graphene.UUID(),
         account_id=graphene.UUID(),
         credit_card_id=graphene.UUID(),
+        cursor=graphene.String(),
+        include_total=graphene.Boolean(default_value=True),
     )
     transaction_summary = graphene.Field(
         TransactionSummaryPayloadType,
@@ -73,6 +90,8 @@ class TransactionQueryMixin:
         page=graphene.Int(default_value=1),
         per_page=graphene.Int(default_value=10),
         order_by=graphene.String(default_value="overdue_first"),
+        cursor=graphene.String(),
+        include_total=graphene.Boolean(default_value=True),
     )
     transaction = graphene.Field(
         TransactionTypeObject,
@@ -91,6 +110,8 @@ class TransactionQueryMixin:
         tag_id: UUID | None = None,
         account_id: UUID | None = None,
         credit_card_id: UUID | None = None,
+        cursor: str | None = None,
+        include_total: bool = True,
     ) -> TransactionListPayloadType:
         _validate_pagination_values(page, per_page)
         user = get_current_user_required()
@@ -105,6 +126,8 @@ class TransactionQueryMixin:
             tag_id=_parse_optional_uuid(tag_id, "tag_id"),
             account_id=_parse_optional_uuid(account_id, "account_id"),
             credit_card_id=_parse_optional_uuid(credit_card_id, "credit_card_id"),
+            cursor=cursor,
+            include_total=include_total,
         )
         pagination = result["pagination"]
         return TransactionListPayloadType(
@@ -113,11 +136,8 @@ class TransactionQueryMixin:
                 for item in result["items"]
                 if isinstance(item, dict)
             ],
-            pagination=paginate(
-                total=int(pagination["total"]),
-                page=int(pagination["page"]),
-                per_page=int(pagination["per_page"]),
-            ),
+            pagination=_cursor_pagination(pagination),
+            next_cursor=pagination.get("next_cursor"),
         )
 
     def resolve_transaction(
@@ -205,6 +225,8 @@ class TransactionQueryMixin:
         page: int = 1,
         per_page: int = 10,
         order_by: str = "overdue_first",
+        cursor: str | None = None,
+        include_total: bool = True,
     ) -> TransactionDueRangePayloadType:
         _validate_pagination_values(page, per_page)
         effective_start_date, effective_end_date = _resolve_date_range_aliases(
@@ -222,6 +244,8 @@ class TransactionQueryMixin:
                 page=page,
                 per_page=per_page,
                 order_by=order_by,
+                cursor=cursor,
+                include_total=include_total,
             )
         except TransactionApplicationError as exc:
             raise build_public_graphql_error(
@@ -237,14 +261,15 @@ class TransactionQueryMixin:
                 for item in result["items"]
                 if isinstance(item, dict)
             ],
-            counts=TransactionDueCountsType(
-                total_transactions=int(counts["total_transactions"]),
-                income_transactions=int(counts["income_transactions"]),
-                expense_transactions=int(counts["expense_transactions"]),
-            ),
-            pagination=paginate(
-                total=int(pagination["total"]),
-                page=int(pagination["page"]),
-                per_page=int(pagination["per_page"]),
+            counts=(
+                TransactionDueCountsType()
+                if counts is None
+                else TransactionDueCountsType(
+                    total_transactions=int(counts["total_transactions"]),
+                    income_transactions=int(counts["income_transactions"]),
+                    expense_transactions=int(counts["expense_transactions"]),
+                )
             ),
+            pagination=_cursor_pagination(pagination),
+            next_cursor=pagination.get("next_cursor"),
         )
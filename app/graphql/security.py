@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Any
+import json
+from typing import TYPE_CHECKING, Any
 
 from app.graphql.complexity.analyzer import (
     GraphQLQueryMetrics,
@@ -23,6 +24,9 @@ from app.graphql.complexity.policy import (
 )
 from app.graphql.introspection_policy import enforce_introspection_policy
 
+if TYPE_CHECKING:
+    from app.graphql.document_cache import CachedDocument
+
 __all__ = [
     "GRAPHQL_COMPLEXITY_LIMIT_EXCEEDED",
     "GRAPHQL_DEPTH_LIMIT_EXCEEDED",
@@ -51,7 +55,13 @@ def analyze_graphql_query(
     operation_name: str | None,
     variable_values: dict[str, Any] | None,
     policy: GraphQLSecurityPolicy,
+    cached: CachedDocument | None = None,
 ) -> GraphQLQueryMetrics:
+    """Enforce the security policy and return the query metrics.
+
+    With *cached* the pre-parsed document is reused and the metrics for the
+    same operation, variables and weights are computed only once.
+    """
     query_bytes = len(query.encode("utf-8"))
     if query_bytes > policy.max_query_bytes:
         raise GraphQLSecurityViolation(
@@ -66,19 +76,30 @@ def analyze_graphql_query(
             },
         )
 
-    document = parse_document(query)
+    document = cached.document if cached is not None else parse_document(query)
     fragments, operations = collect_fragments_and_operations(document)
     ensure_operation_count_within_limit(operations, policy)
     selected_operations = select_operations_to_analyze(operations, operation_name)
     enforce_introspection_policy(selected_operations, policy)
-    metrics = calculate_metrics(
-        selected_operations,
-        fragments=fragments,
-        variable_values=variable_values,
-        max_list_multiplier=policy.max_list_multiplier,
-        field_weights=policy.field_weights,
-        query=query,
+    memo_key = (
+        "metrics",
+        operation_name,
+        json.dumps(variable_values, sort_keys=True, default=str),
+        policy.max_list_multiplier,
+        tuple(sorted(policy.field_weights.items())),
     )
+    metrics = cached.memo_get(memo_key) if cached is not None else None
+    if metrics is None:
+        metrics = calculate_metrics(
+            selected_operations,
+            fragments=fragments,
+            variable_values=variable_values,
+            max_list_multiplier=policy.max_list_multiplier,
+            field_weights=policy.field_weights,
+            query=query,
+        )
+        if cached is not None:
+            cached.memo_set(memo_key, metrics)
     enforce_depth_and_complexity_limits(metrics, policy)
     return GraphQLQueryMetrics(
         operation_count=len(operations),
@@ -130,9 +130,19 @@ class MutationPayload(graphene.ObjectType):
 # ---------------------------------------------------------------------------
 
 
+class TransactionCursorPaginationType(graphene.ObjectType):
+    # total/pages are null when the query opts out of counting
+    # (includeTotal: false); page/perPage are always set.
+    total = graphene.Int()
+    page = graphene.Int(required=True)
+    per_page = graphene.Int(required=True)
+    pages = graphene.Int()
+
+
 class TransactionListPayloadType(graphene.ObjectType):
     items = graphene.List(TransactionTypeObject, required=True)
-    pagination = graphene.Field(PaginationType, required=True)
+    pagination = graphene.Field(TransactionCursorPaginationType, required=True)
+    next_cursor = graphene.String()
 
 
 class TransactionSummaryPayloadType(graphene.ObjectType):
@@ -144,15 +154,17 @@ class TransactionSummaryPayloadType(graphene.ObjectType):
 
 
 class TransactionDueCountsType(graphene.ObjectType):
-    total_transactions = graphene.Int(required=True)
-    income_transactions = graphene.Int(required=True)
-    expense_transactions = graphene.Int(required=True)
+    # Null when the query opts out of counting (includeTotal: false).
+    total_transactions = graphene.Int()
+    income_transactions = graphene.Int()
+    expense_transactions = graphene.Int()
 
 
 class TransactionDueRangePayloadType(graphene.ObjectType):
     items = graphene.List(TransactionTypeObject, required=True)
     counts = graphene.Field(TransactionDueCountsType, required=True)
-    pagination = graphene.Field(PaginationType, required=True)
+    pagination = graphene.Field(TransactionCursorPaginationType, required=True)
+    next_cursor = graphene.String()
 
 
 class DashboardStatusCountsType(graphene.ObjectType):
@@ -505,6 +517,7 @@ class PortfolioHistoryItemType(graphene.ObjectType):
 class PortfolioHistorySummaryType(graphene.ObjectType):
     start_date = graphene.String(required=True)
     end_date = graphene.String(required=True)
+    granularity = graphene.String(required=True)
     total_points = graphene.Int(required=True)
     total_buy_amount = graphene.String(required=True)
     total_sell_amount = graphene.String(required=True)
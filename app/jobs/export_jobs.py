@@ -0,0 +1,31 @@
+"""RQ job definitions for background transaction exports."""
+
+from __future__ import annotations
+
+from uuid import UUID
+
+from flask import has_app_context
+
+
+def run_export_job(job_id: str) -> dict[str, object]:
+    """Render an export job's file and store it for download."""
+
+    def _process() -> dict[str, object]:
+        from app.services.export_job_service import (
+            process_export_job,
+            serialize_export_job,
+        )
+
+        return serialize_export_job(process_export_job(UUID(str(job_id))))
+
+    if has_app_context():
+        return _process()
+
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        return _process()
+
+
+__all__ = ["run_export_job"]
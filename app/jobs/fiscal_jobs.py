@@ -0,0 +1,30 @@
+"""RQ job definitions for fiscal CSV imports."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from flask import has_app_context
+
+
+def import_receivables_csv(
+    batch_id: str, payload_key: str, column_map: dict[str, str]
+) -> dict[str, Any]:
+    """Ingest a staged receivables CSV into an existing import batch."""
+
+    def _process() -> dict[str, Any]:
+        from app.services.csv_ingestion_service import run_staged_csv_import
+
+        return run_staged_csv_import(batch_id, payload_key, column_map)
+
+    if has_app_context():
+        return _process()
+
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        return _process()
+
+
+__all__ = ["import_receivables_csv"]
@@ -0,0 +1,59 @@
+"""RQ job definitions for Expo push delivery.
+
+``send_push_batch`` posts the messages to Expo in batches and schedules
+``check_push_receipts`` for the tickets it got back; the receipt check prunes
+devices Expo reports as unregistered. When Redis is unavailable the
+``SyncOutboundQueue`` runs ``send_push_batch`` inline and skips the delayed
+receipt check.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from flask import has_app_context
+
+
+def send_push_batch(messages: list[dict[str, Any]]) -> dict[str, int]:
+    """Deliver Expo message payloads and schedule their receipt check."""
+
+    def _process() -> dict[str, int]:
+        from app.services.expo_push_service import deliver_push_messages
+        from app.services.outbound_queue import get_default_outbound_queue
+
+        result = deliver_push_messages(messages)
+        if result.ticket_tokens:
+            get_default_outbound_queue().enqueue_push_receipts_check(
+                ticket_tokens=result.ticket_tokens
+            )
+        return {"sent": result.sent, "failed": result.failed, "pruned": result.pruned}
+
+    if has_app_context():
+        return _process()
+
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        return _process()
+
+
+def check_push_receipts(ticket_tokens: dict[str, str]) -> dict[str, int]:
+    """Resolve Expo tickets into receipts and prune dead tokens."""
+
+    def _process() -> dict[str, int]:
+        from app.services.expo_push_service import process_push_receipts
+
+        return {"pruned": process_push_receipts(ticket_tokens)}
+
+    if has_app_context():
+        return _process()
+
+    from app import create_app
+
+    app = create_app()
+    with app.app_context():
+        return _process()
+
+
+__all__ = ["check_push_receipts", "send_push_batch"]
@@ -103,6 +103,7 @@ def _build_registry() -> list[EntityRule]:
     from app.models.consent import Consent
     from app.models.credit_card import CreditCard
     from app.models.entitlement import Entitlement
+    from app.models.export_job import ExportJob
     from app.models.fiscal import (
         FiscalAdjustment,
         FiscalDocument,
@@ -121,9 +122,11 @@ def _build_registry() -> list[EntityRule]:
     from app.models.subscription import Subscription
     from app.models.tag import Tag
     from app.models.transaction import Transaction
+    from app.models.transaction_daily_rollup import TransactionDailyRollup
     from app.models.user import User
     from app.models.user_ticker import UserTicker
     from app.models.wallet import Wallet
+    from app.models.wallet_history_event import WalletHistoryEvent
 
     return [
         # === User profile (base entity) =====================================
@@ -158,6 +161,26 @@ def _build_registry() -> list[EntityRule]:
             retention_days=None,
             description="Income and expense transactions",
         ),
+        EntityRule(
+            model=TransactionDailyRollup,
+            user_id_field="user_id",
+            table_name="transaction_daily_rollups",
+            deletion_strategy=DeletionStrategy.DELETE,
+            export_included=False,
+            retention_reason=RetentionReason.NONE,
+            retention_days=None,
+            description="Derived daily ledger totals for dashboard analytics",
+        ),
+        EntityRule(
+            model=ExportJob,
+            user_id_field="user_id",
+            table_name="export_jobs",
+            deletion_strategy=DeletionStrategy.DELETE,
+            export_included=False,
+            retention_reason=RetentionReason.NONE,
+            retention_days=None,
+            description="Background CSV/PDF transaction export jobs",
+        ),
         EntityRule(
             model=Budget,
             user_id_field="user_id",
@@ -198,6 +221,16 @@ def _build_registry() -> list[EntityRule]:
             retention_days=None,
             description="Per-goal contribution entries",
         ),
+        EntityRule(
+            model=WalletHistoryEvent,
+            user_id_field="user_id",
+            table_name="wallet_history_events",
+            deletion_strategy=DeletionStrategy.DELETE,
+            export_included=True,
+            retention_reason=RetentionReason.NONE,
+            retention_days=None,
+            description="Change log of investment wallet entries",
+        ),
         EntityRule(
             model=Wallet,
             user_id_field="user_id",
@@ -6,24 +6,30 @@ Contract:
   - All POST requests MAY include an ``Idempotency-Key`` header.
   - POST requests to paths matching REQUIRED_PREFIXES MUST include the header
     (missing key → 400 Bad Request).
-  - First request with a given key: executed normally; response is cached in
-    Redis for TTL_SECONDS (24 h).
+  - First request with a given key: takes an in-flight lock (``SET NX``),
+    re-reads the stored response (a duplicate may have finished between the
+    first read and the lock), then is executed normally and its response is
+    cached in Redis for the path's TTL (``IDEMPOTENCY_TTL_SECONDS``, default
+    24 h; per-prefix overrides in ``IDEMPOTENCY_PREFIX_TTLS`` as
+    ``/prefix=seconds,...``).
+  - A duplicate arriving while the first is still running waits up to
+    ``IDEMPOTENCY_WAIT_MS`` for its response, then gets ``409`` with
+    ``IDEMPOTENCY_PROCESSING`` — the handler never runs twice concurrently.
   - Subsequent requests with the same key: cached response returned as-is
     without re-executing the handler.
   - Same key + different request body: 409 Conflict.
+  - 5xx responses are not cached; the lock is released so a retry runs again.
   - Redis unavailable: middleware is bypassed (fail-open). Idempotency is best-
     effort — do NOT block requests when the backend is down.
 
-Redis key structure:
-  ``idempotency:{user_subject}:{path}:{sha256(idempotency_key_value)}``
-
-Redis value (JSON):
-  {
-    "body_hash": "<sha256 of raw request body at first call>",
-    "status_code": 200,
-    "body": "<base64-encoded response body>",
-    "content_type": "application/json",
-  }
+Redis keys:
+  ``auraxis:idempotency:v2:{user_subject}:{path}:{sha256(key)}`` — hash with
+  ``body_hash``, ``status_code``, ``content_type``, ``encoding`` and ``body``
+  (raw response bytes, zlib-compressed when ``encoding`` is ``zlib``).
+  ``...:lock`` — in-flight marker holding ``{token}:{body_hash}``, expiring
+  after ``IDEMPOTENCY_LOCK_TTL_SECONDS`` in case the worker dies. The token is
+  unique per request and the lock is released with a compare-and-delete
+  script, so a request whose lock expired never frees a successor's lock.
 
 Usage:
   Register AFTER the auth guard so ``user_subject`` is available:
@@ -34,13 +40,14 @@ Usage:
 
 from __future__ import annotations
 
-import base64
 import hashlib
 import importlib
-import json
 import logging
 import os
+import time
+import zlib
 from typing import Any
+from uuid import uuid4
 
 from flask import Flask, Response, g, jsonify, request
 
@@ -50,6 +57,11 @@ from app.utils.response_builder import error_payload
 logger = logging.getLogger(__name__)
 
 TTL_SECONDS = 86_400  # 24 hours
+LOCK_TTL_SECONDS = 60
+WAIT_MS = 2_000
+_WAIT_POLL_SECONDS = 0.05
+# Bodies smaller than this are stored uncompressed.
+_COMPRESS_MIN_BYTES = 512
 
 # POST endpoints where the header is mandatory.
 REQUIRED_PREFIXES = (
@@ -67,7 +79,15 @@ _SKIP_PREFIXES = (
 )
 
 IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
-_KEY_PREFIX = "auraxis:idempotency"
+# v2: hash entries; v1 JSON strings under the old prefix simply expire.
+_KEY_PREFIX = "auraxis:idempotency:v2"
+
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
 
 
 def _sha256(value: str) -> str:
@@ -78,6 +98,38 @@ def _body_hash(raw: bytes) -> str:
     return hashlib.sha256(raw).hexdigest()
 
 
+def _read_int_env(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def _parse_prefix_ttls(raw: str) -> dict[str, int]:
+    ttls: dict[str, int] = {}
+    for item in raw.split(","):
+        prefix, _, seconds = item.partition("=")
+        try:
+            ttls[prefix.strip()] = max(1, int(seconds))
+        except ValueError:
+            continue
+    ttls.pop("", None)
+    return ttls
+
+
+def _ttl_for_path(path: str) -> int:
+    """TTL of the longest matching prefix in ``IDEMPOTENCY_PREFIX_TTLS``."""
+    default = _read_int_env("IDEMPOTENCY_TTL_SECONDS", TTL_SECONDS) or TTL_SECONDS
+    matches = [
+        (len(prefix), ttl)
+        for prefix, ttl in _parse_prefix_ttls(
+            os.getenv("IDEMPOTENCY_PREFIX_TTLS", "")
+        ).items()
+        if path == prefix or path.startswith(prefix)
+    ]
+    return max(matches)[1] if matches else default
+
+
 def _get_user_subject() -> str | None:
     """Return the JWT subject if a valid token is present, else None."""
     from flask_jwt_extended import get_jwt, verify_jwt_in_request
@@ -116,6 +168,23 @@ def _build_conflict_response() -> Response:
     return response
 
 
+def _build_processing_response() -> Response:
+    if is_v2_contract_request():
+        payload = error_payload(
+            message="Uma requisição com esta Idempotency-Key ainda está em andamento.",
+            code="IDEMPOTENCY_PROCESSING",
+        )
+    else:
+        payload = {
+            "message": "A request with this Idempotency-Key is still being processed.",
+            "error": "IDEMPOTENCY_PROCESSING",
+        }
+    response = jsonify(payload)
+    response.status_code = 409
+    response.headers["Retry-After"] = "1"
+    return response
+
+
 def _build_missing_key_response() -> Response:
     if is_v2_contract_request():
         payload = error_payload(
@@ -179,61 +248,149 @@ def _check_idempotency(redis_client: Any) -> Response | None:
 
     user_subject = _get_user_subject()
     redis_key = _build_redis_key(user_subject, request.path, idempotency_key)
-    raw_body = request.get_data()
-    current_body_hash = _body_hash(raw_body)
+    current_body_hash = _body_hash(request.get_data())
 
+    lock_value = f"{uuid4().hex}:{current_body_hash}"
     try:
-        cached = redis_client.get(redis_key)
+        cached = redis_client.hgetall(redis_key)
+        if cached:
+            return _replay_or_conflict(cached, current_body_hash)
+        acquired = redis_client.set(
+            f"{redis_key}:lock",
+            lock_value,
+            nx=True,
+            ex=_read_int_env("IDEMPOTENCY_LOCK_TTL_SECONDS", LOCK_TTL_SECONDS),
+        )
+        # The previous owner may have stored its response and released the
+        # lock between the read above and SET NX.
+        cached = redis_client.hgetall(redis_key) if acquired else {}
     except Exception:
         logger.warning("idempotency_redis_get_failed key=%s mode=fail_open", redis_key)
         return None
 
-    if cached is None:
-        g.idempotency_redis_key = redis_key
-        g.idempotency_body_hash = current_body_hash
-        return None
-
-    return _replay_or_conflict(cached, current_body_hash)
+    if not acquired:
+        return _wait_for_in_flight(redis_client, redis_key, current_body_hash)
+    if cached:
+        replay = _replay_or_conflict(cached, current_body_hash)
+        if replay is not None:
+            _release_lock(redis_client, redis_key, lock_value)
+            return replay
+    g.idempotency_redis_key = redis_key
+    g.idempotency_body_hash = current_body_hash
+    g.idempotency_lock_value = lock_value
+    return None
+
+
+def _release_lock(redis_client: Any, redis_key: str, lock_value: str) -> None:
+    """Delete the in-flight lock only if this request still owns it."""
+    try:
+        redis_client.eval(_RELEASE_LOCK_SCRIPT, 1, f"{redis_key}:lock", lock_value)
+    except Exception:
+        logger.warning("idempotency_lock_release_failed key=%s", redis_key)
 
 
-def _replay_or_conflict(cached: bytes, current_body_hash: str) -> Response | None:
+def _wait_for_in_flight(
+    redis_client: Any, redis_key: str, current_body_hash: str
+) -> Response:
+    """Wait for a concurrent request with the same key to store its response."""
+    deadline = time.monotonic() + _read_int_env("IDEMPOTENCY_WAIT_MS", WAIT_MS) / 1000
     try:
-        stored: dict[str, Any] = json.loads(cached)
-    except (json.JSONDecodeError, TypeError):
-        logger.warning("idempotency_cache_corrupt")
-        return None
+        owner = _as_text(redis_client.get(f"{redis_key}:lock"))
+        owner_hash = owner.partition(":")[2]
+        if owner_hash and owner_hash != current_body_hash:
+            return _build_conflict_response()
+        while time.monotonic() < deadline:
+            time.sleep(_WAIT_POLL_SECONDS)
+            cached = redis_client.hgetall(redis_key)
+            if cached:
+                replay = _replay_or_conflict(cached, current_body_hash)
+                return replay or _build_processing_response()
+            if not redis_client.exists(f"{redis_key}:lock"):
+                break  # The first request failed without storing a response.
+    except Exception:
+        logger.warning("idempotency_wait_failed key=%s", redis_key)
+    return _build_processing_response()
+
 
-    stored_body_hash = stored.get("body_hash", "")
+def _as_text(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value).decode("utf-8", "replace")
+    return str(value)
+
+
+def _field(stored: dict[Any, Any], name: str) -> Any:
+    value = stored.get(name.encode())
+    return stored.get(name) if value is None else value
+
+
+def _replay_or_conflict(
+    stored: dict[Any, Any], current_body_hash: str
+) -> Response | None:
+    stored_body_hash = _as_text(_field(stored, "body_hash"))
     if stored_body_hash and stored_body_hash != current_body_hash:
         return _build_conflict_response()
 
-    body_bytes = base64.b64decode(stored.get("body", ""))
+    body = _field(stored, "body") or b""
+    if isinstance(body, str):
+        body = body.encode()
+    try:
+        if _as_text(_field(stored, "encoding")) == "zlib":
+            body = zlib.decompress(body)
+        status_code = int(_as_text(_field(stored, "status_code")) or 200)
+    except (zlib.error, ValueError):
+        logger.warning("idempotency_cache_corrupt")
+        return None
+
     response = Response(
-        body_bytes,
-        status=int(stored.get("status_code", 200)),
-        content_type=stored.get("content_type", "application/json"),
+        body,
+        status=status_code,
+        content_type=_as_text(_field(stored, "content_type")) or "application/json",
     )
     response.headers["X-Idempotency-Replayed"] = "true"
     return response
 
 
+def _encode_response(response: Response, body_hash: str) -> dict[str, Any]:
+    body = response.get_data()
+    encoding = "identity"
+    if len(body) >= _COMPRESS_MIN_BYTES:
+        body = zlib.compress(body)
+        encoding = "zlib"
+    return {
+        "body_hash": body_hash,
+        "status_code": response.status_code,
+        "content_type": response.content_type or "application/json",
+        "encoding": encoding,
+        "body": body,
+    }
+
+
 def _make_after_request(redis_client: Any) -> Any:
     def idempotency_after_request(response: Response) -> Response:
         redis_key = getattr(g, "idempotency_redis_key", None)
         if not redis_key:
             return response
+        g.idempotency_redis_key = None
 
-        body_hash = getattr(g, "idempotency_body_hash", "")
         try:
-            stored = json.dumps(
-                {
-                    "body_hash": body_hash,
-                    "status_code": response.status_code,
-                    "body": base64.b64encode(response.get_data()).decode(),
-                    "content_type": response.content_type or "application/json",
-                }
+            pipe = redis_client.pipeline()
+            if response.status_code < 500:
+                pipe.hset(
+                    redis_key,
+                    mapping=_encode_response(
+                        response, getattr(g, "idempotency_body_hash", "")
+                    ),
+                )
+                pipe.expire(redis_key, _ttl_for_path(request.path))
+            pipe.eval(
+                _RELEASE_LOCK_SCRIPT,
+                1,
+                f"{redis_key}:lock",
+                getattr(g, "idempotency_lock_value", ""),
             )
-            redis_client.set(redis_key, stored, ex=TTL_SECONDS)
+            pipe.execute()
         except Exception:
             logger.warning("idempotency_redis_set_failed key=%s", redis_key)
 
@@ -242,6 +399,18 @@ def _make_after_request(redis_client: Any) -> Any:
     return idempotency_after_request
 
 
+def _make_teardown(redis_client: Any) -> Any:
+    def idempotency_teardown(exc: BaseException | None) -> None:
+        # Unhandled exceptions skip after_request; free the lock for retries.
+        redis_key = getattr(g, "idempotency_redis_key", None)
+        if not redis_key:
+            return
+        g.idempotency_redis_key = None
+        _release_lock(redis_client, redis_key, getattr(g, "idempotency_lock_value", ""))
+
+    return idempotency_teardown
+
+
 def register_idempotency_guard(app: Flask) -> None:
     redis_client = _try_get_redis()
     if redis_client is None:
@@ -253,3 +422,4 @@ def register_idempotency_guard(app: Flask) -> None:
     app.extensions["idempotency_redis"] = redis_client
     app.before_request(_make_before_request(redis_client))
     app.after_request(_make_after_request(redis_client))
+    app.teardown_request(_make_teardown(redis_client))
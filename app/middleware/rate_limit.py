@@ -81,6 +81,8 @@ def _extract_subject_from_bearer_token() -> str | None:
         return None
 
     try:
+        # Memoised on ``g`` by RequestMemoizedJWTManager, so the JWT layer
+        # reuses this decode later in the request.
         decoded = decode_token(token, allow_expired=False)
     except Exception:
         return None
@@ -371,6 +373,7 @@ class RateLimiterService:
         consumed, retry_after_seconds = self._storage.consume(
             rule_name=rule.name,
             key=key,
+            limit=rule.limit,
             window_seconds=rule.window_seconds,
         )
         allowed = consumed <= rule.limit
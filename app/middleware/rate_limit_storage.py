@@ -3,8 +3,9 @@ from __future__ import annotations
 import importlib
 import os
 import threading
-from collections import defaultdict, deque
-from time import monotonic, time
+from collections import OrderedDict, deque
+from math import ceil
+from time import monotonic
 from typing import Any, Deque, Protocol
 
 __all__ = [
@@ -21,9 +22,12 @@ class RateLimitStorage(Protocol):
         *,
         rule_name: str,
         key: str,
+        limit: int,
         window_seconds: int,
     ) -> tuple[int, int]:
-        # Protocol contract only; concrete storage tracks per-window consumption.
+        # Protocol contract only; returns (requests counted in the window
+        # including this one, retry-after seconds). Rejected requests are not
+        # counted, so a client that keeps hammering is not locked out forever.
         ...
 
     def reset(self) -> None:
@@ -31,9 +35,15 @@ class RateLimitStorage(Protocol):
         ...
 
 
+DEFAULT_MEMORY_MAX_KEYS = 10_000
+
+
 class InMemoryRateLimitStorage:
-    def __init__(self) -> None:
-        self._events: dict[tuple[str, str], Deque[float]] = defaultdict(deque)
+    """Exact sliding-log limiter with LRU eviction of idle keys."""
+
+    def __init__(self, *, max_keys: int = DEFAULT_MEMORY_MAX_KEYS) -> None:
+        self._events: OrderedDict[tuple[str, str], Deque[float]] = OrderedDict()
+        self._max_keys = max(1, max_keys)
         self._lock = threading.Lock()
 
     def consume(
@@ -41,15 +51,25 @@ class InMemoryRateLimitStorage:
         *,
         rule_name: str,
         key: str,
+        limit: int,
         window_seconds: int,
     ) -> tuple[int, int]:
         now = monotonic()
         bucket_key = (rule_name, key)
         with self._lock:
-            events = self._events[bucket_key]
+            events = self._events.get(bucket_key)
+            if events is None:
+                events = self._events[bucket_key] = deque()
+                while len(self._events) > self._max_keys:
+                    self._events.popitem(last=False)
+            else:
+                self._events.move_to_end(bucket_key)
             cutoff = now - window_seconds
             while events and events[0] <= cutoff:
                 events.popleft()
+            if len(events) >= limit:
+                retry_after_seconds = window_seconds - (now - events[0])
+                return len(events) + 1, max(1, ceil(retry_after_seconds))
             events.append(now)
             retry_after_seconds = max(1, int(window_seconds - (now - events[0])))
             return len(events), retry_after_seconds
@@ -59,30 +79,64 @@ class InMemoryRateLimitStorage:
             self._events.clear()
 
 
+# Sliding-window counter in one atomic script: the previous fixed window's
+# count is weighted by how much of it still overlaps the sliding window, so
+# bursts at window edges cannot reach twice the limit. State is one hash per
+# (rule, key) so the script touches a single key; time comes from the Redis
+# server so app hosts with skewed clocks agree.
+_SLIDING_WINDOW_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window_ms = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now_ms = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local slot = math.floor(now_ms / window_ms)
+local state = redis.call('HMGET', KEYS[1], 'slot', 'curr', 'prev')
+local stored_slot = tonumber(state[1]) or slot
+local curr = tonumber(state[2]) or 0
+local prev = tonumber(state[3]) or 0
+if stored_slot ~= slot then
+  if stored_slot == slot - 1 then prev = curr else prev = 0 end
+  curr = 0
+end
+local elapsed = now_ms - slot * window_ms
+local weighted_prev = prev * (window_ms - elapsed) / window_ms
+local count = math.floor(weighted_prev + curr) + 1
+local retry_ms = window_ms - elapsed
+if count <= limit then
+  curr = curr + 1
+elseif curr < limit and prev > 0 then
+  -- Wait until the previous window's weight has decayed enough.
+  local needed = window_ms * (1 - (limit - curr - 1) / prev)
+  retry_ms = math.max(math.ceil(needed - elapsed), 1)
+end
+redis.call('HSET', KEYS[1], 'slot', slot, 'curr', curr, 'prev', prev)
+redis.call('PEXPIRE', KEYS[1], window_ms * 2)
+return {count, retry_ms}
+"""
+
+
 class RedisRateLimitStorage:
+    """Sliding-window counter evaluated atomically with one ``EVALSHA``."""
+
     def __init__(self, client: Any, *, key_prefix: str = "auraxis:rate-limit") -> None:
         self._client = client
         self._key_prefix = key_prefix
-
-    def _window_slot(self, window_seconds: int) -> tuple[int, int]:
-        now_seconds = int(time())
-        slot = now_seconds // window_seconds
-        retry_after_seconds = max(1, window_seconds - (now_seconds % window_seconds))
-        return slot, retry_after_seconds
+        # redis-py sends EVALSHA and only falls back to EVAL on NOSCRIPT.
+        self._script = client.register_script(_SLIDING_WINDOW_SCRIPT)
 
     def consume(
         self,
         *,
         rule_name: str,
         key: str,
+        limit: int,
         window_seconds: int,
     ) -> tuple[int, int]:
-        slot, retry_after_seconds = self._window_slot(window_seconds)
-        redis_key = f"{self._key_prefix}:{rule_name}:{key}:{slot}"
-        consumed = int(self._client.incr(redis_key))
-        if consumed == 1:
-            self._client.expire(redis_key, window_seconds + 2)
-        return consumed, retry_after_seconds
+        redis_key = f"{self._key_prefix}:{rule_name}:{key}"
+        count, retry_ms = self._script(
+            keys=[redis_key], args=[limit, window_seconds * 1000]
+        )
+        return int(count), max(1, ceil(int(retry_ms) / 1000))
 
     def reset(self) -> None:
         # No-op for Redis backend in runtime paths.
@@ -90,6 +144,15 @@ class RedisRateLimitStorage:
         return None
 
 
+def _memory_storage() -> InMemoryRateLimitStorage:
+    raw = os.getenv("RATE_LIMIT_MEMORY_MAX_KEYS", "")
+    try:
+        max_keys = int(raw) if raw.strip() else DEFAULT_MEMORY_MAX_KEYS
+    except ValueError:
+        max_keys = DEFAULT_MEMORY_MAX_KEYS
+    return InMemoryRateLimitStorage(max_keys=max_keys)
+
+
 def _build_storage_from_env() -> tuple[
     RateLimitStorage,
     str,
@@ -99,14 +162,14 @@ def _build_storage_from_env() -> tuple[
 ]:
     backend = str(os.getenv("RATE_LIMIT_BACKEND", "memory")).strip().lower()
     if backend != "redis":
-        return InMemoryRateLimitStorage(), "memory", True, "memory", None
+        return _memory_storage(), "memory", True, "memory", None
 
     redis_url = str(
         os.getenv("RATE_LIMIT_REDIS_URL", os.getenv("REDIS_URL", ""))
     ).strip()
     if not redis_url:
         return (
-            InMemoryRateLimitStorage(),
+            _memory_storage(),
             "memory",
             False,
             "redis",
@@ -117,7 +180,7 @@ def _build_storage_from_env() -> tuple[
         redis_client_cls = importlib.import_module("redis").Redis
     except Exception:
         return (
-            InMemoryRateLimitStorage(),
+            _memory_storage(),
             "memory",
             False,
             "redis",
@@ -129,7 +192,7 @@ def _build_storage_from_env() -> tuple[
         client.ping()
     except Exception:
         return (
-            InMemoryRateLimitStorage(),
+            _memory_storage(),
             "memory",
             False,
             "redis",
@@ -0,0 +1,70 @@
+# mypy: disable-error-code="name-defined"
+"""Background transaction export job."""
+
+from __future__ import annotations
+
+import enum
+import uuid
+
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.extensions.database import db
+from app.utils.datetime_utils import utc_now_naive
+
+
+def _enum_values(e: type[enum.Enum]) -> list[str]:
+    return [m.value for m in e]
+
+
+class ExportJobStatus(enum.Enum):
+    queued = "queued"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+
+class ExportJob(db.Model):
+    """A CSV/PDF export rendered by a worker and delivered from storage."""
+
+    __tablename__ = "export_jobs"
+
+    id = db.Column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False
+    )
+    user_id = db.Column(
+        UUID(as_uuid=True),
+        db.ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    format = db.Column(db.String(8), nullable=False)
+    status = db.Column(
+        db.Enum(
+            ExportJobStatus,
+            name="export_job_status_enum",
+            native_enum=False,
+            values_callable=_enum_values,
+        ),
+        nullable=False,
+        default=ExportJobStatus.queued,
+    )
+    # Export filters (ISO dates / enum values) replayed by the worker.
+    params_json = db.Column(db.JSON, nullable=False, default=dict)
+    filename = db.Column(db.String(255), nullable=False)
+    content_type = db.Column(db.String(100), nullable=False)
+    storage_key = db.Column(db.String(512), nullable=True)
+    size_bytes = db.Column(db.BigInteger, nullable=True)
+    row_count = db.Column(db.Integer, nullable=True)
+    error = db.Column(db.String(500), nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=utc_now_naive)
+    started_at = db.Column(db.DateTime, nullable=True)
+    completed_at = db.Column(db.DateTime, nullable=True)
+    # After this instant the stored file is deleted and the row purged.
+    expires_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.Index("ix_export_jobs_user_created", "user_id", "created_at"),
+        db.Index("ix_export_jobs_expires_at", "expires_at"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<ExportJob id={self.id} format={self.format} status={self.status}>"
@@ -86,6 +86,8 @@ class FiscalImport(db.Model):
     total_rows = db.Column(db.Integer, nullable=True)
     valid_rows = db.Column(db.Integer, nullable=True)
     error_rows = db.Column(db.Integer, nullable=True)
+    # Valid rows ingested so far; advanced per chunk by bulk imports.
+    processed_rows = db.Column(db.Integer, nullable=True)
     confirmed_at = db.Column(db.DateTime, nullable=True)
     created_at = db.Column(db.DateTime, nullable=False, default=utc_now_naive)
     updated_at = db.Column(
@@ -0,0 +1,40 @@
+# mypy: disable-error-code=name-defined
+"""Shared daily close prices per ticker — local store in front of BRAPI.
+
+``TickerDailyPrice`` holds one close per ``(ticker, day)``, shared by every
+user. ``TickerPriceCoverage`` records the contiguous ``[covered_from,
+covered_to]`` interval already fetched for a ticker, so weekends and holidays
+(days without a price row) are not mistaken for gaps. Both tables are filled
+by ``app.services.ticker_price_store`` and warmed by ``flask market backfill``.
+"""
+
+from __future__ import annotations
+
+from app.extensions.database import db
+from app.utils.datetime_utils import utc_now_naive
+
+
+class TickerDailyPrice(db.Model):
+    __tablename__ = "ticker_daily_prices"
+
+    ticker = db.Column(db.String(10), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    close = db.Column(db.Numeric(18, 6), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<TickerDailyPrice(ticker={self.ticker}, day={self.day})>"
+
+
+class TickerPriceCoverage(db.Model):
+    __tablename__ = "ticker_price_coverage"
+
+    ticker = db.Column(db.String(10), primary_key=True)
+    covered_from = db.Column(db.Date, nullable=False)
+    covered_to = db.Column(db.Date, nullable=False)
+    refreshed_at = db.Column(db.DateTime, default=utc_now_naive, nullable=False)
+
+    def __repr__(self) -> str:
+        return (
+            f"<TickerPriceCoverage(ticker={self.ticker}, "
+            f"from={self.covered_from}, to={self.covered_to})>"
+        )
@@ -102,6 +102,10 @@ class Transaction(db.Model):
         UUID(as_uuid=True), db.ForeignKey("credit_cards.id"), nullable=True
     )
     installment_group_id = db.Column(UUID(as_uuid=True), nullable=True)
+    # Deterministic occurrence key of materialised recurring rows:
+    # "<series id>:<due date>". Unique per user so concurrent runs of the
+    # recurrence engine cannot create the same occurrence twice.
+    recurrence_key = db.Column(db.String(64), nullable=True)
     paid_at = db.Column(db.DateTime, nullable=True)
     source = db.Column(
         db.String(40),
@@ -130,8 +134,28 @@ class Transaction(db.Model):
         db.Index("ix_transactions_user_source", "user_id", "source"),
         # PERF-GAP-01: composite indexes for hot list/filter/date-range queries.
         db.Index("ix_transactions_user_deleted", "user_id", "deleted"),
+        # Trailing id lets cursor pages seek on the (due_date, id) row value.
         db.Index(
-            "ix_transactions_user_deleted_due_date", "user_id", "deleted", "due_date"
+            "ix_transactions_user_deleted_due_date_id",
+            "user_id",
+            "deleted",
+            "due_date",
+            "id",
+        ),
+        # Cross-user due-date scans (reminder dispatch) over live rows only;
+        # id lets each keyset chunk resume where the previous one stopped.
+        db.Index(
+            "ix_transactions_due_date_id_active",
+            "due_date",
+            "id",
+            postgresql_where=db.text("deleted = false"),
+            sqlite_where=db.text("deleted = 0"),
+        ),
+        db.Index(
+            "uq_transactions_user_recurrence_key",
+            "user_id",
+            "recurrence_key",
+            unique=True,
         ),
     )
 
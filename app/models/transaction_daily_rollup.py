@@ -0,0 +1,47 @@
+# mypy: disable-error-code=name-defined
+"""Per-user daily ledger rollup — pre-aggregated source for dashboard analytics.
+
+One row per ``(user_id, day, type, status, category, tag_id)`` holding the sum
+and count of the non-deleted transactions that fall in that bucket. Rows are
+kept in sync with ``transactions`` inside the same DB transaction by the flush
+listener in ``app.services.transaction_rollup_service`` and can be rebuilt from
+scratch with ``flask analytics rebuild``.
+
+``type``/``status``/``category`` hold the enum *values* (``"income"``,
+``"paid"`` …) as plain strings. ``tag_id`` intentionally has no FK so tag
+deletion never blocks on derived rows.
+"""
+
+from __future__ import annotations
+
+from uuid import uuid4
+
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.extensions.database import db
+
+
+class TransactionDailyRollup(db.Model):
+    __tablename__ = "transaction_daily_rollups"
+
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    user_id = db.Column(UUID(as_uuid=True), db.ForeignKey("users.id"), nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    type = db.Column(db.String(20), nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    category = db.Column(db.String(20), nullable=True)
+    tag_id = db.Column(UUID(as_uuid=True), nullable=True)
+    amount_total = db.Column(
+        db.Numeric(14, 2), nullable=False, default=0, server_default="0"
+    )
+    tx_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        db.Index("ix_transaction_daily_rollups_user_day", "user_id", "day"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<TransactionDailyRollup(user_id={self.user_id}, day={self.day}, "
+            f"type={self.type}, status={self.status}, total={self.amount_total})>"
+        )
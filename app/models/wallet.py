@@ -3,7 +3,6 @@
 import uuid
 
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.ext.mutable import MutableList
 
 from app.extensions.database import db
 
@@ -32,7 +31,6 @@ class Wallet(db.Model):
     updated_at = db.Column(
         db.DateTime, server_default=db.func.now(), onupdate=db.func.now()
     )
-    history = db.Column(MutableList.as_mutable(db.JSON), default=list, nullable=True)
 
     # Relacionamento (opcional, útil para backref no User)
     user = db.relationship("User", backref="wallet_entries")
@@ -0,0 +1,53 @@
+# mypy: disable-error-code=name-defined
+"""Append-only change log of a wallet entry (quantity / value edits).
+
+One row per recorded change, replacing the old ``wallets.history`` JSON
+column. ``payload`` keeps the original event shape (``changeDate``,
+``originalQuantity``, ``originalValue`` …) so history items are serialized
+as before; ``recorded_at`` mirrors ``changeDate`` and backs the
+``(wallet_id, recorded_at)`` index that serves paginated history reads.
+"""
+
+from __future__ import annotations
+
+from uuid import uuid4
+
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.extensions.database import db
+from app.utils.datetime_utils import utc_now_naive
+
+
+class WalletHistoryEvent(db.Model):
+    __tablename__ = "wallet_history_events"
+
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    wallet_id = db.Column(
+        UUID(as_uuid=True),
+        db.ForeignKey("wallets.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    user_id = db.Column(UUID(as_uuid=True), db.ForeignKey("users.id"), nullable=False)
+    recorded_at = db.Column(db.DateTime, default=utc_now_naive, nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+
+    wallet = db.relationship(
+        "Wallet",
+        backref=db.backref(
+            "history_events", cascade="all, delete-orphan", passive_deletes=True
+        ),
+    )
+
+    __table_args__ = (
+        db.Index(
+            "ix_wallet_history_events_wallet_recorded",
+            "wallet_id",
+            "recorded_at",
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<WalletHistoryEvent(wallet_id={self.wallet_id}, "
+            f"recorded_at={self.recorded_at})>"
+        )
@@ -58,3 +58,17 @@ def serialize_document(doc: Any) -> dict[str, Any]:
         "description": doc.description,
         "created_at": doc.created_at.isoformat() if doc.created_at else None,
     }
+
+
+def serialize_import(batch: Any) -> dict[str, Any]:
+    return {
+        "id": str(batch.id),
+        "status": batch.status.value,
+        "filename": batch.filename,
+        "total_rows": batch.total_rows,
+        "valid_rows": batch.valid_rows,
+        "error_rows": batch.error_rows,
+        "processed_rows": batch.processed_rows,
+        "confirmed_at": batch.confirmed_at.isoformat() if batch.confirmed_at else None,
+        "created_at": batch.created_at.isoformat() if batch.created_at else None,
+    }
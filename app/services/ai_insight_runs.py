@@ -25,6 +25,8 @@ from app.utils.datetime_utils import utc_now_naive
 
 log = logging.getLogger(__name__)
 
+_PURGE_CHUNK_SIZE = 1000
+
 
 def _count_domains_present(data_quality_json: Any) -> int:
     """Count financial domains flagged present in ``data_quality.domain_presence``.
@@ -238,30 +240,48 @@ def transition_ai_insight_run_status(
     )
 
 
-def purge_expired_ai_insight_runs(*, now: datetime | None = None) -> int:
+def purge_expired_ai_insight_runs(
+    *, now: datetime | None = None, chunk_size: int = _PURGE_CHUNK_SIZE
+) -> int:
     """Purge retained snapshot payloads whose audit retention window expired.
 
     The run row remains as a lightweight audit marker. Account deletion still
-    hard-deletes the whole row through the LGPD registry.
+    hard-deletes the whole row through the LGPD registry. Rows are purged with
+    set-based UPDATEs of at most *chunk_size* rows, each committed on its own,
+    so a large backlog never becomes one long transaction.
     """
 
     purge_at = now or utc_now_naive()
-    rows = (
-        AIInsightRun.query.filter(AIInsightRun.expires_at <= purge_at)
-        .filter(AIInsightRun.purged_at.is_(None))
-        .all()
-    )
-    for row in rows:
-        row.snapshot_json = None
-        row.evidence_manifest_json = None
-        row.status = AIInsightRunStatus.purged
-        row.purged_at = purge_at
-        record_ai_insight_run(
-            status=AIInsightRunStatus.purged.value,
-            period_type=row.period_type.value,
+    purged = 0
+    while True:
+        rows = db.session.execute(
+            db.select(AIInsightRun.id, AIInsightRun.period_type)
+            .where(AIInsightRun.expires_at <= purge_at)
+            .where(AIInsightRun.purged_at.is_(None))
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            break
+        db.session.execute(
+            db.update(AIInsightRun)
+            .where(AIInsightRun.id.in_([row.id for row in rows]))
+            .values(
+                snapshot_json=db.null(),
+                evidence_manifest_json=db.null(),
+                status=AIInsightRunStatus.purged,
+                purged_at=purge_at,
+            )
+            .execution_options(synchronize_session=False)
         )
-    db.session.commit()
-    purged = len(rows)
+        db.session.commit()
+        for row in rows:
+            record_ai_insight_run(
+                status=AIInsightRunStatus.purged.value,
+                period_type=row.period_type.value,
+            )
+        purged += len(rows)
+        if len(rows) < chunk_size:
+            break
     record_ai_insight_runs_purged(purged)
     log.info("ai_insight.run.purged count=%s purge_at=%s", purged, purge_at)
     return purged
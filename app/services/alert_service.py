@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from typing import Any
 from uuid import UUID
 
@@ -70,6 +71,24 @@ def _is_dispatch_allowed(user_id: UUID, alert_type: str) -> bool:
     return bool(pref.enabled)
 
 
+def _dispatch_allowed_user_ids(user_ids: Iterable[UUID], alert_type: str) -> set[UUID]:
+    """Batch form of ``_is_dispatch_allowed``: one preference query per call."""
+    candidates = set(user_ids)
+    matrix_entry = TRIGGER_MATRIX.get(alert_type)
+    if matrix_entry is None or not candidates:
+        return set()
+
+    blocked = {
+        pref.user_id
+        for pref in AlertPreference.query.filter(
+            AlertPreference.user_id.in_(candidates),
+            AlertPreference.category == matrix_entry["category"],
+        )
+        if pref.global_opt_out or not pref.enabled
+    }
+    return candidates - blocked
+
+
 def dispatch_alert(
     user_id: UUID,
     alert_type: str,
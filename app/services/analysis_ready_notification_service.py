@@ -19,17 +19,20 @@ from __future__ import annotations
 
 import logging
 from dataclasses import dataclass
-from typing import cast
 from uuid import UUID
 
-import requests as http_client
-
 from app.extensions.database import db
 from app.models.push_subscription import PushSubscription, PushTransport
 from app.models.user import User
 from app.services.email_provider import EmailMessage, get_default_email_provider
 from app.services.email_templates.base import render_analysis_ready_email
 from app.services.entitlement_service import has_entitlement
+from app.services.expo_push_service import (
+    ExpoPushBuffer,
+    ExpoPushMessage,
+    is_expo_push_token,
+)
+from app.services.outbound_queue import get_default_outbound_queue
 
 log = logging.getLogger(__name__)
 
@@ -38,7 +41,6 @@ _DEFAULT_SUMMARY = (
     "Sua análise financeira semanal está disponível. "
     "Acesse o dashboard para ver seus insights personalizados."
 )
-_EXPO_PUSH_URL = "https://exp.host/--/api/v2/push/send"
 
 
 @dataclass(frozen=True)
@@ -52,6 +54,7 @@ def dispatch_analysis_ready_notification(
     *,
     user_id: UUID,
     summary_preview: str = _DEFAULT_SUMMARY,
+    push_buffer: ExpoPushBuffer | None = None,
 ) -> AnalysisNotificationResult:
     """Send 'analysis ready' notification to a premium user.
 
@@ -61,6 +64,8 @@ def dispatch_analysis_ready_notification(
     Args:
         user_id: The user to notify.
         summary_preview: A 1-2 sentence AI-generated preview included in the email.
+        push_buffer: Fan-outs pass a shared buffer so pushes for many users
+            are enqueued together; without one the push is enqueued now.
 
     Returns:
         AnalysisNotificationResult with flags indicating what was sent.
@@ -98,6 +103,7 @@ def dispatch_analysis_ready_notification(
         user_id=user_id,
         first_name=first_name,
         summary_preview=summary_preview,
+        push_buffer=push_buffer,
     )
 
     return AnalysisNotificationResult(
@@ -152,60 +158,55 @@ def _send_expo_push(
     user_id: UUID,
     first_name: str,
     summary_preview: str,
+    push_buffer: ExpoPushBuffer | None = None,
 ) -> bool:
-    """Send Expo push notifications to all registered Expo tokens for the user.
+    """Queue an Expo push for every registered Expo token of the user.
 
-    Returns True if at least one notification was dispatched successfully.
-    Swallows individual token failures so one bad token doesn't block the rest.
+    Delivery happens on the outbound queue in batches (see
+    ``app.services.expo_push_service``), so this never waits on Expo. With
+    ``push_buffer`` the messages join the buffer's next batch instead of
+    being enqueued as a job of their own.
+    Returns True when at least one message was handed to the queue.
     """
-    subscriptions = cast(
-        list[PushSubscription],
-        PushSubscription.query.filter_by(
+    tokens = [
+        str(endpoint)
+        for (endpoint,) in db.session.query(PushSubscription.endpoint).filter_by(
             user_id=user_id,
             transport=PushTransport.expo,
-        ).all(),
-    )
-    if not subscriptions:
+        )
+        if is_expo_push_token(str(endpoint))
+    ]
+    if not tokens:
         return False
 
-    any_sent = False
-    for sub in subscriptions:
-        token = str(sub.endpoint)
-        if not token.startswith("ExponentPushToken["):
-            continue
-        try:
-            resp = http_client.post(
-                _EXPO_PUSH_URL,
-                json={
-                    "to": token,
-                    "title": f"Análise pronta, {first_name}!",
-                    "body": summary_preview[:200],
-                    "data": {"screen": "Dashboard"},
-                    "sound": "default",
-                    "channelId": "analysis_ready",
-                },
-                timeout=10,
-            )
-            if resp.ok:
-                any_sent = True
-                log.info(
-                    "analysis_ready_notification.push_sent user_id=%s token=%s...",
-                    user_id,
-                    token[:30],
-                )
-            else:
-                log.warning(
-                    "analysis_ready_notification.push_rejected user_id=%s status=%s",
-                    user_id,
-                    resp.status_code,
-                )
-        except Exception as exc:
-            log.warning(
-                "analysis_ready_notification.push_failed user_id=%s error=%s",
-                user_id,
-                exc,
-            )
-    return any_sent
+    messages = [
+        ExpoPushMessage(
+            to=token,
+            title=f"Análise pronta, {first_name}!",
+            body=summary_preview[:200],
+            data={"screen": "Dashboard"},
+            channel_id="analysis_ready",
+        ).to_payload()
+        for token in tokens
+    ]
+    try:
+        if push_buffer is not None:
+            push_buffer.add(messages)
+        else:
+            get_default_outbound_queue().enqueue_push_batch(messages=messages)
+    except Exception as exc:
+        log.warning(
+            "analysis_ready_notification.push_failed user_id=%s error=%s",
+            user_id,
+            exc,
+        )
+        return False
+    log.info(
+        "analysis_ready_notification.push_queued user_id=%s tokens=%s",
+        user_id,
+        len(tokens),
+    )
+    return True
 
 
 __all__ = [
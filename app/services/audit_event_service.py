@@ -4,7 +4,6 @@ from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
-from app.extensions.database import db
 from app.models.audit_event import AuditEvent
 
 
@@ -42,14 +41,12 @@ def search_audit_events_by_request_id(
 
 def purge_expired_audit_events(*, retention_days: int) -> int:
     from app.extensions.prometheus_metrics import record_audit_purge
+    from app.services.audit_partition_service import purge_audit_events_before
 
     safe_retention_days = max(int(retention_days), 1)
     cutoff = datetime.now(UTC) - timedelta(days=safe_retention_days)
-    deleted = AuditEvent.query.filter(AuditEvent.created_at < cutoff).delete(
-        synchronize_session=False
-    )
-    db.session.commit()
-    count = int(deleted)
+    # Expired monthly partitions are dropped whole; the rest goes in chunks.
+    count = purge_audit_events_before(cutoff).total
     if count > 0:
         record_audit_purge(count)
     return count
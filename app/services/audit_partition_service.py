@@ -0,0 +1,287 @@
+"""Monthly range partitions for ``audit_events``.
+
+On PostgreSQL ``audit_events`` is partitioned by ``created_at`` into
+``audit_events_pYYYY_MM`` tables plus an ``audit_events_default`` catch-all.
+Retention detaches and drops whole expired months, which is a catalog
+operation; only rows of the month straddling the cutoff (and any stragglers in
+the default partition) are removed with bounded ``DELETE`` chunks. SQLite and
+non-partitioned databases use the chunked delete alone.
+
+PostgreSQL refuses to create a month partition while the default partition
+holds rows of that month, so ``ensure_audit_partitions`` first detaches the
+default partition, creates the month, moves those rows into it and attaches
+the default partition again, all in one transaction. Catalog lookups are
+scoped to the current schema.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+from typing import Any
+
+import sqlalchemy as sa
+
+from app.extensions.database import db
+from app.models.audit_event import AuditEvent
+
+log = logging.getLogger(__name__)
+
+AUDIT_EVENTS_TABLE = "audit_events"
+DEFAULT_PARTITION = f"{AUDIT_EVENTS_TABLE}_default"
+DEFAULT_MONTHS_AHEAD = 3
+DEFAULT_DELETE_CHUNK_SIZE = 5000
+_PARTITION_NAME_RE = re.compile(r"^audit_events_p(\d{4})_(\d{2})$")
+
+
+@dataclass(frozen=True)
+class AuditPurgeResult:
+    dropped_partitions: list[str]
+    dropped_rows_estimate: int
+    deleted_rows: int
+
+    @property
+    def total(self) -> int:
+        return self.dropped_rows_estimate + self.deleted_rows
+
+
+def month_start(value: date | datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(first_day: date, months: int) -> date:
+    index = first_day.year * 12 + first_day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(first_day: date) -> str:
+    return f"{AUDIT_EVENTS_TABLE}_p{first_day.year:04d}_{first_day.month:02d}"
+
+
+def _connection() -> Any:
+    return db.session.connection()
+
+
+def is_audit_events_partitioned(connection: Any | None = None) -> bool:
+    conn = connection if connection is not None else _connection()
+    if conn.dialect.name != "postgresql":
+        return False
+    return bool(
+        conn.execute(
+            sa.text(
+                "SELECT 1 FROM pg_partitioned_table pt "
+                "JOIN pg_class c ON c.oid = pt.partrelid "
+                "WHERE c.relname = :name AND c.relnamespace = "
+                "to_regnamespace(current_schema())"
+            ),
+            {"name": AUDIT_EVENTS_TABLE},
+        ).scalar()
+    )
+
+
+def _monthly_partitions(conn: Any) -> dict[date, str]:
+    names = conn.execute(
+        sa.text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :name AND p.relnamespace = "
+            "to_regnamespace(current_schema())"
+        ),
+        {"name": AUDIT_EVENTS_TABLE},
+    ).scalars()
+    partitions: dict[date, str] = {}
+    for name in names:
+        match = _PARTITION_NAME_RE.match(name)
+        if match:
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+def create_month_partition_sql(first_day: date) -> str:
+    upper = add_months(first_day, 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(first_day)} "
+        f"PARTITION OF {AUDIT_EVENTS_TABLE} "
+        f"FOR VALUES FROM ('{first_day.isoformat()} 00:00:00+00') "
+        f"TO ('{upper.isoformat()} 00:00:00+00')"
+    )
+
+
+def _month_bounds(first_day: date) -> tuple[str, str]:
+    upper = add_months(first_day, 1)
+    return f"{first_day.isoformat()} 00:00:00+00", f"{upper.isoformat()} 00:00:00+00"
+
+
+def _has_default_partition(conn: Any) -> bool:
+    return bool(
+        conn.execute(
+            sa.text(
+                "SELECT 1 FROM pg_partitioned_table pt "
+                "JOIN pg_class p ON p.oid = pt.partrelid "
+                "JOIN pg_class d ON d.oid = pt.partdefid "
+                "WHERE p.relname = :name AND d.relname = :default_name "
+                "AND p.relnamespace = to_regnamespace(current_schema())"
+            ),
+            {"name": AUDIT_EVENTS_TABLE, "default_name": DEFAULT_PARTITION},
+        ).scalar()
+    )
+
+
+def _default_holds_month(conn: Any, first_day: date) -> bool:
+    lower, upper = _month_bounds(first_day)
+    return bool(
+        conn.execute(
+            sa.text(
+                f"SELECT 1 FROM {DEFAULT_PARTITION} "
+                "WHERE created_at >= :lower AND created_at < :upper LIMIT 1"
+            ),
+            {"lower": lower, "upper": upper},
+        ).scalar()
+    )
+
+
+def _create_month_partition(conn: Any, first_day: date, *, has_default: bool) -> int:
+    """Create one month partition; return rows moved out of the default one."""
+    if not has_default or not _default_holds_month(conn, first_day):
+        conn.execute(sa.text(create_month_partition_sql(first_day)))
+        return 0
+    lower, upper = _month_bounds(first_day)
+    conn.execute(
+        sa.text(
+            f"ALTER TABLE {AUDIT_EVENTS_TABLE} DETACH PARTITION {DEFAULT_PARTITION}"
+        )
+    )
+    conn.execute(sa.text(create_month_partition_sql(first_day)))
+    moved = conn.execute(
+        sa.text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            "WHERE created_at >= :lower AND created_at < :upper RETURNING *) "
+            f"INSERT INTO {AUDIT_EVENTS_TABLE} SELECT * FROM moved"
+        ),
+        {"lower": lower, "upper": upper},
+    ).rowcount
+    conn.execute(
+        sa.text(
+            f"ALTER TABLE {AUDIT_EVENTS_TABLE} "
+            f"ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"
+        )
+    )
+    return int(moved or 0)
+
+
+def ensure_audit_partitions(
+    *, months_ahead: int = DEFAULT_MONTHS_AHEAD, now: datetime | None = None
+) -> list[str]:
+    """Create the current and next *months_ahead* monthly partitions.
+
+    Returns the names of partitions that did not exist yet. No-op when the
+    table is not partitioned.
+    """
+    conn = _connection()
+    if not is_audit_events_partitioned(conn):
+        return []
+    existing = _monthly_partitions(conn)
+    has_default = _has_default_partition(conn)
+    current = month_start(now or datetime.now(UTC))
+    created: list[str] = []
+    for offset in range(max(int(months_ahead), 0) + 1):
+        first_day = add_months(current, offset)
+        if first_day in existing:
+            continue
+        moved = _create_month_partition(conn, first_day, has_default=has_default)
+        db.session.commit()
+        created.append(partition_name(first_day))
+        if moved:
+            log.info(
+                "audit_partitions.moved_from_default name=%s rows=%s",
+                partition_name(first_day),
+                moved,
+            )
+    if created:
+        log.info("audit_partitions.created names=%s", ",".join(created))
+    return created
+
+
+def _drop_expired_partitions(conn: Any, cutoff: datetime) -> tuple[list[str], int]:
+    dropped: list[str] = []
+    rows_estimate = 0
+    for first_day, name in sorted(_monthly_partitions(conn).items()):
+        upper = datetime.combine(add_months(first_day, 1), datetime.min.time(), UTC)
+        if upper > cutoff:
+            continue
+        estimate = conn.execute(
+            sa.text(
+                "SELECT reltuples FROM pg_class WHERE relname = :name "
+                "AND relnamespace = to_regnamespace(current_schema())"
+            ),
+            {"name": name},
+        ).scalar()
+        conn.execute(
+            sa.text(f"ALTER TABLE {AUDIT_EVENTS_TABLE} DETACH PARTITION {name}")
+        )
+        conn.execute(sa.text(f"DROP TABLE {name}"))
+        db.session.commit()
+        dropped.append(name)
+        rows_estimate += max(int(estimate or 0), 0)
+    return dropped, rows_estimate
+
+
+def delete_expired_in_chunks(
+    cutoff: datetime, *, chunk_size: int = DEFAULT_DELETE_CHUNK_SIZE
+) -> int:
+    """Delete rows older than *cutoff* in bounded, separately committed chunks."""
+    table = AuditEvent.__table__
+    expired_ids = (
+        sa.select(table.c.id)
+        .where(table.c.created_at < cutoff)
+        .limit(max(int(chunk_size), 1))
+    )
+    stmt = sa.delete(table).where(table.c.id.in_(expired_ids.scalar_subquery()))
+    deleted = 0
+    while True:
+        result = _connection().execute(stmt)
+        db.session.commit()
+        count = int(result.rowcount or 0)
+        deleted += count
+        if count < chunk_size:
+            return deleted
+
+
+def purge_audit_events_before(
+    cutoff: datetime, *, chunk_size: int = DEFAULT_DELETE_CHUNK_SIZE
+) -> AuditPurgeResult:
+    conn = _connection()
+    dropped: list[str] = []
+    rows_estimate = 0
+    if is_audit_events_partitioned(conn):
+        dropped, rows_estimate = _drop_expired_partitions(conn, cutoff)
+    deleted = delete_expired_in_chunks(cutoff, chunk_size=chunk_size)
+    if dropped:
+        log.info(
+            "audit_partitions.dropped names=%s rows_estimate=%s",
+            ",".join(dropped),
+            rows_estimate,
+        )
+    return AuditPurgeResult(
+        dropped_partitions=dropped,
+        dropped_rows_estimate=rows_estimate,
+        deleted_rows=deleted,
+    )
+
+
+__all__ = [
+    "AUDIT_EVENTS_TABLE",
+    "DEFAULT_PARTITION",
+    "AuditPurgeResult",
+    "add_months",
+    "create_month_partition_sql",
+    "delete_expired_in_chunks",
+    "ensure_audit_partitions",
+    "is_audit_events_partitioned",
+    "month_start",
+    "partition_name",
+    "purge_audit_events_before",
+]
@@ -1,14 +1,31 @@
 from __future__ import annotations
 
+import io
+from collections.abc import Iterator
 from dataclasses import dataclass
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from decimal import Decimal
-from typing import Any, Iterable, Sequence
-from uuid import UUID
+from itertools import islice
+from typing import IO, Any, Iterable, Sequence, TypeVar
+from uuid import UUID, uuid4
 
-from app.extensions.database import db
+from app.extensions.database import db, dialect_insert
 from app.models.transaction import Transaction, TransactionStatus, TransactionType
-from app.services.bank_statement_parsers import ParsedEntry, parse_nubank_csv, parse_ofx
+from app.services.bank_statement_parsers import (
+    ParsedEntry,
+    PrefixedStream,
+    iter_nubank_csv_entries,
+    iter_ofx_entries,
+)
+from app.services.cache_service import get_cache_service
+from app.services.transaction_rollup_service import refresh_rollup_days
+from app.utils.datetime_utils import utc_now_naive
+
+_T = TypeVar("_T")
+# Entries checked per ``external_id IN (...)`` query while previewing.
+_DEDUP_BATCH_SIZE = 500
+_INSERT_BATCH_SIZE = 500
+_PEEK_SIZE = 4096
 
 _BANK_ALIASES = {
     "banco do brasil": "bb",
@@ -67,42 +84,52 @@ class BankImportService:
     def __init__(self, user_id: UUID | str) -> None:
         self.user_id = UUID(user_id) if isinstance(user_id, str) else user_id
 
-    def build_preview(self, *, content: str, bank_name: str) -> BankImportPreview:
-        normalized_bank = _normalize_bank_name(bank_name)
-        if not content.strip():
-            raise ValueError("Bank statement content cannot be empty")
+    def build_preview(
+        self, *, content: str | IO[bytes], bank_name: str
+    ) -> BankImportPreview:
+        """Parse *content* (text or a binary upload stream) into a preview.
 
-        parsed_entries = _parse_entries(content=content, bank_name=normalized_bank)
-        existing_external_ids = self._load_existing_external_ids(parsed_entries)
+        Entries are parsed incrementally and checked against existing
+        ``external_id``s in batches of ``_DEDUP_BATCH_SIZE``.
+        """
+        normalized_bank = _normalize_bank_name(bank_name)
+        stream = _open_statement(content)
 
         preview_entries: list[BankImportPreviewEntry] = []
         duplicate_entries = 0
         seen_external_ids: set[str] = set()
 
-        for entry in parsed_entries:
-            duplicate_reason: str | None = None
-            if entry.external_id in existing_external_ids:
-                duplicate_reason = "existing_transaction"
-            elif entry.external_id in seen_external_ids:
-                duplicate_reason = "duplicate_in_file"
-
-            if duplicate_reason is None:
-                seen_external_ids.add(entry.external_id)
-            else:
-                duplicate_entries += 1
-
-            preview_entries.append(
-                BankImportPreviewEntry(
-                    external_id=entry.external_id,
-                    date=entry.date.isoformat(),
-                    description=entry.description,
-                    amount=entry.amount,
-                    transaction_type=entry.transaction_type,
-                    bank_name=entry.bank_name,
-                    is_duplicate=duplicate_reason is not None,
-                    duplicate_reason=duplicate_reason,
-                )
+        for batch in _batched(
+            _iter_entries(stream=stream, bank_name=normalized_bank),
+            _DEDUP_BATCH_SIZE,
+        ):
+            existing_external_ids = self._load_existing_external_ids(
+                entry.external_id for entry in batch
             )
+            for entry in batch:
+                duplicate_reason: str | None = None
+                if entry.external_id in existing_external_ids:
+                    duplicate_reason = "existing_transaction"
+                elif entry.external_id in seen_external_ids:
+                    duplicate_reason = "duplicate_in_file"
+
+                if duplicate_reason is None:
+                    seen_external_ids.add(entry.external_id)
+                else:
+                    duplicate_entries += 1
+
+                preview_entries.append(
+                    BankImportPreviewEntry(
+                        external_id=entry.external_id,
+                        date=entry.date.isoformat(),
+                        description=entry.description,
+                        amount=entry.amount,
+                        transaction_type=entry.transaction_type,
+                        bank_name=entry.bank_name,
+                        is_duplicate=duplicate_reason is not None,
+                        duplicate_reason=duplicate_reason,
+                    )
+                )
 
         return BankImportPreview(
             bank_name=normalized_bank,
@@ -133,87 +160,107 @@ class BankImportService:
 
         _validate_entries_month(entries, month=normalized_month)
 
+        touched_days: set[date] = set()
         replaced_count = 0
         if normalized_mode == "replace_month":
             replaced_count = self._replace_month_transactions(
                 bank_name=normalized_bank,
                 month=normalized_month,
             )
+            if replaced_count:
+                touched_days.update(_month_days(normalized_month))
 
-        existing_external_ids = self._load_existing_transaction_ids_for_entries(entries)
-        imported_transactions: list[Transaction] = []
-        skipped_duplicates = 0
+        rows: list[dict[str, Any]] = []
         seen_external_ids: set[str] = set()
-
         for entry in entries:
             if entry.external_id in seen_external_ids:
-                skipped_duplicates += 1
-                continue
-            if entry.external_id in existing_external_ids:
-                skipped_duplicates += 1
                 continue
-
             seen_external_ids.add(entry.external_id)
-            transaction = Transaction(
-                user_id=self.user_id,
-                title=_build_transaction_title(entry.description),
-                description=entry.description,
-                amount=abs(entry.amount),
-                status=TransactionStatus.PAID,
-                type=_resolve_transaction_type_enum(entry.transaction_type),
-                due_date=entry.date,
-                paid_at=datetime.combine(entry.date, datetime.min.time()),
-                source="bank_import",
-                external_id=entry.external_id,
-                bank_name=entry.bank_name,
-            )
-            db.session.add(transaction)
-            imported_transactions.append(transaction)
+            rows.append(self._build_row(entry))
 
+        inserted_ids = self._insert_rows(rows)
+        touched_days.update(
+            row["due_date"] for row in rows if row["id"] in inserted_ids
+        )
+        if touched_days:
+            # Core statements bypass the ORM flush listener of the rollups.
+            refresh_rollup_days(db.session.connection(), {self.user_id: touched_days})
         db.session.commit()
+        get_cache_service().invalidate_domain("transactions", self.user_id)
+
+        imported_transactions = self._load_transactions(
+            [row["id"] for row in rows if row["id"] in inserted_ids]
+        )
         return BankImportConfirmation(
             bank_name=normalized_bank,
             month=normalized_month,
             imported_count=len(imported_transactions),
-            skipped_duplicates=skipped_duplicates,
+            skipped_duplicates=len(entries) - len(imported_transactions),
             replaced_count=replaced_count,
             transactions=imported_transactions,
         )
 
-    def _load_existing_external_ids(
-        self,
-        parsed_entries: Iterable[ParsedEntry],
-    ) -> set[str]:
-        external_ids = sorted({entry.external_id for entry in parsed_entries})
-        if not external_ids:
-            return set()
-
-        rows = (
-            db.session.query(Transaction.external_id)
-            .filter(Transaction.user_id == self.user_id)
-            .filter(Transaction.deleted.is_(False))
-            .filter(Transaction.external_id.in_(external_ids))
-            .all()
-        )
+    def _build_row(self, entry: BankImportSelectedEntry) -> dict[str, Any]:
+        now = utc_now_naive()
         return {
-            external_id
-            for (external_id,) in rows
-            if external_id is not None and external_id.strip()
+            "id": uuid4(),
+            "user_id": self.user_id,
+            "title": _build_transaction_title(entry.description),
+            "description": entry.description,
+            "amount": abs(entry.amount),
+            "currency": "BRL",
+            "status": TransactionStatus.PAID,
+            "type": _resolve_transaction_type_enum(entry.transaction_type),
+            "due_date": entry.date,
+            "paid_at": datetime.combine(entry.date, datetime.min.time()),
+            "is_recurring": False,
+            "is_installment": False,
+            "source": "bank_import",
+            "external_id": entry.external_id,
+            "bank_name": entry.bank_name,
+            "deleted": False,
+            "created_at": now,
+            "updated_at": now,
         }
 
-    def _load_existing_transaction_ids_for_entries(
-        self,
-        entries: Sequence[BankImportSelectedEntry],
-    ) -> set[str]:
-        external_ids = sorted({entry.external_id for entry in entries})
-        if not external_ids:
+    def _insert_rows(self, rows: list[dict[str, Any]]) -> set[UUID]:
+        """Bulk insert *rows*; existing ``(user_id, external_id)`` are skipped.
+
+        Returns the ids actually inserted.
+        """
+        table = Transaction.__table__
+        connection = db.session.connection()
+        insert = dialect_insert(connection.dialect.name)
+        inserted: set[UUID] = set()
+        for batch in _batched(rows, _INSERT_BATCH_SIZE):
+            stmt = (
+                insert(table)
+                .values(batch)
+                .on_conflict_do_nothing(index_elements=["user_id", "external_id"])
+                .returning(table.c.id)
+            )
+            inserted.update(connection.execute(stmt).scalars())
+        return inserted
+
+    def _load_transactions(self, ids: list[UUID]) -> list[Transaction]:
+        by_id: dict[UUID, Transaction] = {}
+        for batch in _batched(ids, _DEDUP_BATCH_SIZE):
+            for transaction in Transaction.query.filter(Transaction.id.in_(batch)):
+                by_id[transaction.id] = transaction
+        return [
+            by_id[transaction_id] for transaction_id in ids if transaction_id in by_id
+        ]
+
+    def _load_existing_external_ids(self, external_ids: Iterable[str]) -> set[str]:
+        unique_ids = sorted(set(external_ids))
+        if not unique_ids:
             return set()
 
         rows = (
             db.session.query(Transaction.external_id)
             .filter(Transaction.user_id == self.user_id)
             .filter(Transaction.deleted.is_(False))
-            .filter(Transaction.external_id.in_(external_ids))
+            .filter(Transaction.external_id.in_(unique_ids))
             .all()
         )
         return {
@@ -223,21 +270,19 @@ class BankImportService:
         }
 
     def _replace_month_transactions(self, *, bank_name: str, month: str) -> int:
-        year, month_number = map(int, month.split("-"))
-        rows = (
-            Transaction.query.filter(Transaction.user_id == self.user_id)
-            .filter(Transaction.deleted.is_(False))
-            .filter(Transaction.source == "bank_import")
-            .filter(Transaction.bank_name == bank_name)
-            .filter(db.extract("year", Transaction.due_date) == year)
-            .filter(db.extract("month", Transaction.due_date) == month_number)
-            .all()
+        first_day = datetime.strptime(month, "%Y-%m").date()
+        table = Transaction.__table__
+        result = db.session.connection().execute(
+            table.delete().where(
+                table.c.user_id == self.user_id,
+                table.c.deleted.is_(False),
+                table.c.source == "bank_import",
+                table.c.bank_name == bank_name,
+                table.c.due_date >= first_day,
+                table.c.due_date < _next_month(first_day),
+            )
         )
-
-        for transaction in rows:
-            db.session.delete(transaction)
-        db.session.flush()
-        return len(rows)
+        return int(result.rowcount or 0)
 
 
 def _normalize_bank_name(bank_name: str) -> str:
@@ -251,10 +296,41 @@ def _normalize_bank_name(bank_name: str) -> str:
     return canonical
 
 
-def _parse_entries(*, content: str, bank_name: str) -> list[ParsedEntry]:
+def _open_statement(content: str | IO[bytes]) -> IO[bytes] | PrefixedStream:
+    if isinstance(content, str):
+        if not content.strip():
+            raise ValueError("Bank statement content cannot be empty")
+        return io.BytesIO(content.encode("utf-8"))
+    head = content.read(_PEEK_SIZE)
+    if not head.strip():
+        raise ValueError("Bank statement content cannot be empty")
+    return PrefixedStream(head, content)
+
+
+def _iter_entries(*, stream: Any, bank_name: str) -> Iterator[ParsedEntry]:
     if bank_name == "nubank":
-        return parse_nubank_csv(content)
-    return parse_ofx(content, bank_name)
+        return iter_nubank_csv_entries(stream)
+    return iter_ofx_entries(stream, bank_name)
+
+
+def _batched(items: Iterable[_T], size: int) -> Iterator[list[_T]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _next_month(first_day: date) -> date:
+    if first_day.month == 12:
+        return date(first_day.year + 1, 1, 1)
+    return date(first_day.year, first_day.month + 1, 1)
+
+
+def _month_days(month: str) -> set[date]:
+    first_day = datetime.strptime(month, "%Y-%m").date()
+    return {
+        first_day + timedelta(days=offset)
+        for offset in range((_next_month(first_day) - first_day).days)
+    }
 
 
 def _normalize_month(month: str) -> str:
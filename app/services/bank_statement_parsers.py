@@ -1,13 +1,22 @@
+"""Bank statement parsers (OFX 1/2 and Nubank CSV).
+
+The ``iter_*`` functions read a binary stream incrementally so multi-year
+exports never have to be held in memory as one string; ``parse_*`` keep the
+list-returning API for callers that already hold the text.
+"""
+
 from __future__ import annotations
 
+import codecs
 import csv
 import hashlib
 import io
 import re
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
 from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
-from typing import Sequence
+from typing import IO, Any
 from xml.etree import ElementTree
 
 from app.services.csv_ingestion_service import _parse_amount, _parse_date
@@ -15,6 +24,8 @@ from app.services.csv_ingestion_service import _parse_amount, _parse_date
 _SUPPORTED_OFX_BANKS = {"bradesco", "itau", "bb", "caixa"}
 _OFX_1_STMTTRN_RE = re.compile(r"<STMTTRN>(.*?)</STMTTRN>", re.DOTALL | re.IGNORECASE)
 _OFX_1_FIELD_RE = re.compile(r"<(?P<tag>[A-Z0-9_]+)>(?P<value>[^\r\n<]+)")
+_READ_CHUNK_SIZE = 64 * 1024
+_OPEN_TAG_OVERLAP = len("<STMTTRN>") - 1
 
 
 @dataclass(frozen=True)
@@ -28,18 +39,41 @@ class ParsedEntry:
 
 
 def parse_ofx(content: str, bank_name: str) -> list[ParsedEntry]:
+    return list(iter_ofx_entries(_text_stream(content), bank_name))
+
+
+def parse_nubank_csv(content: str) -> list[ParsedEntry]:
+    return list(iter_nubank_csv_entries(_text_stream(content)))
+
+
+def iter_ofx_entries(stream: IO[bytes], bank_name: str) -> Iterator[ParsedEntry]:
+    """Yield OFX entries while reading *stream* incrementally.
+
+    OFX 2 (XML) goes through ``iterparse`` and clears each ``STMTTRN`` once it
+    is consumed; OFX 1 (SGML) is scanned chunk by chunk.
+    """
     normalized_bank = bank_name.strip().lower()
     if normalized_bank not in _SUPPORTED_OFX_BANKS:
         raise ValueError(f"Unsupported OFX bank: {bank_name!r}")
 
-    stripped = content.lstrip()
-    if stripped.startswith(("<?xml", "<OFX>")):
-        return _parse_ofx_xml(content, normalized_bank)
-    return _parse_ofx_sgml(content, normalized_bank)
+    head = stream.read(_READ_CHUNK_SIZE)
+    source = PrefixedStream(head, stream)
+    if head.lstrip().lstrip(b"\xef\xbb\xbf").startswith((b"<?xml", b"<OFX>")):
+        nodes: Iterable[ElementTree.Element | dict[str, str]] = _iter_ofx_xml_nodes(
+            source
+        )
+    else:
+        nodes = _iter_ofx_sgml_nodes(source)
+    empty = True
+    for entry in _iter_ofx_entries(nodes, bank_name=normalized_bank):
+        empty = False
+        yield entry
+    if empty:
+        raise ValueError("OFX content missing STMTTRN blocks")
 
 
-def parse_nubank_csv(content: str) -> list[ParsedEntry]:
-    reader = csv.DictReader(io.StringIO(content))
+def iter_nubank_csv_entries(stream: IO[bytes]) -> Iterator[ParsedEntry]:
+    reader = csv.DictReader(_iter_text_lines(stream))
     if reader.fieldnames is None:
         raise ValueError("Nubank CSV is empty or missing header")
 
@@ -49,7 +83,7 @@ def parse_nubank_csv(content: str) -> list[ParsedEntry]:
     if missing:
         raise ValueError("Nubank CSV missing required columns: " + ", ".join(missing))
 
-    entries: list[ParsedEntry] = []
+    empty = True
     for row in reader:
         date_raw = _read_csv_value(row, header_map["date"])
         title_raw = _read_csv_value(row, header_map["title"])
@@ -60,64 +94,114 @@ def parse_nubank_csv(content: str) -> list[ParsedEntry]:
         parsed_date = _parse_date(date_raw)
         parsed_amount = _parse_amount(amount_raw)
         description = _normalize_description(title_raw)
-        entries.append(
-            ParsedEntry(
-                external_id=_build_csv_external_id(
-                    parsed_date=parsed_date,
-                    description=description,
-                    amount=parsed_amount,
-                ),
-                date=parsed_date,
+        empty = False
+        yield ParsedEntry(
+            external_id=_build_csv_external_id(
+                parsed_date=parsed_date,
                 description=description,
                 amount=parsed_amount,
-                transaction_type=_resolve_transaction_type(parsed_amount),
-                bank_name="nubank",
-            )
+            ),
+            date=parsed_date,
+            description=description,
+            amount=parsed_amount,
+            transaction_type=_resolve_transaction_type(parsed_amount),
+            bank_name="nubank",
         )
 
-    if not entries:
+    if empty:
         raise ValueError("Nubank CSV has no transaction rows")
-    return entries
 
 
-def _parse_ofx_xml(content: str, bank_name: str) -> list[ParsedEntry]:
-    try:
-        root = ElementTree.fromstring(content)
-    except ElementTree.ParseError as exc:
-        raise ValueError("Invalid OFX XML content") from exc
+class PrefixedStream:
+    """Binary reader that replays an already-read *prefix* before *stream*."""
 
-    statement_nodes = list(root.iterfind(".//STMTTRN"))
-    if not statement_nodes:
-        statement_nodes = [
-            node for node in root.iter() if _local_name(node.tag) == "STMTTRN"
-        ]
-    if not statement_nodes:
-        raise ValueError("OFX content missing STMTTRN blocks")
-    return _build_ofx_entries(statement_nodes, bank_name=bank_name)
+    def __init__(self, prefix: bytes, stream: IO[bytes]) -> None:
+        self._prefix = prefix
+        self._stream = stream
 
+    def read(self, size: int = -1) -> bytes:
+        if not self._prefix:
+            return self._stream.read(size)
+        if size is None or size < 0:
+            data, self._prefix = self._prefix + self._stream.read(), b""
+            return data
+        data, self._prefix = self._prefix[:size], self._prefix[size:]
+        return data
 
-def _parse_ofx_sgml(content: str, bank_name: str) -> list[ParsedEntry]:
-    matches = _OFX_1_STMTTRN_RE.findall(content)
-    if not matches:
-        raise ValueError("OFX content missing STMTTRN blocks")
 
-    statement_nodes: list[dict[str, str]] = []
-    for raw_block in matches:
-        fields = {
-            match.group("tag").upper(): match.group("value").strip()
-            for match in _OFX_1_FIELD_RE.finditer(raw_block)
-        }
-        statement_nodes.append(fields)
+def _text_stream(content: str) -> IO[bytes]:
+    return io.BytesIO(content.encode("utf-8"))
+
 
-    return _build_ofx_entries(statement_nodes, bank_name=bank_name)
+def _iter_text_chunks(stream: Any) -> Iterator[str]:
+    """Decode *stream* as UTF-8, falling back to Latin-1 once invalid bytes appear."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    fallback = False
+    while True:
+        raw = stream.read(_READ_CHUNK_SIZE)
+        if not raw:
+            break
+        if fallback:
+            yield raw.decode("latin-1")
+            continue
+        try:
+            yield decoder.decode(raw)
+        except UnicodeDecodeError:
+            fallback = True
+            pending, _ = decoder.getstate()
+            yield (pending + raw).decode("latin-1")
+    if not fallback:
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+
+def _iter_text_lines(stream: IO[bytes]) -> Iterator[str]:
+    pending = ""
+    for chunk in _iter_text_chunks(stream):
+        lines = (pending + chunk).splitlines(keepends=True)
+        pending = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        yield from lines
+    if pending:
+        yield pending
+
+
+def _iter_ofx_xml_nodes(stream: Any) -> Iterator[ElementTree.Element]:
+    try:
+        for _event, node in ElementTree.iterparse(stream, events=("end",)):
+            if _local_name(node.tag) == "STMTTRN":
+                yield node
+                node.clear()
+    except ElementTree.ParseError as exc:
+        raise ValueError("Invalid OFX XML content") from exc
 
 
-def _build_ofx_entries(
-    statement_nodes: Sequence[ElementTree.Element | dict[str, str]],
+def _iter_ofx_sgml_nodes(stream: Any) -> Iterator[dict[str, str]]:
+    buffer = ""
+    for chunk in _iter_text_chunks(stream):
+        buffer += chunk
+        consumed = 0
+        for match in _OFX_1_STMTTRN_RE.finditer(buffer):
+            consumed = match.end()
+            yield {
+                field.group("tag").upper(): field.group("value").strip()
+                for field in _OFX_1_FIELD_RE.finditer(match.group(1))
+            }
+        buffer = buffer[consumed:]
+        # Keep only what may still open a block: an unterminated <STMTTRN>
+        # or a tag cut in half at the chunk boundary.
+        start = buffer.upper().rfind("<STMTTRN>")
+        if start >= 0:
+            buffer = buffer[start:]
+        else:
+            buffer = buffer[-_OPEN_TAG_OVERLAP:]
+
+
+def _iter_ofx_entries(
+    statement_nodes: Iterable[ElementTree.Element | dict[str, str]],
     *,
     bank_name: str,
-) -> list[ParsedEntry]:
-    entries: list[ParsedEntry] = []
+) -> Iterator[ParsedEntry]:
     for node in statement_nodes:
         fit_id = _extract_ofx_value(node, "FITID")
         posted_at = _extract_ofx_value(node, "DTPOSTED")
@@ -132,21 +216,15 @@ def _build_ofx_entries(
             )
 
         amount = _parse_ofx_amount(amount_raw)
-        entries.append(
-            ParsedEntry(
-                external_id=fit_id,
-                date=_parse_ofx_date(posted_at),
-                description=_normalize_description(description_raw),
-                amount=amount,
-                transaction_type=_resolve_transaction_type(amount),
-                bank_name=bank_name,
-            )
+        yield ParsedEntry(
+            external_id=fit_id,
+            date=_parse_ofx_date(posted_at),
+            description=_normalize_description(description_raw),
+            amount=amount,
+            transaction_type=_resolve_transaction_type(amount),
+            bank_name=bank_name,
         )
 
-    if not entries:
-        raise ValueError("OFX content has no transaction rows")
-    return entries
-
 
 def _extract_ofx_value(
     node: ElementTree.Element | dict[str, str],
@@ -212,4 +290,11 @@ def _local_name(tag: str) -> str:
     return tag.rsplit("}", maxsplit=1)[-1].upper()
 
 
-__all__ = ["ParsedEntry", "parse_nubank_csv", "parse_ofx"]
+__all__ = [
+    "ParsedEntry",
+    "PrefixedStream",
+    "iter_nubank_csv_entries",
+    "iter_ofx_entries",
+    "parse_nubank_csv",
+    "parse_ofx",
+]
@@ -1,20 +1,31 @@
 from __future__ import annotations
 
+import hashlib
+from calendar import monthrange
+from collections.abc import Sequence
 from dataclasses import dataclass
-from datetime import date
+from datetime import date, timedelta
 from decimal import Decimal
 from typing import Any, cast
 from uuid import UUID
 
 from marshmallow import ValidationError
-from sqlalchemy import extract, func
+from sqlalchemy import func
 from sqlalchemy.orm import joinedload
 
 from app.extensions.database import db
 from app.models.budget import Budget
 from app.models.tag import Tag
-from app.models.transaction import Transaction, TransactionStatus, TransactionType
+from app.models.transaction import (
+    Transaction,
+    TransactionCategory,
+    TransactionStatus,
+    TransactionType,
+)
 from app.schemas.budget_schema import BudgetSchema
+from app.services.cache_service import BUDGET_SPENT_CACHE_TTL, get_cache_service
+
+_BUDGET_SPENT_CACHE_NAMESPACE = "budget:spent"
 
 
 @dataclass
@@ -102,55 +113,96 @@ class BudgetService:
         db.session.commit()
 
     def get_spent_for_budget(self, budget: Budget) -> Decimal:
+        return self.get_spent_for_budgets([budget])[budget.id]
+
+    def get_spent_for_budgets(
+        self, budgets: Sequence[Budget], *, today: date | None = None
+    ) -> dict[UUID, Decimal]:
         """
-        Calculates the total spent amount for a given budget in its current period.
+        Calculates the spent amount of every budget in its current period.
 
-        - monthly: sums paid expense transactions for the current calendar month
-          filtered by tag_id (or all if tag_id is null).
-        - weekly: sums paid expense transactions for the current ISO week.
-        - custom: sums paid expense transactions between start_date and end_date.
+        One grouped query sums paid expense transactions by category, tag and
+        due date over the union of the budgets' windows (see
+        ``budget_period_window``); each budget then adds up the groups that
+        match its category (or legacy tag_id, or everything when neither is
+        set) inside its own window. Results are cached for a short TTL in the
+        ``budget:spent`` namespace, invalidated by any transaction write.
         """
-        today = date.today()
+        if not budgets:
+            return {}
+        today = today or date.today()
+        windows = {budget.id: budget_period_window(budget, today) for budget in budgets}
 
-        query = db.session.query(func.coalesce(func.sum(Transaction.amount), 0)).filter(
+        cache = get_cache_service()
+        cache_key = cache.versioned_key(
+            _BUDGET_SPENT_CACHE_NAMESPACE,
+            self.user_id,
+            today.isoformat(),
+            _budgets_digest(budgets, windows),
+        )
+        cached = cache.get(cache_key)
+        if isinstance(cached, dict):
+            return {UUID(key): Decimal(value) for key, value in cached.items()}
+
+        spent = self._compute_spent(budgets, windows)
+        cache.set(
+            cache_key,
+            {str(key): str(value) for key, value in spent.items()},
+            ttl=BUDGET_SPENT_CACHE_TTL,
+        )
+        return spent
+
+    def _compute_spent(
+        self,
+        budgets: Sequence[Budget],
+        windows: dict[UUID, tuple[date | None, date | None]],
+    ) -> dict[UUID, Decimal]:
+        query = db.session.query(
+            Transaction.category,
+            Transaction.tag_id,
+            Transaction.due_date,
+            func.sum(Transaction.amount),
+        ).filter(
             Transaction.user_id == self.user_id,
             Transaction.type == TransactionType.EXPENSE,
             Transaction.status == TransactionStatus.PAID,
             Transaction.deleted.is_(False),
         )
+        starts = [start for start, _ in windows.values()]
+        ends = [end for _, end in windows.values()]
+        # Plain range predicates keep ix_transactions_user_deleted_due_date_id usable.
+        if None not in starts:
+            query = query.filter(Transaction.due_date >= min(cast(list[date], starts)))
+        if None not in ends:
+            query = query.filter(Transaction.due_date <= max(cast(list[date], ends)))
+        groups = query.group_by(
+            Transaction.category, Transaction.tag_id, Transaction.due_date
+        ).all()
 
-        if budget.category is not None:
-            # Filter by structured category field (preferred over tag_id)
-            from app.models.transaction import TransactionCategory
-
-            query = query.filter(
-                Transaction.category == TransactionCategory(budget.category)
-            )
-        elif budget.tag_id is not None:
-            # Legacy: fall back to tag_id filtering for budgets not yet migrated
-            query = query.filter(Transaction.tag_id == budget.tag_id)
-
-        if budget.period == "monthly":
-            query = query.filter(
-                extract("year", Transaction.due_date) == today.year,
-                extract("month", Transaction.due_date) == today.month,
-            )
-        elif budget.period == "weekly":
-            # ISO week: Monday to Sunday
-            monday = today - __import__("datetime").timedelta(days=today.weekday())
-            sunday = monday + __import__("datetime").timedelta(days=6)
-            query = query.filter(
-                Transaction.due_date >= monday,
-                Transaction.due_date <= sunday,
-            )
-        elif budget.period == "custom" and budget.start_date and budget.end_date:
-            query = query.filter(
-                Transaction.due_date >= budget.start_date,
-                Transaction.due_date <= budget.end_date,
+        spent: dict[UUID, Decimal] = {}
+        for budget in budgets:
+            start, end = windows[budget.id]
+            category = (
+                TransactionCategory(budget.category)
+                if budget.category is not None
+                else None
             )
-
-        result = query.scalar()
-        return Decimal(str(result)) if result is not None else Decimal("0")
+            total = Decimal("0")
+            for tx_category, tx_tag_id, due_date, amount in groups:
+                if start is not None and due_date < start:
+                    continue
+                if end is not None and due_date > end:
+                    continue
+                if category is not None:
+                    # Structured category is preferred over tag_id.
+                    if tx_category != category:
+                        continue
+                elif budget.tag_id is not None and tx_tag_id != budget.tag_id:
+                    # Legacy: tag_id filtering for budgets not yet migrated.
+                    continue
+                total += Decimal(str(amount))
+            spent[budget.id] = total
+        return spent
 
     def serialize(self, budget: Budget) -> dict[str, Any]:
         data = cast(dict[str, Any], self._schema.dump(budget))
@@ -164,10 +216,13 @@ class BudgetService:
         data["tag_color"] = tag_color
         return data
 
-    def serialize_with_spent(self, budget: Budget) -> dict[str, Any]:
+    def serialize_with_spent(
+        self, budget: Budget, *, spent: Decimal | None = None
+    ) -> dict[str, Any]:
         data = self.serialize(budget)
         amount = Decimal(str(budget.amount))
-        spent = self.get_spent_for_budget(budget)
+        if spent is None:
+            spent = self.get_spent_for_budget(budget)
         remaining = amount - spent
         percentage_used = float(spent / amount * 100) if amount > 0 else 0.0
         data["spent"] = str(spent)
@@ -176,14 +231,24 @@ class BudgetService:
         data["is_over_budget"] = spent > amount
         return data
 
+    def serialize_many_with_spent(
+        self, budgets: Sequence[Budget]
+    ) -> list[dict[str, Any]]:
+        spent = self.get_spent_for_budgets(budgets)
+        return [
+            self.serialize_with_spent(budget, spent=spent[budget.id])
+            for budget in budgets
+        ]
+
     def get_summary(self) -> dict[str, Any]:
         """Returns total budgeted vs total spent for current period (active budgets)."""
         budgets = self.list_budgets(active_only=True)
+        spent = self.get_spent_for_budgets(budgets)
         total_budgeted = Decimal("0")
         total_spent = Decimal("0")
         for budget in budgets:
             total_budgeted += Decimal(str(budget.amount))
-            total_spent += self.get_spent_for_budget(budget)
+            total_spent += spent[budget.id]
         total_remaining = total_budgeted - total_spent
         return {
             "total_budgeted": str(total_budgeted),
@@ -209,3 +274,37 @@ class BudgetService:
                 code="TAG_NOT_FOUND",
                 status_code=404,
             )
+
+
+def budget_period_window(
+    budget: Budget, today: date
+) -> tuple[date | None, date | None]:
+    """
+    Inclusive due-date window of *budget*'s current period.
+
+    - monthly: the current calendar month.
+    - weekly: the current ISO week (Monday to Sunday).
+    - custom: start_date to end_date; unbounded when either is missing.
+    """
+    if budget.period == "monthly":
+        last_day = monthrange(today.year, today.month)[1]
+        return today.replace(day=1), today.replace(day=last_day)
+    if budget.period == "weekly":
+        monday = today - timedelta(days=today.weekday())
+        return monday, monday + timedelta(days=6)
+    if budget.period == "custom" and budget.start_date and budget.end_date:
+        return budget.start_date, budget.end_date
+    return None, None
+
+
+def _budgets_digest(
+    budgets: Sequence[Budget],
+    windows: dict[UUID, tuple[date | None, date | None]],
+) -> str:
+    """Digest of the inputs that affect spent totals, so budget edits miss."""
+    parts = sorted(
+        f"{budget.id}|{budget.category}|{budget.tag_id}|"
+        f"{windows[budget.id][0]}|{windows[budget.id][1]}"
+        for budget in budgets
+    )
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:16]
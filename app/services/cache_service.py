@@ -9,15 +9,38 @@ TTLs
 ----
 * Dashboard overview  : 300 s  (5 min) — invalidated on any transaction write
 * BRAPI quotes        : 900 s  (15 min) — invalidated by TTL only
-* Portfolio valuation : 600 s  (10 min) — invalidated on investment operation
+* Portfolio positions : 600 s  (10 min) — invalidated on investment operation
+                        and wallet writes; quotes are applied on read
 * Entitlements        : 300 s  (5 min) — invalidated on grant/revoke/sync
+* Budget spent totals : 60 s   (1 min) — invalidated on any transaction write
 
 Key patterns
 ------------
-* ``dashboard:overview:{user_id}:{month}``
+* ``dashboard:overview:{user_id}:v{version}:{month}``
 * ``brapi:quote:{ticker}``
-* ``portfolio:valuation:{user_id}``
-* ``entitlement:{user_id}:{feature_key}``
+* ``portfolio:valuation:{user_id}:v{version}``
+* ``entitlement:{user_id}:v{version}:{feature_key}``
+* ``budget:spent:{user_id}:v{version}:{today}:{budgets_digest}``
+
+Versioned keyspace
+------------------
+Per-user namespaces embed the user's version counter of every source domain
+they depend on (``CACHE_DOMAIN_DEPENDENTS``). A write invalidates a domain
+with a single ``INCR`` on ``cachever:{domain}:{user_id}`` — O(1) regardless of
+keyspace size — and every dependent key becomes unreachable at once; the
+orphaned entries simply expire with their TTL.
+
+L1 in-process tier
+------------------
+Optional (``CACHE_L1_ENABLED=true``). Decoded values of the namespaces listed
+in ``CACHE_L1_TTL_OVERRIDES`` (``namespace=seconds`` pairs, default
+``dashboard=5,entitlement=15,cachever=5``) are also kept in a per-worker LRU
+bounded by ``CACHE_L1_MAX_ENTRIES`` and ``CACHE_L1_MAX_BYTES``, so hot keys
+skip the Redis round trip and the JSON decode. Every write and invalidation
+of an L1 namespace is published on ``cache:l1:invalidate`` and the other
+gunicorn workers drop their copy; a worker that is not subscribed bypasses
+its L1 tier. Values served from L1 are shared objects — treat them as
+read-only.
 
 Usage
 -----
@@ -29,8 +52,9 @@ Usage
         value = _expensive_query()
         cache.set("dashboard:overview:uuid:2026-04", value, ttl=300)
 
-    # Invalidate all dashboard keys for a user after a transaction write:
-    cache.invalidate_pattern("dashboard:overview:{user_id}:*")
+    # Versioned per-user keys — invalidated by bumping the source domain:
+    key = cache.versioned_key("dashboard:trends", user_id, "6")
+    cache.invalidate_domain("transactions", user_id)
 """
 
 from __future__ import annotations
@@ -39,7 +63,13 @@ import importlib
 import json
 import logging
 import os
-from typing import Any
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from fnmatch import fnmatchcase
+from typing import Any, NamedTuple
+from uuid import UUID, uuid4
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +79,280 @@ DASHBOARD_CACHE_TTL = 300  # 5 minutes
 BRAPI_CACHE_TTL = 900  # 15 minutes
 PORTFOLIO_CACHE_TTL = 600  # 10 minutes
 ENTITLEMENT_CACHE_TTL = 300  # 5 minutes — invalidated on grant/revoke/sync
+BUDGET_SPENT_CACHE_TTL = 60  # 1 minute — invalidated on any transaction write
+# Dashboard keys are versioned, so a stale entry only lags time-dependent
+# fields (e.g. "today"), never a write.
+DASHBOARD_STALE_TTL = 120  # 2 minutes served stale while refreshing
+# Version counters must outlive every data TTL so a counter that expires and
+# restarts at 0 can never resurrect a still-live entry.
+CACHE_VERSION_TTL = 30 * 86_400  # 30 days, refreshed on every bump
+
+# ── Versioned keyspace: source domain → dependent namespaces ─────────────────
+
+CACHE_DOMAIN_DEPENDENTS: dict[str, tuple[str, ...]] = {
+    "transactions": (
+        "dashboard:overview",
+        "dashboard:trends",
+        "dashboard:survival-index",
+        "dashboard:weekly-summary",
+        "budget:spent",
+    ),
+    "wallets": ("dashboard:survival-index", "portfolio:valuation"),
+    "investment_operations": ("portfolio:valuation",),
+    "entitlements": ("entitlement",),
+}
+
+
+def _build_namespace_domains() -> dict[str, tuple[str, ...]]:
+    mapping: dict[str, list[str]] = {}
+    for domain, namespaces in CACHE_DOMAIN_DEPENDENTS.items():
+        for namespace in namespaces:
+            mapping.setdefault(namespace, []).append(domain)
+    return {namespace: tuple(sorted(d)) for namespace, d in mapping.items()}
+
+
+_NAMESPACE_DOMAINS = _build_namespace_domains()
+
+
+def _version_key(domain: str, user_id: str | UUID) -> str:
+    return f"cachever:{domain}:{user_id}"
+
+
+def namespace_domains(namespace: str) -> tuple[str, ...]:
+    """Return the source domains whose version is embedded in *namespace* keys."""
+    try:
+        return _NAMESPACE_DOMAINS[namespace]
+    except KeyError:
+        raise ValueError(f"Unknown versioned cache namespace: {namespace}") from None
+
+
+def _compose_key(
+    namespace: str, user_id: str | UUID, token: str, parts: tuple[str, ...]
+) -> str:
+    return ":".join((namespace, str(user_id), token, *parts))
+
+
+# ── L1 in-process tier ────────────────────────────────────────────────────────
+
+L1_INVALIDATION_CHANNEL = "cache:l1:invalidate"
+_L1_DEFAULT_TTL_OVERRIDES = "dashboard=5,entitlement=15,cachever=5"
+_L1_DEFAULT_MAX_ENTRIES = 4096
+_L1_DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+_L1_RESUBSCRIBE_DELAY_SECONDS = 1.0
+_MISSING = object()
+
+
+class _LocalCacheTier:
+    """Bounded in-process LRU/TTL store of decoded values (L1).
+
+    Only keys whose namespace has an entry in *ttl_overrides* are admitted;
+    ``ns:sub`` overrides win over ``ns``. Entry size is the length of the JSON
+    payload, so the byte cap follows the Redis footprint.
+    """
+
+    def __init__(
+        self, *, max_entries: int, max_bytes: int, ttl_overrides: dict[str, int]
+    ) -> None:
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl_overrides = ttl_overrides
+        self._entries: OrderedDict[str, tuple[float, int, Any]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; a fetch that started under an older
+        # generation must not repopulate the tier.
+        self.generation = 0
+        # True only while subscribed to the invalidation channel.
+        self.active = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def ttl_for(self, key: str) -> int | None:
+        segments = key.split(":", 2)
+        if len(segments) > 1:
+            ttl = self._ttl_overrides.get(f"{segments[0]}:{segments[1]}")
+            if ttl is not None:
+                return ttl
+        return self._ttl_overrides.get(segments[0])
+
+    def get(self, key: str) -> Any:
+        """Return the cached value, or ``_MISSING`` when absent or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            if entry[0] <= now:
+                self._pop(key)
+                return _MISSING
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def put(
+        self, key: str, value: Any, *, size: int, ttl: int | None, generation: int
+    ) -> None:
+        l1_ttl = self.ttl_for(key)
+        if l1_ttl is None or size > self._max_bytes:
+            return
+        expires_at = time.monotonic() + (l1_ttl if ttl is None else min(ttl, l1_ttl))
+        with self._lock:
+            if not self.active or generation != self.generation:
+                return
+            self._pop(key)
+            self._entries[key] = (expires_at, size, value)
+            self._bytes += size
+            while (
+                len(self._entries) > self._max_entries or self._bytes > self._max_bytes
+            ):
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self.generation += 1
+            self._pop(key)
+
+    def discard_matching(self, pattern: str) -> None:
+        with self._lock:
+            self.generation += 1
+            for key in [k for k in self._entries if fnmatchcase(k, pattern)]:
+                self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def reset_after_fork(self) -> None:
+        """Start over in a forked child (the parent's lock may be held)."""
+        self._lock = threading.Lock()
+        self.active = False
+        self._entries = OrderedDict()
+        self._bytes = 0
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[1]
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = str(os.getenv(name, "")).strip()
+    try:
+        return int(raw) if raw else default
+    except ValueError:
+        logger.warning("cache_service: invalid %s=%r — using %d", name, raw, default)
+        return default
+
+
+def _parse_ttl_overrides(raw: str) -> dict[str, int]:
+    overrides: dict[str, int] = {}
+    for item in raw.split(","):
+        namespace, sep, seconds = item.strip().partition("=")
+        if not sep or not seconds.strip().isdigit() or int(seconds) <= 0:
+            continue
+        overrides[namespace.strip()] = int(seconds)
+    return overrides
+
+
+def _build_local_tier() -> _LocalCacheTier | None:
+    enabled = str(os.getenv("CACHE_L1_ENABLED", "false")).strip().lower()
+    if enabled not in {"1", "true", "yes", "on"}:
+        return None
+    return _LocalCacheTier(
+        max_entries=_env_int("CACHE_L1_MAX_ENTRIES", _L1_DEFAULT_MAX_ENTRIES),
+        max_bytes=_env_int("CACHE_L1_MAX_BYTES", _L1_DEFAULT_MAX_BYTES),
+        ttl_overrides=_parse_ttl_overrides(
+            str(os.getenv("CACHE_L1_TTL_OVERRIDES", _L1_DEFAULT_TTL_OVERRIDES))
+        ),
+    )
+
+
+# ── Single-flight / stale-while-revalidate ───────────────────────────────────
+
+SINGLE_FLIGHT_LOCK_TTL_MS = 10_000
+SINGLE_FLIGHT_WAIT_SECONDS = 2.0
+_SINGLE_FLIGHT_POLL_SECONDS = 0.05
+_SWR_VALUE = "__swr_value"
+_SWR_FRESH_UNTIL = "__swr_fresh_until"
+# Delete the lock only if we still own it (it may have expired and been
+# re-acquired by another worker).
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+class CacheLookup(NamedTuple):
+    """Result of :meth:`get_or_compute`.
+
+    ``status`` is ``"hit"``, ``"stale"`` (served while refreshing),
+    ``"coalesced"`` (another caller computed it) or ``"miss"``.
+    """
+
+    value: Any
+    status: str
+
+
+class _FlightCall:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class _SingleFlight:
+    """In-process coalescing: concurrent callers of one key share one call."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[str, _FlightCall] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> tuple[Any, bool]:
+        """Run *fn* once per in-flight *key*; return ``(value, shared)``."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _FlightCall()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+        try:
+            call.value = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.value, False
+
+
+def _swr_envelope(value: Any, ttl: int) -> dict[str, Any]:
+    return {_SWR_VALUE: value, _SWR_FRESH_UNTIL: time.time() + ttl}
+
+
+def _swr_unwrap(raw: Any) -> tuple[Any, bool] | None:
+    """Return ``(value, is_fresh)`` or ``None`` for a missing/legacy entry."""
+    if not isinstance(raw, dict) or _SWR_VALUE not in raw:
+        return None
+    return raw[_SWR_VALUE], float(raw.get(_SWR_FRESH_UNTIL) or 0) > time.time()
+
+
+def _lock_key(key: str) -> str:
+    return f"lock:{key}"
 
 
 # ── No-op fallback ────────────────────────────────────────────────────────────
@@ -75,6 +379,25 @@ class _NoOpCacheService:
     def invalidate_pattern(self, pattern: str) -> None:
         del pattern
 
+    def versioned_key(self, namespace: str, user_id: str | UUID, *parts: str) -> str:
+        namespace_domains(namespace)
+        return _compose_key(namespace, user_id, "v0", parts)
+
+    def invalidate_domain(self, domain: str, user_id: str | UUID) -> None:
+        del domain, user_id
+
+    def get_or_compute(
+        self, key: str, fn: Callable[[], Any], *, ttl: int, stale_ttl: int = 0
+    ) -> CacheLookup:
+        """Nothing is stored, but concurrent callers in this worker coalesce."""
+        from app.extensions.prometheus_metrics import record_cache_recompute
+
+        del ttl, stale_ttl
+        value, shared = _noop_flight.do(key, fn)
+        outcome = "coalesced" if shared else "computed"
+        record_cache_recompute(key.split(":")[0], outcome=outcome)
+        return CacheLookup(value, "coalesced" if shared else "miss")
+
     @property
     def available(self) -> bool:
         return False
@@ -84,10 +407,93 @@ class _NoOpCacheService:
 
 
 class RedisCacheService:
-    """Redis-backed cache service with JSON serialization."""
+    """Redis-backed cache service with JSON serialization.
+
+    When *local* is given, admitted namespaces are served from the in-process
+    L1 tier first (see module docstring).
+    """
 
-    def __init__(self, client: Any) -> None:
+    def __init__(self, client: Any, *, local: _LocalCacheTier | None = None) -> None:
         self._client = client
+        self._local = local
+        self._origin = uuid4().hex
+        self._listener_pid: int | None = None
+        self._flight = _SingleFlight()
+
+    # ── L1 plumbing ──────────────────────────────────────────────────────────
+
+    def _l1_for(self, key: str) -> _LocalCacheTier | None:
+        """Return the L1 tier when it is live and admits *key*."""
+        local = self._local
+        if local is None:
+            return None
+        if self._listener_pid is not None and self._listener_pid != os.getpid():
+            # Forked after the listener started: the thread did not survive.
+            self.start_invalidation_listener()
+        if not local.active or local.ttl_for(key) is None:
+            return None
+        return local
+
+    def _broadcast(self, op: str, target: str) -> None:
+        if self._local is None:
+            return
+        message = json.dumps({"origin": self._origin, "op": op, "target": target})
+        try:
+            self._client.publish(L1_INVALIDATION_CHANNEL, message)
+        except Exception:
+            logger.warning("cache_service: L1 invalidation publish failed")
+
+    def _apply_invalidation(self, data: Any) -> None:
+        if self._local is None:
+            return
+        try:
+            message = json.loads(data)
+            origin, op, target = message["origin"], message["op"], message["target"]
+        except (TypeError, ValueError, KeyError):
+            logger.warning("cache_service: malformed L1 invalidation message")
+            return
+        if origin == self._origin:
+            return
+        if op == "pattern":
+            self._local.discard_matching(str(target))
+        else:
+            self._local.discard(str(target))
+
+    def _listen_for_invalidations(self, local: _LocalCacheTier) -> None:
+        while True:
+            try:
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(L1_INVALIDATION_CHANNEL)
+                local.clear()
+                local.active = True
+                for message in pubsub.listen():
+                    self._apply_invalidation(message.get("data"))
+            except Exception:
+                logger.warning(
+                    "cache_service: L1 invalidation listener failed", exc_info=True
+                )
+            # Invalidations may have been missed: drop and bypass L1 until the
+            # subscription is back.
+            local.active = False
+            local.clear()
+            time.sleep(_L1_RESUBSCRIBE_DELAY_SECONDS)
+
+    def start_invalidation_listener(self) -> None:
+        """Subscribe this process to L1 invalidations (idempotent per process)."""
+        local = self._local
+        if local is None or self._listener_pid == os.getpid():
+            return
+        if self._listener_pid is not None:
+            local.reset_after_fork()
+        self._listener_pid = os.getpid()
+        threading.Thread(
+            target=self._listen_for_invalidations,
+            args=(local,),
+            name="cache-l1-invalidation",
+            daemon=True,
+        ).start()
+
+    # ── Public API ───────────────────────────────────────────────────────────
 
     def get(self, key: str) -> Any | None:
         from app.extensions.prometheus_metrics import (
@@ -96,6 +502,15 @@ class RedisCacheService:
         )
 
         ns = key.split(":")[0]
+        local = self._l1_for(key)
+        generation = 0
+        if local is not None:
+            value = local.get(key)
+            if value is not _MISSING:
+                record_cache_hit(ns, tier="l1")
+                return value
+            record_cache_miss(ns, tier="l1")
+            generation = local.generation
         try:
             raw = self._client.get(key)
             if raw is None:
@@ -106,24 +521,45 @@ class RedisCacheService:
             )
             result = json.loads(decoded)
             record_cache_hit(ns)
-            return result
         except Exception:
             # key is user-controlled — do not include in log output (S5145).
             logger.warning("cache_service: GET failed — cache miss", exc_info=True)
             record_cache_miss(ns)
             return None
+        if local is not None:
+            local.put(key, result, size=len(raw), ttl=None, generation=generation)
+        return result
 
     def set(self, key: str, value: Any, *, ttl: int) -> None:
         try:
-            self._client.setex(key, ttl, json.dumps(value, default=str))
+            payload = json.dumps(value, default=str)
+            self._client.setex(key, ttl, payload)
         except Exception:
             # key is user-controlled — do not include in log output (S5145).
             logger.warning("cache_service: SET failed", exc_info=True)
+            return
+        if self._local is None or self._local.ttl_for(key) is None:
+            return
+        self._local.discard(key)
+        self._broadcast("key", key)
+        local = self._l1_for(key)
+        if local is not None:
+            # Store the round-tripped value so L1 serves exactly what Redis would.
+            local.put(
+                key,
+                json.loads(payload),
+                size=len(payload),
+                ttl=ttl,
+                generation=local.generation,
+            )
 
     def invalidate(self, key: str) -> None:
         from app.extensions.prometheus_metrics import record_cache_invalidation
 
         ns = key.split(":")[0]
+        if self._local is not None:
+            self._local.discard(key)
+            self._broadcast("key", key)
         try:
             self._client.delete(key)
             record_cache_invalidation(ns)
@@ -136,6 +572,9 @@ class RedisCacheService:
         from app.extensions.prometheus_metrics import record_cache_invalidation
 
         ns = pattern.split(":")[0]
+        if self._local is not None:
+            self._local.discard_matching(pattern)
+            self._broadcast("pattern", pattern)
         try:
             cursor = 0
             while True:
@@ -150,11 +589,195 @@ class RedisCacheService:
             # pattern is user-controlled — do not include in log output (S5145).
             logger.warning("cache_service: invalidate_pattern failed", exc_info=True)
 
+    def _domain_versions(self, version_keys: list[str]) -> list[int] | None:
+        local = self._l1_for(version_keys[0])
+        generation = 0
+        if local is not None:
+            cached = [local.get(key) for key in version_keys]
+            if all(value is not _MISSING for value in cached):
+                return [int(value) for value in cached]
+            generation = local.generation
+        try:
+            raw_versions = self._client.mget(version_keys)
+            versions = [int(raw or 0) for raw in raw_versions]
+        except Exception:
+            logger.warning("cache_service: version lookup failed", exc_info=True)
+            return None
+        if local is not None:
+            for key, version in zip(version_keys, versions, strict=True):
+                local.put(key, version, size=len(key), ttl=None, generation=generation)
+        return versions
+
+    def versioned_key(self, namespace: str, user_id: str | UUID, *parts: str) -> str:
+        """Build a key that embeds the user's current version of each domain.
+
+        One ``MGET`` (or an L1 lookup) fetches every version the namespace
+        depends on. When the versions cannot be read the key gets a random
+        token: the read misses and the write lands on an entry nobody will
+        ever read, so a Redis hiccup can never serve data from before an
+        invalidation.
+        """
+        domains = namespace_domains(namespace)
+        versions = self._domain_versions(
+            [_version_key(domain, user_id) for domain in domains]
+        )
+        if versions is None:
+            return _compose_key(namespace, user_id, f"x{uuid4().hex}", parts)
+        token = "v" + ".".join(str(version) for version in versions)
+        return _compose_key(namespace, user_id, token, parts)
+
+    def invalidate_domain(self, domain: str, user_id: str | UUID) -> None:
+        """Invalidate every namespace depending on *domain* for *user_id*.
+
+        A single ``INCR`` (plus a TTL refresh in the same pipeline) replaces a
+        keyspace ``SCAN``; dependent keys built afterwards embed the new
+        version.
+        """
+        from app.extensions.prometheus_metrics import record_cache_invalidation
+
+        if domain not in CACHE_DOMAIN_DEPENDENTS:
+            raise ValueError(f"Unknown cache domain: {domain}")
+        key = _version_key(domain, user_id)
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            pipe.incr(key)
+            pipe.expire(key, CACHE_VERSION_TTL)
+            pipe.execute()
+            record_cache_invalidation(domain)
+        except Exception:
+            logger.warning("cache_service: invalidate_domain failed", exc_info=True)
+        if self._local is not None:
+            self._local.discard(key)
+            self._broadcast("key", key)
+
+    # ── Single-flight / stale-while-revalidate ──────────────────────────────
+
+    def _acquire_lock(self, key: str) -> str | None:
+        """Return the lock token, ``""`` when Redis failed, ``None`` if held."""
+        token = uuid4().hex
+        try:
+            acquired = self._client.set(
+                _lock_key(key), token, nx=True, px=SINGLE_FLIGHT_LOCK_TTL_MS
+            )
+        except Exception:
+            # Fall back to the in-process single-flight alone.
+            logger.warning("cache_service: lock acquisition failed", exc_info=True)
+            return ""
+        return token if acquired else None
+
+    def _release_lock(self, key: str, token: str) -> None:
+        if not token:
+            return
+        try:
+            self._client.eval(_RELEASE_LOCK_SCRIPT, 1, _lock_key(key), token)
+        except Exception:
+            logger.warning("cache_service: lock release failed", exc_info=True)
+
+    def _wait_for_value(self, key: str) -> Any:
+        """Poll for the lock holder's result; ``_MISSING`` on timeout."""
+        deadline = time.monotonic() + SINGLE_FLIGHT_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(_SINGLE_FLIGHT_POLL_SECONDS)
+            try:
+                raw = self._client.get(key)
+                entry = _swr_unwrap(json.loads(raw)) if raw is not None else None
+            except Exception:
+                return _MISSING
+            if entry is not None:
+                return entry[0]
+        return _MISSING
+
+    def _store(self, key: str, value: Any, *, ttl: int, stale_ttl: int) -> None:
+        self.set(key, _swr_envelope(value, ttl), ttl=ttl + stale_ttl)
+
+    def _compute_once(
+        self, key: str, fn: Callable[[], Any], *, ttl: int, stale_ttl: int
+    ) -> tuple[Any, bool]:
+        """Compute across workers; return ``(value, computed_here)``."""
+        token = self._acquire_lock(key)
+        if token is None:
+            value = self._wait_for_value(key)
+            if value is not _MISSING:
+                return value, False
+            # The holder is slow or died: answer the request ourselves.
+        try:
+            value = fn()
+            self._store(key, value, ttl=ttl, stale_ttl=stale_ttl)
+        finally:
+            if token:
+                self._release_lock(key, token)
+        return value, True
+
+    def _refresh_in_background(
+        self, key: str, fn: Callable[[], Any], *, ttl: int, stale_ttl: int
+    ) -> None:
+        from flask import current_app, has_app_context
+
+        token = self._acquire_lock(key)
+        if not token:
+            return  # another worker is refreshing (or Redis is struggling)
+        app = (
+            current_app._get_current_object()  # type: ignore[attr-defined]
+            if has_app_context()
+            else None
+        )
+
+        def _run() -> None:
+            try:
+                if app is None:
+                    value = fn()
+                else:
+                    with app.app_context():
+                        value = fn()
+                self._store(key, value, ttl=ttl, stale_ttl=stale_ttl)
+            except Exception:
+                logger.warning(
+                    "cache_service: background refresh failed", exc_info=True
+                )
+            finally:
+                self._release_lock(key, token)
+
+        threading.Thread(target=_run, name="cache-swr-refresh", daemon=True).start()
+
+    def get_or_compute(
+        self, key: str, fn: Callable[[], Any], *, ttl: int, stale_ttl: int = 0
+    ) -> CacheLookup:
+        """Return the cached value of *key*, computing it with *fn* at most once.
+
+        Fresh for *ttl* seconds, then served stale for up to *stale_ttl* more
+        while a single background refresh runs. Exceptions raised by *fn*
+        propagate to every caller waiting on it and nothing is cached.
+        """
+        from app.extensions.prometheus_metrics import record_cache_recompute
+
+        ns = key.split(":")[0]
+        entry = _swr_unwrap(self.get(key))
+        if entry is not None:
+            value, fresh = entry
+            if fresh:
+                return CacheLookup(value, "hit")
+            self._refresh_in_background(key, fn, ttl=ttl, stale_ttl=stale_ttl)
+            record_cache_recompute(ns, outcome="stale")
+            return CacheLookup(value, "stale")
+
+        (value, computed), shared = self._flight.do(
+            key,
+            lambda: self._compute_once(key, fn, ttl=ttl, stale_ttl=stale_ttl),
+        )
+        if computed and not shared:
+            record_cache_recompute(ns, outcome="computed")
+            return CacheLookup(value, "miss")
+        record_cache_recompute(ns, outcome="coalesced")
+        return CacheLookup(value, "coalesced")
+
     @property
     def available(self) -> bool:
         return True
 
 
+_noop_flight = _SingleFlight()
+
+
 # ── Singleton factory ─────────────────────────────────────────────────────────
 
 _cache_instance: RedisCacheService | _NoOpCacheService | None = None
@@ -176,13 +799,19 @@ def _build_cache() -> RedisCacheService | _NoOpCacheService:
         client = redis_cls.from_url(redis_url, decode_responses=False)
         client.ping()
         logger.info("cache_service: Redis connected (%s)", redis_url.split("@")[-1])
-        return RedisCacheService(client)
     except Exception:
         logger.warning(
             "cache_service: Redis connection failed — using no-op cache", exc_info=True
         )
         return _NoOpCacheService()
 
+    local = _build_local_tier()
+    service = RedisCacheService(client, local=local)
+    if local is not None:
+        service.start_invalidation_listener()
+        logger.info("cache_service: L1 in-process tier enabled")
+    return service
+
 
 def get_cache_service() -> RedisCacheService | _NoOpCacheService:
     """Return the module-level cache singleton (built lazily on first call)."""
@@ -7,21 +7,31 @@ from __future__ import annotations
 
 import csv
 import io
+import logging
+import os
+import tempfile
 import uuid
+from collections.abc import Callable, Iterable, Iterator
 from dataclasses import dataclass, field
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
-from typing import Any
+from itertools import chain, islice
+from pathlib import Path
+from typing import Any, Literal, TypeVar
 
-from app.extensions.database import db
+from app.extensions.database import db, dialect_insert
 from app.models.fiscal import (
     FiscalDocument,
+    FiscalDocumentStatus,
     FiscalDocumentType,
     FiscalImport,
     FiscalImportStatus,
     ReceivableEntry,
     ReconciliationStatus,
 )
+from app.services.export_storage import get_export_storage
+from app.services.outbound_queue import get_default_outbound_queue
+from app.utils.datetime_utils import utc_now_naive
 
 _DATE_FORMATS = [
     "%Y-%m-%d",
@@ -32,6 +42,23 @@ _DATE_FORMATS = [
 
 _AMOUNT_TRANSLATION = str.maketrans({"R": "", "$": "", " ": "", "\xa0": ""})
 
+# Bulk mode: rows sampled to pick each column's format, and keys per
+# duplicate-lookup query / insert statement.
+_FORMAT_SAMPLE_ROWS = 50
+_BULK_CHUNK_SIZE = 2000
+# Async imports stage their content in export storage; the queued job only
+# carries this key.
+_STAGED_PAYLOAD_PREFIX = "fiscal-imports"
+# Confirm payloads at least this large are imported in the background.
+ASYNC_IMPORT_THRESHOLD_BYTES = int(
+    os.getenv("FISCAL_CSV_ASYNC_THRESHOLD_BYTES", str(1024 * 1024))
+)
+
+AmountStyle = Literal["br", "intl"]
+_T = TypeVar("_T")
+
+log = logging.getLogger(__name__)
+
 
 @dataclass
 class ParsedRow:
@@ -67,8 +94,6 @@ def _parse_amount(raw: str) -> Decimal:
 
 def _parse_date(raw: str) -> date:
     """Parse date strings in common Brazilian and ISO formats."""
-    from datetime import datetime
-
     raw = raw.strip()
     for fmt in _DATE_FORMATS:
         try:
@@ -78,30 +103,23 @@ def _parse_date(raw: str) -> date:
     raise ValueError(f"Cannot parse date: {raw!r}")
 
 
-def parse_csv_generic(content: str, column_map: dict[str, str]) -> ParseResult:
-    """Parse a CSV string using a flexible column mapping.
-
-    Args:
-        content: Raw CSV text content.
-        column_map: Maps CSV header names to ParsedRow field names.
-            Required mappings: ``description``, ``amount``, ``date``.
-            Optional mappings: ``category``, ``external_id``.
-
-    Returns:
-        ParseResult with successfully parsed rows and any per-row errors.
-    """
+def _parse_records(
+    records: Iterable[dict[str, str]],
+    column_map: dict[str, str],
+    *,
+    parse_amount: Callable[[str], Decimal],
+    parse_date: Callable[[str], date],
+) -> ParseResult:
     result = ParseResult()
-    reader = csv.DictReader(io.StringIO(content))
-
     reverse_map = {v: k for k, v in column_map.items()}
 
     def _get(row: dict[str, str], target_field: str) -> str | None:
         csv_col = reverse_map.get(target_field)
         if csv_col is None:
             return None
-        return row.get(csv_col, "").strip() or None
+        return (row.get(csv_col) or "").strip() or None
 
-    for line_number, row in enumerate(reader, start=2):
+    for line_number, row in enumerate(records, start=2):
         try:
             description_raw = _get(row, "description")
             amount_raw = _get(row, "amount")
@@ -116,8 +134,8 @@ def parse_csv_generic(content: str, column_map: dict[str, str]) -> ParseResult:
 
             parsed = ParsedRow(
                 description=description_raw,
-                amount=_parse_amount(amount_raw),
-                date=_parse_date(date_raw),
+                amount=parse_amount(amount_raw),
+                date=parse_date(date_raw),
                 category=_get(row, "category"),
                 external_id=_get(row, "external_id"),
             )
@@ -130,6 +148,118 @@ def parse_csv_generic(content: str, column_map: dict[str, str]) -> ParseResult:
     return result
 
 
+def parse_csv_generic(content: str, column_map: dict[str, str]) -> ParseResult:
+    """Parse a CSV string using a flexible column mapping.
+
+    Args:
+        content: Raw CSV text content.
+        column_map: Maps CSV header names to ParsedRow field names.
+            Required mappings: ``description``, ``amount``, ``date``.
+            Optional mappings: ``category``, ``external_id``.
+
+    Returns:
+        ParseResult with successfully parsed rows and any per-row errors.
+    """
+    return _parse_records(
+        csv.DictReader(io.StringIO(content)),
+        column_map,
+        parse_amount=_parse_amount,
+        parse_date=_parse_date,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Bulk mode — per-column format detection
+# ---------------------------------------------------------------------------
+
+
+def _matches_date_format(raw: str, fmt: str) -> bool:
+    try:
+        datetime.strptime(raw, fmt)
+    except ValueError:
+        return False
+    return True
+
+
+def detect_date_format(samples: Iterable[str]) -> str | None:
+    """Return the first of ``_DATE_FORMATS`` that parses every sample value.
+
+    Returns ``None`` when the column is empty or no single format fits it.
+    """
+    values = [raw.strip() for raw in samples if raw and raw.strip()]
+    if not values:
+        return None
+    for fmt in _DATE_FORMATS:
+        if all(_matches_date_format(raw, fmt) for raw in values):
+            return fmt
+    return None
+
+
+def detect_amount_style(samples: Iterable[str]) -> AmountStyle:
+    """Return ``"br"`` when the column uses a comma as decimal separator.
+
+    A value such as ``1.234,56`` or ``800,50`` marks the column as Brazilian;
+    anything else (``1,234.56``, ``1500.00``) is treated as international.
+    """
+    for raw in samples:
+        value = raw.strip().translate(_AMOUNT_TRANSLATION)
+        if "," in value and value.rfind(",") > value.rfind("."):
+            return "br"
+    return "intl"
+
+
+def _amount_parser(style: AmountStyle) -> Callable[[str], Decimal]:
+    strip = "." if style == "br" else ","
+
+    def _parse(raw: str) -> Decimal:
+        value = raw.strip().translate(_AMOUNT_TRANSLATION).replace(strip, "")
+        if style == "br":
+            value = value.replace(",", ".")
+        try:
+            return Decimal(value)
+        except InvalidOperation:
+            return _parse_amount(raw)
+
+    return _parse
+
+
+def _date_parser(fmt: str | None) -> Callable[[str], date]:
+    if fmt is None:
+        return _parse_date
+
+    def _parse(raw: str) -> date:
+        try:
+            return datetime.strptime(raw.strip(), fmt).date()
+        except ValueError:
+            return _parse_date(raw)
+
+    return _parse
+
+
+def parse_csv_bulk(content: str, column_map: dict[str, str]) -> ParseResult:
+    """Parse large CSV exports with one date/amount format per column.
+
+    The formats are detected once from the first ``_FORMAT_SAMPLE_ROWS`` rows
+    instead of being probed on every cell. Cells that do not match the
+    detected format fall back to the per-cell parsers, so the result matches
+    :func:`parse_csv_generic` apart from ambiguous values such as ``1.500``,
+    which follow the convention of the rest of their column.
+    """
+    reader = csv.DictReader(io.StringIO(content))
+    sample = list(islice(reader, _FORMAT_SAMPLE_ROWS))
+    reverse_map = {v: k for k, v in column_map.items()}
+    amount_column = reverse_map.get("amount")
+    date_column = reverse_map.get("date")
+    amount_samples = [row.get(amount_column) or "" for row in sample]
+    date_samples = [row.get(date_column) or "" for row in sample]
+    return _parse_records(
+        chain(sample, reader),
+        column_map,
+        parse_amount=_amount_parser(detect_amount_style(amount_samples)),
+        parse_date=_date_parser(detect_date_format(date_samples)),
+    )
+
+
 def ingest_as_receivables(
     user_id: str,
     rows: list[ParsedRow],
@@ -185,6 +315,120 @@ def ingest_as_receivables(
     return created
 
 
+def _batched(items: Iterable[_T], size: int) -> Iterator[list[_T]]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _existing_external_ids(user_id: uuid.UUID, external_ids: list[str]) -> set[str]:
+    return set(
+        db.session.execute(
+            db.select(FiscalDocument.external_id).where(
+                FiscalDocument.user_id == user_id,
+                FiscalDocument.external_id.in_(external_ids),
+            )
+        ).scalars()
+    )
+
+
+def _insert_receivables(
+    user_id: uuid.UUID,
+    import_id: uuid.UUID | None,
+    rows: list[tuple[str, ParsedRow]],
+) -> int:
+    """Bulk insert one chunk of documents and their receivable entries.
+
+    Documents whose ``(user_id, external_id)`` appeared concurrently are
+    skipped by the unique constraint. Returns the number of documents inserted.
+    """
+    now = utc_now_naive()
+    documents = [
+        {
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "import_id": import_id,
+            "external_id": ext_id,
+            "type": FiscalDocumentType.SERVICE_INVOICE,
+            "status": FiscalDocumentStatus.ISSUED,
+            "issued_at": row.date,
+            "counterparty": row.description,
+            "gross_amount": row.amount,
+            "currency": "BRL",
+            "description": row.category,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for ext_id, row in rows
+    ]
+    table = FiscalDocument.__table__
+    connection = db.session.connection()
+    stmt = (
+        dialect_insert(connection.dialect.name)(table)
+        .values(documents)
+        .on_conflict_do_nothing(index_elements=["user_id", "external_id"])
+        .returning(table.c.id)
+    )
+    inserted = set(connection.execute(stmt).scalars())
+    entries = [
+        {
+            "id": uuid.uuid4(),
+            "fiscal_document_id": document["id"],
+            "user_id": user_id,
+            "expected_net_amount": document["gross_amount"],
+            "reconciliation_status": ReconciliationStatus.PENDING,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for document in documents
+        if document["id"] in inserted
+    ]
+    if entries:
+        connection.execute(ReceivableEntry.__table__.insert(), entries)
+    return len(inserted)
+
+
+def ingest_receivables_bulk(
+    user_id: str,
+    rows: Iterable[ParsedRow],
+    import_id: str | None = None,
+    *,
+    batch: FiscalImport | None = None,
+    chunk_size: int = _BULK_CHUNK_SIZE,
+) -> int:
+    """Persist ParsedRows in chunks with set-based duplicate detection.
+
+    Each chunk costs one ``external_id IN (...)`` lookup plus one insert per
+    table and is committed on its own; ``batch.processed_rows`` is advanced
+    after every chunk so clients can poll the import's progress. Returns the
+    number of documents created.
+    """
+    user_uuid = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
+    import_uuid: uuid.UUID | None = None
+    if import_id is not None:
+        import_uuid = uuid.UUID(import_id) if isinstance(import_id, str) else import_id
+
+    seen: set[str] = set()
+    created = 0
+    processed = 0
+    for chunk in _batched(rows, chunk_size):
+        keyed = [(row.external_id or str(uuid.uuid4()), row) for row in chunk]
+        existing = _existing_external_ids(user_uuid, [key for key, _ in keyed])
+        pending: list[tuple[str, ParsedRow]] = []
+        for ext_id, row in keyed:
+            if ext_id in existing or ext_id in seen:
+                continue
+            seen.add(ext_id)
+            pending.append((ext_id, row))
+        if pending:
+            created += _insert_receivables(user_uuid, import_uuid, pending)
+        processed += len(chunk)
+        if batch is not None:
+            batch.processed_rows = processed
+        db.session.commit()
+    return created
+
+
 def create_import_batch(user_id: str, filename: str | None = None) -> FiscalImport:
     """Create a FiscalImport batch record in PROCESSING state."""
     batch = FiscalImport(
@@ -205,8 +449,6 @@ def finalize_import_batch(
     confirmed: bool = False,
 ) -> FiscalImport:
     """Update batch statistics and mark as PREVIEW_READY or CONFIRMED."""
-    from app.utils.datetime_utils import utc_now_naive
-
     batch.total_rows = total_rows
     batch.valid_rows = valid_rows
     batch.error_rows = error_rows
@@ -217,3 +459,108 @@ def finalize_import_batch(
         batch.status = FiscalImportStatus.PREVIEW_READY
     db.session.commit()
     return batch
+
+
+def get_import_batch(user_id: str, import_id: str) -> FiscalImport | None:
+    """Return the caller's import batch, or ``None`` when it does not exist."""
+    try:
+        import_uuid = uuid.UUID(str(import_id))
+    except ValueError:
+        return None
+    batch = db.session.get(FiscalImport, import_uuid)
+    if batch is None or str(batch.user_id) != str(user_id):
+        return None
+    return batch
+
+
+def run_csv_import(
+    batch_id: str, content: str, column_map: dict[str, str]
+) -> dict[str, Any]:
+    """Parse and ingest *content* into an existing PROCESSING batch.
+
+    Row counts are stored before ingestion starts so ``processed_rows`` can be
+    read against ``valid_rows`` while the import runs. On failure the batch is
+    marked FAILED; chunks committed before the error are kept.
+    """
+    batch = db.session.get(FiscalImport, uuid.UUID(str(batch_id)))
+    if batch is None:
+        raise ValueError(f"Fiscal import {batch_id} not found")
+    try:
+        result = parse_csv_bulk(content, column_map)
+        batch.total_rows = len(result.rows) + len(result.errors)
+        batch.valid_rows = len(result.rows)
+        batch.error_rows = len(result.errors)
+        batch.processed_rows = 0
+        db.session.commit()
+        created = ingest_receivables_bulk(
+            str(batch.user_id), result.rows, import_id=str(batch.id), batch=batch
+        )
+        finalize_import_batch(
+            batch,
+            total_rows=len(result.rows) + len(result.errors),
+            valid_rows=len(result.rows),
+            error_rows=len(result.errors),
+            confirmed=True,
+        )
+    except Exception as exc:
+        db.session.rollback()
+        batch.status = FiscalImportStatus.FAILED
+        db.session.commit()
+        log.warning("fiscal_import.failed batch_id=%s error=%s", batch_id, exc)
+        raise
+
+    return {
+        "import_id": str(batch.id),
+        "imported_count": created,
+        "skipped_duplicates": len(result.rows) - created,
+        "error_rows": len(result.errors),
+        "errors": result.errors,
+    }
+
+
+def _staged_payload_key(batch_id: str) -> str:
+    return f"{_STAGED_PAYLOAD_PREFIX}/{batch_id}.csv"
+
+
+def run_staged_csv_import(
+    batch_id: str, payload_key: str, column_map: dict[str, str]
+) -> dict[str, Any]:
+    """Run :func:`run_csv_import` on a staged payload, then discard it."""
+    storage = get_export_storage()
+    try:
+        content = storage.read(payload_key).decode("utf-8")
+        return run_csv_import(batch_id, content, column_map)
+    finally:
+        storage.delete(payload_key)
+
+
+def enqueue_csv_import(
+    batch: FiscalImport, content: str, column_map: dict[str, str]
+) -> dict[str, Any]:
+    """Stage *content* and hand the import to the outbound queue.
+
+    Returns ``{"queued": True, ...}`` with the batch id to poll when a worker
+    took it, or the batch's final status when the queue ran it inline.
+    """
+    batch_id = str(batch.id)
+    payload_key = _staged_payload_key(batch_id)
+    with tempfile.NamedTemporaryFile("wb", suffix=".csv", delete=False) as fh:
+        fh.write(content.encode("utf-8"))
+        staged = Path(fh.name)
+    get_export_storage().save(payload_key, staged)
+
+    job_id = get_default_outbound_queue().enqueue_csv_import(
+        batch_id=batch_id, payload_key=payload_key, column_map=column_map
+    )
+    db.session.refresh(batch)
+    data: dict[str, Any] = {
+        "import_id": batch_id,
+        "status": batch.status.value,
+        "queued": job_id is not None,
+    }
+    if job_id is not None:
+        data["job_id"] = job_id
+    else:
+        data["valid_rows"] = batch.valid_rows
+        data["error_rows"] = batch.error_rows
+    return data
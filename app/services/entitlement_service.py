@@ -3,6 +3,7 @@
 Public surface
 --------------
 has_entitlement(user_id, feature_key) -> bool
+user_ids_with_entitlement(user_ids, feature_key) -> set[UUID]
 require_entitlement(feature_key)       -> Flask decorator (403 on failure)
 grant_entitlement(...)                 -> Entitlement
 revoke_entitlement(user_id, feature_key) -> None
@@ -16,6 +17,7 @@ from __future__ import annotations
 
 import functools
 import logging
+from collections.abc import Iterable
 from datetime import datetime
 from typing import Any, cast
 from uuid import UUID
@@ -33,23 +35,16 @@ from app.utils.datetime_utils import utc_now_naive
 logger = logging.getLogger(__name__)
 
 _ENTITLEMENT_KEY_PREFIX = "entitlement"
-
-
-def _entitlement_cache_key(user_id: str | UUID, feature_key: str) -> str:
-    return f"{_ENTITLEMENT_KEY_PREFIX}:{user_id}:{feature_key}"
-
-
-def _entitlement_user_pattern(user_id: str | UUID) -> str:
-    return f"{_ENTITLEMENT_KEY_PREFIX}:{user_id}:*"
+_ENTITLEMENT_CACHE_DOMAIN = "entitlements"
 
 
 def _invalidate_entitlement_cache(user_id: str | UUID) -> None:
-    """Invalidate all cached entitlement checks for *user_id*."""
+    """Invalidate all cached entitlement checks for *user_id* (one INCR)."""
     try:
-        get_cache_service().invalidate_pattern(_entitlement_user_pattern(user_id))
+        get_cache_service().invalidate_domain(_ENTITLEMENT_CACHE_DOMAIN, user_id)
     except Exception:
         logger.warning(
-            "entitlement_cache: invalidate_pattern failed for user_id=%s", user_id
+            "entitlement_cache: invalidate_domain failed for user_id=%s", user_id
         )
 
 
@@ -62,9 +57,10 @@ def has_entitlement(user_id: str | UUID, feature_key: str) -> bool:
     """Return True when *user_id* holds a non-expired entitlement for *feature_key*.
 
     Results are cached in Redis for ``ENTITLEMENT_CACHE_TTL`` seconds and
-    invalidated whenever an entitlement is granted, revoked, or synced.  When
-    Redis is unavailable the function falls through to the database query so
-    that a cache outage never incorrectly blocks a legitimate user.
+    invalidated whenever an entitlement is granted, revoked, or synced.
+    Concurrent misses for the same key run a single query.  When Redis is
+    unavailable the function falls through to the database query so that a
+    cache outage never incorrectly blocks a legitimate user.
     """
     try:
         from app.services.subscription_service import (
@@ -78,25 +74,55 @@ def has_entitlement(user_id: str | UUID, feature_key: str) -> bool:
     except (TypeError, ValueError):
         pass
 
+    def _lookup() -> bool:
+        now = utc_now_naive()
+        ent = (
+            Entitlement.query.filter_by(
+                user_id=user_id,
+                feature_key=feature_key,
+            )
+            .filter((Entitlement.expires_at.is_(None)) | (Entitlement.expires_at > now))
+            .first()
+        )
+        return ent is not None
+
     cache = get_cache_service()
-    cache_key = _entitlement_cache_key(user_id, feature_key)
+    cache_key = cache.versioned_key(_ENTITLEMENT_KEY_PREFIX, user_id, feature_key)
+    # No stale window: serving a stale grant could outlive ``expires_at``.
+    lookup = cache.get_or_compute(cache_key, _lookup, ttl=ENTITLEMENT_CACHE_TTL)
+    return bool(lookup.value)
+
 
-    cached = cache.get(cache_key)
-    if cached is not None:
-        return bool(cached)
+def user_ids_with_entitlement(user_ids: Iterable[UUID], feature_key: str) -> set[UUID]:
+    """Return the subset of *user_ids* holding a non-expired *feature_key*.
+
+    Batch counterpart of ``has_entitlement`` for jobs that check many users:
+    one query for the whole set, bypassing the per-user cache.
+    """
+    from app.services.subscription_service import (
+        ensure_premium_override_subscription,
+        is_premium_override_user_id,
+    )
+
+    candidates = set(user_ids)
+    if not candidates:
+        return set()
+    for user_id in candidates:
+        if is_premium_override_user_id(user_id):
+            ensure_premium_override_subscription(user_id)
 
     now = utc_now_naive()
-    ent = (
-        Entitlement.query.filter_by(
-            user_id=user_id,
-            feature_key=feature_key,
+    rows = (
+        db.session.query(Entitlement.user_id)
+        .filter(
+            Entitlement.user_id.in_(candidates),
+            Entitlement.feature_key == feature_key,
+            (Entitlement.expires_at.is_(None)) | (Entitlement.expires_at > now),
         )
-        .filter((Entitlement.expires_at.is_(None)) | (Entitlement.expires_at > now))
-        .first()
+        .distinct()
+        .all()
     )
-    result = ent is not None
-    cache.set(cache_key, result, ttl=ENTITLEMENT_CACHE_TTL)
-    return result
+    return {row[0] for row in rows}
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,337 @@
+"""Batched delivery of Expo push notifications.
+
+Expo's push API accepts up to 100 messages per ``/send`` call and answers
+with one *ticket* per message; the final delivery outcome (a *receipt*) is
+fetched later from ``/getReceipts`` with up to 1000 ticket ids per call.
+
+``deliver_push_messages`` splits a list of messages into batches of 100 and
+posts them on a small thread pool sharing one ``requests.Session`` (so
+connections are reused across batches and jobs). Only HTTP runs on the pool;
+the database work — pruning tokens Expo reports as ``DeviceNotRegistered``
+and stamping ``last_used_at`` — happens afterwards on the calling thread.
+
+``process_push_receipts`` resolves tickets into receipts and prunes the dead
+tokens those reveal. Both are normally run by the RQ jobs in
+``app.jobs.push_jobs`` via the outbound queue.
+
+Configuration (env):
+    EXPO_PUSH_BASE_URL      API root (default ``https://exp.host/--/api/v2/push``).
+    EXPO_ACCESS_TOKEN       Optional bearer token for enhanced push security.
+    EXPO_PUSH_MAX_WORKERS   Concurrent batch requests (default 4).
+    EXPO_PUSH_TIMEOUT_SECONDS  Per-request timeout (default 10).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.extensions.database import db
+from app.models.push_subscription import PushSubscription, PushTransport
+from app.utils.datetime_utils import utc_now_naive
+
+if TYPE_CHECKING:
+    from app.services.outbound_queue import OutboundQueue
+
+log = logging.getLogger(__name__)
+
+EXPO_TOKEN_PREFIX = "ExponentPushToken["
+SEND_BATCH_SIZE = 100
+RECEIPT_BATCH_SIZE = 1000
+_DEFAULT_BASE_URL = "https://exp.host/--/api/v2/push"
+_DEVICE_NOT_REGISTERED = "DeviceNotRegistered"
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+@dataclass(frozen=True)
+class ExpoPushMessage:
+    to: str
+    title: str
+    body: str
+    data: dict[str, Any] = field(default_factory=dict)
+    sound: str | None = "default"
+    channel_id: str | None = None
+
+    def to_payload(self) -> dict[str, Any]:
+        payload: dict[str, Any] = {
+            "to": self.to,
+            "title": self.title,
+            "body": self.body,
+            "data": self.data,
+        }
+        if self.sound:
+            payload["sound"] = self.sound
+        if self.channel_id:
+            payload["channelId"] = self.channel_id
+        return payload
+
+
+@dataclass(frozen=True)
+class PushDeliveryResult:
+    sent: int = 0
+    failed: int = 0
+    pruned: int = 0
+    # Ticket id -> device token, kept so receipts can be mapped back to tokens.
+    ticket_tokens: dict[str, str] = field(default_factory=dict)
+
+
+class ExpoPushClient:
+    """Thin client over Expo's push endpoints with a pooled HTTP session."""
+
+    def __init__(
+        self,
+        *,
+        base_url: str = _DEFAULT_BASE_URL,
+        access_token: str | None = None,
+        timeout_seconds: float = 10,
+        pool_size: int = 4,
+    ) -> None:
+        self._base_url = base_url.rstrip("/")
+        self._timeout = timeout_seconds
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._session.headers.update(
+            {"Accept": "application/json", "Accept-Encoding": "gzip, deflate"}
+        )
+        if access_token:
+            self._session.headers["Authorization"] = f"Bearer {access_token}"
+
+    def _post(self, path: str, payload: Any) -> Any:
+        response = self._session.post(
+            f"{self._base_url}{path}", json=payload, timeout=self._timeout
+        )
+        response.raise_for_status()
+        return response.json().get("data")
+
+    def send(self, messages: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Send up to ``SEND_BATCH_SIZE`` messages; returns one ticket each."""
+        data = self._post("/send", list(messages))
+        return list(data) if isinstance(data, list) else []
+
+    def get_receipts(self, ticket_ids: Sequence[str]) -> dict[str, dict[str, Any]]:
+        data = self._post("/getReceipts", {"ids": list(ticket_ids)})
+        return dict(data) if isinstance(data, dict) else {}
+
+    def close(self) -> None:
+        self._session.close()
+
+
+_client: ExpoPushClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_expo_push_client() -> ExpoPushClient:
+    """Return the process-level client (lazy singleton)."""
+    global _client  # noqa: PLW0603
+    with _client_lock:
+        if _client is None:
+            _client = ExpoPushClient(
+                base_url=os.getenv("EXPO_PUSH_BASE_URL", _DEFAULT_BASE_URL),
+                access_token=os.getenv("EXPO_ACCESS_TOKEN") or None,
+                timeout_seconds=_int_env("EXPO_PUSH_TIMEOUT_SECONDS", 10),
+                pool_size=_int_env("EXPO_PUSH_MAX_WORKERS", 4),
+            )
+        return _client
+
+
+def reset_expo_push_client_for_tests() -> None:
+    global _client  # noqa: PLW0603
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+
+
+def is_expo_push_token(token: str) -> bool:
+    return token.startswith(EXPO_TOKEN_PREFIX)
+
+
+def _chunks(items: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+class ExpoPushBuffer:
+    """Collects push payloads across users and enqueues them in full batches.
+
+    Fan-outs that notify many users pass one buffer to every
+    ``dispatch_analysis_ready_notification(push_buffer=...)`` call instead of
+    enqueueing one job per user; every ``SEND_BATCH_SIZE`` messages become one
+    ``enqueue_push_batch`` call.
+    ``flush`` enqueues the remainder and must run when the fan-out ends.
+    """
+
+    def __init__(
+        self, queue: OutboundQueue, *, batch_size: int = SEND_BATCH_SIZE
+    ) -> None:
+        self._queue = queue
+        self._batch_size = max(1, batch_size)
+        self._pending: list[dict[str, Any]] = []
+        self.enqueued_batches = 0
+
+    def add(self, messages: Iterable[dict[str, Any]]) -> None:
+        self._pending.extend(messages)
+        while len(self._pending) >= self._batch_size:
+            batch = self._pending[: self._batch_size]
+            del self._pending[: self._batch_size]
+            self._enqueue(batch)
+
+    def flush(self) -> None:
+        if self._pending:
+            batch, self._pending = self._pending, []
+            self._enqueue(batch)
+
+    def _enqueue(self, batch: list[dict[str, Any]]) -> None:
+        self._queue.enqueue_push_batch(messages=batch)
+        self.enqueued_batches += 1
+
+
+def _send_batch(
+    client: ExpoPushClient, batch: Sequence[dict[str, Any]]
+) -> list[dict[str, Any]] | None:
+    try:
+        return client.send(batch)
+    except Exception as exc:
+        log.warning("expo_push.batch_failed size=%s error=%s", len(batch), exc)
+        return None
+
+
+def deliver_push_messages(
+    messages: Sequence[dict[str, Any]],
+) -> PushDeliveryResult:
+    """Send message payloads to Expo in concurrent batches of 100.
+
+    Requires an app context: dead tokens are deleted from
+    ``push_subscriptions`` and delivered ones get ``last_used_at`` stamped.
+    A failed batch is logged and counted, never raised, so one Expo outage
+    does not fail the rest of the batches.
+    """
+    messages = [message for message in messages if is_expo_push_token(message["to"])]
+    if not messages:
+        return PushDeliveryResult()
+
+    client = get_expo_push_client()
+    batches = list(_chunks(messages, SEND_BATCH_SIZE))
+    workers = min(_int_env("EXPO_PUSH_MAX_WORKERS", 4), len(batches))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        responses = list(pool.map(lambda batch: _send_batch(client, batch), batches))
+
+    sent = failed = 0
+    ticket_tokens: dict[str, str] = {}
+    delivered: set[str] = set()
+    dead: set[str] = set()
+    for batch, tickets in zip(batches, responses, strict=True):
+        if tickets is None:
+            failed += len(batch)
+            continue
+        for message, ticket in zip(batch, tickets, strict=False):
+            token = str(message["to"])
+            if ticket.get("status") == "ok":
+                sent += 1
+                delivered.add(token)
+                if ticket.get("id"):
+                    ticket_tokens[str(ticket["id"])] = token
+                continue
+            failed += 1
+            if (ticket.get("details") or {}).get("error") == _DEVICE_NOT_REGISTERED:
+                dead.add(token)
+        # Expo answers with one ticket per message; anything missing failed.
+        failed += max(0, len(batch) - len(tickets))
+
+    pruned = prune_push_tokens(dead)
+    _touch_push_tokens(delivered - dead)
+    db.session.commit()
+    log.info(
+        "expo_push.delivered sent=%s failed=%s pruned=%s batches=%s",
+        sent,
+        failed,
+        pruned,
+        len(batches),
+    )
+    return PushDeliveryResult(
+        sent=sent, failed=failed, pruned=pruned, ticket_tokens=ticket_tokens
+    )
+
+
+def process_push_receipts(ticket_tokens: dict[str, str]) -> int:
+    """Fetch receipts for ``ticket_tokens`` and prune unregistered devices.
+
+    Returns the number of subscriptions removed. Receipts Expo has not
+    produced yet are simply absent from the response and are ignored.
+    """
+    if not ticket_tokens:
+        return 0
+    client = get_expo_push_client()
+    dead: set[str] = set()
+    for ticket_ids in _chunks(list(ticket_tokens), RECEIPT_BATCH_SIZE):
+        try:
+            receipts = client.get_receipts(ticket_ids)
+        except Exception as exc:
+            log.warning(
+                "expo_push.receipts_failed size=%s error=%s", len(ticket_ids), exc
+            )
+            continue
+        for ticket_id, receipt in receipts.items():
+            if receipt.get("status") == "ok":
+                continue
+            error = (receipt.get("details") or {}).get("error")
+            log.info("expo_push.receipt_error ticket=%s error=%s", ticket_id, error)
+            if error == _DEVICE_NOT_REGISTERED and ticket_id in ticket_tokens:
+                dead.add(ticket_tokens[ticket_id])
+
+    pruned = prune_push_tokens(dead)
+    db.session.commit()
+    return pruned
+
+
+def prune_push_tokens(tokens: Iterable[str]) -> int:
+    """Delete the Expo subscriptions for ``tokens`` (caller commits)."""
+    tokens = list(tokens)
+    if not tokens:
+        return 0
+    deleted = PushSubscription.query.filter(
+        PushSubscription.transport == PushTransport.expo,
+        PushSubscription.endpoint.in_(tokens),
+    ).delete(synchronize_session=False)
+    log.info("expo_push.pruned tokens=%s", deleted)
+    return int(deleted)
+
+
+def _touch_push_tokens(tokens: Iterable[str]) -> None:
+    tokens = list(tokens)
+    if not tokens:
+        return
+    PushSubscription.query.filter(
+        PushSubscription.transport == PushTransport.expo,
+        PushSubscription.endpoint.in_(tokens),
+    ).update({"last_used_at": utc_now_naive()}, synchronize_session=False)
+
+
+__all__ = [
+    "ExpoPushBuffer",
+    "ExpoPushClient",
+    "ExpoPushMessage",
+    "PushDeliveryResult",
+    "deliver_push_messages",
+    "get_expo_push_client",
+    "is_expo_push_token",
+    "process_push_receipts",
+    "prune_push_tokens",
+    "reset_expo_push_client_for_tests",
+]
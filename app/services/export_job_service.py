@@ -0,0 +1,273 @@
+"""Background transaction export jobs.
+
+A job row records the export filters; a worker (``app.jobs.export_jobs``,
+enqueued through the ``OutboundQueue``) renders the file into a temporary
+file, moves it to export storage and records its key and size. CSV job
+output is gzip-compressed. Without Redis the ``SyncOutboundQueue`` runs the
+job inline, so the job is already finished when the API responds.
+
+Finished jobs expire ``EXPORT_JOB_RETENTION_HOURS`` after completion:
+expired jobs are no longer served and ``purge_expired_export_jobs`` (run by
+``flask exports purge-expired``) deletes their stored files and rows. LGPD
+account deletion removes a user's stored files through
+``delete_stored_exports``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from app.extensions.database import db
+from app.models.export_job import ExportJob, ExportJobStatus
+from app.models.transaction import TransactionStatus, TransactionType
+from app.services.export_storage import get_export_storage
+from app.services.outbound_queue import get_default_outbound_queue
+from app.services.transaction_export_service import (
+    write_csv_export,
+    write_pdf_export,
+)
+from app.utils.datetime_utils import utc_now_naive
+
+log = logging.getLogger(__name__)
+
+# CSV exports with at least this many rows go through a job when the client
+# lets the server choose (``async=auto``).
+CSV_JOB_THRESHOLD_ROWS = int(os.getenv("EXPORT_CSV_JOB_THRESHOLD_ROWS", "20000"))
+EXPORT_RETENTION_HOURS = int(os.getenv("EXPORT_JOB_RETENTION_HOURS", "72"))
+_ERROR_MAX_LENGTH = 500
+_PURGE_BATCH_SIZE = 500
+
+
+def _filters_to_params(
+    *,
+    start_date: date | None,
+    end_date: date | None,
+    tx_type: TransactionType | None,
+    status: TransactionStatus | None,
+    month_label: str,
+) -> dict[str, Any]:
+    return {
+        "start_date": start_date.isoformat() if start_date else None,
+        "end_date": end_date.isoformat() if end_date else None,
+        "type": tx_type.value if tx_type else None,
+        "status": status.value if status else None,
+        "month_label": month_label,
+    }
+
+
+def _params_to_filters(params: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "start_date": (
+            date.fromisoformat(params["start_date"])
+            if params.get("start_date")
+            else None
+        ),
+        "end_date": (
+            date.fromisoformat(params["end_date"]) if params.get("end_date") else None
+        ),
+        "tx_type": TransactionType(params["type"]) if params.get("type") else None,
+        "status": (
+            TransactionStatus(params["status"]) if params.get("status") else None
+        ),
+    }
+
+
+def create_export_job(
+    *,
+    user_id: UUID,
+    fmt: str,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    tx_type: TransactionType | None = None,
+    status: TransactionStatus | None = None,
+    month_label: str = "",
+) -> ExportJob:
+    """Persist a queued export job and hand it to the outbound queue."""
+    base_name = f"auraxis_transactions_{month_label or 'export'}"
+    if fmt == "pdf":
+        filename, content_type = f"{base_name}.pdf", "application/pdf"
+    else:
+        filename, content_type = f"{base_name}.csv.gz", "application/gzip"
+    job = ExportJob(
+        user_id=user_id,
+        format=fmt,
+        status=ExportJobStatus.queued,
+        params_json=_filters_to_params(
+            start_date=start_date,
+            end_date=end_date,
+            tx_type=tx_type,
+            status=status,
+            month_label=month_label,
+        ),
+        filename=filename,
+        content_type=content_type,
+    )
+    db.session.add(job)
+    db.session.commit()
+    get_default_outbound_queue().enqueue_export_job(job_id=str(job.id))
+    db.session.refresh(job)
+    return job
+
+
+def _render(job: ExportJob, target: Path) -> int:
+    filters = _params_to_filters(job.params_json or {})
+    with target.open("wb") as stream:
+        if job.format == "pdf":
+            return write_pdf_export(
+                stream,
+                user_id=job.user_id,
+                month_label=str((job.params_json or {}).get("month_label") or ""),
+                **filters,
+            )
+        return write_csv_export(stream, user_id=job.user_id, compress=True, **filters)
+
+
+def process_export_job(job_id: UUID) -> ExportJob:
+    """Render and store one export job; marks it failed (and re-raises) on error."""
+    job = db.session.get(ExportJob, job_id)
+    if job is None:
+        raise ValueError(f"Export job {job_id} not found")
+    job.status = ExportJobStatus.running
+    job.started_at = utc_now_naive()
+    job.error = None
+    db.session.commit()
+
+    fd, tmp_name = tempfile.mkstemp(prefix="auraxis-export-")
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    try:
+        row_count = _render(job, tmp_path)
+        key = f"exports/{job.user_id}/{job.id}/{job.filename}"
+        size = get_export_storage().save(key, tmp_path)
+    except Exception as exc:
+        db.session.rollback()
+        job.status = ExportJobStatus.failed
+        job.error = f"{type(exc).__name__}: {exc}"[:_ERROR_MAX_LENGTH]
+        job.completed_at = utc_now_naive()
+        job.expires_at = _expiry(job.completed_at)
+        db.session.commit()
+        log.warning("export_job.failed job_id=%s error=%s", job.id, exc)
+        raise
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+    job.status = ExportJobStatus.completed
+    job.storage_key = key
+    job.size_bytes = size
+    job.row_count = row_count
+    job.completed_at = utc_now_naive()
+    job.expires_at = _expiry(job.completed_at)
+    db.session.commit()
+    log.info(
+        "export_job.completed job_id=%s format=%s rows=%s bytes=%s",
+        job.id,
+        job.format,
+        row_count,
+        size,
+    )
+    return job
+
+
+def get_export_job(user_id: UUID, job_id: str) -> ExportJob | None:
+    try:
+        job_uuid = UUID(str(job_id))
+    except ValueError:
+        return None
+    job = db.session.get(ExportJob, job_uuid)
+    if job is None or job.user_id != user_id:
+        return None
+    if job.expires_at is not None and job.expires_at <= utc_now_naive():
+        return None
+    return job
+
+
+def _expiry(completed_at: datetime) -> datetime:
+    return completed_at + timedelta(hours=EXPORT_RETENTION_HOURS)
+
+
+def stored_export_keys(user_id: UUID) -> list[str]:
+    """Return the storage keys of every stored export owned by *user_id*."""
+    rows = (
+        db.session.query(ExportJob.storage_key)
+        .filter(ExportJob.user_id == user_id, ExportJob.storage_key.isnot(None))
+        .all()
+    )
+    return [str(key) for (key,) in rows]
+
+
+def delete_stored_exports(keys: list[str]) -> list[str]:
+    """Delete *keys* from export storage; return the keys that failed."""
+    storage = get_export_storage()
+    failed: list[str] = []
+    for key in keys:
+        try:
+            storage.delete(key)
+        except Exception as exc:
+            failed.append(key)
+            log.warning("export_job.delete_failed key=%s error=%s", key, exc)
+    return failed
+
+
+def purge_expired_export_jobs(*, now: datetime | None = None) -> int:
+    """Delete the stored files and rows of expired jobs; return rows deleted.
+
+    A job whose file could not be deleted keeps its row so the next sweep
+    retries it.
+    """
+    cutoff = now or utc_now_naive()
+    purged = 0
+    while True:
+        jobs = (
+            db.session.query(ExportJob)
+            .filter(ExportJob.expires_at <= cutoff)
+            .order_by(ExportJob.expires_at)
+            .limit(_PURGE_BATCH_SIZE)
+            .all()
+        )
+        failed = set(
+            delete_stored_exports([str(j.storage_key) for j in jobs if j.storage_key])
+        )
+        deletable = [job.id for job in jobs if job.storage_key not in failed]
+        if deletable:
+            db.session.query(ExportJob).filter(ExportJob.id.in_(deletable)).delete(
+                synchronize_session=False
+            )
+        db.session.commit()
+        purged += len(deletable)
+        if len(jobs) < _PURGE_BATCH_SIZE or not deletable:
+            return purged
+
+
+def serialize_export_job(job: ExportJob) -> dict[str, Any]:
+    return {
+        "id": str(job.id),
+        "format": job.format,
+        "status": job.status.value,
+        "filename": job.filename,
+        "content_type": job.content_type,
+        "size_bytes": job.size_bytes,
+        "row_count": job.row_count,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+        "expires_at": job.expires_at.isoformat() if job.expires_at else None,
+    }
+
+
+__all__ = [
+    "CSV_JOB_THRESHOLD_ROWS",
+    "EXPORT_RETENTION_HOURS",
+    "create_export_job",
+    "delete_stored_exports",
+    "get_export_job",
+    "process_export_job",
+    "purge_expired_export_jobs",
+    "serialize_export_job",
+    "stored_export_keys",
+]
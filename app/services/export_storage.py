@@ -0,0 +1,141 @@
+"""Storage backends for rendered export files and staged import payloads.
+
+``EXPORT_STORAGE_BACKEND`` selects ``local`` (default; files under
+``EXPORT_STORAGE_DIR``) or ``s3`` (``EXPORT_S3_BUCKET``; set
+``EXPORT_S3_ENDPOINT_URL`` for S3-compatible services). Both backends serve
+byte ranges so downloads can be resumed.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, Protocol
+
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+class ExportStorageError(RuntimeError):
+    pass
+
+
+class ExportStorage(Protocol):
+    def save(self, key: str, source: Path) -> int:
+        """Store *source* under *key* and return its size in bytes."""
+        ...
+
+    def iter_range(self, key: str, start: int, stop: int) -> Iterator[bytes]:
+        """Yield the bytes ``[start, stop)`` of the object stored under *key*."""
+        ...
+
+    def read(self, key: str) -> bytes:
+        """Return the whole object stored under *key*."""
+        ...
+
+    def delete(self, key: str) -> None: ...
+
+
+class LocalExportStorage:
+    def __init__(self, root: Path) -> None:
+        self._root = root
+
+    def _path(self, key: str) -> Path:
+        path = (self._root / key).resolve()
+        if self._root.resolve() not in path.parents:
+            raise ExportStorageError(f"Invalid export key: {key!r}")
+        return path
+
+    def save(self, key: str, source: Path) -> int:
+        target = self._path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(source), target)
+        return target.stat().st_size
+
+    def iter_range(self, key: str, start: int, stop: int) -> Iterator[bytes]:
+        with self._path(key).open("rb") as fh:
+            fh.seek(start)
+            remaining = stop - start
+            while remaining > 0:
+                chunk = fh.read(min(_READ_CHUNK_SIZE, remaining))
+                if not chunk:
+                    return
+                remaining -= len(chunk)
+                yield chunk
+
+    def read(self, key: str) -> bytes:
+        return self._path(key).read_bytes()
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+
+class S3ExportStorage:
+    def __init__(
+        self,
+        bucket: str,
+        *,
+        region: str | None = None,
+        endpoint_url: str | None = None,
+    ) -> None:
+        self._bucket = bucket
+        self._region = region
+        self._endpoint_url = endpoint_url
+
+    def _client(self) -> Any:
+        import boto3
+
+        return boto3.client(
+            "s3", region_name=self._region, endpoint_url=self._endpoint_url
+        )
+
+    def save(self, key: str, source: Path) -> int:
+        size = source.stat().st_size
+        try:
+            self._client().upload_file(str(source), self._bucket, key)
+        except Exception as exc:
+            raise ExportStorageError(f"Falha ao enviar exportação: {exc}") from exc
+        finally:
+            source.unlink(missing_ok=True)
+        return size
+
+    def iter_range(self, key: str, start: int, stop: int) -> Iterator[bytes]:
+        response = self._client().get_object(
+            Bucket=self._bucket, Key=key, Range=f"bytes={start}-{stop - 1}"
+        )
+        yield from response["Body"].iter_chunks(_READ_CHUNK_SIZE)
+
+    def read(self, key: str) -> bytes:
+        response = self._client().get_object(Bucket=self._bucket, Key=key)
+        return bytes(response["Body"].read())
+
+    def delete(self, key: str) -> None:
+        self._client().delete_object(Bucket=self._bucket, Key=key)
+
+
+def get_export_storage() -> ExportStorage:
+    backend = os.getenv("EXPORT_STORAGE_BACKEND", "local").strip().lower()
+    if backend == "s3":
+        bucket = os.getenv("EXPORT_S3_BUCKET", "").strip()
+        if not bucket:
+            raise ExportStorageError("EXPORT_S3_BUCKET is not configured.")
+        return S3ExportStorage(
+            bucket,
+            region=os.getenv("EXPORT_S3_REGION") or None,
+            endpoint_url=os.getenv("EXPORT_S3_ENDPOINT_URL") or None,
+        )
+    root = os.getenv("EXPORT_STORAGE_DIR", "").strip()
+    return LocalExportStorage(
+        Path(root) if root else Path(tempfile.gettempdir()) / "auraxis-exports"
+    )
+
+
+__all__ = [
+    "ExportStorage",
+    "ExportStorageError",
+    "LocalExportStorage",
+    "S3ExportStorage",
+    "get_export_storage",
+]
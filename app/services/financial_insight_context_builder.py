@@ -17,6 +17,8 @@ from decimal import Decimal, InvalidOperation
 from typing import Any, cast
 from uuid import UUID
 
+from sqlalchemy import and_, or_
+
 from app.models.budget import Budget
 from app.models.credit_card import CreditCard
 from app.models.goal import Goal
@@ -27,7 +29,6 @@ from app.models.transaction import (
     TransactionType,
 )
 from app.models.user import User
-from app.models.wallet import Wallet
 from app.services.credit_card_bill_service import compute_utilization
 from app.services.investor_profile_targets import (
     AllocationDiagnosis,
@@ -37,6 +38,10 @@ from app.services.market_rates_provider import (
     MarketRatesProvider,
     get_default_market_rates_provider,
 )
+from app.services.portfolio_valuation_service import (
+    PortfolioPosition,
+    load_portfolio_positions,
+)
 
 INSIGHT_DIMENSIONS: tuple[str, ...] = (
     "general",
@@ -614,6 +619,55 @@ def _compute_projections(
     return payload
 
 
+class _TransactionPool:
+    """Transactions preloaded once for every window a snapshot build needs.
+
+    Daily and weekly builds summarize several windows (day, week-to-date,
+    comparisons…). Instead of two queries per window, the union of the
+    windows is loaded with one query per date axis and each period is sliced
+    in memory, keeping the ordering the per-window queries used.
+    """
+
+    def __init__(
+        self,
+        *,
+        windows: list[tuple[date, date]],
+        by_due_date: list[Transaction],
+        by_created_at: list[Transaction],
+    ) -> None:
+        self._windows = windows
+        self._by_due_date = by_due_date
+        self._by_created_at = by_created_at
+
+    def covers(self, start: date, end: date) -> bool:
+        return any(
+            window_start <= start and end <= window_end
+            for window_start, window_end in self._windows
+        )
+
+    def due_between(self, start: date, end: date) -> list[Transaction]:
+        return [tx for tx in self._by_due_date if start <= tx.due_date <= end]
+
+    def created_between(self, start: date, end: date) -> list[Transaction]:
+        start_dt = datetime.combine(start, datetime.min.time())
+        end_dt = datetime.combine(end + timedelta(days=1), datetime.min.time())
+        return [
+            tx
+            for tx in self._by_created_at
+            if tx.created_at is not None and start_dt <= tx.created_at < end_dt
+        ]
+
+
+def _merge_windows(windows: list[tuple[date, date]]) -> list[tuple[date, date]]:
+    merged: list[tuple[date, date]] = []
+    for start, end in sorted(windows):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            continue
+        merged.append((start, end))
+    return merged
+
+
 class FinancialInsightContextBuilder:
     """Build sanitized financial snapshots for daily, weekly and monthly insights."""
 
@@ -627,6 +681,32 @@ class FinancialInsightContextBuilder:
         timezone_fallback: bool = False,
     ) -> dict[str, Any]:
         """Return a daily snapshot with extended temporal comparisons."""
+        yesterday = anchor_date - timedelta(days=1)
+        previous_week = anchor_date - timedelta(days=7)
+        same_day_previous_month = _same_day_previous_month(anchor_date)
+        same_day_previous_year = _same_day_previous_year(anchor_date)
+        month_start = date(anchor_date.year, anchor_date.month, 1)
+        week_start, _ = _week_bounds(anchor_date)
+        week_elapsed_days = (anchor_date - week_start).days
+        previous_week_start = week_start - timedelta(days=7)
+        previous_week_equivalent_end = previous_week_start + timedelta(
+            days=week_elapsed_days
+        )
+        pool = self._preload_transactions(
+            user_id=user_id,
+            windows=[
+                (month_start, anchor_date),
+                (week_start, anchor_date),
+                (previous_week_start, previous_week_equivalent_end),
+                (yesterday, yesterday),
+                (previous_week, previous_week),
+                *(
+                    (day, day)
+                    for day in (same_day_previous_month, same_day_previous_year)
+                    if day is not None
+                ),
+            ],
+        )
         current = self._period_snapshot(
             user_id=user_id,
             start=anchor_date,
@@ -640,17 +720,7 @@ class FinancialInsightContextBuilder:
             previous_generated_at=previous_generated_at,
             timezone_name=timezone_name,
             timezone_fallback=timezone_fallback,
-        )
-        yesterday = anchor_date - timedelta(days=1)
-        previous_week = anchor_date - timedelta(days=7)
-        same_day_previous_month = _same_day_previous_month(anchor_date)
-        same_day_previous_year = _same_day_previous_year(anchor_date)
-        month_start = date(anchor_date.year, anchor_date.month, 1)
-        week_start, _ = _week_bounds(anchor_date)
-        week_elapsed_days = (anchor_date - week_start).days
-        previous_week_start = week_start - timedelta(days=7)
-        previous_week_equivalent_end = previous_week_start + timedelta(
-            days=week_elapsed_days
+            pool=pool,
         )
         week_to_date = self._period_snapshot(
             user_id=user_id,
@@ -658,6 +728,7 @@ class FinancialInsightContextBuilder:
             end=anchor_date,
             label=f"{anchor_date.isocalendar().year}-W{anchor_date.isocalendar().week:02d}-to-date",
             period_type="week_to_date",
+            pool=pool,
         )
         previous_week_to_date = self._period_snapshot(
             user_id=user_id,
@@ -668,6 +739,7 @@ class FinancialInsightContextBuilder:
                 f"W{previous_week_start.isocalendar().week:02d}-equivalent"
             ),
             period_type="previous_week_to_date",
+            pool=pool,
         )
 
         missing_comparisons: list[str] = []
@@ -678,6 +750,7 @@ class FinancialInsightContextBuilder:
                 start=yesterday,
                 end=yesterday,
                 label=yesterday.isoformat(),
+                pool=pool,
             ),
             "previous_week": self._comparison_snapshot(
                 user_id=user_id,
@@ -685,6 +758,7 @@ class FinancialInsightContextBuilder:
                 start=previous_week,
                 end=previous_week,
                 label=previous_week.isoformat(),
+                pool=pool,
             ),
             "month_to_date": self._compact_period_snapshot(
                 self._period_snapshot(
@@ -693,6 +767,7 @@ class FinancialInsightContextBuilder:
                     end=anchor_date,
                     label=f"{anchor_date:%Y-%m}-to-{anchor_date:%d}",
                     period_type="month_to_date",
+                    pool=pool,
                 )
             ),
             "week_to_date_vs_previous_week": {
@@ -711,6 +786,7 @@ class FinancialInsightContextBuilder:
                 start=same_day_previous_month,
                 end=same_day_previous_month,
                 label=same_day_previous_month.isoformat(),
+                pool=pool,
             )
         else:
             missing_comparisons.append("same_day_previous_month")
@@ -722,6 +798,7 @@ class FinancialInsightContextBuilder:
                 start=same_day_previous_year,
                 end=same_day_previous_year,
                 label=same_day_previous_year.isoformat(),
+                pool=pool,
             )
         else:
             missing_comparisons.append("same_day_previous_year")
@@ -749,6 +826,11 @@ class FinancialInsightContextBuilder:
     ) -> dict[str, Any]:
         """Return a weekly snapshot for the ISO week containing ``anchor_date``."""
         start, end = _week_bounds(anchor_date)
+        previous_start = start - timedelta(days=7)
+        previous_end = start - timedelta(days=1)
+        pool = self._preload_transactions(
+            user_id=user_id, windows=[(previous_start, end)]
+        )
         current = self._period_snapshot(
             user_id=user_id,
             start=start,
@@ -762,9 +844,8 @@ class FinancialInsightContextBuilder:
             previous_generated_at=previous_generated_at,
             timezone_name=timezone_name,
             timezone_fallback=timezone_fallback,
+            pool=pool,
         )
-        previous_start = start - timedelta(days=7)
-        previous_end = start - timedelta(days=1)
         current["comparisons"] = {
             "previous_period": self._comparison_snapshot(
                 user_id=user_id,
@@ -775,6 +856,7 @@ class FinancialInsightContextBuilder:
                     f"{previous_start.isocalendar().year}-"
                     f"W{previous_start.isocalendar().week:02d}"
                 ),
+                pool=pool,
             )
         }
         return current
@@ -814,6 +896,7 @@ class FinancialInsightContextBuilder:
         start: date,
         end: date,
         label: str,
+        pool: _TransactionPool | None = None,
     ) -> dict[str, Any]:
         comparison = self._period_snapshot(
             user_id=user_id,
@@ -821,6 +904,7 @@ class FinancialInsightContextBuilder:
             end=end,
             label=label,
             period_type="comparison",
+            pool=pool,
         )
         compact = self._compact_period_snapshot(comparison)
         compact["delta"] = self._delta(current["current_period"], comparison)
@@ -856,17 +940,22 @@ class FinancialInsightContextBuilder:
         previous_generated_at: datetime | None = None,
         timezone_name: str = _TIMEZONE,
         timezone_fallback: bool = False,
+        pool: _TransactionPool | None = None,
     ) -> dict[str, Any]:
-        due_transactions = self._fetch_transactions(
-            user_id=user_id,
-            start=start,
-            end=end,
-        )
-        created_transactions = self._fetch_transactions_created(
-            user_id=user_id,
-            start=start,
-            end=end,
-        )
+        if pool is not None and pool.covers(start, end):
+            due_transactions = pool.due_between(start, end)
+            created_transactions = pool.created_between(start, end)
+        else:
+            due_transactions = self._fetch_transactions(
+                user_id=user_id,
+                start=start,
+                end=end,
+            )
+            created_transactions = self._fetch_transactions_created(
+                user_id=user_id,
+                start=start,
+                end=end,
+            )
         transactions = self._merge_transactions(
             due_transactions,
             created_transactions,
@@ -911,7 +1000,9 @@ class FinancialInsightContextBuilder:
                 non_cancelled,
                 previous_generated_at=previous_generated_at,
             ),
-            "budgets": self._budgets_payload(user_id=user_id, start=start, end=end)
+            "budgets": self._budgets_payload(
+                user_id=user_id, due_transactions=due_non_cancelled
+            )
             if include_budgets
             else [],
             "goals": goals_payload,
@@ -1024,12 +1115,13 @@ class FinancialInsightContextBuilder:
         Sanitized list of holdings + asset-class distribution + investor
         profile diagnosis + benchmark CDI/IPCA for the anchor's month.
         """
-        wallets = Wallet.query.filter_by(user_id=user_id).order_by(Wallet.name).all()
+        # Served from the cached portfolio read model.
+        positions = sorted(load_portfolio_positions(user_id), key=lambda p: p.name)
         user = User.query.filter_by(id=user_id).first()
-        items = [self._serialize_wallet_item(w) for w in wallets]
+        items = [self._serialize_wallet_item(p) for p in positions]
         diagnosis = evaluate_allocation(
             investor_profile=getattr(user, "investor_profile", None) if user else None,
-            wallets=wallets,
+            wallets=positions,
         )
         benchmark, missing = self._fetch_wallet_benchmark(
             market_rates=market_rates,
@@ -1053,7 +1145,7 @@ class FinancialInsightContextBuilder:
             missing,
         )
 
-    def _serialize_wallet_item(self, wallet: Wallet) -> dict[str, Any]:
+    def _serialize_wallet_item(self, wallet: PortfolioPosition) -> dict[str, Any]:
         return {
             "name": _sanitize_text(wallet.name, max_length=80) or "Investimento",
             "asset_class": (wallet.asset_class or "custom").lower(),
@@ -1109,6 +1201,55 @@ class FinancialInsightContextBuilder:
             missing,
         )
 
+    def _preload_transactions(
+        self,
+        *,
+        user_id: UUID,
+        windows: list[tuple[date, date]],
+    ) -> _TransactionPool:
+        """Load every transaction due or created inside *windows* (2 queries)."""
+        merged = _merge_windows(windows)
+        by_due_date = (
+            Transaction.query.filter(
+                Transaction.user_id == user_id,
+                Transaction.deleted.is_(False),
+                or_(
+                    *(
+                        and_(Transaction.due_date >= start, Transaction.due_date <= end)
+                        for start, end in merged
+                    )
+                ),
+            )
+            .order_by(Transaction.due_date.asc(), Transaction.created_at.asc())
+            .all()
+        )
+        by_created_at = (
+            Transaction.query.filter(
+                Transaction.user_id == user_id,
+                Transaction.deleted.is_(False),
+                or_(
+                    *(
+                        and_(
+                            Transaction.created_at
+                            >= datetime.combine(start, datetime.min.time()),
+                            Transaction.created_at
+                            < datetime.combine(
+                                end + timedelta(days=1), datetime.min.time()
+                            ),
+                        )
+                        for start, end in merged
+                    )
+                ),
+            )
+            .order_by(Transaction.created_at.asc(), Transaction.due_date.asc())
+            .all()
+        )
+        return _TransactionPool(
+            windows=merged,
+            by_due_date=cast(list[Transaction], by_due_date),
+            by_created_at=cast(list[Transaction], by_created_at),
+        )
+
     def _fetch_transactions(
         self,
         *,
@@ -1469,8 +1610,7 @@ class FinancialInsightContextBuilder:
         self,
         *,
         user_id: UUID,
-        start: date,
-        end: date,
+        due_transactions: list[Transaction],
     ) -> list[dict[str, Any]]:
         rows = (
             Budget.query.filter(
@@ -1482,20 +1622,31 @@ class FinancialInsightContextBuilder:
             .all()
         )
         budgets = cast(list[Budget], rows)
-        paid = [
-            tx
-            for tx in self._fetch_transactions(user_id=user_id, start=start, end=end)
-            if tx.status == TransactionStatus.PAID
-            and tx.type == TransactionType.EXPENSE
-        ]
+        # One pass over the period's paid expenses; every budget reads its
+        # category total (or the overall total) instead of rescanning them.
+        spent_by_category: dict[str | None, Decimal] = {}
+        spent_total = Decimal("0.00")
+        for tx in due_transactions:
+            if (
+                tx.status != TransactionStatus.PAID
+                or tx.type != TransactionType.EXPENSE
+            ):
+                continue
+            amount = _money(tx.amount)
+            key = _enum_value(tx.category)
+            spent_by_category[key] = (
+                spent_by_category.get(key, Decimal("0.00")) + amount
+            )
+            spent_total += amount
 
         result: list[dict[str, Any]] = []
         for budget in budgets:
             category = str(budget.category) if budget.category else None
-            spent = Decimal("0.00")
-            for tx in paid:
-                if category is None or _enum_value(tx.category) == category:
-                    spent += _money(tx.amount)
+            spent = (
+                spent_total
+                if category is None
+                else spent_by_category.get(category, Decimal("0.00"))
+            )
 
             amount = _money(budget.amount)
             result.append(
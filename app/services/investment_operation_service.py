@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from dataclasses import dataclass
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
 from typing import Any, cast
 from uuid import UUID
@@ -10,6 +11,11 @@ from app.extensions.database import db
 from app.models.investment_operation import InvestmentOperation
 from app.models.wallet import Wallet
 from app.schemas.investment_operation_schema import InvestmentOperationSchema
+from app.services.cache_service import get_cache_service
+
+# Cache domain bumped on every operation write; the portfolio read model
+# (``portfolio:valuation``) depends on it.
+INVESTMENT_OPERATIONS_CACHE_DOMAIN = "investment_operations"
 
 
 @dataclass
@@ -20,6 +26,69 @@ class InvestmentOperationError(Exception):
     details: dict[str, Any] | None = None
 
 
+def compute_position(operations: Iterable[InvestmentOperation]) -> dict[str, Any]:
+    """Average-cost position of a wallet from its operations (any order).
+
+    Sells reduce the cost basis at the average cost before the sale; a sell
+    that empties the position resets both quantity and cost basis to zero.
+    """
+    ordered = sorted(
+        operations,
+        key=lambda op: (op.executed_at, op.created_at or datetime.min),
+    )
+    current_quantity = Decimal("0")
+    current_cost_basis = Decimal("0")
+    buy_operations = 0
+    sell_operations = 0
+    total_buy_quantity = Decimal("0")
+    total_sell_quantity = Decimal("0")
+
+    for operation in ordered:
+        quantity = Decimal(operation.quantity)
+        unit_price = Decimal(operation.unit_price)
+        fees = Decimal(operation.fees or 0)
+        operation_total = (quantity * unit_price) + fees
+
+        if operation.operation_type == "buy":
+            buy_operations += 1
+            total_buy_quantity += quantity
+            current_quantity += quantity
+            current_cost_basis += operation_total
+            continue
+
+        sell_operations += 1
+        total_sell_quantity += quantity
+
+        if current_quantity <= 0:
+            current_quantity -= quantity
+            continue
+
+        quantity_to_reduce = min(quantity, current_quantity)
+        average_cost_before_sell = current_cost_basis / current_quantity
+        current_cost_basis -= average_cost_before_sell * quantity_to_reduce
+        current_quantity -= quantity
+
+        if current_quantity <= 0:
+            current_quantity = Decimal("0")
+            current_cost_basis = Decimal("0")
+
+    average_cost = (
+        (current_cost_basis / current_quantity)
+        if current_quantity > 0
+        else Decimal("0")
+    )
+
+    return {
+        "buy_operations": buy_operations,
+        "sell_operations": sell_operations,
+        "total_buy_quantity": str(total_buy_quantity),
+        "total_sell_quantity": str(total_sell_quantity),
+        "current_quantity": str(current_quantity),
+        "current_cost_basis": str(current_cost_basis),
+        "average_cost": str(average_cost),
+    }
+
+
 class InvestmentOperationService:
     def __init__(self, user_id: UUID) -> None:
         self.user_id = user_id
@@ -88,6 +157,7 @@ class InvestmentOperationService:
         )
         db.session.add(operation)
         db.session.commit()
+        self._invalidate_portfolio_cache()
         return operation
 
     def list_operations(
@@ -132,12 +202,14 @@ class InvestmentOperationService:
             else:
                 setattr(operation, field, value)
         db.session.commit()
+        self._invalidate_portfolio_cache()
         return operation
 
     def delete_operation(self, investment_id: UUID, operation_id: UUID) -> None:
         operation = self.get_owned_operation(investment_id, operation_id)
         db.session.delete(operation)
         db.session.commit()
+        self._invalidate_portfolio_cache()
 
     def get_summary(self, investment_id: UUID) -> dict[str, Any]:
         self.get_owned_investment(investment_id)
@@ -183,58 +255,7 @@ class InvestmentOperationService:
             investment_id, chronological=True
         )
 
-        current_quantity = Decimal("0")
-        current_cost_basis = Decimal("0")
-        buy_operations = 0
-        sell_operations = 0
-        total_buy_quantity = Decimal("0")
-        total_sell_quantity = Decimal("0")
-
-        for operation in operations:
-            quantity = Decimal(operation.quantity)
-            unit_price = Decimal(operation.unit_price)
-            fees = Decimal(operation.fees or 0)
-            operation_total = (quantity * unit_price) + fees
-
-            if operation.operation_type == "buy":
-                buy_operations += 1
-                total_buy_quantity += quantity
-                current_quantity += quantity
-                current_cost_basis += operation_total
-                continue
-
-            sell_operations += 1
-            total_sell_quantity += quantity
-
-            if current_quantity <= 0:
-                current_quantity -= quantity
-                continue
-
-            quantity_to_reduce = min(quantity, current_quantity)
-            average_cost_before_sell = current_cost_basis / current_quantity
-            current_cost_basis -= average_cost_before_sell * quantity_to_reduce
-            current_quantity -= quantity
-
-            if current_quantity <= 0:
-                current_quantity = Decimal("0")
-                current_cost_basis = Decimal("0")
-
-        average_cost = (
-            (current_cost_basis / current_quantity)
-            if current_quantity > 0
-            else Decimal("0")
-        )
-
-        return {
-            "total_operations": len(operations),
-            "buy_operations": buy_operations,
-            "sell_operations": sell_operations,
-            "total_buy_quantity": str(total_buy_quantity),
-            "total_sell_quantity": str(total_sell_quantity),
-            "current_quantity": str(current_quantity),
-            "current_cost_basis": str(current_cost_basis),
-            "average_cost": str(average_cost),
-        }
+        return {"total_operations": len(operations), **compute_position(operations)}
 
     def get_invested_amount_by_date(
         self, investment_id: UUID, operation_date: date
@@ -278,6 +299,11 @@ class InvestmentOperationService:
             "net_invested_amount": str(net_invested),
         }
 
+    def _invalidate_portfolio_cache(self) -> None:
+        get_cache_service().invalidate_domain(
+            INVESTMENT_OPERATIONS_CACHE_DOMAIN, self.user_id
+        )
+
     def _get_operations_for_investment(
         self, investment_id: UUID, *, chronological: bool = False
     ) -> list[InvestmentOperation]:
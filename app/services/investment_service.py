@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import os
 import re
-from datetime import UTC, datetime
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, date, datetime
 from typing import Any, Dict, Optional
 
 import requests
+from flask import has_app_context
 from requests.exceptions import RequestException
 
 from app.extensions.brapi_cache import get_brapi_cache
@@ -31,6 +34,12 @@ class InvestmentService:
         cache_ttl_seconds = int(os.getenv("BRAPI_CACHE_TTL_SECONDS", "60"))
         return timeout_seconds, max_retries, cache_ttl_seconds
 
+    @staticmethod
+    def _batch_settings() -> tuple[int, int]:
+        batch_size = max(int(os.getenv("BRAPI_QUOTE_BATCH_SIZE", "10")), 1)
+        max_workers = max(int(os.getenv("BRAPI_QUOTE_MAX_WORKERS", "4")), 1)
+        return batch_size, max_workers
+
     @staticmethod
     def _cache_get(cache_key: str, ttl_seconds: int) -> Any | None:
         if ttl_seconds <= 0:
@@ -92,16 +101,10 @@ class InvestmentService:
         return normalized
 
     @staticmethod
-    def _extract_market_price(payload: Any) -> float | None:
-        if not isinstance(payload, dict):
-            return None
-        results = payload.get("results")
-        if not isinstance(results, list) or not results:
-            return None
-        first_result = results[0]
-        if not isinstance(first_result, dict):
+    def _extract_quote_price(result: Any) -> float | None:
+        if not isinstance(result, dict):
             return None
-        raw_price = first_result.get("regularMarketPrice")
+        raw_price = result.get("regularMarketPrice")
         if not isinstance(raw_price, (int, float)):
             return None
         price = float(raw_price)
@@ -109,6 +112,31 @@ class InvestmentService:
             return None
         return price
 
+    @staticmethod
+    def _extract_market_price(payload: Any) -> float | None:
+        if not isinstance(payload, dict):
+            return None
+        results = payload.get("results")
+        if not isinstance(results, list) or not results:
+            return None
+        return InvestmentService._extract_quote_price(results[0])
+
+    @staticmethod
+    def _extract_market_prices(payload: Any) -> dict[str, float]:
+        """Map ``symbol -> price`` from a multi-quote payload (invalid rows skipped)."""
+        if not isinstance(payload, dict):
+            return {}
+        results = payload.get("results")
+        if not isinstance(results, list):
+            return {}
+        prices: dict[str, float] = {}
+        for result in results:
+            price = InvestmentService._extract_quote_price(result)
+            symbol = result.get("symbol") if isinstance(result, dict) else None
+            if price is not None and isinstance(symbol, str):
+                prices[symbol.strip().upper()] = price
+        return prices
+
     @staticmethod
     def _extract_historical_rows(payload: Any) -> list[dict[str, Any]] | None:
         if not isinstance(payload, dict):
@@ -127,13 +155,10 @@ class InvestmentService:
         return [row for row in historical_rows if isinstance(row, dict)]
 
     @staticmethod
-    def _build_historical_price_map(
-        *,
+    def _parse_historical_rows(
         historical_rows: list[dict[str, Any]],
-        start_date: str,
-        end_date: str,
-    ) -> dict[str, float]:
-        prices: dict[str, float] = {}
+    ) -> dict[date, float]:
+        prices: dict[date, float] = {}
         for row in historical_rows:
             unix_ts = row.get("date")
             close_price = row.get("close")
@@ -141,11 +166,45 @@ class InvestmentService:
                 close_price, (int, float)
             ):
                 continue
-            day = datetime.fromtimestamp(float(unix_ts), tz=UTC).date().isoformat()
-            if start_date <= day <= end_date:
-                prices[day] = float(close_price)
+            day = datetime.fromtimestamp(float(unix_ts), tz=UTC).date()
+            prices[day] = float(close_price)
         return prices
 
+    @staticmethod
+    def _build_historical_price_map(
+        *,
+        historical_rows: list[dict[str, Any]],
+        start_date: str,
+        end_date: str,
+    ) -> dict[str, float]:
+        prices: dict[str, float] = {}
+        parsed = InvestmentService._parse_historical_rows(historical_rows)
+        for day, close_price in parsed.items():
+            iso_day = day.isoformat()
+            if start_date <= iso_day <= end_date:
+                prices[iso_day] = close_price
+        return prices
+
+    @staticmethod
+    def _fetch_history_range(ticker: str, brapi_range: str) -> dict[date, float] | None:
+        """Download one BRAPI daily range for an already-normalized ticker."""
+        payload = InvestmentService._circuit_breaker.call(
+            InvestmentService._request_json,
+            f"https://brapi.dev/api/quote/{ticker}",
+            params={
+                "range": brapi_range,
+                "interval": "1d",
+            },
+        )
+        historical_rows = InvestmentService._extract_historical_rows(payload)
+        if historical_rows is None:
+            InvestmentService._record_brapi_event(
+                "invalid_payload",
+                detail=f"historical:{ticker}",
+            )
+            return None
+        return InvestmentService._parse_historical_rows(historical_rows)
+
     @staticmethod
     def get_market_price(ticker: str) -> Optional[float]:
         """Consulta preço de mercado via BRAPI com timeout, retry e cache curto."""
@@ -182,14 +241,113 @@ class InvestmentService:
         InvestmentService._cache_set(normalized_ticker, price, cache_ttl_seconds)
         return price
 
+    @staticmethod
+    def _fetch_quote_chunk(tickers: list[str]) -> dict[str, float]:
+        """One multi-quote request (``/quote/A,B,C``) for normalized tickers."""
+        payload = InvestmentService._circuit_breaker.call(
+            InvestmentService._request_json,
+            f"https://brapi.dev/api/quote/{','.join(tickers)}",
+        )
+        if (
+            payload is None
+            and InvestmentService._circuit_breaker.state != CircuitBreaker.CLOSED
+        ):
+            InvestmentService._record_brapi_event(
+                "circuit_open", detail=",".join(tickers)
+            )
+        prices = InvestmentService._extract_market_prices(payload)
+        return {ticker: prices[ticker] for ticker in tickers if ticker in prices}
+
+    @staticmethod
+    def _fetch_quotes(tickers: list[str]) -> dict[str, float]:
+        if not tickers:
+            return {}
+        batch_size, max_workers = InvestmentService._batch_settings()
+        chunks = [
+            tickers[offset : offset + batch_size]
+            for offset in range(0, len(tickers), batch_size)
+        ]
+        if len(chunks) == 1:
+            results = [InvestmentService._fetch_quote_chunk(chunks[0])]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(max_workers, len(chunks)),
+                thread_name_prefix="brapi-quotes",
+            ) as pool:
+                results = list(pool.map(InvestmentService._fetch_quote_chunk, chunks))
+        prices: dict[str, float] = {}
+        for chunk_prices in results:
+            prices.update(chunk_prices)
+        return prices
+
+    @staticmethod
+    def get_market_prices(tickers: Iterable[str]) -> dict[str, float | None]:
+        """Cotações de vários tickers com um round trip por etapa.
+
+        Lê o cache em lote (``MGET``), busca os ausentes no endpoint
+        multi-quote da BRAPI em blocos de ``BRAPI_QUOTE_BATCH_SIZE`` executados
+        em paralelo (até ``BRAPI_QUOTE_MAX_WORKERS`` threads) e grava de volta
+        em pipeline. A chave do resultado é o ticker recebido; ``None`` quando
+        inválido ou indisponível.
+        """
+        normalized = {
+            ticker: InvestmentService._normalize_ticker(ticker)
+            for ticker in dict.fromkeys(tickers)
+        }
+        for value in normalized.values():
+            if value is None:
+                InvestmentService._record_brapi_event("invalid_ticker")
+        unique = sorted({value for value in normalized.values() if value})
+        _, _, cache_ttl_seconds = InvestmentService._settings()
+
+        prices: dict[str, float] = {}
+        if cache_ttl_seconds > 0 and unique:
+            cached = get_brapi_cache().get_many(unique)
+            prices.update({key: float(value) for key, value in cached.items()})
+        missing = [ticker for ticker in unique if ticker not in prices]
+        fetched = InvestmentService._fetch_quotes(missing)
+        for ticker in missing:
+            if ticker not in fetched:
+                InvestmentService._record_brapi_event(
+                    "invalid_payload",
+                    detail=f"market_price:{ticker}",
+                )
+        get_brapi_cache().set_many(fetched, cache_ttl_seconds)
+        prices.update(fetched)
+        return {
+            ticker: prices.get(value) if value else None
+            for ticker, value in normalized.items()
+        }
+
     @staticmethod
     def get_historical_prices(
         ticker: str, *, start_date: str, end_date: str
     ) -> dict[str, float]:
+        """Preços de fechamento diários de ``start_date`` a ``end_date``.
+
+        Com app context, lê o ``ticker_daily_prices`` compartilhado e só busca
+        na BRAPI o trecho ainda não coberto. Sem app context (scripts, testes
+        sem banco), baixa ``5y`` e usa o cache curto como antes.
+        """
         normalized_ticker = InvestmentService._normalize_ticker(ticker)
         if normalized_ticker is None:
             InvestmentService._record_brapi_event("invalid_ticker")
             return {}
+        if has_app_context():
+            from app.services.ticker_price_store import get_daily_prices
+
+            try:
+                start = date.fromisoformat(start_date)
+                end = date.fromisoformat(end_date)
+            except ValueError:
+                return {}
+            return get_daily_prices(
+                normalized_ticker,
+                start=start,
+                end=end,
+                fetch=InvestmentService._fetch_history_range,
+            )
+
         _, _, cache_ttl_seconds = InvestmentService._settings()
         cache_key = f"HIST:{normalized_ticker}:{start_date}:{end_date}"
         cached = InvestmentService._cache_get(cache_key, cache_ttl_seconds)
@@ -220,6 +378,21 @@ class InvestmentService:
         InvestmentService._cache_set(cache_key, prices, cache_ttl_seconds)
         return prices
 
+    @staticmethod
+    def backfill_historical_prices(ticker: str, *, brapi_range: str) -> int | None:
+        """Warm the shared price store; return stored rows or ``None`` on failure."""
+        from app.services.ticker_price_store import backfill_ticker
+
+        normalized_ticker = InvestmentService._normalize_ticker(ticker)
+        if normalized_ticker is None:
+            InvestmentService._record_brapi_event("invalid_ticker")
+            return None
+        return backfill_ticker(
+            normalized_ticker,
+            brapi_range=brapi_range,
+            fetch=InvestmentService._fetch_history_range,
+        )
+
     @staticmethod
     def calculate_estimated_value(data: Dict[str, Any]) -> Optional[float]:
         """
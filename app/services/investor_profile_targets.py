@@ -18,15 +18,22 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import TYPE_CHECKING, Iterable, Literal
+from typing import Any, Iterable, Literal, Protocol
 
 from app.schemas.wallet_schema import (
     FIXED_INCOME_ASSET_CLASSES,
     MARKET_ASSET_CLASSES,
 )
 
-if TYPE_CHECKING:  # pragma: no cover
-    from app.models.wallet import Wallet
+
+class WalletHolding(Protocol):
+    """What the allocation math reads: a ``Wallet`` or a portfolio position."""
+
+    @property
+    def value(self) -> Any: ...
+
+    @property
+    def asset_class(self) -> Any: ...
 
 
 ProfileKey = Literal["conservador", "moderado", "agressivo"]
@@ -87,7 +94,7 @@ class AllocationDiagnosis:
     notes: tuple[str, ...]
 
 
-def compute_distribution(wallets: Iterable["Wallet"]) -> AllocationDistribution:
+def compute_distribution(wallets: Iterable[WalletHolding]) -> AllocationDistribution:
     """Return percent split of a wallet collection by asset-class bucket."""
     total = Decimal("0")
     fixed = Decimal("0")
@@ -124,7 +131,7 @@ def compute_distribution(wallets: Iterable["Wallet"]) -> AllocationDistribution:
 def evaluate_allocation(
     *,
     investor_profile: str | None,
-    wallets: Iterable["Wallet"],
+    wallets: Iterable[WalletHolding],
 ) -> AllocationDiagnosis:
     """Diagnose whether the actual allocation matches the declared profile.
 
@@ -183,7 +190,7 @@ def _normalize_profile(raw: str | None) -> ProfileKey | None:
     return None
 
 
-def _wallet_value(wallet: "Wallet") -> Decimal:
+def _wallet_value(wallet: WalletHolding) -> Decimal:
     raw = wallet.value
     if raw is None:
         return Decimal("0")
@@ -200,6 +207,7 @@ __all__ = [
     "PROFILE_TARGETS",
     "ProfileKey",
     "ProfileTarget",
+    "WalletHolding",
     "compute_distribution",
     "evaluate_allocation",
 ]
@@ -2,7 +2,7 @@
 
 The ``MarketDataProvider`` Protocol is the formal *port* that decouples
 business logic from the BRAPI HTTP adapter.  Any class that implements the
-three required methods is structurally compatible, enabling easy substitution
+four required methods is structurally compatible, enabling easy substitution
 for testing (mock providers) or migration to alternative data providers.
 
 Concrete implementations
@@ -18,6 +18,7 @@ Factory
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from typing import Any, Optional, Protocol, runtime_checkable
 
 
@@ -29,6 +30,14 @@ class MarketDataProvider(Protocol):
         """Return the current market price for *ticker*, or ``None`` on failure."""
         ...
 
+    def get_market_prices(self, tickers: Iterable[str]) -> dict[str, Optional[float]]:
+        """Return ``{ticker: price}`` for many tickers (``None`` when unavailable).
+
+        Implementations should batch provider round trips instead of looping
+        over ``get_current_price``.
+        """
+        ...
+
     def get_historical_prices(
         self,
         ticker: str,
@@ -56,6 +65,11 @@ class BrapiMarketDataProvider:
 
         return InvestmentService.get_market_price(ticker)
 
+    def get_market_prices(self, tickers: Iterable[str]) -> dict[str, Optional[float]]:
+        from app.services.investment_service import InvestmentService
+
+        return InvestmentService.get_market_prices(tickers)
+
     def get_historical_prices(
         self,
         ticker: str,
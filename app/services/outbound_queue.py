@@ -1,4 +1,7 @@
-"""OutboundQueue — async job queue port for transactional emails (ARC-API-02).
+"""OutboundQueue — async job queue port for outbound work (ARC-API-02).
+
+Carries transactional emails, Expo push batches, background transaction
+exports and large fiscal CSV imports.
 
 The ``OutboundQueue`` Protocol is the *port* that separates email-dispatch
 business logic from the transport mechanism.  Two adapters are provided:
@@ -18,12 +21,37 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import Protocol, runtime_checkable
+from collections.abc import Sequence
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, Protocol, runtime_checkable
+
+if TYPE_CHECKING:
+    from app.services.email_provider import EmailMessage
 
 logger = logging.getLogger("auraxis.outbound_queue")
 
 _QUEUE_NAME = "auraxis_outbound"
 _JOB_TIMEOUT = "5m"
+_JOB_TIMEOUT_SECONDS = 5 * 60
+_EXPORT_JOB_TIMEOUT = "30m"
+_CSV_IMPORT_JOB_TIMEOUT = "30m"
+_DEFAULT_PUSH_RECEIPT_DELAY_SECONDS = 15 * 60
+
+
+def _push_receipt_delay_seconds() -> int:
+    """Expo recommends waiting ~15 minutes before fetching receipts."""
+    try:
+        return max(
+            0,
+            int(
+                os.getenv(
+                    "EXPO_RECEIPT_DELAY_SECONDS",
+                    str(_DEFAULT_PUSH_RECEIPT_DELAY_SECONDS),
+                )
+            ),
+        )
+    except ValueError:
+        return _DEFAULT_PUSH_RECEIPT_DELAY_SECONDS
 
 
 @runtime_checkable
@@ -42,6 +70,32 @@ class OutboundQueue(Protocol):
         """Enqueue an email send job.  Returns the job ID or ``None`` (sync path)."""
         ...
 
+    def enqueue_send_email_batch(
+        self, messages: Sequence[EmailMessage]
+    ) -> list[str | None]:
+        """Enqueue one send job per message in a single round trip."""
+        ...
+
+    def enqueue_export_job(self, *, job_id: str) -> str | None:
+        """Enqueue a transaction export job.  Returns the RQ job ID or ``None``."""
+        ...
+
+    def enqueue_csv_import(
+        self, *, batch_id: str, payload_key: str, column_map: dict[str, str]
+    ) -> str | None:
+        """Enqueue a fiscal CSV import whose content is staged under *payload_key*."""
+        ...
+
+    def enqueue_push_batch(self, *, messages: list[dict[str, Any]]) -> str | None:
+        """Enqueue Expo push message payloads for batched delivery."""
+        ...
+
+    def enqueue_push_receipts_check(
+        self, *, ticket_tokens: dict[str, str]
+    ) -> str | None:
+        """Schedule the receipt check for delivered Expo tickets."""
+        ...
+
 
 class SyncOutboundQueue:
     """Fallback adapter: executes send_email synchronously in the request thread.
@@ -80,6 +134,61 @@ class SyncOutboundQueue:
             )
             get_email_dlq().push(message, reason=str(exc))
 
+    def enqueue_send_email_batch(
+        self, messages: Sequence[EmailMessage]
+    ) -> list[str | None]:
+        for message in messages:
+            self.enqueue_send_email(
+                to_email=message.to_email,
+                subject=message.subject,
+                html=message.html,
+                text=message.text,
+                tag=message.tag,
+            )
+        return [None] * len(messages)
+
+    def enqueue_export_job(self, *, job_id: str) -> None:
+        from app.jobs.export_jobs import run_export_job
+
+        try:
+            run_export_job(job_id)
+        except Exception:
+            # The job row is already marked failed; callers poll its status.
+            logger.warning("outbound_queue(sync): export job failed job_id=%s", job_id)
+
+    def enqueue_csv_import(
+        self, *, batch_id: str, payload_key: str, column_map: dict[str, str]
+    ) -> None:
+        from app.jobs.fiscal_jobs import import_receivables_csv
+
+        try:
+            import_receivables_csv(batch_id, payload_key, column_map)
+        except Exception:
+            # The batch is already marked failed; callers poll its status.
+            logger.warning(
+                "outbound_queue(sync): csv import failed batch_id=%s", batch_id
+            )
+
+    def enqueue_push_batch(self, *, messages: list[dict[str, Any]]) -> None:
+        from app.jobs.push_jobs import send_push_batch
+
+        try:
+            send_push_batch(messages)
+        except Exception:
+            logger.warning(
+                "outbound_queue(sync): push delivery failed messages=%s",
+                len(messages),
+                exc_info=True,
+            )
+
+    def enqueue_push_receipts_check(self, *, ticket_tokens: dict[str, str]) -> None:
+        # Receipts are only ready minutes after sending; without a scheduler
+        # dead tokens are still pruned from the DeviceNotRegistered tickets.
+        logger.debug(
+            "outbound_queue(sync): skipping receipt check tickets=%s",
+            len(ticket_tokens),
+        )
+
 
 class RQOutboundQueue:
     """Redis Queue adapter — enqueues jobs for worker consumption."""
@@ -132,6 +241,117 @@ class RQOutboundQueue:
             )
             return None
 
+    def enqueue_send_email_batch(
+        self, messages: Sequence[EmailMessage]
+    ) -> list[str | None]:
+        if not messages:
+            return []
+        try:
+            jobs = self._queue.enqueue_many(
+                [
+                    self._queue.prepare_data(
+                        "app.jobs.email_jobs.send_email",
+                        kwargs={
+                            "to_email": message.to_email,
+                            "subject": message.subject,
+                            "html": message.html,
+                            "text": message.text,
+                            "tag": message.tag,
+                        },
+                        timeout=_JOB_TIMEOUT_SECONDS,
+                    )
+                    for message in messages
+                ]
+            )
+            logger.debug("outbound_queue(rq): enqueued %s emails", len(jobs))
+            return [str(job.id) for job in jobs]
+        except Exception as exc:
+            logger.warning(
+                "outbound_queue(rq): batch enqueue failed — falling back to sync. "
+                "reason=%s",
+                str(exc),
+            )
+            return SyncOutboundQueue().enqueue_send_email_batch(messages)
+
+    def enqueue_export_job(self, *, job_id: str) -> str | None:
+        try:
+            # Positional: ``job_id`` is a reserved keyword of ``Queue.enqueue``.
+            job = self._queue.enqueue(
+                "app.jobs.export_jobs.run_export_job",
+                job_id,
+                job_timeout=_EXPORT_JOB_TIMEOUT,
+            )
+            return str(job.id)
+        except Exception as exc:
+            logger.warning(
+                "outbound_queue(rq): export enqueue failed — falling back to sync. "
+                "reason=%s",
+                str(exc),
+            )
+            SyncOutboundQueue().enqueue_export_job(job_id=job_id)
+            return None
+
+    def enqueue_csv_import(
+        self, *, batch_id: str, payload_key: str, column_map: dict[str, str]
+    ) -> str | None:
+        try:
+            job = self._queue.enqueue(
+                "app.jobs.fiscal_jobs.import_receivables_csv",
+                batch_id,
+                payload_key,
+                column_map,
+                job_timeout=_CSV_IMPORT_JOB_TIMEOUT,
+            )
+            return str(job.id)
+        except Exception as exc:
+            logger.warning(
+                "outbound_queue(rq): csv import enqueue failed — falling back to "
+                "sync. reason=%s",
+                str(exc),
+            )
+            SyncOutboundQueue().enqueue_csv_import(
+                batch_id=batch_id, payload_key=payload_key, column_map=column_map
+            )
+            return None
+
+    def enqueue_push_batch(self, *, messages: list[dict[str, Any]]) -> str | None:
+        if not messages:
+            return None
+        try:
+            job = self._queue.enqueue(
+                "app.jobs.push_jobs.send_push_batch",
+                messages,
+                job_timeout=_JOB_TIMEOUT,
+            )
+            return str(job.id)
+        except Exception as exc:
+            logger.warning(
+                "outbound_queue(rq): push enqueue failed — falling back to sync. "
+                "reason=%s",
+                str(exc),
+            )
+            SyncOutboundQueue().enqueue_push_batch(messages=messages)
+            return None
+
+    def enqueue_push_receipts_check(
+        self, *, ticket_tokens: dict[str, str]
+    ) -> str | None:
+        try:
+            # Runs on workers started with the scheduler (``flask worker run``).
+            job = self._queue.enqueue_in(
+                timedelta(seconds=_push_receipt_delay_seconds()),
+                "app.jobs.push_jobs.check_push_receipts",
+                ticket_tokens,
+                job_timeout=_JOB_TIMEOUT,
+            )
+            return str(job.id)
+        except Exception as exc:
+            # Not retried inline: receipts are not available yet.
+            logger.warning(
+                "outbound_queue(rq): receipt check enqueue failed reason=%s", str(exc)
+            )
+            return None
+
 
 # ── Singleton factory ─────────────────────────────────────────────────────────
 
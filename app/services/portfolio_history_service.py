@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import date, timedelta
-from decimal import Decimal
+from decimal import ROUND_HALF_UP, Decimal
+from itertools import accumulate
 from typing import Any
 from uuid import UUID
 
@@ -15,6 +16,8 @@ from app.models.wallet import Wallet
 from app.services.investment_service import InvestmentService
 
 FIXED_INCOME_ASSET_CLASSES = {"cdb", "cdi", "lci", "lca", "tesouro"}
+HISTORY_GRANULARITIES = ("daily", "weekly", "monthly")
+_CENT = Decimal("0.01")
 
 
 @dataclass
@@ -41,7 +44,12 @@ class PortfolioHistoryService:
         *,
         start_date: date | None,
         end_date: date | None,
+        granularity: str = "daily",
     ) -> dict[str, Any]:
+        if granularity not in HISTORY_GRANULARITIES:
+            raise PublicValidationError(
+                "Granularidade inválida. Use daily, weekly ou monthly."
+            )
         history_range = self._resolve_range(start_date=start_date, end_date=end_date)
         wallets: list[Wallet] = (
             db.session.query(Wallet)
@@ -59,11 +67,12 @@ class PortfolioHistoryService:
             opening_event["total_operations"] += 1
 
         states = self._build_wallet_states(wallets, history_range.start_date)
-        items = self._build_daily_series(
+        items = self._build_series(
             history_range=history_range,
             events=events,
             states=states,
             ticker_prices=ticker_prices,
+            granularity=granularity,
         )
 
         total_buy_amount = sum((Decimal(i["buy_amount"]) for i in items), Decimal("0"))
@@ -86,6 +95,7 @@ class PortfolioHistoryService:
             "summary": {
                 "start_date": history_range.start_date.isoformat(),
                 "end_date": history_range.end_date.isoformat(),
+                "granularity": granularity,
                 "total_points": len(items),
                 "total_buy_amount": str(total_buy_amount),
                 "total_sell_amount": str(total_sell_amount),
@@ -305,67 +315,86 @@ class PortfolioHistoryService:
         events: dict[date, dict[str, Any]], event_date: date
     ) -> dict[str, Any]:
         if event_date not in events:
-            events[event_date] = {
-                "buy_amount": Decimal("0"),
-                "sell_amount": Decimal("0"),
-                "total_operations": 0,
-                "buy_operations": 0,
-                "sell_operations": 0,
-            }
+            events[event_date] = PortfolioHistoryService._empty_event()
         return events[event_date]
 
-    def _build_daily_series(
+    def _build_series(
         self,
         *,
         history_range: PortfolioHistoryRange,
         events: dict[date, dict[str, Any]],
         states: list[WalletState],
         ticker_prices: dict[str, dict[str, float]],
+        granularity: str,
     ) -> list[dict[str, Any]]:
-        current_date = history_range.start_date
+        days = [
+            history_range.start_date + timedelta(days=offset)
+            for offset in range(
+                (history_range.end_date - history_range.start_date).days + 1
+            )
+        ]
+        values = self._estimate_value_series(
+            days=days, states=states, ticker_prices=ticker_prices
+        )
+
+        # Points are emitted at the last day of each bucket: flows are summed
+        # over the bucket, cumulative and value estimates are taken at its end.
         cumulative_net = Decimal("0")
         items: list[dict[str, Any]] = []
-
-        while current_date <= history_range.end_date:
-            for state in states:
-                for operation in state.operations_by_date.get(current_date, []):
-                    self._apply_operation(state, operation)
-
-            event = events.get(
-                current_date,
-                {
-                    "buy_amount": Decimal("0"),
-                    "sell_amount": Decimal("0"),
-                    "total_operations": 0,
-                    "buy_operations": 0,
-                    "sell_operations": 0,
-                },
-            )
-            net = event["buy_amount"] - event["sell_amount"]
-            cumulative_net += net
-            current_value = self._estimate_current_value(
-                day=current_date,
-                states=states,
-                ticker_prices=ticker_prices,
-            )
-            profit_loss = current_value - cumulative_net
+        bucket: dict[str, Any] | None = None
+        for index, day in enumerate(days):
+            event = events.get(day)
+            if bucket is None:
+                bucket = self._empty_event()
+            if event is not None:
+                for field in bucket:
+                    bucket[field] += event[field]
+                cumulative_net += event["buy_amount"] - event["sell_amount"]
+            is_last_day = index == len(days) - 1
+            if not is_last_day and self._same_bucket(day, days[index + 1], granularity):
+                continue
+            current_value = self._to_money(values[index])
             items.append(
                 {
-                    "date": current_date.isoformat(),
-                    "total_operations": event["total_operations"],
-                    "buy_operations": event["buy_operations"],
-                    "sell_operations": event["sell_operations"],
-                    "buy_amount": str(event["buy_amount"]),
-                    "sell_amount": str(event["sell_amount"]),
-                    "net_invested_amount": str(net),
+                    "date": day.isoformat(),
+                    "total_operations": bucket["total_operations"],
+                    "buy_operations": bucket["buy_operations"],
+                    "sell_operations": bucket["sell_operations"],
+                    "buy_amount": str(bucket["buy_amount"]),
+                    "sell_amount": str(bucket["sell_amount"]),
+                    "net_invested_amount": str(
+                        bucket["buy_amount"] - bucket["sell_amount"]
+                    ),
                     "cumulative_net_invested": str(cumulative_net),
                     "total_current_value_estimate": str(current_value),
-                    "total_profit_loss_estimate": str(profit_loss),
+                    "total_profit_loss_estimate": str(current_value - cumulative_net),
                 }
             )
-            current_date += timedelta(days=1)
+            bucket = None
         return items
 
+    @staticmethod
+    def _empty_event() -> dict[str, Any]:
+        return {
+            "buy_amount": Decimal("0"),
+            "sell_amount": Decimal("0"),
+            "total_operations": 0,
+            "buy_operations": 0,
+            "sell_operations": 0,
+        }
+
+    @staticmethod
+    def _same_bucket(day: date, next_day: date, granularity: str) -> bool:
+        if granularity == "weekly":
+            return day.isocalendar()[:2] == next_day.isocalendar()[:2]
+        if granularity == "monthly":
+            return (day.year, day.month) == (next_day.year, next_day.month)
+        return False
+
+    @staticmethod
+    def _to_money(value: float) -> Decimal:
+        return Decimal(repr(value)).quantize(_CENT, rounding=ROUND_HALF_UP)
+
     @staticmethod
     def _apply_operation(state: WalletState, operation: InvestmentOperation) -> None:
         quantity = Decimal(str(operation.quantity))
@@ -385,42 +414,146 @@ class PortfolioHistoryService:
             state.quantity = Decimal("0")
             state.cost_basis = Decimal("0")
 
-    def _estimate_current_value(
+    def _estimate_value_series(
         self,
         *,
-        day: date,
+        days: list[date],
         states: list[WalletState],
         ticker_prices: dict[str, dict[str, float]],
-    ) -> Decimal:
-        total = Decimal("0")
+    ) -> list[float]:
+        """Return the portfolio value estimate for every day in *days*.
+
+        Quantity and cost basis are step functions that only change on
+        operation days, so each wallet writes its steps into difference arrays
+        over the day index instead of evaluating every day: held amounts go to
+        one flat array (or one array per fixed-income growth curve) and
+        quantities to one array per ticker. A cumulative sum of each array then
+        yields every wallet's contribution at once, and per-day work scales
+        with the number of tickers and growth curves, not wallets. Ticker closes
+        are forward-filled over days without a quote; values are only rounded
+        to ``Decimal`` cents when serialized.
+        """
+        size = len(days)
+        flat = [0.0] * (size + 1)
+        quantities: dict[str, list[float]] = {}
+        closes_by_ticker: dict[str, list[float | None]] = {}
+        growth_held: dict[tuple[float, date], list[float]] = {}
         for state in states:
-            wallet = state.wallet
-            asset_class = str(wallet.asset_class or "custom").lower()
-            if wallet.ticker:
-                ticker = wallet.ticker.upper()
-                price = ticker_prices.get(ticker, {}).get(day.isoformat())
-                if price is not None:
-                    total += Decimal(str(price)) * state.quantity
-                    continue
-            if (
-                asset_class in FIXED_INCOME_ASSET_CLASSES
-                and wallet.annual_rate is not None
-            ):
-                annual_rate = Decimal(str(wallet.annual_rate)) / Decimal("100")
-                growth_days = max((day - wallet.register_date).days, 0)
-                growth_factor = (Decimal("1") + annual_rate) ** (
-                    Decimal(growth_days) / Decimal("365")
-                )
-                invested_base = (
-                    state.cost_basis
-                    if state.cost_basis > 0
-                    else self._wallet_base_amount(wallet)
+            priced_from = size
+            quantity_diff: list[float] | None = None
+            if state.wallet.ticker:
+                ticker = state.wallet.ticker.upper()
+                if ticker not in closes_by_ticker:
+                    closes_by_ticker[ticker] = self._forward_filled_closes(
+                        days, ticker_prices.get(ticker, {})
+                    )
+                    quantities[ticker] = [0.0] * (size + 1)
+                closes = closes_by_ticker[ticker]
+                priced_from = next(
+                    (index for index, close in enumerate(closes) if close is not None),
+                    size,
                 )
-                total += invested_base * growth_factor
-                continue
-            total += (
-                state.cost_basis
-                if state.cost_basis > 0
-                else self._wallet_base_amount(wallet)
-            )
-        return total
+                quantity_diff = quantities[ticker]
+            held_diff = flat
+            growth_key = self._growth_key(state.wallet)
+            if growth_key is not None:
+                held_diff = growth_held.setdefault(growth_key, [0.0] * (size + 1))
+            for begin, end, quantity, held in self._wallet_steps(state, days=days):
+                self._add_range(held_diff, begin, min(end, priced_from), held)
+                if quantity_diff is not None:
+                    self._add_range(
+                        quantity_diff, max(begin, priced_from), end, quantity
+                    )
+
+        totals = list(accumulate(flat[:size]))
+        for ticker, quantity_diff in quantities.items():
+            self._add_ticker_column(totals, closes_by_ticker[ticker], quantity_diff)
+        for growth_key, held_diff in growth_held.items():
+            self._add_growth_column(totals, days, growth_key, held_diff)
+        return totals
+
+    @staticmethod
+    def _add_ticker_column(
+        totals: list[float],
+        closes: list[float | None],
+        quantity_diff: list[float],
+    ) -> None:
+        for index, quantity in enumerate(accumulate(quantity_diff[: len(closes)])):
+            close = closes[index]
+            if close is not None and quantity:
+                totals[index] += close * quantity
+
+    @staticmethod
+    def _add_growth_column(
+        totals: list[float],
+        days: list[date],
+        growth_key: tuple[float, date],
+        held_diff: list[float],
+    ) -> None:
+        base, register_date = growth_key
+        for index, held in enumerate(accumulate(held_diff[: len(days)])):
+            if held:
+                elapsed = max((days[index] - register_date).days, 0)
+                totals[index] += held * base ** (elapsed / 365.0)
+
+    @staticmethod
+    def _add_range(diff: list[float], begin: int, end: int, amount: float) -> None:
+        if begin >= end or not amount:
+            return
+        diff[begin] += amount
+        diff[end] -= amount
+
+    @staticmethod
+    def _forward_filled_closes(
+        days: list[date], prices: dict[str, float]
+    ) -> list[float | None]:
+        closes: list[float | None] = []
+        last: float | None = None
+        for day in days:
+            price = prices.get(day.isoformat())
+            if price is not None:
+                last = price
+            closes.append(last)
+        return closes
+
+    @staticmethod
+    def _growth_key(wallet: Wallet) -> tuple[float, date] | None:
+        asset_class = str(wallet.asset_class or "custom").lower()
+        if asset_class not in FIXED_INCOME_ASSET_CLASSES or wallet.annual_rate is None:
+            return None
+        return 1.0 + float(wallet.annual_rate) / 100.0, wallet.register_date
+
+    def _held_amount(self, state: WalletState) -> float:
+        if state.cost_basis > 0:
+            return float(state.cost_basis)
+        return float(self._wallet_base_amount(state.wallet))
+
+    def _wallet_steps(
+        self, state: WalletState, *, days: list[date]
+    ) -> list[tuple[int, int, float, float]]:
+        """Split *days* into ``(begin, end, quantity, held)`` index ranges.
+
+        A new range starts on every in-range operation day, after that day's
+        operations are applied to *state*.
+        """
+        first_day = days[0]
+        size = len(days)
+        boundaries = sorted(
+            (day - first_day).days
+            for day in state.operations_by_date
+            if 0 <= (day - first_day).days < size
+        )
+        steps: list[tuple[int, int, float, float]] = []
+        begin = 0
+        quantity = float(state.quantity)
+        held = self._held_amount(state)
+        for boundary in boundaries:
+            if boundary > begin:
+                steps.append((begin, boundary, quantity, held))
+                begin = boundary
+            for operation in state.operations_by_date[days[boundary]]:
+                self._apply_operation(state, operation)
+            quantity = float(state.quantity)
+            held = self._held_amount(state)
+        steps.append((begin, size, quantity, held))
+        return steps
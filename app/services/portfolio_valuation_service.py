@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from dataclasses import asdict, dataclass
 from datetime import date
 from decimal import Decimal
 from typing import Any
@@ -9,13 +10,121 @@ from sqlalchemy.orm import selectinload
 
 from app.extensions.database import db
 from app.models.wallet import Wallet
+from app.services.cache_service import PORTFOLIO_CACHE_TTL, get_cache_service
 from app.services.investment_operation_service import (
-    InvestmentOperationError,
     InvestmentOperationService,
+    compute_position,
 )
 from app.services.investment_service import InvestmentService
 
 FIXED_INCOME_ASSET_CLASSES = {"cdb", "cdi", "lci", "lca", "tesouro"}
+PORTFOLIO_CACHE_NAMESPACE = "portfolio:valuation"
+
+_DECIMAL_FIELDS = (
+    "value",
+    "estimated_value_on_create_date",
+    "annual_rate",
+    "operation_quantity",
+    "operation_cost_basis",
+)
+
+
+@dataclass(frozen=True)
+class PortfolioPosition:
+    """Quote-independent snapshot of one wallet entry.
+
+    The per-user list of positions is the portfolio read model: it is cached
+    under the versioned ``portfolio:valuation`` namespace (invalidated by
+    wallet and investment-operation writes) and repriced on every read with
+    the current quotes, so a quote change never requires a rebuild.
+    Attribute names mirror ``Wallet`` so allocation helpers accept either.
+    """
+
+    id: UUID
+    name: str
+    asset_class: str | None
+    ticker: str | None
+    quantity: int | None
+    value: Decimal | None
+    estimated_value_on_create_date: Decimal | None
+    annual_rate: Decimal | None
+    register_date: date
+    should_be_on_wallet: bool
+    has_operations: bool
+    operation_quantity: Decimal
+    operation_cost_basis: Decimal
+
+    @classmethod
+    def from_wallet(cls, wallet: Wallet) -> PortfolioPosition:
+        operations = list(wallet.operations)
+        position = compute_position(operations) if operations else {}
+        return cls(
+            id=wallet.id,
+            name=wallet.name,
+            asset_class=wallet.asset_class,
+            ticker=wallet.ticker,
+            quantity=wallet.quantity,
+            value=_to_decimal(wallet.value),
+            estimated_value_on_create_date=_to_decimal(
+                wallet.estimated_value_on_create_date
+            ),
+            annual_rate=_to_decimal(wallet.annual_rate),
+            register_date=wallet.register_date,
+            should_be_on_wallet=wallet.should_be_on_wallet,
+            has_operations=bool(operations),
+            operation_quantity=Decimal(position.get("current_quantity", "0")),
+            operation_cost_basis=Decimal(position.get("current_cost_basis", "0")),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["id"] = str(self.id)
+        data["register_date"] = self.register_date.isoformat()
+        for key in _DECIMAL_FIELDS:
+            if data[key] is not None:
+                data[key] = str(data[key])
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> PortfolioPosition:
+        values = dict(data)
+        values["id"] = UUID(values["id"])
+        values["register_date"] = date.fromisoformat(values["register_date"])
+        for key in _DECIMAL_FIELDS:
+            values[key] = _to_decimal(values[key])
+        return cls(**values)
+
+
+def _to_decimal(value: Any) -> Decimal | None:
+    return Decimal(str(value)) if value is not None else None
+
+
+def load_portfolio_positions(user_id: UUID) -> list[PortfolioPosition]:
+    """Return the user's positions from the read model, building it on a miss.
+
+    A miss costs two queries (wallets, then their operations in one batch);
+    a hit is a single cache read. Without Redis every call rebuilds.
+    """
+    cache = get_cache_service()
+    key = cache.versioned_key(PORTFOLIO_CACHE_NAMESPACE, user_id)
+    lookup = cache.get_or_compute(
+        key,
+        lambda: [position.to_dict() for position in _build_positions(user_id)],
+        ttl=PORTFOLIO_CACHE_TTL,
+    )
+    return [PortfolioPosition.from_dict(item) for item in lookup.value]
+
+
+def _build_positions(user_id: UUID) -> list[PortfolioPosition]:
+    # PERF-GAP-02: selectinload avoids N+1 — positions read wallet.operations
+    # for every wallet in the list.
+    wallets: list[Wallet] = (
+        db.session.query(Wallet)
+        .filter_by(user_id=user_id)
+        .options(selectinload(Wallet.operations))
+        .all()
+    )
+    return [PortfolioPosition.from_wallet(wallet) for wallet in wallets]
 
 
 class PortfolioValuationService:
@@ -25,18 +134,15 @@ class PortfolioValuationService:
 
     def get_investment_current_valuation(self, investment_id: UUID) -> dict[str, Any]:
         wallet = self._operations_service.get_owned_investment(investment_id)
-        return self._build_item(wallet)
+        position = PortfolioPosition.from_wallet(wallet)
+        return self._build_item(position, self._quote_prices([position]))
 
     def get_portfolio_current_valuation(self) -> dict[str, Any]:
-        # PERF-GAP-02: selectinload avoids N+1 — _build_item accesses
-        # wallet.operations for every wallet in the list.
-        wallets: list[Wallet] = (
-            db.session.query(Wallet)
-            .filter_by(user_id=self.user_id)
-            .options(selectinload(Wallet.operations))
-            .all()
-        )
-        items = [self._build_item(wallet) for wallet in wallets]
+        positions = load_portfolio_positions(self.user_id)
+        # One batched quote lookup for the whole portfolio instead of one
+        # sequential BRAPI round trip per ticker wallet.
+        market_prices = self._quote_prices(positions)
+        items = [self._build_item(position, market_prices) for position in positions]
         total_current_value = sum(
             (Decimal(item["current_value"]) for item in items), Decimal("0")
         )
@@ -65,11 +171,21 @@ class PortfolioValuationService:
             "items": items,
         }
 
-    def _build_item(self, wallet: Wallet) -> dict[str, Any]:
-        has_operations = bool(wallet.operations)
-        operation_quantity, operation_cost_basis = self._resolve_operations_position(
-            wallet
-        )
+    @staticmethod
+    def _quote_prices(
+        positions: list[PortfolioPosition],
+    ) -> dict[str, float | None]:
+        tickers = [position.ticker for position in positions if position.ticker]
+        if not tickers:
+            return {}
+        return InvestmentService.get_market_prices(tickers)
+
+    def _build_item(
+        self, wallet: PortfolioPosition, market_prices: dict[str, float | None]
+    ) -> dict[str, Any]:
+        has_operations = wallet.has_operations
+        operation_quantity = wallet.operation_quantity
+        operation_cost_basis = wallet.operation_cost_basis
 
         base_quantity = (
             Decimal(str(wallet.quantity)) if wallet.quantity is not None else None
@@ -87,6 +203,7 @@ class PortfolioValuationService:
             current_value, invested_amount, valuation_source, market_price = (
                 self._build_ticker_valuation(
                     wallet=wallet,
+                    market_price=market_prices.get(wallet.ticker),
                     effective_quantity=effective_quantity,
                     has_operations=has_operations,
                     operation_cost_basis=operation_cost_basis,
@@ -135,26 +252,14 @@ class PortfolioValuationService:
             "uses_operations_quantity": has_operations,
         }
 
-    def _resolve_operations_position(self, wallet: Wallet) -> tuple[Decimal, Decimal]:
-        if not wallet.operations:
-            return Decimal("0"), Decimal("0")
-        try:
-            position = self._operations_service.get_position(wallet.id)
-            return (
-                Decimal(position["current_quantity"]),
-                Decimal(position["current_cost_basis"]),
-            )
-        except InvestmentOperationError:
-            return Decimal("0"), Decimal("0")
-
     def _build_ticker_valuation(
         self,
-        wallet: Wallet,
+        wallet: PortfolioPosition,
+        market_price: float | None,
         effective_quantity: Decimal,
         has_operations: bool,
         operation_cost_basis: Decimal,
     ) -> tuple[Decimal, Decimal, str, float | None]:
-        market_price = InvestmentService.get_market_price(wallet.ticker)
         invested_amount = self._resolve_invested_amount_from_operations(
             wallet, has_operations, operation_cost_basis
         )
@@ -173,7 +278,7 @@ class PortfolioValuationService:
         return Decimal("0"), invested_amount, "manual_value", None
 
     def _build_fixed_income_valuation(
-        self, wallet: Wallet, base_quantity: Decimal | None
+        self, wallet: PortfolioPosition, base_quantity: Decimal | None
     ) -> tuple[Decimal, Decimal, str, None]:
         invested_amount = self._resolve_base_invested_amount(wallet, base_quantity)
         days = max((date.today() - wallet.register_date).days, 0)
@@ -183,7 +288,7 @@ class PortfolioValuationService:
         return current_value, invested_amount, "fixed_income_projection", None
 
     def _build_manual_valuation(
-        self, wallet: Wallet, base_quantity: Decimal | None
+        self, wallet: PortfolioPosition, base_quantity: Decimal | None
     ) -> tuple[Decimal, Decimal, str, None]:
         invested_amount = self._resolve_base_invested_amount(wallet, base_quantity)
         if invested_amount > 0:
@@ -200,7 +305,7 @@ class PortfolioValuationService:
 
     @staticmethod
     def _resolve_invested_amount_from_operations(
-        wallet: Wallet, has_operations: bool, operation_cost_basis: Decimal
+        wallet: PortfolioPosition, has_operations: bool, operation_cost_basis: Decimal
     ) -> Decimal:
         if has_operations and operation_cost_basis > 0:
             return operation_cost_basis
@@ -210,7 +315,7 @@ class PortfolioValuationService:
 
     @staticmethod
     def _resolve_base_invested_amount(
-        wallet: Wallet, base_quantity: Decimal | None
+        wallet: PortfolioPosition, base_quantity: Decimal | None
     ) -> Decimal:
         if wallet.value is not None and base_quantity is not None:
             return Decimal(str(wallet.value)) * base_quantity
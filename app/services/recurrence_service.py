@@ -1,19 +1,43 @@
+"""Materialisation of recurring transactions.
+
+Set-based engine: recurring users are streamed in keyset-ordered chunks. Per
+chunk, one query loads the occurrence keys already present, the expected due
+dates of every series are computed in memory, and only the missing ones are
+bulk-inserted and committed together. Each occurrence carries a deterministic
+``recurrence_key`` (``"<series id>:<due date>"``) backed by a unique index, so
+re-runs and concurrent workers stay idempotent. ``shards``/``shard`` split the
+users across worker processes (see ``scripts/generate_recurring_transactions.py
+--workers``).
+"""
+
 from __future__ import annotations
 
 import calendar
 import logging
+from collections import defaultdict
+from collections.abc import Iterator
 from dataclasses import dataclass
 from datetime import date, timedelta
-from typing import Iterable
+from typing import Any, Iterable
+from uuid import UUID, uuid4
 
-from app.extensions.database import db
+from app.extensions.database import db, dialect_insert
 from app.models.transaction import RecurrenceUnit, Transaction
+from app.services.cache_service import get_cache_service
+from app.services.transaction_rollup_service import refresh_rollup_days
+from app.utils.datetime_utils import utc_now_naive
 
 logger = logging.getLogger(__name__)
 
 # Safety bound: when a recurring transaction has no usable end_date, materialise
 # at most this far ahead so a runaway cadence cannot flood the table.
 _MAX_HORIZON_DAYS = 366 * 2
+DEFAULT_CHUNK_USERS = 200
+_INSERT_BATCH_SIZE = 500
+
+
+def occurrence_key(series_id: UUID, due_date: date) -> str:
+    return f"{series_id}:{due_date.isoformat()}"
 
 
 def _add_months(value: date, months: int) -> date:
@@ -87,29 +111,37 @@ class RecurrenceService:
             due_date = _advance(due_date, unit, interval)
 
     @staticmethod
-    def generate_missing_occurrences(reference_date: date | None = None) -> int:
+    def generate_missing_occurrences(
+        reference_date: date | None = None,
+        *,
+        chunk_size: int = DEFAULT_CHUNK_USERS,
+        shard: int = 0,
+        shards: int = 1,
+    ) -> int:
+        """Materialise every missing occurrence; returns how many were created.
+
+        Commits once per chunk of ``chunk_size`` users. With ``shards > 1`` only
+        users whose id falls in ``shard`` are processed.
+        """
         reference = reference_date or date.today()
-        templates = Transaction.query.filter_by(
-            is_recurring=True,
-            deleted=False,
-        ).all()
+        created = 0
+        chunks = 0
+        for user_ids in RecurrenceService._iter_user_chunks(
+            chunk_size=max(int(chunk_size), 1), shard=shard, shards=max(shards, 1)
+        ):
+            chunks += 1
+            created += RecurrenceService._materialize_users(user_ids, reference)
 
         logger.info(
-            "recurrence: found %d recurring template(s) for reference_date=%s",
-            len(templates),
+            "recurrence: processed %d chunk(s) for reference_date=%s "
+            "(shard %d/%d) — created %d occurrence(s)",
+            chunks,
             reference,
+            shard,
+            shards,
+            created,
         )
-
-        created: list[Transaction] = []
-        for template in templates:
-            window = RecurrenceService._build_window(template, reference)
-            if window is None:
-                continue
-            created.extend(
-                RecurrenceService._build_occurrences(template=template, window=window)
-            )
-
-        return RecurrenceService._persist(created)
+        return created
 
     @staticmethod
     def materialize_for_template(
@@ -125,82 +157,194 @@ class RecurrenceService:
         window = RecurrenceService._build_window(template, reference)
         if window is None:
             return 0
-        return RecurrenceService._persist(
-            RecurrenceService._build_occurrences(template=template, window=window)
+        series_id = template.installment_group_id or template.id
+        existing = RecurrenceService._existing_keys(
+            [template.user_id], series_id=series_id
+        )
+        rows = RecurrenceService._missing_rows(
+            template=template, window=window, existing=existing
+        )
+        return RecurrenceService._persist(rows)
+
+    @staticmethod
+    def _iter_user_chunks(
+        *, chunk_size: int, shard: int, shards: int
+    ) -> Iterator[list[UUID]]:
+        """Yield ids of users owning live recurring rows, keyset-ordered."""
+        tx = Transaction.__table__
+        last: UUID | None = None
+        while True:
+            stmt = (
+                db.select(tx.c.user_id)
+                .where(tx.c.is_recurring.is_(True), tx.c.deleted.is_(False))
+                .distinct()
+                .order_by(tx.c.user_id)
+                .limit(chunk_size)
+            )
+            if last is not None:
+                stmt = stmt.where(tx.c.user_id > last)
+            batch = list(db.session.execute(stmt).scalars())
+            if not batch:
+                return
+            last = batch[-1]
+            owned = [uid for uid in batch if shards == 1 or uid.int % shards == shard]
+            if owned:
+                yield owned
+            if len(batch) < chunk_size:
+                return
+
+    @staticmethod
+    def _existing_keys(
+        user_ids: list[UUID], *, series_id: UUID | None = None
+    ) -> set[tuple[UUID, str]]:
+        """Occurrence keys already taken (soft-deleted rows included).
+
+        Rows written before ``recurrence_key`` existed get their key derived
+        from ``(installment_group_id or id, due_date)``.
+        """
+        tx = Transaction.__table__
+        stmt = db.select(
+            tx.c.user_id,
+            tx.c.id,
+            tx.c.installment_group_id,
+            tx.c.due_date,
+            tx.c.recurrence_key,
+        ).where(tx.c.user_id.in_(user_ids), tx.c.is_recurring.is_(True))
+        if series_id is not None:
+            stmt = stmt.where(
+                (tx.c.installment_group_id == series_id) | (tx.c.id == series_id)
+            )
+        return {
+            (user_id, key or occurrence_key(group_id or row_id, due_date))
+            for user_id, row_id, group_id, due_date, key in db.session.execute(stmt)
+        }
+
+    @staticmethod
+    def _materialize_users(user_ids: list[UUID], reference: date) -> int:
+        existing = RecurrenceService._existing_keys(user_ids)
+        templates = (
+            Transaction.query.filter(
+                Transaction.user_id.in_(user_ids),
+                Transaction.is_recurring.is_(True),
+                Transaction.deleted.is_(False),
+            )
+            .order_by(Transaction.due_date.asc(), Transaction.id.asc())
+            .all()
         )
+        # The earliest live member of a series yields a superset of the due
+        # dates its later members would, so one generator per series suffices.
+        generators: dict[UUID, tuple[Transaction, RecurrenceWindow]] = {}
+        for template in templates:
+            series_id = template.installment_group_id or template.id
+            if series_id in generators:
+                continue
+            window = RecurrenceService._build_window(template, reference)
+            if window is not None:
+                generators[series_id] = (template, window)
+
+        rows: list[dict[str, Any]] = []
+        for template, window in generators.values():
+            rows.extend(
+                RecurrenceService._missing_rows(
+                    template=template, window=window, existing=existing
+                )
+            )
+        return RecurrenceService._persist(rows)
 
     @staticmethod
-    def _build_occurrences(
-        *, template: Transaction, window: RecurrenceWindow
-    ) -> list[Transaction]:
-        occurrences: list[Transaction] = []
+    def _missing_rows(
+        *,
+        template: Transaction,
+        window: RecurrenceWindow,
+        existing: set[tuple[UUID, str]],
+    ) -> list[dict[str, Any]]:
+        series_id = template.installment_group_id or template.id
+        unit = template.recurrence_unit or RecurrenceUnit.month
+        interval = template.recurrence_interval or 1
         expected_dates = RecurrenceService._iter_expected_due_dates(
             window=window,
             base_due_date=template.due_date,
-            unit=template.recurrence_unit or RecurrenceUnit.month,
-            interval=template.recurrence_interval or 1,
+            unit=unit,
+            interval=interval,
         )
+        now = utc_now_naive()
+        rows: list[dict[str, Any]] = []
         for due in expected_dates:
-            if due == template.due_date:
-                continue
-
-            exists = Transaction.query.filter_by(
-                user_id=template.user_id,
-                title=template.title,
-                amount=template.amount,
-                type=template.type,
-                due_date=due,
-                is_recurring=True,
-                start_date=template.start_date,
-                end_date=template.end_date,
-                deleted=False,
-            ).first()
-            if exists:
+            key = occurrence_key(series_id, due)
+            if due == template.due_date or (template.user_id, key) in existing:
                 continue
-
-            occurrences.append(
-                Transaction(
-                    user_id=template.user_id,
-                    title=template.title,
-                    description=template.description,
-                    observation=template.observation,
-                    is_recurring=True,
-                    is_installment=False,
-                    installment_count=None,
-                    recurrence_interval=template.recurrence_interval or 1,
-                    recurrence_unit=template.recurrence_unit or RecurrenceUnit.month,
-                    amount=template.amount,
-                    currency=template.currency,
-                    status=template.status,
-                    type=template.type,
-                    due_date=due,
-                    start_date=template.start_date,
-                    end_date=template.end_date,
-                    tag_id=template.tag_id,
-                    account_id=template.account_id,
-                    credit_card_id=template.credit_card_id,
-                    installment_group_id=(template.installment_group_id or template.id),
-                    paid_at=None,
-                )
+            existing.add((template.user_id, key))
+            rows.append(
+                {
+                    "id": uuid4(),
+                    "user_id": template.user_id,
+                    "title": template.title,
+                    "description": template.description,
+                    "observation": template.observation,
+                    "is_recurring": True,
+                    "is_installment": False,
+                    "installment_count": None,
+                    "recurrence_interval": interval,
+                    "recurrence_unit": unit,
+                    "amount": template.amount,
+                    "currency": template.currency,
+                    "status": template.status,
+                    "type": template.type,
+                    "due_date": due,
+                    "start_date": template.start_date,
+                    "end_date": template.end_date,
+                    "tag_id": template.tag_id,
+                    "account_id": template.account_id,
+                    "credit_card_id": template.credit_card_id,
+                    "installment_group_id": series_id,
+                    "recurrence_key": key,
+                    "paid_at": None,
+                    "source": "manual",
+                    "deleted": False,
+                    "created_at": now,
+                    "updated_at": now,
+                }
             )
-        return occurrences
+        return rows
 
     @staticmethod
-    def _persist(created: list[Transaction]) -> int:
-        if not created:
-            logger.info("recurrence: no new occurrences to create")
+    def _persist(rows: list[dict[str, Any]]) -> int:
+        if not rows:
             return 0
 
+        touched: dict[UUID, set[date]] = defaultdict(set)
+        for row in rows:
+            touched[row["user_id"]].add(row["due_date"])
         try:
-            db.session.add_all(created)
+            connection = db.session.connection()
+            insert = dialect_insert(connection.dialect.name)
+            created = 0
+            for offset in range(0, len(rows), _INSERT_BATCH_SIZE):
+                stmt = insert(Transaction.__table__).values(
+                    rows[offset : offset + _INSERT_BATCH_SIZE]
+                )
+                result = connection.execute(
+                    stmt.on_conflict_do_nothing(
+                        index_elements=["user_id", "recurrence_key"]
+                    )
+                )
+                # Rows skipped by ON CONFLICT (a concurrent run got there
+                # first) are not counted as created.
+                created += max(result.rowcount, 0)
+            # Core inserts bypass the ORM flush listener that keeps the
+            # daily rollups in sync.
+            refresh_rollup_days(connection, touched)
             db.session.commit()
         except Exception:
             db.session.rollback()
             logger.exception(
                 "recurrence: failed to persist %d occurrence(s) — session rolled back",
-                len(created),
+                len(rows),
             )
             raise
 
-        logger.info("recurrence: created %d new occurrence(s)", len(created))
-        return len(created)
+        cache = get_cache_service()
+        for user_id in touched:
+            cache.invalidate_domain("transactions", user_id)
+        logger.info("recurrence: created %d new occurrence(s)", created)
+        return created
@@ -0,0 +1,303 @@
+"""Shared daily price store in front of the BRAPI historical endpoint.
+
+Historical closes are kept in ``ticker_daily_prices`` and shared by every
+user. A lookup reads the store and only calls the provider for the part of
+the requested range that ``ticker_price_coverage`` does not cover yet.
+
+BRAPI only serves ranges anchored at today (``5d``, ``1mo`` … ``max``), so a
+gap is filled with the smallest range reaching back to its first day and the
+coverage always ends today. Today's close is intraday and is refreshed at
+most every ``BRAPI_INTRADAY_REFRESH_SECONDS`` (default 900).
+
+Writes run in their own short transaction on the engine so a read path never
+commits the caller's unit of work.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import func
+
+from app.extensions.database import db, dialect_insert
+from app.models.ticker_daily_price import TickerDailyPrice, TickerPriceCoverage
+from app.models.wallet import Wallet
+from app.utils.datetime_utils import utc_now_naive
+
+logger = logging.getLogger(__name__)
+
+# ``(ticker, brapi_range) -> {day: close}``; ``None`` when the provider failed.
+HistoryFetcher = Callable[[str, str], dict[date, float] | None]
+
+# BRAPI range → calendar days it is guaranteed to reach back (conservative:
+# "1mo" may be 28 days in February). ``None`` means the full history.
+BRAPI_RANGES: tuple[tuple[str, int | None], ...] = (
+    ("5d", 5),
+    ("1mo", 28),
+    ("3mo", 89),
+    ("6mo", 180),
+    ("1y", 365),
+    ("2y", 730),
+    ("5y", 1825),
+    ("10y", 3650),
+    ("max", None),
+)
+_BRAPI_RANGE_SPANS = dict(BRAPI_RANGES)
+_DEFAULT_INTRADAY_REFRESH_SECONDS = 900
+_INSERT_CHUNK_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class PriceCoverage:
+    covered_from: date
+    covered_to: date
+    refreshed_at: datetime
+
+
+def brapi_range_for(days_back: int) -> str:
+    """Return the smallest BRAPI range reaching *days_back* days before today."""
+    for name, span in BRAPI_RANGES:
+        if span is None or span >= days_back:
+            return name
+    return "max"
+
+
+def _intraday_refresh_seconds() -> int:
+    raw = str(os.getenv("BRAPI_INTRADAY_REFRESH_SECONDS", "")).strip()
+    try:
+        return int(raw) if raw else _DEFAULT_INTRADAY_REFRESH_SECONDS
+    except ValueError:
+        return _DEFAULT_INTRADAY_REFRESH_SECONDS
+
+
+def load_coverage(ticker: str) -> PriceCoverage | None:
+    row = db.session.execute(
+        db.select(
+            TickerPriceCoverage.covered_from,
+            TickerPriceCoverage.covered_to,
+            TickerPriceCoverage.refreshed_at,
+        ).where(TickerPriceCoverage.ticker == ticker)
+    ).first()
+    if row is None:
+        return None
+    return PriceCoverage(
+        covered_from=row.covered_from,
+        covered_to=row.covered_to,
+        refreshed_at=row.refreshed_at,
+    )
+
+
+def missing_from(
+    coverage: PriceCoverage | None,
+    *,
+    start: date,
+    end: date,
+    today: date,
+    now: datetime,
+) -> date | None:
+    """Return the first day that must be fetched, or ``None`` if fully covered.
+
+    The fetch always runs from that day up to today, which keeps the stored
+    coverage a single contiguous interval.
+    """
+    end = min(end, today)
+    if start > end:
+        return None
+    if coverage is None or start < coverage.covered_from:
+        return start
+    if end > coverage.covered_to:
+        return coverage.covered_to + timedelta(days=1)
+    stale_seconds = (now - coverage.refreshed_at).total_seconds()
+    if end >= today and stale_seconds > _intraday_refresh_seconds():
+        return today
+    return None
+
+
+def read_prices(ticker: str, *, start: date, end: date) -> dict[str, float]:
+    """Return ``{YYYY-MM-DD: close}`` stored for ``[start, end]``."""
+    rows = db.session.execute(
+        db.select(TickerDailyPrice.day, TickerDailyPrice.close).where(
+            TickerDailyPrice.ticker == ticker,
+            TickerDailyPrice.day >= start,
+            TickerDailyPrice.day <= end,
+        )
+    )
+    return {day.isoformat(): float(close) for day, close in rows}
+
+
+def _merge_coverage(
+    existing: PriceCoverage | None, *, covered_from: date, covered_to: date
+) -> tuple[date, date]:
+    # A non-overlapping interval replaces the old one: claiming the days in
+    # between as covered would hide a real gap.
+    if (
+        existing is None
+        or covered_from > existing.covered_to + timedelta(days=1)
+        or covered_to < existing.covered_from - timedelta(days=1)
+    ):
+        return covered_from, covered_to
+    return (
+        min(covered_from, existing.covered_from),
+        max(covered_to, existing.covered_to),
+    )
+
+
+def store_prices(
+    ticker: str,
+    prices: dict[date, float],
+    *,
+    covered_from: date,
+    covered_to: date,
+) -> None:
+    """Upsert *prices* and extend the ticker coverage in one transaction."""
+    merged_from, merged_to = _merge_coverage(
+        load_coverage(ticker), covered_from=covered_from, covered_to=covered_to
+    )
+    rows = [
+        {"ticker": ticker, "day": day, "close": Decimal(str(close))}
+        for day, close in sorted(prices.items())
+    ]
+    with db.engine.begin() as connection:
+        insert = dialect_insert(connection.dialect.name)
+        for offset in range(0, len(rows), _INSERT_CHUNK_SIZE):
+            stmt = insert(TickerDailyPrice.__table__).values(
+                rows[offset : offset + _INSERT_CHUNK_SIZE]
+            )
+            connection.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["ticker", "day"],
+                    set_={"close": stmt.excluded.close},
+                )
+            )
+        coverage_stmt = insert(TickerPriceCoverage.__table__).values(
+            ticker=ticker,
+            covered_from=merged_from,
+            covered_to=merged_to,
+            refreshed_at=utc_now_naive(),
+        )
+        connection.execute(
+            coverage_stmt.on_conflict_do_update(
+                index_elements=["ticker"],
+                set_={
+                    "covered_from": coverage_stmt.excluded.covered_from,
+                    "covered_to": coverage_stmt.excluded.covered_to,
+                    "refreshed_at": coverage_stmt.excluded.refreshed_at,
+                },
+            )
+        )
+
+
+def _fetch_and_store(
+    ticker: str,
+    brapi_range: str,
+    *,
+    fetch: HistoryFetcher,
+    today: date,
+    fallback_from: date,
+) -> tuple[dict[date, float], bool] | None:
+    """Fetch and persist; return ``(prices, persisted)`` or ``None`` on failure."""
+    fetched = fetch(ticker, brapi_range)
+    if fetched is None:
+        return None
+    span = _BRAPI_RANGE_SPANS.get(brapi_range)
+    covered_from = today - timedelta(days=span) if span is not None else fallback_from
+    if fetched:
+        covered_from = min(covered_from, min(fetched))
+    try:
+        store_prices(ticker, fetched, covered_from=covered_from, covered_to=today)
+    except Exception:
+        logger.warning(
+            "ticker_price_store: failed to persist prices for %s",
+            ticker,
+            exc_info=True,
+        )
+        return fetched, False
+    return fetched, True
+
+
+def get_daily_prices(
+    ticker: str,
+    *,
+    start: date,
+    end: date,
+    fetch: HistoryFetcher,
+    today: date | None = None,
+) -> dict[str, float]:
+    """Return ``{YYYY-MM-DD: close}`` for ``[start, end]``, filling gaps first.
+
+    When the provider fails the prices already stored are returned.
+    """
+    today = today or date.today()
+    first_missing = missing_from(
+        load_coverage(ticker),
+        start=start,
+        end=end,
+        today=today,
+        now=utc_now_naive(),
+    )
+    if first_missing is not None:
+        result = _fetch_and_store(
+            ticker,
+            brapi_range_for((today - first_missing).days),
+            fetch=fetch,
+            today=today,
+            fallback_from=first_missing,
+        )
+        if result is not None and not result[1]:
+            return {
+                day.isoformat(): close
+                for day, close in result[0].items()
+                if start <= day <= end
+            }
+    return read_prices(ticker, start=start, end=end)
+
+
+def backfill_ticker(
+    ticker: str,
+    *,
+    brapi_range: str,
+    fetch: HistoryFetcher,
+    today: date | None = None,
+) -> int | None:
+    """Fetch *brapi_range* of history into the store; return rows or ``None``."""
+    if brapi_range not in _BRAPI_RANGE_SPANS:
+        raise ValueError(f"Unknown BRAPI range: {brapi_range}")
+    today = today or date.today()
+    result = _fetch_and_store(
+        ticker, brapi_range, fetch=fetch, today=today, fallback_from=today
+    )
+    return None if result is None else len(result[0])
+
+
+def popular_tickers(limit: int) -> list[str]:
+    """Return the tickers held in the most wallets, most popular first."""
+    ticker = func.upper(Wallet.ticker)
+    rows = (
+        db.session.query(ticker, func.count(Wallet.id))
+        .filter(Wallet.ticker.isnot(None), Wallet.ticker != "")
+        .group_by(ticker)
+        .order_by(func.count(Wallet.id).desc(), ticker)
+        .limit(limit)
+        .all()
+    )
+    return [str(row[0]) for row in rows]
+
+
+__all__ = [
+    "BRAPI_RANGES",
+    "HistoryFetcher",
+    "PriceCoverage",
+    "backfill_ticker",
+    "brapi_range_for",
+    "get_daily_prices",
+    "load_coverage",
+    "missing_from",
+    "popular_tickers",
+    "read_prices",
+    "store_prices",
+]
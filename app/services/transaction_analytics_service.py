@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+from calendar import monthrange
+from datetime import date
 from typing import TYPE_CHECKING, Any, cast
 from uuid import UUID
 
-from sqlalchemy import case, func, literal
+from sqlalchemy import case, func
 
 from app.extensions.database import db
 from app.models.tag import Tag
 from app.models.transaction import Transaction, TransactionStatus, TransactionType
+from app.models.transaction_daily_rollup import TransactionDailyRollup
+from app.services.transaction_rollup_service import range_filters
 from app.services.transaction_trends import (
     classify_survival as classify_survival,  # re-export
 )
@@ -22,18 +26,43 @@ if TYPE_CHECKING:
         TransactionTrendsResult,
     )
 
+_Rollup = TransactionDailyRollup
+_STATUS_KEYS = tuple(status.value for status in TransactionStatus)
+
+
+def _month_bounds(year: int, month_number: int) -> tuple[date, date]:
+    return (
+        date(year, month_number, 1),
+        date(year, month_number, monthrange(year, month_number)[1]),
+    )
+
+
+def _sum_if(condition: Any, value: Any) -> Any:
+    return func.coalesce(func.sum(case((condition, value), else_=0)), 0)
+
 
 class TransactionAnalyticsService:
+    """Month-level dashboard analytics.
+
+    Aggregates are served from ``transaction_daily_rollups`` (see
+    ``app.services.transaction_rollup_service``) with sargable
+    ``(user_id, day)`` range predicates; row listings read ``transactions``
+    using the ``(user_id, deleted, due_date)`` index.
+    """
+
     def __init__(self, user_id: UUID) -> None:
         self.user_id = user_id
 
     def _month_query(self, *, year: int, month_number: int) -> Any:
-        return (
-            Transaction.query.filter_by(user_id=self.user_id, deleted=False)
-            .filter(db.extract("year", Transaction.due_date) == year)
-            .filter(db.extract("month", Transaction.due_date) == month_number)
+        start, end = _month_bounds(year, month_number)
+        return Transaction.query.filter_by(user_id=self.user_id, deleted=False).filter(
+            Transaction.due_date >= start, Transaction.due_date <= end
         )
 
+    def _month_rollup_filters(self, *, year: int, month_number: int) -> tuple[Any, ...]:
+        start, end = _month_bounds(year, month_number)
+        return range_filters(user_id=self.user_id, start=start, end=end)
+
     def get_month_transactions(
         self, *, year: int, month_number: int
     ) -> list[Transaction]:
@@ -41,8 +70,12 @@ class TransactionAnalyticsService:
         return cast(list[Transaction], transactions)
 
     def get_month_transaction_count(self, *, year: int, month_number: int) -> int:
-        total = self._month_query(year=year, month_number=month_number).count()
-        return int(total)
+        total = (
+            db.session.query(func.coalesce(func.sum(_Rollup.tx_count), 0))
+            .filter(*self._month_rollup_filters(year=year, month_number=month_number))
+            .scalar()
+        )
+        return int(total or 0)
 
     def get_month_transactions_page(
         self,
@@ -62,83 +95,22 @@ class TransactionAnalyticsService:
         return cast(list[Transaction], transactions)
 
     def get_month_aggregates(self, *, year: int, month_number: int) -> dict[str, Any]:
-        row = (
-            db.session.query(
-                func.coalesce(
-                    func.sum(
-                        case(
-                            (
-                                Transaction.type == TransactionType.INCOME,
-                                Transaction.amount,
-                            ),
-                            else_=0,
-                        )
-                    ),
-                    0,
-                ).label("income_total"),
-                func.coalesce(
-                    func.sum(
-                        case(
-                            (
-                                Transaction.type == TransactionType.EXPENSE,
-                                Transaction.amount,
-                            ),
-                            else_=0,
-                        )
-                    ),
-                    0,
-                ).label("expense_total"),
-                func.count(Transaction.id).label("total_transactions"),
-                func.coalesce(
-                    func.sum(
-                        case((Transaction.type == TransactionType.INCOME, 1), else_=0)
-                    ),
-                    0,
-                ).label("income_transactions"),
-                func.coalesce(
-                    func.sum(
-                        case((Transaction.type == TransactionType.EXPENSE, 1), else_=0)
-                    ),
-                    0,
-                ).label("expense_transactions"),
-            )
-            .filter(Transaction.user_id == self.user_id)
-            .filter(Transaction.deleted.is_(False))
-            .filter(db.extract("year", Transaction.due_date) == year)
-            .filter(db.extract("month", Transaction.due_date) == month_number)
-            .one()
+        overview = self.get_dashboard_overview_coalesced(
+            year=year, month_number=month_number
         )
-
-        income_total = row.income_total or 0
-        expense_total = row.expense_total or 0
-        return {
-            "income_total": income_total,
-            "expense_total": expense_total,
-            "balance": income_total - expense_total,
-            "total_transactions": int(row.total_transactions or 0),
-            "income_transactions": int(row.income_transactions or 0),
-            "expense_transactions": int(row.expense_transactions or 0),
-        }
+        overview.pop("status")
+        return overview
 
     def get_status_counts(self, *, year: int, month_number: int) -> dict[str, int]:
-        default_counts = {
-            "paid": 0,
-            "pending": 0,
-            "cancelled": 0,
-            "postponed": 0,
-            "overdue": 0,
-        }
+        default_counts = dict.fromkeys(_STATUS_KEYS, 0)
         rows = (
-            db.session.query(Transaction.status, func.count(Transaction.id))
-            .filter(Transaction.user_id == self.user_id)
-            .filter(Transaction.deleted.is_(False))
-            .filter(db.extract("year", Transaction.due_date) == year)
-            .filter(db.extract("month", Transaction.due_date) == month_number)
-            .group_by(Transaction.status)
+            db.session.query(_Rollup.status, func.sum(_Rollup.tx_count))
+            .filter(*self._month_rollup_filters(year=year, month_number=month_number))
+            .group_by(_Rollup.status)
             .all()
         )
-        for status_enum, count in rows:
-            default_counts[status_enum.value] = int(count)
+        for status_value, count in rows:
+            default_counts[status_value] = int(count or 0)
         return default_counts
 
     def get_top_categories(
@@ -148,143 +120,40 @@ class TransactionAnalyticsService:
         month_number: int,
         transaction_type: TransactionType,
     ) -> list[dict[str, Any]]:
-        rows = (
-            db.session.query(
-                Transaction.tag_id,
-                Tag.name,
-                func.coalesce(func.sum(Transaction.amount), 0).label("total_amount"),
-                func.count(Transaction.id).label("transactions_count"),
-            )
-            .outerjoin(Tag, Tag.id == Transaction.tag_id)
-            .filter(Transaction.user_id == self.user_id)
-            .filter(Transaction.deleted.is_(False))
-            .filter(Transaction.type == transaction_type)
-            .filter(db.extract("year", Transaction.due_date) == year)
-            .filter(db.extract("month", Transaction.due_date) == month_number)
-            .group_by(Transaction.tag_id, Tag.name)
-            .order_by(func.sum(Transaction.amount).desc())
-            .limit(5)
-            .all()
-        )
-
-        return [
-            {
-                "tag_id": str(tag_id) if tag_id else None,
-                "category_name": tag_name or "Sem categoria",
-                "total_amount": float(total_amount),
-                "transactions_count": int(transactions_count),
-            }
-            for tag_id, tag_name, total_amount, transactions_count in rows
-        ]
+        both = self.get_top_categories_both(year=year, month_number=month_number)
+        if transaction_type == TransactionType.INCOME:
+            return both["top_income_categories"]
+        return both["top_expense_categories"]
 
     def get_dashboard_overview_coalesced(
         self, *, year: int, month_number: int
     ) -> dict[str, Any]:
-        """Coalesce aggregates + status into 1 SQL query (down from 2).
-
-        PERF: antes get_month_aggregates + get_status_counts emitiam 2
-        queries separadas. Este metodo combina ambos em uma unica passagem
-        via CASE/conditional aggregation.
+        """Totals, per-type counts and status breakdown in one rollup read.
 
-        Usado por get_month_dashboard junto com get_top_categories_both
-        para reduzir o total do dashboard de 4 queries para 2.
+        PERF: reads the month's pre-aggregated rollup rows (a few dozen at
+        most) via a sargable ``(user_id, day)`` range instead of scanning raw
+        transactions with ``extract(year/month, due_date)``.
         """
-        _base = (
-            Transaction.user_id == self.user_id,
-            Transaction.deleted.is_(False),
-            db.extract("year", Transaction.due_date) == year,
-            db.extract("month", Transaction.due_date) == month_number,
-        )
-
+        is_income = _Rollup.type == TransactionType.INCOME.value
+        is_expense = _Rollup.type == TransactionType.EXPENSE.value
+        status_columns = [
+            _sum_if(_Rollup.status == status_value, _Rollup.tx_count).label(
+                f"status_{status_value}"
+            )
+            for status_value in _STATUS_KEYS
+        ]
         row = (
             db.session.query(
-                func.coalesce(
-                    func.sum(
-                        case(
-                            (
-                                Transaction.type == TransactionType.INCOME,
-                                Transaction.amount,
-                            ),
-                            else_=0,
-                        )
-                    ),
-                    0,
-                ).label("income_total"),
-                func.coalesce(
-                    func.sum(
-                        case(
-                            (
-                                Transaction.type == TransactionType.EXPENSE,
-                                Transaction.amount,
-                            ),
-                            else_=0,
-                        )
-                    ),
-                    0,
-                ).label("expense_total"),
-                func.count(Transaction.id).label("total_transactions"),
-                func.coalesce(
-                    func.sum(
-                        case(
-                            (Transaction.type == TransactionType.INCOME, 1),
-                            else_=0,
-                        )
-                    ),
-                    0,
-                ).label("income_transactions"),
-                func.coalesce(
-                    func.sum(
-                        case(
-                            (Transaction.type == TransactionType.EXPENSE, 1),
-                            else_=0,
-                        )
-                    ),
-                    0,
-                ).label("expense_transactions"),
-                func.coalesce(
-                    func.sum(
-                        case((Transaction.status == TransactionStatus.PAID, 1), else_=0)
-                    ),
-                    0,
-                ).label("status_paid"),
-                func.coalesce(
-                    func.sum(
-                        case(
-                            (Transaction.status == TransactionStatus.PENDING, 1),
-                            else_=0,
-                        )
-                    ),
-                    0,
-                ).label("status_pending"),
-                func.coalesce(
-                    func.sum(
-                        case(
-                            (Transaction.status == TransactionStatus.CANCELLED, 1),
-                            else_=0,
-                        )
-                    ),
-                    0,
-                ).label("status_cancelled"),
-                func.coalesce(
-                    func.sum(
-                        case(
-                            (Transaction.status == TransactionStatus.POSTPONED, 1),
-                            else_=0,
-                        )
-                    ),
-                    0,
-                ).label("status_postponed"),
-                func.coalesce(
-                    func.sum(
-                        case(
-                            (Transaction.status == TransactionStatus.OVERDUE, 1),
-                            else_=0,
-                        )
-                    ),
-                    0,
-                ).label("status_overdue"),
+                _sum_if(is_income, _Rollup.amount_total).label("income_total"),
+                _sum_if(is_expense, _Rollup.amount_total).label("expense_total"),
+                func.coalesce(func.sum(_Rollup.tx_count), 0).label(
+                    "total_transactions"
+                ),
+                _sum_if(is_income, _Rollup.tx_count).label("income_transactions"),
+                _sum_if(is_expense, _Rollup.tx_count).label("expense_transactions"),
+                *status_columns,
             )
-            .filter(*_base)
+            .filter(*self._month_rollup_filters(year=year, month_number=month_number))
             .one()
         )
 
@@ -299,11 +168,8 @@ class TransactionAnalyticsService:
             "income_transactions": int(row.income_transactions or 0),
             "expense_transactions": int(row.expense_transactions or 0),
             "status": {
-                "paid": int(row.status_paid or 0),
-                "pending": int(row.status_pending or 0),
-                "cancelled": int(row.status_cancelled or 0),
-                "postponed": int(row.status_postponed or 0),
-                "overdue": int(row.status_overdue or 0),
+                status_value: int(getattr(row, f"status_{status_value}") or 0)
+                for status_value in _STATUS_KEYS
             },
         }
 
@@ -314,75 +180,47 @@ class TransactionAnalyticsService:
         month_number: int,
         limit: int = 5,
     ) -> dict[str, list[dict[str, Any]]]:
-        """Return top-categories for INCOME and EXPENSE in a UNION ALL query.
+        """Return top-categories for INCOME and EXPENSE in one grouped read.
 
-        PERF: replaces two get_top_categories calls with a single query
-        that fetches both sets in one round-trip to the database.
+        PERF: a single ``GROUP BY type, tag`` over the month's rollup rows;
+        ranking and the per-type ``limit`` are applied in memory.
         """
-        _common = (
-            Transaction.user_id == self.user_id,
-            Transaction.deleted.is_(False),
-            db.extract("year", Transaction.due_date) == year,
-            db.extract("month", Transaction.due_date) == month_number,
-        )
-
-        def _subq(tx_type: TransactionType) -> Any:
-            label = "income" if tx_type == TransactionType.INCOME else "expense"
-            return (
-                db.session.query(
-                    Transaction.tag_id,
-                    Tag.name.label("tag_name"),
-                    func.coalesce(func.sum(Transaction.amount), 0).label(
-                        "total_amount"
-                    ),
-                    func.count(Transaction.id).label("transactions_count"),
-                    literal(label).label("tx_type"),
-                )
-                .outerjoin(Tag, Tag.id == Transaction.tag_id)
-                .filter(*_common)
-                .filter(Transaction.type == tx_type)
-                .group_by(Transaction.tag_id, Tag.name)
-                .order_by(func.sum(Transaction.amount).desc())
-                .limit(limit)
-                .subquery()
-            )
-
-        exp_sub = _subq(TransactionType.EXPENSE)
-        inc_sub = _subq(TransactionType.INCOME)
-
+        total_amount = func.coalesce(func.sum(_Rollup.amount_total), 0)
         rows = (
             db.session.query(
-                exp_sub.c.tag_id,
-                exp_sub.c.tag_name,
-                exp_sub.c.total_amount,
-                exp_sub.c.transactions_count,
-                exp_sub.c.tx_type,
-            )
-            .union_all(
-                db.session.query(
-                    inc_sub.c.tag_id,
-                    inc_sub.c.tag_name,
-                    inc_sub.c.total_amount,
-                    inc_sub.c.transactions_count,
-                    inc_sub.c.tx_type,
-                )
+                _Rollup.type,
+                _Rollup.tag_id,
+                Tag.name,
+                total_amount.label("total_amount"),
+                func.coalesce(func.sum(_Rollup.tx_count), 0).label(
+                    "transactions_count"
+                ),
             )
+            .outerjoin(Tag, Tag.id == _Rollup.tag_id)
+            .filter(*self._month_rollup_filters(year=year, month_number=month_number))
+            .group_by(_Rollup.type, _Rollup.tag_id, Tag.name)
+            .order_by(total_amount.desc())
             .all()
         )
 
         expense_categories: list[dict[str, Any]] = []
         income_categories: list[dict[str, Any]] = []
-        for tag_id, tag_name, total_amount, transactions_count, tx_type in rows:
-            entry: dict[str, Any] = {
-                "tag_id": str(tag_id) if tag_id else None,
-                "category_name": tag_name or "Sem categoria",
-                "total_amount": float(total_amount),
-                "transactions_count": int(transactions_count),
-            }
-            if tx_type == "expense":
-                expense_categories.append(entry)
-            else:
-                income_categories.append(entry)
+        for tx_type, tag_id, tag_name, amount, transactions_count in rows:
+            bucket = (
+                income_categories
+                if tx_type == TransactionType.INCOME.value
+                else expense_categories
+            )
+            if len(bucket) >= limit:
+                continue
+            bucket.append(
+                {
+                    "tag_id": str(tag_id) if tag_id else None,
+                    "category_name": tag_name or "Sem categoria",
+                    "total_amount": float(amount),
+                    "transactions_count": int(transactions_count),
+                }
+            )
 
         return {
             "top_expense_categories": expense_categories,
@@ -9,19 +9,22 @@ yields one line at a time so the response body is flushed incrementally.
 This removes the previous 10 000-row hard limit and reduces peak memory
 usage from O(N) to O(batch_size).
 
-PDF export loads rows in batches but must materialise the full document
-before returning (ReportLab's SimpleDocTemplate is not incrementally
-writable without the low-level canvas API).
+PDF export is drawn page by page with ReportLab's low-level canvas while
+rows are read in batches, so only the current page is laid out in memory.
+The summary line comes from one aggregate query before the rows are drawn.
+``write_pdf_export`` / ``write_csv_export`` render into any binary stream;
+background export jobs (``export_job_service``) use them to write files.
 """
 
 from __future__ import annotations
 
 import csv
+import gzip
 import io
 from dataclasses import dataclass
 from datetime import date
 from decimal import Decimal
-from typing import TYPE_CHECKING, Any, Generator, Iterator
+from typing import IO, TYPE_CHECKING, Any, Callable, Generator, Iterator
 
 from app.models.transaction import Transaction, TransactionStatus, TransactionType
 
@@ -240,118 +243,250 @@ _LABEL_MAP: dict[str, str] = {
 }
 
 
-def generate_pdf_export(
+@dataclass(frozen=True)
+class ExportTotals:
+    count: int
+    income: Decimal
+    expense: Decimal
+
+    @property
+    def balance(self) -> Decimal:
+        return self.income - self.expense
+
+
+def export_totals(
     *,
     user_id: "UUID",
     start_date: date | None = None,
     end_date: date | None = None,
     tx_type: TransactionType | None = None,
     status: TransactionStatus | None = None,
-    month_label: str = "",
-) -> ExportResult:
-    from reportlab.lib import colors
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib.styles import getSampleStyleSheet
-    from reportlab.lib.units import cm
-    from reportlab.platypus import (
-        Paragraph,
-        SimpleDocTemplate,
-        Spacer,
-        Table,
-        TableStyle,
+) -> ExportTotals:
+    """Row count and income/expense sums of an export in one query."""
+    from sqlalchemy import case, func
+
+    def _sum_of(kind: TransactionType) -> Any:
+        return func.coalesce(
+            func.sum(case((Transaction.type == kind, Transaction.amount), else_=0)),
+            0,
+        )
+
+    query = _build_export_query(
+        user_id=user_id,
+        start_date=start_date,
+        end_date=end_date,
+        tx_type=tx_type,
+        status=status,
+        last_due=None,
+        last_id=None,
+    )
+    count, income, expense = query.with_entities(
+        func.count(Transaction.id),
+        _sum_of(TransactionType.INCOME),
+        _sum_of(TransactionType.EXPENSE),
+    ).one()
+    return ExportTotals(
+        count=int(count or 0),
+        income=Decimal(str(income or 0)),
+        expense=Decimal(str(expense or 0)),
     )
 
-    # Materialise rows in batches — no 10K hard limit
-    transactions = list(
-        _iter_transactions_batched(
-            user_id=user_id,
-            start_date=start_date,
-            end_date=end_date,
-            tx_type=tx_type,
-            status=status,
-        )
+
+def write_csv_export(
+    stream: IO[bytes],
+    *,
+    user_id: "UUID",
+    start_date: date | None = None,
+    end_date: date | None = None,
+    tx_type: TransactionType | None = None,
+    status: TransactionStatus | None = None,
+    compress: bool = False,
+) -> int:
+    """Write the CSV export to *stream* (gzip-compressed if asked).
+
+    Returns the number of data rows written.
+    """
+    lines = generate_csv_stream(
+        user_id=user_id,
+        start_date=start_date,
+        end_date=end_date,
+        tx_type=tx_type,
+        status=status,
     )
+    if compress:
+        with gzip.GzipFile(fileobj=stream, mode="wb") as compressed:
+            return _write_lines(compressed.write, lines)
+    return _write_lines(stream.write, lines)
+
+
+def _write_lines(write: Callable[[bytes], object], lines: Iterator[str]) -> int:
+    rows = -1  # the first line is the header
+    for line in lines:
+        write(line.encode("utf-8"))
+        rows += 1
+    return rows
+
+
+# A4 portrait, 2 cm margins — the layout of the former platypus Table.
+_PAGE_WIDTH = 595.2756
+_PAGE_HEIGHT = 841.8898
+_CM = 28.3465
+_MARGIN = 2 * _CM
+_ROW_HEIGHT = 14.0
+_FONT_SIZE = 8
+_CELL_PADDING = 3.0
+_COL_WIDTHS = (2.5 * _CM, 2.5 * _CM, 7 * _CM, 3 * _CM, 2.5 * _CM)
+_PDF_HEADER = ("Data", "Tipo", "Título", "Valor (R$)", "Status")
+_HEADER_BACKGROUND = "#1a1a2e"
+_STRIPE_BACKGROUND = "#f5f5f5"
+_GRID_COLOR = "#cccccc"
+
+
+class _PdfPageWriter:
+    """Draws the export table row by row, starting a page when one fills up."""
+
+    def __init__(self, canvas: Any) -> None:
+        self._canvas = canvas
+        self._left = (_PAGE_WIDTH - sum(_COL_WIDTHS)) / 2
+        self._y = _PAGE_HEIGHT - _MARGIN
+        self._row_index = 0
+
+    def draw_heading(self, title: str, summary: str) -> None:
+        canvas = self._canvas
+        self._y -= 18
+        canvas.setFont("Helvetica-Bold", 18)
+        canvas.drawCentredString(_PAGE_WIDTH / 2, self._y, title)
+        self._y -= 11 + 0.4 * _CM
+        canvas.setFont("Helvetica", 10)
+        canvas.drawString(self._left, self._y, summary)
+        self._y -= 0.6 * _CM
+        self._draw_header()
+
+    def draw_row(self, cells: tuple[str, ...]) -> None:
+        if self._y - _ROW_HEIGHT < _MARGIN:
+            self._canvas.showPage()
+            self._y = _PAGE_HEIGHT - _MARGIN
+            self._draw_header()
+        background = _STRIPE_BACKGROUND if self._row_index % 2 else None
+        self._draw_cells(cells, font="Helvetica", color="#000000", fill=background)
+        self._row_index += 1
+
+    def _draw_header(self) -> None:
+        self._draw_cells(
+            _PDF_HEADER,
+            font="Helvetica-Bold",
+            color="#ffffff",
+            fill=_HEADER_BACKGROUND,
+        )
 
-    buf = io.BytesIO()
-    doc = SimpleDocTemplate(
-        buf,
-        pagesize=A4,
-        rightMargin=2 * cm,
-        leftMargin=2 * cm,
-        topMargin=2 * cm,
-        bottomMargin=2 * cm,
+    def _draw_cells(
+        self, cells: tuple[str, ...], *, font: str, color: str, fill: str | None
+    ) -> None:
+        from reportlab.lib import colors
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+
+        canvas = self._canvas
+        bottom = self._y - _ROW_HEIGHT
+        width = sum(_COL_WIDTHS)
+        if fill is not None:
+            canvas.setFillColor(colors.HexColor(fill))
+            canvas.rect(self._left, bottom, width, _ROW_HEIGHT, stroke=0, fill=1)
+        canvas.setStrokeColor(colors.HexColor(_GRID_COLOR))
+        canvas.setLineWidth(0.25)
+        canvas.rect(self._left, bottom, width, _ROW_HEIGHT, stroke=1, fill=0)
+        canvas.setFillColor(colors.HexColor(color))
+        canvas.setFont(font, _FONT_SIZE)
+        x = self._left
+        baseline = bottom + (_ROW_HEIGHT - _FONT_SIZE) / 2 + 1.5
+        for column, (text, col_width) in enumerate(
+            zip(cells, _COL_WIDTHS, strict=True)
+        ):
+            if column:
+                canvas.line(x, bottom, x, self._y)
+            max_width = col_width - 2 * _CELL_PADDING
+            while text and stringWidth(text, font, _FONT_SIZE) > max_width:
+                text = text[:-1]
+            if column == 3:
+                canvas.drawRightString(x + col_width - _CELL_PADDING, baseline, text)
+            else:
+                canvas.drawString(x + _CELL_PADDING, baseline, text)
+            x += col_width
+        self._y = bottom
+
+
+def _pdf_cells(tx: Transaction) -> tuple[str, ...]:
+    return (
+        tx.due_date.strftime(_DATE_FMT) if tx.due_date else "",
+        _LABEL_MAP.get(tx.type.value, tx.type.value) if tx.type else "",
+        (tx.title or "")[:50],
+        f"{Decimal(str(tx.amount)):.2f}",
+        _LABEL_MAP.get(tx.status.value, tx.status.value) if tx.status else "",
     )
-    styles = getSampleStyleSheet()
-    elements = []
 
-    # Header
-    title_text = "Auraxis — Extrato de Transações"
+
+def write_pdf_export(
+    stream: IO[bytes],
+    *,
+    user_id: "UUID",
+    start_date: date | None = None,
+    end_date: date | None = None,
+    tx_type: TransactionType | None = None,
+    status: TransactionStatus | None = None,
+    month_label: str = "",
+) -> int:
+    """Draw the PDF export into *stream*; returns the number of rows drawn."""
+    from reportlab.pdfgen.canvas import Canvas
+
+    filters: dict[str, Any] = {
+        "user_id": user_id,
+        "start_date": start_date,
+        "end_date": end_date,
+        "tx_type": tx_type,
+        "status": status,
+    }
+    totals = export_totals(**filters)
+    title = "Auraxis — Extrato de Transações"
     if month_label:
-        title_text += f" ({month_label})"
-    elements.append(Paragraph(title_text, styles["Title"]))
-    elements.append(Spacer(1, 0.4 * cm))
-
-    # Summary line
-    total_income = sum(
-        Decimal(str(tx.amount))
-        for tx in transactions
-        if tx.type == TransactionType.INCOME
-    )
-    total_expense = sum(
-        Decimal(str(tx.amount))
-        for tx in transactions
-        if tx.type == TransactionType.EXPENSE
-    )
-    balance = total_income - total_expense
+        title += f" ({month_label})"
     summary = (
-        f"Total de registros: {len(transactions)} | "
-        f"Receitas: R$ {total_income:.2f} | "
-        f"Despesas: R$ {total_expense:.2f} | "
-        f"Saldo: R$ {balance:.2f}"
+        f"Total de registros: {totals.count} | "
+        f"Receitas: R$ {totals.income:.2f} | "
+        f"Despesas: R$ {totals.expense:.2f} | "
+        f"Saldo: R$ {totals.balance:.2f}"
     )
-    elements.append(Paragraph(summary, styles["Normal"]))
-    elements.append(Spacer(1, 0.6 * cm))
-
-    # Table
-    header_row = ["Data", "Tipo", "Título", "Valor (R$)", "Status"]
-    table_data: list[list[str]] = [header_row]
-    for tx in transactions:
-        table_data.append(
-            [
-                tx.due_date.strftime(_DATE_FMT) if tx.due_date else "",
-                _LABEL_MAP.get(tx.type.value, tx.type.value) if tx.type else "",
-                (tx.title or "")[:50],
-                f"{Decimal(str(tx.amount)):.2f}",
-                _LABEL_MAP.get(tx.status.value, tx.status.value) if tx.status else "",
-            ]
-        )
 
-    col_widths = [2.5 * cm, 2.5 * cm, 7 * cm, 3 * cm, 2.5 * cm]
-    table = Table(table_data, colWidths=col_widths, repeatRows=1)
-    table.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1a1a2e")),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                ("FONTSIZE", (0, 0), (-1, -1), 8),
-                (
-                    "ROWBACKGROUNDS",
-                    (0, 1),
-                    (-1, -1),
-                    [colors.white, colors.HexColor("#f5f5f5")],
-                ),
-                ("GRID", (0, 0), (-1, -1), 0.25, colors.HexColor("#cccccc")),
-                ("ALIGN", (3, 0), (3, -1), "RIGHT"),
-                ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                ("TOPPADDING", (0, 0), (-1, -1), 4),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-            ]
-        )
-    )
-    elements.append(table)
+    canvas = Canvas(stream, pagesize=(_PAGE_WIDTH, _PAGE_HEIGHT))
+    canvas.setTitle(title)
+    page = _PdfPageWriter(canvas)
+    page.draw_heading(title, summary)
+    rows = 0
+    for tx in _iter_transactions_batched(**filters):
+        page.draw_row(_pdf_cells(tx))
+        rows += 1
+    canvas.showPage()
+    canvas.save()
+    return rows
 
-    doc.build(elements)
+
+def generate_pdf_export(
+    *,
+    user_id: "UUID",
+    start_date: date | None = None,
+    end_date: date | None = None,
+    tx_type: TransactionType | None = None,
+    status: TransactionStatus | None = None,
+    month_label: str = "",
+) -> ExportResult:
+    buf = io.BytesIO()
+    write_pdf_export(
+        buf,
+        user_id=user_id,
+        start_date=start_date,
+        end_date=end_date,
+        tx_type=tx_type,
+        status=status,
+        month_label=month_label,
+    )
     filename = f"auraxis_transactions_{month_label or 'export'}.pdf"
     return ExportResult(
         content=buf.getvalue(),
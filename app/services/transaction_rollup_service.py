@@ -0,0 +1,400 @@
+"""Maintenance and read helpers for ``transaction_daily_rollups``.
+
+The rollup table pre-aggregates ``transactions`` per
+``(user_id, day, type, status, category, tag_id)`` so dashboard analytics read
+a few dozen rows instead of scanning the raw ledger.
+
+Write side
+----------
+A ``before_flush`` session listener collects every ``(user_id, day)`` touched
+by inserted, updated (including soft-delete) or deleted ``Transaction`` rows
+and ``after_flush`` recomputes just those days on the flushing connection.
+The recompute runs in the same DB transaction as the write, so every ORM path
+— REST/GraphQL writes, bank import, recurrence materialisation — keeps the
+rollup exact without call-site changes. On PostgreSQL each ``(user_id, day)``
+is guarded by a transaction-scoped advisory lock so two concurrent writers
+cannot both delete-then-insert the same day and double count it. Bulk
+``Query.update``/``Query.delete`` bypass the listener; use
+:func:`rebuild_transaction_rollups` (``flask analytics rebuild``) after such
+maintenance.
+
+Read side
+---------
+:func:`sum_paid_range` and :func:`paid_daily_totals` are sargable range reads
+on ``(user_id, day)`` used by trends, survival index and weekly summary.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Any
+from uuid import UUID, uuid4
+
+from sqlalchemy import case, event, func, inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.extensions.database import db
+from app.models.transaction import Transaction, TransactionStatus, TransactionType
+from app.models.transaction_daily_rollup import TransactionDailyRollup
+
+# Attributes whose change moves a transaction between rollup buckets.
+_TRACKED_ATTRS = (
+    "user_id",
+    "due_date",
+    "amount",
+    "type",
+    "status",
+    "category",
+    "tag_id",
+    "deleted",
+)
+
+_PAID = TransactionStatus.PAID.value
+_INCOME = TransactionType.INCOME.value
+_EXPENSE = TransactionType.EXPENSE.value
+
+
+@dataclass(frozen=True)
+class RollupTotals:
+    """Income/expense sums and transaction count over a set of rollup rows."""
+
+    income: float
+    expense: float
+    count: int
+
+
+# ---------------------------------------------------------------------------
+# Write side
+# ---------------------------------------------------------------------------
+
+
+def _as_date(value: Any) -> date | None:
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str) and value:
+        try:
+            return date.fromisoformat(value[:10])
+        except ValueError:
+            return None
+    return None
+
+
+def _as_uuid(value: Any) -> UUID | None:
+    if isinstance(value, UUID):
+        return value
+    if value is None:
+        return None
+    try:
+        return UUID(str(value))
+    except ValueError:
+        return None
+
+
+def _add_key(keys: dict[UUID, set[date]], user_id: Any, day: Any) -> None:
+    uid = _as_uuid(user_id)
+    parsed_day = _as_date(day)
+    if uid is not None and parsed_day is not None:
+        keys[uid].add(parsed_day)
+
+
+def _collect_dirty_transaction(obj: Transaction, keys: dict[UUID, set[date]]) -> bool:
+    """Add the buckets of a modified transaction to *keys*.
+
+    Returns ``True`` when the transaction moved (new ``user_id``/``due_date``)
+    but its previous bucket is unknown because the attribute was expired.
+    """
+    state: Any = inspect(obj)
+    if not any(state.attrs[a].history.has_changes() for a in _TRACKED_ATTRS):
+        return False
+    _add_key(keys, obj.user_id, obj.due_date)
+    user_hist = state.attrs.user_id.history
+    day_hist = state.attrs.due_date.history
+    for user_id in user_hist.deleted or [obj.user_id]:
+        for day in day_hist.deleted or [obj.due_date]:
+            _add_key(keys, user_id, day)
+    moved = bool(user_hist.added or day_hist.added)
+    return moved and not (user_hist.deleted or day_hist.deleted) and bool(obj.id)
+
+
+def _collect_dirty_keys(session: Session) -> dict[UUID, set[date]]:
+    """Return the ``(user_id, day)`` buckets touched by the pending flush.
+
+    Runs before the flush so the *previous* bucket of a moved transaction can
+    still be read: when ``due_date``/``user_id`` was reassigned on an expired
+    instance the ORM has no old value in history, so those rows are looked up
+    with one ``IN`` query on the flushing connection.
+    """
+    keys: dict[UUID, set[date]] = defaultdict(set)
+    for obj in (*session.new, *session.deleted):
+        if isinstance(obj, Transaction):
+            _add_key(keys, obj.user_id, obj.due_date)
+
+    unknown_previous: list[Any] = []
+    for obj in session.dirty:
+        if isinstance(obj, Transaction) and _collect_dirty_transaction(obj, keys):
+            unknown_previous.append(obj.id)
+
+    if unknown_previous:
+        tx = Transaction.__table__
+        previous = session.connection().execute(
+            db.select(tx.c.user_id, tx.c.due_date).where(tx.c.id.in_(unknown_previous))
+        )
+        for user_id, day in previous:
+            _add_key(keys, user_id, day)
+    return keys
+
+
+def _enum_value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+def _aggregate_rows(
+    connection: Connection, *, user_id: UUID | None, days: Iterable[date] | None
+) -> list[dict[str, Any]]:
+    tx = Transaction.__table__
+    stmt = (
+        db.select(
+            tx.c.user_id,
+            tx.c.due_date,
+            tx.c.type,
+            tx.c.status,
+            tx.c.category,
+            tx.c.tag_id,
+            func.coalesce(func.sum(tx.c.amount), 0),
+            func.count(tx.c.id),
+        )
+        .where(tx.c.deleted.is_(False))
+        .group_by(
+            tx.c.user_id,
+            tx.c.due_date,
+            tx.c.type,
+            tx.c.status,
+            tx.c.category,
+            tx.c.tag_id,
+        )
+    )
+    if user_id is not None:
+        stmt = stmt.where(tx.c.user_id == user_id)
+    if days is not None:
+        stmt = stmt.where(tx.c.due_date.in_(list(days)))
+
+    rows: list[dict[str, Any]] = []
+    for uid, day, tx_type, status, category, tag_id, total, count in connection.execute(
+        stmt
+    ):
+        rows.append(
+            {
+                "id": uuid4(),
+                "user_id": uid,
+                "day": day,
+                "type": _enum_value(tx_type),
+                # Legacy rows may carry a NULL status; the ORM default is PENDING.
+                "status": _enum_value(status) or TransactionStatus.PENDING.value,
+                "category": _enum_value(category),
+                "tag_id": tag_id,
+                "amount_total": Decimal(str(total or 0)),
+                "tx_count": int(count or 0),
+            }
+        )
+    return rows
+
+
+def rollup_lock_key(user_id: UUID, day: date) -> int:
+    """Signed 64-bit advisory-lock key for one ``(user_id, day)`` bucket."""
+    digest = hashlib.blake2b(
+        f"transaction_rollup:{user_id}:{day.isoformat()}".encode(), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def _lock_rollup_days(connection: Connection, user_id: UUID, days: list[date]) -> None:
+    # Held until commit/rollback. Under READ COMMITTED the second writer then
+    # runs its DELETE after the first commits, so it sees (and replaces) the
+    # rows the first one inserted. Keys are taken in sorted order to avoid
+    # deadlocks between writers touching overlapping days.
+    if connection.dialect.name != "postgresql":
+        return
+    for day in days:
+        connection.execute(
+            db.text("SELECT pg_advisory_xact_lock(:key)"),
+            {"key": rollup_lock_key(user_id, day)},
+        )
+
+
+def refresh_rollup_days(connection: Connection, keys: dict[UUID, set[date]]) -> None:
+    """Recompute the rollup rows of every ``(user_id, day)`` in *keys*."""
+    rollup = TransactionDailyRollup.__table__
+    for user_id in sorted(keys, key=str):
+        days = sorted(keys[user_id])
+        if not days:
+            continue
+        _lock_rollup_days(connection, user_id, days)
+        connection.execute(
+            rollup.delete().where(rollup.c.user_id == user_id, rollup.c.day.in_(days))
+        )
+        rows = _aggregate_rows(connection, user_id=user_id, days=days)
+        if rows:
+            connection.execute(rollup.insert(), rows)
+
+
+_PENDING_KEYS_INFO = "transaction_rollup_pending_keys"
+
+
+def _before_flush(session: Session, flush_context: Any, instances: Any) -> None:
+    del flush_context, instances
+    keys = _collect_dirty_keys(session)
+    if keys:
+        pending = session.info.setdefault(_PENDING_KEYS_INFO, defaultdict(set))
+        for user_id, days in keys.items():
+            pending[user_id] |= days
+
+
+def _after_flush(session: Session, flush_context: Any) -> None:
+    del flush_context
+    keys = session.info.pop(_PENDING_KEYS_INFO, None)
+    if keys:
+        refresh_rollup_days(session.connection(), keys)
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEYS_INFO, None)
+
+
+def install_transaction_rollup_listener() -> None:
+    """Attach the rollup maintenance listeners to every ORM session (idempotent)."""
+    for name, listener in (
+        ("before_flush", _before_flush),
+        ("after_flush", _after_flush),
+        ("after_rollback", _after_rollback),
+    ):
+        if not event.contains(Session, name, listener):
+            event.listen(Session, name, listener)
+
+
+def rebuild_transaction_rollups(*, user_id: UUID | None = None) -> int:
+    """Drop and recompute rollup rows for one user (or everyone).
+
+    Commits on success and returns the number of rollup rows written.
+    """
+    rollup = TransactionDailyRollup.__table__
+    connection = db.session.connection()
+    delete_stmt = rollup.delete()
+    if user_id is not None:
+        delete_stmt = delete_stmt.where(rollup.c.user_id == user_id)
+    connection.execute(delete_stmt)
+    rows = _aggregate_rows(connection, user_id=user_id, days=None)
+    if rows:
+        connection.execute(rollup.insert(), rows)
+    db.session.commit()
+    return len(rows)
+
+
+# ---------------------------------------------------------------------------
+# Read side
+# ---------------------------------------------------------------------------
+
+
+def _income_expense_columns() -> tuple[Any, Any]:
+    income = func.coalesce(
+        func.sum(
+            case(
+                (
+                    TransactionDailyRollup.type == _INCOME,
+                    TransactionDailyRollup.amount_total,
+                ),
+                else_=0,
+            )
+        ),
+        0,
+    )
+    expense = func.coalesce(
+        func.sum(
+            case(
+                (
+                    TransactionDailyRollup.type == _EXPENSE,
+                    TransactionDailyRollup.amount_total,
+                ),
+                else_=0,
+            )
+        ),
+        0,
+    )
+    return income, expense
+
+
+def range_filters(*, user_id: UUID, start: date, end: date) -> tuple[Any, ...]:
+    """Sargable ``(user_id, day)`` range predicate for rollup reads."""
+    return (
+        TransactionDailyRollup.user_id == user_id,
+        TransactionDailyRollup.day >= start,
+        TransactionDailyRollup.day <= end,
+    )
+
+
+def sum_paid_range(*, user_id: UUID, start: date, end: date) -> RollupTotals:
+    """Return PAID income/expense totals and count for ``[start, end]``."""
+    income, expense = _income_expense_columns()
+    row = (
+        db.session.query(
+            income.label("income"),
+            expense.label("expense"),
+            func.coalesce(func.sum(TransactionDailyRollup.tx_count), 0).label(
+                "tx_count"
+            ),
+        )
+        .filter(*range_filters(user_id=user_id, start=start, end=end))
+        .filter(TransactionDailyRollup.status == _PAID)
+        .one()
+    )
+    return RollupTotals(
+        income=float(row.income or 0),
+        expense=float(row.expense or 0),
+        count=int(row.tx_count or 0),
+    )
+
+
+def paid_daily_totals(
+    *, user_id: UUID, start: date, end: date
+) -> dict[date, RollupTotals]:
+    """Return PAID totals per day for ``[start, end]`` (days without rows omitted)."""
+    income, expense = _income_expense_columns()
+    rows = (
+        db.session.query(
+            TransactionDailyRollup.day,
+            income.label("income"),
+            expense.label("expense"),
+            func.coalesce(func.sum(TransactionDailyRollup.tx_count), 0).label(
+                "tx_count"
+            ),
+        )
+        .filter(*range_filters(user_id=user_id, start=start, end=end))
+        .filter(TransactionDailyRollup.status == _PAID)
+        .group_by(TransactionDailyRollup.day)
+        .all()
+    )
+    return {
+        row.day: RollupTotals(
+            income=float(row.income or 0),
+            expense=float(row.expense or 0),
+            count=int(row.tx_count or 0),
+        )
+        for row in rows
+    }
+
+
+__all__ = [
+    "RollupTotals",
+    "install_transaction_rollup_listener",
+    "paid_daily_totals",
+    "range_filters",
+    "rebuild_transaction_rollups",
+    "refresh_rollup_days",
+    "rollup_lock_key",
+    "sum_paid_range",
+]
@@ -10,11 +10,11 @@ from datetime import date, timedelta
 from typing import TYPE_CHECKING
 from uuid import UUID
 
-from sqlalchemy import case, func
+from sqlalchemy import func
 
 from app.extensions.database import db
-from app.models.transaction import Transaction, TransactionStatus, TransactionType
 from app.models.wallet import Wallet
+from app.services.transaction_rollup_service import paid_daily_totals, sum_paid_range
 
 if TYPE_CHECKING:
     from app.application.services.transaction.query_types import (
@@ -29,7 +29,8 @@ def compute_dashboard_trends(*, user_id: UUID, months: int) -> TransactionTrends
     """Compute monthly income/expense/balance for the last N months.
 
     Only months that have at least one PAID transaction are included. Results
-    are ordered most-recent first.
+    are ordered most-recent first. Served from ``transaction_daily_rollups``
+    with a single range query regardless of ``months``.
     """
     today = date.today()
     month_starts: list[date] = []
@@ -41,57 +42,33 @@ def compute_dashboard_trends(*, user_id: UUID, months: int) -> TransactionTrends
             year -= 1
         month_starts.append(date(year, month, 1))
 
+    # One indexed range read over the rollup covers every requested month;
+    # days are bucketed into months in memory.
+    daily = paid_daily_totals(
+        user_id=user_id,
+        start=month_starts[-1],
+        end=_last_day_of_month(month_starts[0]),
+    )
+    by_month: dict[tuple[int, int], list[float]] = {}
+    for day, totals in daily.items():
+        bucket = by_month.setdefault((day.year, day.month), [0.0, 0.0, 0])
+        bucket[0] += totals.income
+        bucket[1] += totals.expense
+        bucket[2] += totals.count
+
     series: list[TransactionTrendsMonthEntry] = []
     for month_start in month_starts:
-        month_end = _last_day_of_month(month_start)
-        row = (
-            db.session.query(
-                func.coalesce(
-                    func.sum(
-                        case(
-                            (
-                                Transaction.type == TransactionType.INCOME,
-                                Transaction.amount,
-                            ),
-                            else_=0,
-                        )
-                    ),
-                    0,
-                ).label("income"),
-                func.coalesce(
-                    func.sum(
-                        case(
-                            (
-                                Transaction.type == TransactionType.EXPENSE,
-                                Transaction.amount,
-                            ),
-                            else_=0,
-                        )
-                    ),
-                    0,
-                ).label("expenses"),
-                func.count(Transaction.id).label("tx_count"),
-            )
-            .filter(
-                Transaction.user_id == user_id,
-                Transaction.deleted.is_(False),
-                Transaction.status == TransactionStatus.PAID,
-                Transaction.due_date >= month_start,
-                Transaction.due_date <= month_end,
-            )
-            .one()
+        income, expenses, tx_count = by_month.get(
+            (month_start.year, month_start.month), [0.0, 0.0, 0]
         )
-
-        if int(row.tx_count or 0) == 0:
+        if int(tx_count) == 0:
             continue
 
-        income = float(row.income or 0)
-        expenses = float(row.expenses or 0)
         series.append(
             {
                 "month": month_start.strftime("%Y-%m"),
-                "income": income,
-                "expenses": expenses,
+                "income": round(income, 2),
+                "expenses": round(expenses, 2),
                 "balance": round(income - expenses, 2),
             }
         )
@@ -129,19 +106,9 @@ def compute_survival_index(
     period_start = date(year, anchor_month, 1)
     period_end = today.replace(day=1) - timedelta(days=1)
 
-    expense_row = (
-        db.session.query(func.coalesce(func.sum(Transaction.amount), 0).label("total"))
-        .filter(
-            Transaction.user_id == user_id,
-            Transaction.deleted.is_(False),
-            Transaction.type == TransactionType.EXPENSE,
-            Transaction.status == TransactionStatus.PAID,
-            Transaction.due_date >= period_start,
-            Transaction.due_date <= period_end,
-        )
-        .one()
-    )
-    total_expense = float(expense_row.total or 0)
+    total_expense = sum_paid_range(
+        user_id=user_id, start=period_start, end=period_end
+    ).expense
     avg_monthly_expense = round(total_expense / period_months, 2)
 
     if avg_monthly_expense == 0:
@@ -1,6 +1,7 @@
 """Weekly summary computation — current/previous week comparison + time series.
 
 B13: Contrato de resumo semanal com comparativo e série temporal para gráfico.
+Totais vêm de ``transaction_daily_rollups`` (uma leitura por faixa de datas).
 """
 
 from __future__ import annotations
@@ -9,10 +10,7 @@ from datetime import date, timedelta
 from typing import TYPE_CHECKING
 from uuid import UUID
 
-from sqlalchemy import case, func
-
-from app.extensions.database import db
-from app.models.transaction import Transaction, TransactionStatus, TransactionType
+from app.services.transaction_rollup_service import paid_daily_totals, sum_paid_range
 
 if TYPE_CHECKING:
     from app.application.services.transaction.query_types import (
@@ -38,44 +36,8 @@ def _aggregate_range(
     end: date,
 ) -> tuple[float, float, int]:
     """Return (income, expense, count) for PAID transactions in [start, end]."""
-    row = (
-        db.session.query(
-            func.coalesce(
-                func.sum(
-                    case(
-                        (
-                            Transaction.type == TransactionType.INCOME,
-                            Transaction.amount,
-                        ),
-                        else_=0,
-                    )
-                ),
-                0,
-            ).label("income"),
-            func.coalesce(
-                func.sum(
-                    case(
-                        (
-                            Transaction.type == TransactionType.EXPENSE,
-                            Transaction.amount,
-                        ),
-                        else_=0,
-                    )
-                ),
-                0,
-            ).label("expense"),
-            func.count(Transaction.id).label("tx_count"),
-        )
-        .filter(
-            Transaction.user_id == user_id,
-            Transaction.deleted.is_(False),
-            Transaction.status == TransactionStatus.PAID,
-            Transaction.due_date >= start,
-            Transaction.due_date <= end,
-        )
-        .one()
-    )
-    return float(row.income or 0), float(row.expense or 0), int(row.tx_count or 0)
+    totals = sum_paid_range(user_id=user_id, start=start, end=end)
+    return totals.income, totals.expense, totals.count
 
 
 def _safe_delta_percent(current: float, previous: float) -> float | None:
@@ -90,52 +52,13 @@ def _build_daily_series(
     start: date,
     end: date,
 ) -> list[WeeklySummarySeriesEntry]:
-    rows = (
-        db.session.query(
-            Transaction.due_date.label("day"),
-            func.coalesce(
-                func.sum(
-                    case(
-                        (
-                            Transaction.type == TransactionType.INCOME,
-                            Transaction.amount,
-                        ),
-                        else_=0,
-                    )
-                ),
-                0,
-            ).label("income"),
-            func.coalesce(
-                func.sum(
-                    case(
-                        (
-                            Transaction.type == TransactionType.EXPENSE,
-                            Transaction.amount,
-                        ),
-                        else_=0,
-                    )
-                ),
-                0,
-            ).label("expense"),
-        )
-        .filter(
-            Transaction.user_id == user_id,
-            Transaction.deleted.is_(False),
-            Transaction.status == TransactionStatus.PAID,
-            Transaction.due_date >= start,
-            Transaction.due_date <= end,
-        )
-        .group_by(Transaction.due_date)
-        .order_by(Transaction.due_date)
-        .all()
-    )
-    index: dict[date, tuple[float, float]] = {
-        r.day: (float(r.income or 0), float(r.expense or 0)) for r in rows
-    }
+    index = paid_daily_totals(user_id=user_id, start=start, end=end)
     series: list[WeeklySummarySeriesEntry] = []
     cursor = start
     while cursor <= end:
-        income, expense = index.get(cursor, (0.0, 0.0))
+        totals = index.get(cursor)
+        income = totals.income if totals else 0.0
+        expense = totals.expense if totals else 0.0
         series.append(
             {
                 "date": cursor.isoformat(),
@@ -154,20 +77,24 @@ def _build_weekly_series(
     start: date,
     end: date,
 ) -> list[WeeklySummarySeriesEntry]:
-    # Align start to Monday
+    # Align start to Monday; one rollup read feeds every week bucket.
     week_start = start - timedelta(days=start.weekday())
+    index = paid_daily_totals(user_id=user_id, start=week_start, end=end)
+    weekly: dict[date, tuple[float, float]] = {}
+    for day, totals in index.items():
+        bucket = day - timedelta(days=day.weekday())
+        income, expense = weekly.get(bucket, (0.0, 0.0))
+        weekly[bucket] = (income + totals.income, expense + totals.expense)
+
     series: list[WeeklySummarySeriesEntry] = []
     cursor = week_start
     while cursor <= end:
-        week_end = min(cursor + timedelta(days=6), end)
-        income, expense, _ = _aggregate_range(
-            user_id=user_id, start=cursor, end=week_end
-        )
+        income, expense = weekly.get(cursor, (0.0, 0.0))
         series.append(
             {
                 "date": cursor.isoformat(),
-                "income": income,
-                "expense": expense,
+                "income": round(income, 2),
+                "expense": round(expense, 2),
                 "balance": round(income - expense, 2),
             }
         )
@@ -0,0 +1,116 @@
+"""audit_events_monthly_partitions
+
+Rebuilds `audit_events` on PostgreSQL as a table range-partitioned by month
+on `created_at`, so retention can detach and drop whole months instead of
+running one long `DELETE`. Partitions are named `audit_events_pYYYY_MM`; an
+`audit_events_default` partition catches rows outside the created months.
+
+The upgrade creates one partition per month from the oldest stored event to
+three months ahead, copies the existing rows and drops the old table. The
+primary key becomes (id, created_at) because PostgreSQL requires the
+partition key in every unique constraint. `flask audit-events
+ensure-partitions` (also run by `purge-expired`) keeps future months created.
+Other dialects are left unpartitioned.
+
+Revision ID: aud2_audit_events_monthly_partitions
+Revises: fis2_fiscal_import_progress
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "aud2_audit_events_monthly_partitions"
+down_revision = "fis2_fiscal_import_progress"
+branch_labels = None
+depends_on = None
+
+_MONTHS_AHEAD = 3
+_INDEXES = (
+    ("ix_audit_events_request_id", "request_id"),
+    ("ix_audit_events_created_at", "created_at"),
+    ("ix_audit_events_entity", "entity_type, entity_id"),
+)
+# Monthly partitions already bound created_at scans, so the BRIN index from
+# hd1051 is only restored on downgrade.
+_BRIN_INDEX = "ix_audit_events_created_at_brin"
+
+
+def _add_months(first_day: date, months: int) -> date:
+    index = first_day.year * 12 + first_day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _rename_legacy(old: str, new: str) -> None:
+    op.execute(f"ALTER TABLE {old} RENAME TO {new}")
+    op.execute(f"ALTER TABLE {new} RENAME CONSTRAINT {old}_pkey TO {new}_pkey")
+    for index_name in [name for name, _ in _INDEXES] + [_BRIN_INDEX]:
+        op.execute(
+            f"ALTER INDEX IF EXISTS {index_name} "
+            f"RENAME TO {index_name.replace('audit_events', new)}"
+        )
+
+
+def _create_indexes() -> None:
+    for index_name, columns in _INDEXES:
+        op.execute(f"CREATE INDEX {index_name} ON audit_events ({columns})")
+
+
+def upgrade() -> None:
+    conn = op.get_context().connection
+    if conn is None or conn.dialect.name != "postgresql":
+        return
+
+    _rename_legacy("audit_events", "audit_events_legacy")
+    op.execute(
+        "CREATE TABLE audit_events (LIKE audit_events_legacy INCLUDING DEFAULTS) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    op.execute(
+        "ALTER TABLE audit_events ADD CONSTRAINT audit_events_pkey "
+        "PRIMARY KEY (id, created_at)"
+    )
+    _create_indexes()
+
+    oldest = conn.execute(
+        sa.text("SELECT min(created_at) FROM audit_events_legacy")
+    ).scalar()
+    today = datetime.now(UTC).date()
+    first_day = date((oldest or today).year, (oldest or today).month, 1)
+    last_day = _add_months(date(today.year, today.month, 1), _MONTHS_AHEAD)
+    while first_day <= last_day:
+        upper = _add_months(first_day, 1)
+        op.execute(
+            f"CREATE TABLE audit_events_p{first_day.year:04d}_{first_day.month:02d} "
+            "PARTITION OF audit_events "
+            f"FOR VALUES FROM ('{first_day.isoformat()} 00:00:00+00') "
+            f"TO ('{upper.isoformat()} 00:00:00+00')"
+        )
+        first_day = upper
+    op.execute("CREATE TABLE audit_events_default PARTITION OF audit_events DEFAULT")
+
+    op.execute("INSERT INTO audit_events SELECT * FROM audit_events_legacy")
+    op.execute("DROP TABLE audit_events_legacy")
+
+
+def downgrade() -> None:
+    conn = op.get_context().connection
+    if conn is None or conn.dialect.name != "postgresql":
+        return
+
+    _rename_legacy("audit_events", "audit_events_partitioned")
+    op.execute(
+        "CREATE TABLE audit_events (LIKE audit_events_partitioned INCLUDING DEFAULTS)"
+    )
+    op.execute(
+        "ALTER TABLE audit_events ADD CONSTRAINT audit_events_pkey PRIMARY KEY (id)"
+    )
+    _create_indexes()
+    op.execute(f"CREATE INDEX {_BRIN_INDEX} ON audit_events USING brin (created_at)")
+    op.execute("INSERT INTO audit_events SELECT * FROM audit_events_partitioned")
+    # Dropping the parent drops every partition with it.
+    op.execute("DROP TABLE audit_events_partitioned")
@@ -0,0 +1,64 @@
+"""export_jobs
+
+Adds `export_jobs`, the state of background CSV/PDF transaction exports.
+Workers render the file to export storage (local directory or S3-compatible
+bucket) and record its key and size so the API can serve it with HTTP Range.
+
+Revision ID: exp1_export_jobs
+Revises: aud2_audit_events_monthly_partitions
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "exp1_export_jobs"
+down_revision = "aud2_audit_events_monthly_partitions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "export_jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("format", sa.String(length=8), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum(
+                "queued",
+                "running",
+                "completed",
+                "failed",
+                name="export_job_status_enum",
+                native_enum=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("params_json", sa.JSON(), nullable=False),
+        sa.Column("filename", sa.String(length=255), nullable=False),
+        sa.Column("content_type", sa.String(length=100), nullable=False),
+        sa.Column("storage_key", sa.String(length=512), nullable=True),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=True),
+        sa.Column("row_count", sa.Integer(), nullable=True),
+        sa.Column("error", sa.String(length=500), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_export_jobs_user_created",
+        "export_jobs",
+        ["user_id", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_export_jobs_user_created", table_name="export_jobs")
+    op.drop_table("export_jobs")
@@ -0,0 +1,37 @@
+"""export_jobs expiry
+
+Adds `export_jobs.expires_at` and its index. Finished jobs get an expiry
+(`EXPORT_JOB_RETENTION_HOURS` after completion); `flask exports
+purge-expired` deletes the stored files of expired jobs and then the rows.
+Jobs created before this revision have no expiry and are left alone.
+
+Revision ID: exp2_export_job_expiry
+Revises: tk1_transactions_keyset_index
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "exp2_export_job_expiry"
+down_revision = "tk1_transactions_keyset_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("export_jobs") as batch_op:
+        batch_op.add_column(sa.Column("expires_at", sa.DateTime(), nullable=True))
+    op.create_index(
+        "ix_export_jobs_expires_at",
+        "export_jobs",
+        ["expires_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_export_jobs_expires_at", table_name="export_jobs")
+    with op.batch_alter_table("export_jobs") as batch_op:
+        batch_op.drop_column("expires_at")
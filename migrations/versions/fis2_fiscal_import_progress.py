@@ -0,0 +1,31 @@
+"""fiscal_import_progress
+
+Adds `fiscal_imports.processed_rows`. Bulk CSV imports commit in chunks and
+advance this counter after each one, so clients polling a background import
+can compare it against `valid_rows`.
+
+Revision ID: fis2_fiscal_import_progress
+Revises: rec2_recurrence_occurrence_key
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "fis2_fiscal_import_progress"
+down_revision = "rec2_recurrence_occurrence_key"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "fiscal_imports",
+        sa.Column("processed_rows", sa.Integer(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("fiscal_imports", "processed_rows")
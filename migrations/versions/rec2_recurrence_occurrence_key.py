@@ -0,0 +1,71 @@
+"""recurrence_occurrence_key
+
+Adds `transactions.recurrence_key` ("<series id>:<due date>") plus a unique
+index on (user_id, recurrence_key). The set-based recurrence engine diffs
+expected occurrence keys against this column instead of probing one row per
+expected due date, and the index makes concurrent materialisation idempotent.
+
+On PostgreSQL the upgrade backfills keys for existing recurring rows. When a
+series already holds duplicates for one due date (e.g. a soft-deleted
+occurrence that a later run recreated) only the first live row gets the key.
+The engine derives keys for unkeyed rows on the fly, so other dialects need
+no backfill.
+
+Revision ID: rec2_recurrence_occurrence_key
+Revises: tdp1_ticker_daily_prices
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "rec2_recurrence_occurrence_key"
+down_revision = "tdp1_ticker_daily_prices"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "transactions",
+        sa.Column("recurrence_key", sa.String(length=64), nullable=True),
+    )
+
+    conn = op.get_context().connection
+    if conn is not None and conn.dialect.name == "postgresql":
+        op.execute(
+            """
+            UPDATE transactions t
+            SET recurrence_key = k.occurrence_key
+            FROM (
+                SELECT
+                    id,
+                    COALESCE(installment_group_id, id)::text
+                        || ':' || due_date::text AS occurrence_key,
+                    row_number() OVER (
+                        PARTITION BY user_id,
+                            COALESCE(installment_group_id, id),
+                            due_date
+                        ORDER BY deleted ASC, created_at ASC, id ASC
+                    ) AS rn
+                FROM transactions
+                WHERE is_recurring = true
+                  AND COALESCE(is_installment, false) = false
+            ) k
+            WHERE t.id = k.id AND k.rn = 1
+            """
+        )
+
+    op.create_index(
+        "uq_transactions_user_recurrence_key",
+        "transactions",
+        ["user_id", "recurrence_key"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_transactions_user_recurrence_key", table_name="transactions")
+    op.drop_column("transactions", "recurrence_key")
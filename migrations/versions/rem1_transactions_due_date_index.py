@@ -0,0 +1,49 @@
+"""transactions due_date partial index
+
+Adds `ix_transactions_due_date_id_active` on transactions (due_date, id)
+WHERE deleted = false. The reminder dispatcher scans every user's
+transactions due on one date in keyset chunks ordered by id; all other
+transaction indexes lead with user_id, so that scan was a sequential read of
+the table. With id in the index each chunk starts where the previous one
+stopped instead of re-reading the whole day.
+
+The index is built CONCURRENTLY outside the migration transaction so the
+transactions table stays writable while it builds.
+
+Revision ID: rem1_due_date_index
+Revises: exp1_export_jobs
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "rem1_due_date_index"
+down_revision = "exp1_export_jobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_transactions_due_date_id_active",
+            "transactions",
+            ["due_date", "id"],
+            unique=False,
+            if_not_exists=True,
+            postgresql_where=sa.text("deleted = false"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_transactions_due_date_id_active",
+            table_name="transactions",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,94 @@
+"""transaction_daily_rollups
+
+Creates `transaction_daily_rollups`: per-user daily ledger totals grouped by
+(day, type, status, category, tag_id). Dashboard analytics (overview, trends,
+survival index, weekly summary) read this table through a sargable
+(user_id, day) index instead of scanning `transactions`.
+
+The application keeps the table in sync inside each write transaction. On
+PostgreSQL the upgrade backfills it from existing rows; other dialects (and
+any later repair) use `flask analytics rebuild`.
+
+Revision ID: roll1_transaction_daily_rollups
+Revises: fb1_ai_insight_feedback
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "roll1_transaction_daily_rollups"
+down_revision = "fb1_ai_insight_feedback"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "transaction_daily_rollups",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "user_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("users.id"),
+            nullable=False,
+        ),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("type", sa.String(length=20), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("category", sa.String(length=20), nullable=True),
+        sa.Column("tag_id", UUID(as_uuid=True), nullable=True),
+        sa.Column(
+            "amount_total",
+            sa.Numeric(14, 2),
+            nullable=False,
+            server_default="0",
+        ),
+        sa.Column("tx_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_index(
+        "ix_transaction_daily_rollups_user_day",
+        "transaction_daily_rollups",
+        ["user_id", "day"],
+    )
+
+    conn = op.get_context().connection
+    if conn is not None and conn.dialect.name == "postgresql":
+        # Native enums on `transactions` store member names (PAID, INCOME);
+        # the rollup stores the lowercase values used by the API.
+        op.execute(
+            """
+            INSERT INTO transaction_daily_rollups (
+                id, user_id, day, type, status, category, tag_id,
+                amount_total, tx_count
+            )
+            SELECT
+                md5(
+                    t.user_id::text || t.due_date::text || t.type::text
+                    || COALESCE(t.status::text, '') || COALESCE(t.category, '')
+                    || COALESCE(t.tag_id::text, '')
+                )::uuid,
+                t.user_id,
+                t.due_date,
+                lower(t.type::text),
+                lower(COALESCE(t.status::text, 'PENDING')),
+                t.category,
+                t.tag_id,
+                COALESCE(SUM(t.amount), 0),
+                COUNT(t.id)
+            FROM transactions t
+            WHERE t.deleted = false
+            GROUP BY t.user_id, t.due_date, t.type, t.status, t.category, t.tag_id
+            """
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_transaction_daily_rollups_user_day",
+        table_name="transaction_daily_rollups",
+    )
+    op.drop_table("transaction_daily_rollups")
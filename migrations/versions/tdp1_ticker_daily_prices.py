@@ -0,0 +1,47 @@
+"""ticker_daily_prices
+
+Creates the shared market data store used in front of BRAPI:
+
+* `ticker_daily_prices` — one close per (ticker, day), shared by all users.
+* `ticker_price_coverage` — contiguous [covered_from, covered_to] interval
+  already fetched per ticker, so non-trading days are not treated as gaps.
+
+Both start empty; lookups fill them lazily and `flask market backfill` warms
+the most held tickers.
+
+Revision ID: tdp1_ticker_daily_prices
+Revises: roll1_transaction_daily_rollups
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "tdp1_ticker_daily_prices"
+down_revision = "roll1_transaction_daily_rollups"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "ticker_daily_prices",
+        sa.Column("ticker", sa.String(length=10), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("close", sa.Numeric(18, 6), nullable=False),
+        sa.PrimaryKeyConstraint("ticker", "day"),
+    )
+    op.create_table(
+        "ticker_price_coverage",
+        sa.Column("ticker", sa.String(length=10), primary_key=True),
+        sa.Column("covered_from", sa.Date(), nullable=False),
+        sa.Column("covered_to", sa.Date(), nullable=False),
+        sa.Column("refreshed_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ticker_price_coverage")
+    op.drop_table("ticker_daily_prices")
@@ -0,0 +1,61 @@
+"""transactions keyset index
+
+Replaces `ix_transactions_user_deleted_due_date` (user_id, deleted,
+due_date) with `ix_transactions_user_deleted_due_date_id`, which appends
+the primary key. Cursor-paginated transaction lists seek with the row-value
+predicate `(due_date, id) > (:due_date, :id)`; with `id` in the index that
+predicate is an index range start instead of a filter over every row of the
+cursor's day. The wider index still serves every query the old one did.
+
+Both statements run CONCURRENTLY outside the migration transaction so the
+transactions table stays writable while the index builds.
+
+Revision ID: tk1_transactions_keyset_index
+Revises: wh1_wallet_history_events
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+revision = "tk1_transactions_keyset_index"
+down_revision = "wh1_wallet_history_events"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_transactions_user_deleted_due_date_id",
+            "transactions",
+            ["user_id", "deleted", "due_date", "id"],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_transactions_user_deleted_due_date",
+            table_name="transactions",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_transactions_user_deleted_due_date",
+            "transactions",
+            ["user_id", "deleted", "due_date"],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_transactions_user_deleted_due_date_id",
+            table_name="transactions",
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,209 @@
+"""wallet_history_events
+
+Moves the `wallets.history` JSON blob into an append-only table:
+
+* `wallet_history_events` — one row per recorded wallet change, indexed by
+  (wallet_id, recorded_at) so history pages are served by SQL ORDER BY.
+* Existing JSON entries are backfilled (`recorded_at` from each entry's
+  `changeDate` when it is an ISO date/time, falling back to the wallet's
+  `updated_at`), then the `wallets.history` column is dropped. The downgrade
+  rebuilds the column from the table, oldest event first, on every dialect.
+
+Revision ID: wh1_wallet_history_events
+Revises: rem1_due_date_index
+Create Date: 2026-10-16 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+import json
+import uuid
+from datetime import datetime
+from typing import Any
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "wh1_wallet_history_events"
+down_revision = "rem1_due_date_index"
+branch_labels = None
+depends_on = None
+
+# ISO-8601 date with optional time and offset; anything else is not cast.
+_ISO_DATETIME_PATTERN = (
+    r"^\d{4}-\d{2}-\d{2}"
+    r"([ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}(:?\d{2})?)?)?$"
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "wallet_history_events",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            "wallet_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("wallets.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column(
+            "user_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("users.id"),
+            nullable=False,
+        ),
+        sa.Column("recorded_at", sa.DateTime(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+    )
+    op.create_index(
+        "ix_wallet_history_events_wallet_recorded",
+        "wallet_history_events",
+        ["wallet_id", "recorded_at"],
+    )
+
+    conn = op.get_bind()
+    if conn.dialect.name == "postgresql":
+        conn.execute(
+            sa.text(
+                """
+            INSERT INTO wallet_history_events (
+                id, wallet_id, user_id, recorded_at, payload
+            )
+            SELECT
+                md5(w.id::text || ':' || e.ordinality::text)::uuid,
+                w.id,
+                w.user_id,
+                COALESCE(
+                    CASE
+                        WHEN e.value ->> 'changeDate' ~ :iso_pattern
+                        THEN (e.value ->> 'changeDate')::timestamp
+                    END,
+                    w.updated_at,
+                    w.created_at,
+                    now()
+                ),
+                e.value
+            FROM wallets w
+            CROSS JOIN LATERAL json_array_elements(w.history)
+                WITH ORDINALITY AS e(value, ordinality)
+            WHERE w.history IS NOT NULL
+              AND json_typeof(w.history) = 'array'
+            """
+            ),
+            {"iso_pattern": _ISO_DATETIME_PATTERN},
+        )
+    else:
+        _backfill_portable(conn)
+
+    with op.batch_alter_table("wallets") as batch_op:
+        batch_op.drop_column("history")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("wallets") as batch_op:
+        batch_op.add_column(sa.Column("history", sa.JSON(), nullable=True))
+
+    conn = op.get_bind()
+    if conn.dialect.name == "postgresql":
+        op.execute(
+            """
+            UPDATE wallets w
+            SET history = h.events
+            FROM (
+                SELECT wallet_id, json_agg(payload ORDER BY recorded_at) AS events
+                FROM wallet_history_events
+                GROUP BY wallet_id
+            ) h
+            WHERE w.id = h.wallet_id
+            """
+        )
+    else:
+        _rebuild_history_portable(conn)
+
+    op.drop_index(
+        "ix_wallet_history_events_wallet_recorded",
+        table_name="wallet_history_events",
+    )
+    op.drop_table("wallet_history_events")
+
+
+def _backfill_portable(conn: Any) -> None:
+    wallets = sa.table(
+        "wallets",
+        sa.column("id", UUID(as_uuid=True)),
+        sa.column("user_id", UUID(as_uuid=True)),
+        sa.column("history", sa.JSON()),
+        sa.column("updated_at", sa.DateTime()),
+    )
+    events = sa.table(
+        "wallet_history_events",
+        sa.column("id", UUID(as_uuid=True)),
+        sa.column("wallet_id", UUID(as_uuid=True)),
+        sa.column("user_id", UUID(as_uuid=True)),
+        sa.column("recorded_at", sa.DateTime()),
+        sa.column("payload", sa.JSON()),
+    )
+    rows = conn.execute(
+        sa.select(
+            wallets.c.id, wallets.c.user_id, wallets.c.history, wallets.c.updated_at
+        ).where(wallets.c.history.isnot(None))
+    ).fetchall()
+    for wallet_id, user_id, history, updated_at in rows:
+        if isinstance(history, str):
+            history = json.loads(history)
+        if not isinstance(history, list):
+            continue
+        payloads = [
+            {
+                "id": uuid.uuid4(),
+                "wallet_id": wallet_id,
+                "user_id": user_id,
+                "recorded_at": _recorded_at(entry, updated_at),
+                "payload": entry,
+            }
+            for entry in history
+            if isinstance(entry, dict)
+        ]
+        if payloads:
+            conn.execute(events.insert(), payloads)
+
+
+def _rebuild_history_portable(conn: Any) -> None:
+    wallets = sa.table(
+        "wallets",
+        sa.column("id", UUID(as_uuid=True)),
+        sa.column("history", sa.JSON()),
+    )
+    events = sa.table(
+        "wallet_history_events",
+        sa.column("id", UUID(as_uuid=True)),
+        sa.column("wallet_id", UUID(as_uuid=True)),
+        sa.column("recorded_at", sa.DateTime()),
+        sa.column("payload", sa.JSON()),
+    )
+    rows = conn.execute(
+        sa.select(events.c.wallet_id, events.c.payload).order_by(
+            events.c.wallet_id, events.c.recorded_at, events.c.id
+        )
+    ).fetchall()
+    histories: dict[Any, list[Any]] = {}
+    for wallet_id, payload in rows:
+        if isinstance(payload, str):
+            payload = json.loads(payload)
+        histories.setdefault(wallet_id, []).append(payload)
+    for wallet_id, history in histories.items():
+        conn.execute(
+            wallets.update().where(wallets.c.id == wallet_id).values(history=history)
+        )
+
+
+def _recorded_at(entry: dict[str, Any], fallback: datetime | None) -> datetime:
+    raw = entry.get("changeDate")
+    if isinstance(raw, str):
+        try:
+            # Like PostgreSQL's ::timestamp cast, keep wall time, drop offset.
+            return datetime.fromisoformat(raw).replace(tzinfo=None)
+        except ValueError:
+            pass
+    return fallback or datetime.utcnow()
@@ -1,5 +1,7 @@
+import argparse
 import logging
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date
 from pathlib import Path
 
@@ -8,13 +10,67 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from app import create_app  # noqa: E402
-from app.services.recurrence_service import RecurrenceService  # noqa: E402
+from app.services.recurrence_service import (  # noqa: E402
+    DEFAULT_CHUNK_USERS,
+    RecurrenceService,
+)
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 logger = logging.getLogger(__name__)
 
 
-def main() -> int:
+def _parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Materialise missing occurrences of recurring transactions."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes to shard users across (default: 1).",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_USERS,
+        help="Users per chunk; each chunk commits on its own.",
+    )
+    return parser.parse_args(argv)
+
+
+def _run_shard(shard: int, shards: int, chunk_size: int, reference: date) -> int:
+    app = create_app(enable_http_runtime=False)
+    with app.app_context():
+        return int(
+            RecurrenceService.generate_missing_occurrences(
+                reference_date=reference,
+                chunk_size=chunk_size,
+                shard=shard,
+                shards=shards,
+            )
+        )
+
+
+def _run_sharded(workers: int, chunk_size: int, reference: date) -> int:
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_run_shard, shard, workers, chunk_size, reference)
+            for shard in range(workers)
+        ]
+        return sum(future.result() for future in futures)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv or [])
+    if args.workers > 1:
+        try:
+            created = _run_sharded(args.workers, args.chunk_size, date.today())
+        except Exception:
+            logger.exception("recurrence: sharded run failed")
+            return 1
+        logger.info("recurrence: done — transactions created=%s", created)
+        return 0
+
     try:
         app = create_app(enable_http_runtime=False)
     except Exception:
@@ -24,7 +80,7 @@ def main() -> int:
     with app.app_context():
         try:
             created = RecurrenceService.generate_missing_occurrences(
-                reference_date=date.today()
+                reference_date=date.today(), chunk_size=args.chunk_size
             )
         except Exception:
             logger.exception(
@@ -37,4 +93,4 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(main(sys.argv[1:]))
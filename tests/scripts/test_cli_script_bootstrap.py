@@ -66,7 +66,7 @@ def test_generate_recurring_transactions_uses_internal_runtime(
     monkeypatch.setattr(
         recurrence_script,
         "RecurrenceService",
-        SimpleNamespace(generate_missing_occurrences=lambda reference_date: 0),
+        SimpleNamespace(generate_missing_occurrences=lambda reference_date, **_: 0),
     )
 
     exit_code = recurrence_script.main()
@@ -95,7 +95,7 @@ def test_generate_recurring_transactions_returns_1_on_service_error(
         lambda *, enable_http_runtime=True: _FakeApp(),
     )
 
-    def _failing_service(*, reference_date):
+    def _failing_service(*, reference_date, **_):
         raise RuntimeError("simulated DB failure")
 
     monkeypatch.setattr(
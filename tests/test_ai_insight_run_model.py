@@ -190,3 +190,21 @@ class TestAIInsightRunModel:
             assert fresh.snapshot_json is not None
             assert fresh.evidence_manifest_json is not None
             assert fresh.purged_at is None
+
+    def test_purge_expired_runs_works_through_backlog_in_chunks(self, app) -> None:
+        with app.app_context():
+            user_id = uuid.uuid4()
+            now = utc_now_naive()
+            for index in range(5):
+                payload = _run_payload(user_id)
+                payload["snapshot_hash"] = f"sha256:expired-{index}"
+                db.session.add(
+                    AIInsightRun(**payload, expires_at=now - timedelta(days=1))
+                )
+            db.session.commit()
+
+            assert purge_expired_ai_insight_runs(now=now, chunk_size=2) == 5
+            assert purge_expired_ai_insight_runs(now=now, chunk_size=2) == 0
+            assert (
+                AIInsightRun.query.filter(AIInsightRun.purged_at.is_(None)).count() == 0
+            )
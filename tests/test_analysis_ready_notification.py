@@ -6,7 +6,7 @@ from __future__ import annotations
 import uuid
 from datetime import date, timedelta
 from decimal import Decimal
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from app.application.services.transaction_reminder_service import (
     dispatch_due_transaction_reminders,
@@ -20,6 +20,7 @@ from app.services.analysis_ready_notification_service import (
 )
 from app.services.email_provider import get_email_outbox
 from app.services.entitlement_service import activate_premium, deactivate_premium
+from app.services.expo_push_service import ExpoPushBuffer
 
 # ---------------------------------------------------------------------------
 # plan_features catalog
@@ -128,20 +129,65 @@ def test_dispatch_analysis_ready_sends_expo_push_to_premium_user(app) -> None:
         db.session.add(sub)
         db.session.commit()
 
+        queue = MagicMock()
         with patch(
-            "app.services.analysis_ready_notification_service.http_client.post"
-        ) as mock_post:
-            mock_post.return_value.ok = True
+            "app.services.analysis_ready_notification_service."
+            "get_default_outbound_queue",
+            return_value=queue,
+        ):
             result = dispatch_analysis_ready_notification(
                 user_id=user.id,
                 summary_preview="Gastos acima do esperado.",
             )
 
         assert result.push_sent is True
-        mock_post.assert_called_once()
-        call_body = mock_post.call_args.kwargs["json"]
-        assert "ExponentPushToken" in call_body["to"]
-        assert "Análise" in call_body["title"] or "pronta" in call_body["title"]
+        queue.enqueue_push_batch.assert_called_once()
+        (message,) = queue.enqueue_push_batch.call_args.kwargs["messages"]
+        assert "ExponentPushToken" in message["to"]
+        assert "Análise" in message["title"] or "pronta" in message["title"]
+
+
+def test_dispatch_analysis_ready_joins_shared_push_buffer(app) -> None:
+    with app.app_context():
+        from app.models.push_subscription import PushSubscription, PushTransport
+
+        user_ids = []
+        for index in range(2):
+            user = User(
+                id=uuid.uuid4(),
+                name=f"Buffered {index}",
+                email=f"buffered-{uuid.uuid4()}@test.com",
+                password="hash",
+            )
+            db.session.add(user)
+            db.session.commit()
+            activate_premium(user.id, expires_at=None)
+            db.session.add(
+                PushSubscription(
+                    user_id=user.id,
+                    transport=PushTransport.expo,
+                    endpoint=f"ExponentPushToken[buffered-{index}]",
+                )
+            )
+            db.session.commit()
+            user_ids.append(user.id)
+
+        queue = MagicMock()
+        buffer = ExpoPushBuffer(queue)
+        results = [
+            dispatch_analysis_ready_notification(user_id=user_id, push_buffer=buffer)
+            for user_id in user_ids
+        ]
+        queue.enqueue_push_batch.assert_not_called()
+        buffer.flush()
+
+        assert all(result.push_sent for result in results)
+        queue.enqueue_push_batch.assert_called_once()
+        messages = queue.enqueue_push_batch.call_args.kwargs["messages"]
+        assert sorted(message["to"] for message in messages) == [
+            "ExponentPushToken[buffered-0]",
+            "ExponentPushToken[buffered-1]",
+        ]
 
 
 def test_dispatch_analysis_ready_handles_email_failure(app) -> None:
@@ -124,6 +124,104 @@ class TestPurgeExpiredAuditEvents:
             mock_metric.assert_not_called()
 
 
+# ── monthly partitions / chunked fallback ─────────────────────────────────────
+
+
+class TestAuditPartitions:
+    def test_partition_names_and_bounds(self) -> None:
+        from datetime import date
+
+        from app.services.audit_partition_service import (
+            add_months,
+            create_month_partition_sql,
+            partition_name,
+        )
+
+        assert add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+        assert partition_name(date(2026, 1, 1)) == "audit_events_p2026_01"
+        sql = create_month_partition_sql(date(2026, 12, 1))
+        assert "audit_events_p2026_12 PARTITION OF audit_events" in sql
+        assert "FROM ('2026-12-01 00:00:00+00') TO ('2027-01-01 00:00:00+00')" in sql
+
+    def test_sqlite_is_not_partitioned_and_ensure_is_noop(self, app) -> None:
+        from app.services.audit_partition_service import (
+            ensure_audit_partitions,
+            is_audit_events_partitioned,
+        )
+
+        with app.app_context():
+            assert is_audit_events_partitioned() is False
+            assert ensure_audit_partitions(months_ahead=2) == []
+
+    def test_chunked_delete_removes_every_expired_row(self, app) -> None:
+        from app.extensions.database import db
+        from app.models.audit_event import AuditEvent
+        from app.services.audit_partition_service import purge_audit_events_before
+
+        now = datetime.now(UTC)
+        with app.app_context():
+            db.session.add_all(
+                AuditEvent(
+                    method="GET",
+                    path=f"/old/{index}",
+                    status=200,
+                    created_at=now - timedelta(days=40 + index),
+                )
+                for index in range(7)
+            )
+            db.session.add(
+                AuditEvent(method="GET", path="/new", status=200, created_at=now)
+            )
+            db.session.commit()
+
+            result = purge_audit_events_before(now - timedelta(days=30), chunk_size=3)
+
+            assert result.dropped_partitions == []
+            assert result.deleted_rows == result.total == 7
+            assert [event.path for event in AuditEvent.query.all()] == ["/new"]
+
+    def test_month_holding_default_rows_is_created_around_a_detached_default(
+        self,
+    ) -> None:
+        from datetime import date
+
+        from app.services import audit_partition_service as service
+
+        class _Result:
+            def __init__(self, value: int = 0) -> None:
+                self.value = value
+                self.rowcount = value
+
+            def scalar(self) -> int:
+                return self.value
+
+        class _Connection:
+            def __init__(self) -> None:
+                self.statements: list[str] = []
+
+            def execute(self, statement, params=None) -> _Result:
+                sql = str(statement)
+                self.statements.append(sql)
+                return _Result(4 if "FROM audit_events_default" in sql else 0)
+
+        conn = _Connection()
+        moved = service._create_month_partition(
+            conn, date(2026, 12, 1), has_default=True
+        )
+
+        assert moved == 4
+        expected = [
+            "SELECT 1 FROM audit_events_default",
+            "ALTER TABLE audit_events DETACH PARTITION audit_events_default",
+            "CREATE TABLE IF NOT EXISTS audit_events_p2026_12 PARTITION OF",
+            "WITH moved AS (DELETE FROM audit_events_default",
+            "ALTER TABLE audit_events ATTACH PARTITION audit_events_default DEFAULT",
+        ]
+        assert len(conn.statements) == len(expected)
+        for sql, prefix in zip(conn.statements, expected, strict=True):
+            assert sql.startswith(prefix)
+
+
 # ── record_audit_purge metric ─────────────────────────────────────────────────
 
 
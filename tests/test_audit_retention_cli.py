@@ -83,3 +83,36 @@ def test_audit_retention_cli_fails_on_invalid_days_type(app) -> None:
     )
     assert result.exit_code == 2
     assert "Invalid value for '--retention-days'" in result.output
+
+
+def test_audit_retention_cli_ensure_partitions_is_noop_on_sqlite(app) -> None:
+    result = app.test_cli_runner().invoke(
+        args=["audit-events", "ensure-partitions", "--months-ahead", "2"]
+    )
+    assert result.exit_code == 0
+    assert "created=0 months_ahead=2" in result.output
+
+
+def test_audit_retention_cli_purges_even_when_partitioning_fails(
+    app, monkeypatch
+) -> None:
+    from app.extensions import audit_retention_cli
+
+    def _fail(**_kwargs):
+        raise RuntimeError("default partition holds rows")
+
+    monkeypatch.setattr(audit_retention_cli, "ensure_audit_partitions", _fail)
+    now = datetime.now(UTC)
+    with app.app_context():
+        db.session.add(
+            _new_event(request_id="stale-split", created_at=now - timedelta(days=40))
+        )
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(
+        args=["audit-events", "purge-expired", "--retention-days", "30"]
+    )
+
+    assert result.exit_code == 1
+    assert "deleted=1 retention_days=30" in result.output
+    assert "ensure-partitions failed" in result.output
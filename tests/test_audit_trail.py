@@ -1,9 +1,18 @@
+import fcntl
 import logging
+import os
 
 import pytest
 from flask import Flask
 
 from app.extensions.audit_trail import _is_sensitive_path, register_audit_trail
+from app.extensions.audit_writer import (
+    AuditEventWriter,
+    _row_to_json,
+    build_audit_row,
+    get_audit_writer,
+)
+from app.extensions.integration_metrics import snapshot_metrics
 from app.models.audit_event import AuditEvent
 
 
@@ -63,12 +72,107 @@ def test_audit_trail_persists_event_when_enabled(
     )
     assert response.status_code == 201
 
+    writer = get_audit_writer(app)
+    assert writer is not None
+    writer.flush()
+    writer.stop()
     with app.app_context():
         event = AuditEvent.query.filter_by(path="/auth/register").first()
         assert event is not None
         assert event.method == "POST"
 
 
+def test_audit_trail_sync_mode_persists_in_request(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    monkeypatch.setenv("AUDIT_WRITER_MODE", "sync")
+    monkeypatch.setenv("AUDIT_PERSISTENCE_ENABLED", "true")
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'sync.sqlite3'}")
+    from app import create_app
+    from app.extensions.database import db
+
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+    assert get_audit_writer(app) is None
+
+    response = app.test_client().post("/auth/login", json={})
+
+    assert response.status_code >= 400
+    with app.app_context():
+        assert AuditEvent.query.filter_by(path="/auth/login").count() == 1
+        db.drop_all()
+        db.engine.dispose()
+
+
+def _payload(path: str) -> dict[str, object]:
+    return {"method": "GET", "path": path, "status": 200, "request_id": "r-1"}
+
+
+def test_audit_writer_bulk_inserts_queued_rows(app) -> None:
+    writer = AuditEventWriter(app, batch_size=2, flush_interval_ms=60_000)
+    for index in range(5):
+        assert writer.submit(build_audit_row(_payload(f"/wallet/{index}")))
+    writer.stop()
+
+    with app.app_context():
+        assert AuditEvent.query.filter(AuditEvent.path.like("/wallet/%")).count() == 5
+    assert snapshot_metrics("audit.writer.written")["audit.writer.written"] == 5
+
+
+def test_audit_writer_spills_overflow_and_replays_it(app, tmp_path) -> None:
+    spill = tmp_path / "audit-spill.jsonl"
+    writer = AuditEventWriter(
+        app, queue_size=1, flush_interval_ms=60_000, spill_path=spill
+    )
+    assert writer.submit(build_audit_row(_payload("/auth/a")))
+    assert writer.submit(build_audit_row(_payload("/auth/b"))) is False
+    writer.stop()
+
+    own_spill = tmp_path / f"audit-spill.jsonl.{os.getpid()}"
+    assert len(own_spill.read_text(encoding="utf-8").splitlines()) == 1
+    assert not spill.exists()
+    assert snapshot_metrics("audit.writer.")["audit.writer.spilled"] == 1
+
+    replay = AuditEventWriter(app, flush_interval_ms=60_000, spill_path=spill)
+    replay.submit(build_audit_row(_payload("/auth/c")))
+    replay.stop()
+
+    assert list(tmp_path.glob("audit-spill*")) == []
+    with app.app_context():
+        paths = {event.path for event in AuditEvent.query.all()}
+    assert {"/auth/a", "/auth/b", "/auth/c"} <= paths
+
+
+def test_audit_writer_replays_only_spill_files_of_exited_workers(app, tmp_path) -> None:
+    spill = tmp_path / "audit-spill.jsonl"
+    rows = {
+        "exited": build_audit_row(_payload("/auth/exited")),
+        "live": build_audit_row(_payload("/auth/live")),
+    }
+    for name, pid in (("exited", 111), ("live", 222)):
+        (tmp_path / f"audit-spill.jsonl.{pid}").write_text(
+            _row_to_json(rows[name]) + "\n", encoding="utf-8"
+        )
+    live_handle = (tmp_path / "audit-spill.jsonl.222").open("a", encoding="utf-8")
+    fcntl.flock(live_handle, fcntl.LOCK_EX)
+    try:
+        for _ in range(2):
+            writer = AuditEventWriter(app, flush_interval_ms=60_000, spill_path=spill)
+            writer.submit(build_audit_row(_payload("/auth/start")))
+            writer.stop()
+    finally:
+        live_handle.close()
+
+    spill_files = sorted(path.name for path in tmp_path.glob("audit-spill*"))
+    assert spill_files == ["audit-spill.jsonl.222"]
+    with app.app_context():
+        paths = {event.path for event in AuditEvent.query.all()}
+        exited = AuditEvent.query.filter_by(path="/auth/exited").count()
+    assert exited == 1
+    assert "/auth/live" not in paths
+
+
 def test_audit_trail_does_not_run_retention_on_request(
     client,
     monkeypatch: pytest.MonkeyPatch,
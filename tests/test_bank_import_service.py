@@ -171,3 +171,68 @@ def test_build_preview_rejects_empty_content(app) -> None:
 
         with pytest.raises(ValueError, match="cannot be empty"):
             service.build_preview(content="  \n ", bank_name="nubank")
+
+
+def _selected(external_id: str, day: int, amount: str = "-10.00") -> dict[str, str]:
+    return {
+        "external_id": external_id,
+        "date": f"2026-03-{day:02d}",
+        "description": f"Compra {external_id}",
+        "amount": amount,
+        "transaction_type": "expense",
+        "bank_name": "itau",
+    }
+
+
+def test_confirm_import_bulk_inserts_and_skips_existing_ids(app) -> None:
+    with app.app_context():
+        user = _create_user()
+        existing = _create_existing_transaction(user_id=user.id, external_id="A-1")
+        existing.deleted = True
+        db.session.commit()
+
+        result = BankImportService(user.id).confirm_import(
+            bank_name="itau",
+            month="2026-03",
+            mode="selective",
+            selected_entries=[_selected("A-1", 1), _selected("A-2", 2)]
+            + [_selected("A-2", 2)],
+        )
+
+        assert result.imported_count == 1
+        assert result.skipped_duplicates == 2
+        assert [tx.external_id for tx in result.transactions] == ["A-2"]
+        assert result.transactions[0].status == TransactionStatus.PAID
+
+
+def test_confirm_replace_month_deletes_in_one_statement_and_refreshes_rollups(
+    app,
+) -> None:
+    from app.models.transaction_daily_rollup import TransactionDailyRollup
+
+    with app.app_context():
+        user = _create_user()
+        service = BankImportService(user.id)
+        service.confirm_import(
+            bank_name="itau",
+            month="2026-03",
+            mode="selective",
+            selected_entries=[_selected("OLD-1", 5), _selected("OLD-2", 6)],
+        )
+
+        result = service.confirm_import(
+            bank_name="itau",
+            month="2026-03",
+            mode="replace_month",
+            selected_entries=[_selected("NEW-1", 7)],
+        )
+        remaining = [
+            tx.external_id for tx in Transaction.query.filter_by(user_id=user.id)
+        ]
+        rollup_days = [
+            row.day for row in TransactionDailyRollup.query.filter_by(user_id=user.id)
+        ]
+
+        assert result.replaced_count == 2
+        assert remaining == ["NEW-1"]
+        assert rollup_days == [date(2026, 3, 7)]
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+import io
 from decimal import Decimal
 
 import pytest
 
-from app.services.bank_statement_parsers import parse_nubank_csv, parse_ofx
+from app.services import bank_statement_parsers
+from app.services.bank_statement_parsers import (
+    iter_nubank_csv_entries,
+    iter_ofx_entries,
+    parse_nubank_csv,
+    parse_ofx,
+)
 
 OFX_1_SAMPLE = """
 OFXHEADER:100
@@ -133,3 +140,23 @@ def test_parse_nubank_csv_rejects_empty_rows() -> None:
 
     with pytest.raises(ValueError, match="has no transaction rows"):
         parse_nubank_csv(empty_csv)
+
+
+@pytest.mark.parametrize("sample", [OFX_1_SAMPLE, OFX_2_SAMPLE])
+def test_iter_ofx_entries_handles_tiny_read_chunks(monkeypatch, sample) -> None:
+    monkeypatch.setattr(bank_statement_parsers, "_READ_CHUNK_SIZE", 7)
+
+    streamed = list(iter_ofx_entries(io.BytesIO(sample.encode("utf-8")), "itau"))
+
+    assert [entry.external_id for entry in streamed] == [
+        entry.external_id for entry in parse_ofx(sample, "itau")
+    ]
+
+
+def test_iter_nubank_csv_entries_falls_back_to_latin1(monkeypatch) -> None:
+    monkeypatch.setattr(bank_statement_parsers, "_READ_CHUNK_SIZE", 5)
+    raw = "date,title,amount\n2026-03-14,Padaria São João,-9.50\n".encode("latin-1")
+
+    entries = list(iter_nubank_csv_entries(io.BytesIO(raw)))
+
+    assert [entry.description for entry in entries] == ["Padaria São João"]
@@ -141,6 +141,36 @@ class TestRedisBrapiCache:
         cache = RedisBrapiCache(client)
         cache.reset()
 
+    def test_get_many_uses_single_mget(self):
+        client = self._make_client()
+        client.mget.return_value = [b"32.5", None]
+        cache = RedisBrapiCache(client)
+        assert cache.get_many(["PETR4", "VALE3"]) == {"PETR4": 32.5}
+        client.mget.assert_called_once_with(["brapi:cache:PETR4", "brapi:cache:VALE3"])
+        client.get.assert_not_called()
+
+    def test_get_many_returns_empty_on_redis_error(self):
+        client = self._make_client()
+        client.mget.side_effect = Exception("Redis unavailable")
+        cache = RedisBrapiCache(client)
+        assert cache.get_many(["PETR4"]) == {}
+
+    def test_set_many_pipelines_setex(self):
+        client = self._make_client()
+        pipe = client.pipeline.return_value
+        cache = RedisBrapiCache(client)
+        cache.set_many({"PETR4": 32.5, "VALE3": 60.0}, ttl_seconds=60)
+        client.pipeline.assert_called_once_with(transaction=False)
+        assert pipe.setex.call_count == 2
+        pipe.execute.assert_called_once()
+        client.setex.assert_not_called()
+
+    def test_set_many_skips_when_ttl_zero(self):
+        client = self._make_client()
+        cache = RedisBrapiCache(client)
+        cache.set_many({"PETR4": 32.5}, ttl_seconds=0)
+        client.pipeline.assert_not_called()
+
 
 class TestBuildCache:
     def test_returns_noop_when_redis_url_not_set(self, monkeypatch):
@@ -341,3 +341,105 @@ def test_budget_custom_period(client) -> None:
     assert budget["period"] == "custom"
     assert budget["start_date"] == "2026-04-01"
     assert budget["end_date"] == "2026-04-30"
+
+
+# ---------------------------------------------------------------------------
+# Batch spent calculation
+# ---------------------------------------------------------------------------
+
+
+def test_spent_for_budgets_uses_one_grouped_query(client, app) -> None:
+    from datetime import date
+    from decimal import Decimal
+
+    from flask_jwt_extended import decode_token
+    from sqlalchemy import event
+
+    from app.extensions.database import db
+    from app.models.budget import Budget
+    from app.models.tag import Tag
+    from app.models.transaction import (
+        Transaction,
+        TransactionCategory,
+        TransactionStatus,
+        TransactionType,
+    )
+    from app.services.budget_service import BudgetService
+
+    token = _register_and_login(client, prefix="budget-batch")
+    user_id = uuid.UUID(decode_token(token)["sub"])
+    today = date(2026, 5, 14)  # Thursday
+
+    with app.app_context():
+        tag = Tag(user_id=user_id, name="Mercado")
+        db.session.add(tag)
+        db.session.flush()
+
+        def _expense(amount: str, due: date, **fields: Any) -> Transaction:
+            return Transaction(
+                user_id=user_id,
+                title="Gasto",
+                amount=Decimal(amount),
+                type=TransactionType.EXPENSE,
+                status=fields.pop("status", TransactionStatus.PAID),
+                due_date=due,
+                **fields,
+            )
+
+        db.session.add_all(
+            [
+                _expense(
+                    "100.00",
+                    date(2026, 5, 12),
+                    category=TransactionCategory.alimentacao,
+                ),
+                _expense("40.00", date(2026, 5, 2), tag_id=tag.id),
+                _expense("25.00", date(2026, 4, 30)),
+                _expense("999.00", date(2026, 5, 13), status=TransactionStatus.PENDING),
+            ]
+        )
+        budgets = [
+            Budget(user_id=user_id, name="Geral", amount=Decimal("500")),
+            Budget(
+                user_id=user_id,
+                name="Alimentação",
+                amount=Decimal("300"),
+                category="alimentacao",
+            ),
+            Budget(user_id=user_id, name="Tag", amount=Decimal("50"), tag_id=tag.id),
+            Budget(
+                user_id=user_id, name="Semana", amount=Decimal("90"), period="weekly"
+            ),
+            Budget(
+                user_id=user_id,
+                name="Virada",
+                amount=Decimal("90"),
+                period="custom",
+                start_date=date(2026, 4, 25),
+                end_date=date(2026, 5, 5),
+            ),
+        ]
+        db.session.add_all(budgets)
+        db.session.commit()
+
+        statements: list[str] = []
+
+        def _capture(_conn, _cursor, statement, *_args) -> None:
+            if "FROM transactions" in statement:
+                statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", _capture)
+        try:
+            spent = BudgetService(user_id).get_spent_for_budgets(budgets, today=today)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", _capture)
+
+        assert len(statements) == 1
+        assert "EXTRACT" not in statements[0].upper()
+        assert [spent[budget.id] for budget in budgets] == [
+            Decimal("140.00"),
+            Decimal("100.00"),
+            Decimal("40.00"),
+            Decimal("100.00"),
+            Decimal("65.00"),
+        ]
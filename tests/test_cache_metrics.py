@@ -49,9 +49,13 @@ class TestPrometheusRecordingFunctions:
             if _CACHE_HITS_TOTAL is None:
                 pytest.skip("prometheus_client not installed")
 
-            before = _CACHE_HITS_TOTAL.labels(namespace="dashboard")._value.get()
+            before = _CACHE_HITS_TOTAL.labels(
+                namespace="dashboard", tier="redis"
+            )._value.get()
             record_cache_hit("dashboard")
-            after = _CACHE_HITS_TOTAL.labels(namespace="dashboard")._value.get()
+            after = _CACHE_HITS_TOTAL.labels(
+                namespace="dashboard", tier="redis"
+            )._value.get()
             assert after == before + 1
 
     def test_record_cache_miss_increments_counter(self, app) -> None:
@@ -62,9 +66,13 @@ class TestPrometheusRecordingFunctions:
             if _CACHE_MISSES_TOTAL is None:
                 pytest.skip("prometheus_client not installed")
 
-            before = _CACHE_MISSES_TOTAL.labels(namespace="brapi")._value.get()
+            before = _CACHE_MISSES_TOTAL.labels(
+                namespace="brapi", tier="redis"
+            )._value.get()
             record_cache_miss("brapi")
-            after = _CACHE_MISSES_TOTAL.labels(namespace="brapi")._value.get()
+            after = _CACHE_MISSES_TOTAL.labels(
+                namespace="brapi", tier="redis"
+            )._value.get()
             assert after == before + 1
 
     def test_record_cache_invalidation_increments_counter(self, app) -> None:
@@ -121,10 +129,14 @@ class TestRedisCacheServiceMetrics:
                 pytest.skip("prometheus_client not installed")
 
             svc, _ = _make_redis_service(get_return=True)
-            before = _CACHE_HITS_TOTAL.labels(namespace="dashboard")._value.get()
+            before = _CACHE_HITS_TOTAL.labels(
+                namespace="dashboard", tier="redis"
+            )._value.get()
             result = svc.get("dashboard:overview:abc:2026-04")
             assert result is not None
-            after = _CACHE_HITS_TOTAL.labels(namespace="dashboard")._value.get()
+            after = _CACHE_HITS_TOTAL.labels(
+                namespace="dashboard", tier="redis"
+            )._value.get()
             assert after == before + 1
 
     def test_get_miss_records_miss(self, app) -> None:
@@ -136,10 +148,14 @@ class TestRedisCacheServiceMetrics:
                 pytest.skip("prometheus_client not installed")
 
             svc, _ = _make_redis_service(get_return=False)
-            before = _CACHE_MISSES_TOTAL.labels(namespace="portfolio")._value.get()
+            before = _CACHE_MISSES_TOTAL.labels(
+                namespace="portfolio", tier="redis"
+            )._value.get()
             result = svc.get("portfolio:valuation:abc")
             assert result is None
-            after = _CACHE_MISSES_TOTAL.labels(namespace="portfolio")._value.get()
+            after = _CACHE_MISSES_TOTAL.labels(
+                namespace="portfolio", tier="redis"
+            )._value.get()
             assert after == before + 1
 
     def test_invalidate_records_invalidation(self, app) -> None:
@@ -192,7 +208,11 @@ class TestRedisCacheServiceMetrics:
                 pytest.skip("prometheus_client not installed")
 
             svc, _ = _make_redis_service(get_return=False)
-            before = _CACHE_MISSES_TOTAL.labels(namespace="brapi")._value.get()
+            before = _CACHE_MISSES_TOTAL.labels(
+                namespace="brapi", tier="redis"
+            )._value.get()
             svc.get("brapi:quote:PETR4")
-            after = _CACHE_MISSES_TOTAL.labels(namespace="brapi")._value.get()
+            after = _CACHE_MISSES_TOTAL.labels(
+                namespace="brapi", tier="redis"
+            )._value.get()
             assert after == before + 1
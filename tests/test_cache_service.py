@@ -2,11 +2,21 @@
 
 from __future__ import annotations
 
+import json
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
+import pytest
+
 from app.services.cache_service import (
+    CACHE_VERSION_TTL,
+    L1_INVALIDATION_CHANNEL,
     RedisCacheService,
+    _LocalCacheTier,
     _NoOpCacheService,
+    _parse_ttl_overrides,
+    _SingleFlight,
     get_cache_service,
     reset_cache_service_for_tests,
 )
@@ -111,6 +121,309 @@ def test_invalidate_pattern_is_silent_on_redis_error() -> None:
     cache.invalidate_pattern("dashboard:*")  # must not raise
 
 
+# ── Versioned keyspace ────────────────────────────────────────────────────────
+
+
+def test_versioned_key_embeds_domain_versions() -> None:
+    cache, client = _make_redis_cache()
+    client.mget.return_value = [b"3", None]
+    key = cache.versioned_key("dashboard:survival-index", "uid")
+    client.mget.assert_called_once_with(
+        ["cachever:transactions:uid", "cachever:wallets:uid"]
+    )
+    assert key == "dashboard:survival-index:uid:v3.0"
+
+
+def test_versioned_key_appends_parts() -> None:
+    cache, client = _make_redis_cache()
+    client.mget.return_value = [b"7"]
+    assert cache.versioned_key("dashboard:trends", "uid", "6") == (
+        "dashboard:trends:uid:v7:6"
+    )
+
+
+def test_versioned_key_is_unique_when_versions_unreadable() -> None:
+    cache, client = _make_redis_cache()
+    client.mget.side_effect = ConnectionError("Redis down")
+    first = cache.versioned_key("dashboard:trends", "uid", "6")
+    second = cache.versioned_key("dashboard:trends", "uid", "6")
+    assert first.startswith("dashboard:trends:uid:x")
+    assert first != second
+
+
+def test_versioned_key_rejects_unknown_namespace() -> None:
+    cache, _ = _make_redis_cache()
+    with pytest.raises(ValueError):
+        cache.versioned_key("unknown:namespace", "uid")
+
+
+def test_invalidate_domain_bumps_version_in_pipeline() -> None:
+    cache, client = _make_redis_cache()
+    pipe = client.pipeline.return_value
+    cache.invalidate_domain("transactions", "uid")
+    pipe.incr.assert_called_once_with("cachever:transactions:uid")
+    pipe.expire.assert_called_once_with("cachever:transactions:uid", CACHE_VERSION_TTL)
+    pipe.execute.assert_called_once()
+    client.scan.assert_not_called()
+
+
+def test_invalidate_domain_rejects_unknown_domain() -> None:
+    cache, _ = _make_redis_cache()
+    with pytest.raises(ValueError):
+        cache.invalidate_domain("unknown", "uid")
+
+
+def test_invalidate_domain_is_silent_on_redis_error() -> None:
+    cache, client = _make_redis_cache()
+    client.pipeline.return_value.execute.side_effect = ConnectionError("down")
+    cache.invalidate_domain("wallets", "uid")  # must not raise
+
+
+def test_noop_versioned_key_uses_version_zero() -> None:
+    cache = _NoOpCacheService()
+    assert cache.versioned_key("entitlement", "uid", "export_pdf") == (
+        "entitlement:uid:v0:export_pdf"
+    )
+    cache.invalidate_domain("entitlements", "uid")  # must not raise
+
+
+# ── L1 in-process tier ────────────────────────────────────────────────────────
+
+
+def _make_l1_cache(
+    *, max_entries: int = 100, max_bytes: int = 10_000
+) -> tuple[RedisCacheService, MagicMock, _LocalCacheTier]:
+    local = _LocalCacheTier(
+        max_entries=max_entries,
+        max_bytes=max_bytes,
+        ttl_overrides={"dashboard": 30, "cachever": 30},
+    )
+    local.active = True  # as if subscribed to the invalidation channel
+    client = MagicMock()
+    return RedisCacheService(client, local=local), client, local
+
+
+def test_l1_serves_repeat_reads_without_redis() -> None:
+    cache, client, _ = _make_l1_cache()
+    client.get.return_value = b'{"balance": 1.0}'
+    first = cache.get("dashboard:overview:uid:v1:2026-04")
+    second = cache.get("dashboard:overview:uid:v1:2026-04")
+    assert first == second == {"balance": 1.0}
+    client.get.assert_called_once()
+
+
+def test_l1_skips_namespaces_without_ttl_override() -> None:
+    cache, client, local = _make_l1_cache()
+    client.get.return_value = b"3"
+    cache.get("advisory:rate:uid")
+    cache.get("advisory:rate:uid")
+    assert client.get.call_count == 2
+    assert len(local) == 0
+
+
+def test_l1_bypassed_while_not_subscribed() -> None:
+    cache, client, local = _make_l1_cache()
+    local.active = False
+    client.get.return_value = b"{}"
+    cache.get("dashboard:overview:uid:v1:x")
+    cache.get("dashboard:overview:uid:v1:x")
+    assert client.get.call_count == 2
+
+
+def test_l1_entries_expire_with_ttl(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    cache, client, _ = _make_l1_cache()
+    clock = [1000.0]
+    monkeypatch.setattr("app.services.cache_service.time.monotonic", lambda: clock[0])
+    cache.set("dashboard:trends:uid:v1:6", {"a": 1}, ttl=10)
+    assert cache.get("dashboard:trends:uid:v1:6") == {"a": 1}
+    clock[0] += 11
+    client.get.return_value = None
+    assert cache.get("dashboard:trends:uid:v1:6") is None
+
+
+def test_l1_evicts_by_entries_and_bytes() -> None:
+    cache, client, local = _make_l1_cache(max_entries=2, max_bytes=40)
+    for index in range(3):
+        cache.set(f"dashboard:k{index}", index, ttl=60)
+    assert len(local) == 2
+    assert local.get("dashboard:k0") is local.get("dashboard:missing")
+    cache.set("dashboard:big", "x" * 50, ttl=60)
+    assert local.get("dashboard:big") is local.get("dashboard:missing")
+    assert local.size_bytes <= 40
+
+
+def test_l1_write_and_invalidation_are_broadcast() -> None:
+    cache, client, local = _make_l1_cache()
+    cache.set("dashboard:overview:uid:v1:m", {"a": 1}, ttl=60)
+    cache.invalidate("dashboard:overview:uid:v1:m")
+    cache.invalidate_pattern("dashboard:*")
+    published = [call.args for call in client.publish.call_args_list]
+    assert [channel for channel, _ in published] == [L1_INVALIDATION_CHANNEL] * 3
+    assert len(local) == 0
+
+
+def test_l1_applies_invalidations_from_other_workers() -> None:
+    cache, _, local = _make_l1_cache()
+    cache.set("dashboard:overview:uid:v1:m", {"a": 1}, ttl=60)
+    cache.set("dashboard:trends:uid:v1:6", {"b": 2}, ttl=60)
+    other = '{"origin": "other", "op": "key", "target": "dashboard:overview:uid:v1:m"}'
+    cache._apply_invalidation(other.encode())
+    assert len(local) == 1
+    cache._apply_invalidation(b'{"origin": "other", "op": "pattern", "target": "*"}')
+    assert len(local) == 0
+    cache._apply_invalidation(b"not-json")  # must not raise
+
+
+def test_l1_ignores_fetch_raced_by_invalidation() -> None:
+    cache, client, local = _make_l1_cache()
+
+    def _get(key: str) -> bytes:
+        local.discard(key)  # invalidation lands while Redis is answering
+        return b"1"
+
+    client.get.side_effect = _get
+    assert cache.get("dashboard:overview:uid:v1:m") == 1
+    assert len(local) == 0
+
+
+def test_l1_caches_domain_versions() -> None:
+    cache, client, _ = _make_l1_cache()
+    client.mget.return_value = [b"2"]
+    cache.versioned_key("dashboard:trends", "uid", "6")
+    assert cache.versioned_key("dashboard:trends", "uid", "6") == (
+        "dashboard:trends:uid:v2:6"
+    )
+    client.mget.assert_called_once()
+
+    cache.invalidate_domain("transactions", "uid")
+    client.mget.return_value = [b"3"]
+    assert cache.versioned_key("dashboard:trends", "uid", "6") == (
+        "dashboard:trends:uid:v3:6"
+    )
+
+
+def test_parse_ttl_overrides_skips_invalid_items() -> None:
+    assert _parse_ttl_overrides("dashboard=5, entitlement=15,bad,x=0,y=z") == {
+        "dashboard": 5,
+        "entitlement": 15,
+    }
+
+
+# ── get_or_compute: single-flight + stale-while-revalidate ───────────────────
+
+
+def _envelope(value: object, *, fresh_for: float) -> bytes:
+    return json.dumps(
+        {"__swr_value": value, "__swr_fresh_until": time.time() + fresh_for}
+    ).encode()
+
+
+def test_single_flight_shares_one_call_between_threads() -> None:
+    flight = _SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls: list[int] = []
+
+    def _slow() -> str:
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return "value"
+
+    results: list[tuple[object, bool]] = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", _slow)))
+    leader.start()
+    started.wait(timeout=5)
+    follower = threading.Thread(target=lambda: results.append(flight.do("k", _slow)))
+    follower.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join(timeout=5)
+    follower.join(timeout=5)
+
+    assert calls == [1]
+    assert sorted(results, key=lambda r: r[1]) == [("value", False), ("value", True)]
+
+
+def test_get_or_compute_returns_fresh_hit_without_computing() -> None:
+    cache, client = _make_redis_cache()
+    client.get.return_value = _envelope({"a": 1}, fresh_for=60)
+    fn = MagicMock()
+    lookup = cache.get_or_compute("dashboard:trends:uid:v1:6", fn, ttl=60)
+    assert lookup == ({"a": 1}, "hit")
+    fn.assert_not_called()
+
+
+def test_get_or_compute_miss_computes_under_lock_and_stores() -> None:
+    cache, client = _make_redis_cache()
+    client.get.return_value = None
+    client.set.return_value = True
+    lookup = cache.get_or_compute(
+        "dashboard:trends:uid:v1:6", lambda: {"a": 1}, ttl=60, stale_ttl=30
+    )
+    assert lookup == ({"a": 1}, "miss")
+    assert client.set.call_args.args[0] == "lock:dashboard:trends:uid:v1:6"
+    assert client.set.call_args.kwargs["nx"] is True
+    key, ttl, payload = client.setex.call_args.args
+    assert (key, ttl) == ("dashboard:trends:uid:v1:6", 90)
+    assert json.loads(payload)["__swr_value"] == {"a": 1}
+    client.eval.assert_called_once()
+
+
+def test_get_or_compute_waits_for_lock_holder(monkeypatch) -> None:  # type: ignore[no-untyped-def]
+    monkeypatch.setattr("app.services.cache_service._SINGLE_FLIGHT_POLL_SECONDS", 0)
+    cache, client = _make_redis_cache()
+    client.get.side_effect = [None, None, _envelope({"a": 2}, fresh_for=60)]
+    client.set.return_value = False  # another worker holds the lock
+    fn = MagicMock()
+    lookup = cache.get_or_compute("dashboard:trends:uid:v1:6", fn, ttl=60)
+    assert lookup == ({"a": 2}, "coalesced")
+    fn.assert_not_called()
+    client.setex.assert_not_called()
+
+
+def test_get_or_compute_serves_stale_and_refreshes_in_background() -> None:
+    cache, client = _make_redis_cache()
+    client.get.return_value = _envelope({"old": True}, fresh_for=-1)
+    client.set.return_value = True
+    refreshed = threading.Event()
+
+    def _recompute() -> dict[str, bool]:
+        refreshed.set()
+        return {"old": False}
+
+    lookup = cache.get_or_compute(
+        "dashboard:trends:uid:v1:6", _recompute, ttl=60, stale_ttl=60
+    )
+    assert lookup == ({"old": True}, "stale")
+    assert refreshed.wait(timeout=5)
+    for _ in range(100):
+        if client.eval.called:
+            break
+        time.sleep(0.01)
+    assert json.loads(client.setex.call_args.args[2])["__swr_value"] == {"old": False}
+    client.eval.assert_called_once()
+
+
+def test_get_or_compute_propagates_errors_and_releases_lock() -> None:
+    cache, client = _make_redis_cache()
+    client.get.return_value = None
+    client.set.return_value = True
+
+    def _boom() -> None:
+        raise RuntimeError("db down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("dashboard:trends:uid:v1:6", _boom, ttl=60)
+    client.setex.assert_not_called()
+    client.eval.assert_called_once()
+
+
+def test_noop_get_or_compute_always_computes() -> None:
+    lookup = _NoOpCacheService().get_or_compute("entitlement:x", lambda: 1, ttl=5)
+    assert lookup == (1, "miss")
+
+
 # ── Singleton / factory ───────────────────────────────────────────────────────
 
 
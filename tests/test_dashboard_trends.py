@@ -5,6 +5,8 @@ from __future__ import annotations
 import uuid
 from datetime import UTC, date, datetime
 
+from app.services.cache_service import CacheLookup
+
 # ---------------------------------------------------------------------------
 # Helpers shared across tests
 # ---------------------------------------------------------------------------
@@ -123,29 +125,42 @@ def test_trends_empty_database_returns_empty_series(client) -> None:
     assert body["data"]["series"] == []
 
 
-def test_trends_caching(client, app) -> None:
-    """Second call returns X-Cache: HIT when cache is available."""
-    from app.services import cache_service as cs
+class _FakeCache:
+    def __init__(self) -> None:
+        self._store: dict = {}
+
+    def get(self, key: str):
+        return self._store.get(key)
+
+    def set(self, key: str, value, *, ttl: int) -> None:
+        self._store[key] = value
 
-    class _FakeCache:
-        def __init__(self) -> None:
-            self._store: dict = {}
+    def invalidate(self, key: str) -> None:
+        self._store.pop(key, None)
 
-        def get(self, key: str):
-            return self._store.get(key)
+    def invalidate_pattern(self, pattern: str) -> None:
+        pass
 
-        def set(self, key: str, value, *, ttl: int) -> None:
-            self._store[key] = value
+    def versioned_key(self, namespace: str, user_id, *parts: str) -> str:
+        return ":".join((namespace, str(user_id), "v0", *parts))
 
-        def invalidate(self, key: str) -> None:
-            self._store.pop(key, None)
+    def invalidate_domain(self, domain: str, user_id) -> None:
+        pass
 
-        def invalidate_pattern(self, pattern: str) -> None:
-            pass
+    def get_or_compute(self, key: str, fn, *, ttl: int, stale_ttl: int = 0):
+        if key in self._store:
+            return CacheLookup(self._store[key], "hit")
+        self._store[key] = fn()
+        return CacheLookup(self._store[key], "miss")
 
-        @property
-        def available(self) -> bool:
-            return True
+    @property
+    def available(self) -> bool:
+        return True
+
+
+def test_trends_caching(client, app) -> None:
+    """Second call returns X-Cache: HIT when cache is available."""
+    from app.services import cache_service as cs
 
     original = cs._cache_instance
     fake_cache = _FakeCache()
@@ -0,0 +1,237 @@
+"""Tests for batched Expo push delivery against a local stub of the Expo API."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.extensions.database import db
+from app.jobs.push_jobs import send_push_batch
+from app.models.push_subscription import PushSubscription, PushTransport
+from app.models.user import User
+from app.services.expo_push_service import (
+    ExpoPushBuffer,
+    ExpoPushMessage,
+    deliver_push_messages,
+    process_push_receipts,
+    reset_expo_push_client_for_tests,
+)
+from app.services.outbound_queue import RQOutboundQueue
+
+_DEAD_MARKER = "dead"
+
+
+class StubExpo:
+    """Records requests and answers like Expo's ``/send`` and ``/getReceipts``."""
+
+    def __init__(self) -> None:
+        self.send_batches: list[list[dict[str, Any]]] = []
+        self.receipt_requests: list[list[str]] = []
+        self.receipts: dict[str, dict[str, Any]] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.delay_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def handle(self, path: str, body: Any) -> dict[str, Any]:
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay_seconds)
+            if path.endswith("/send"):
+                self.send_batches.append(body)
+                return {"data": [self._ticket(message) for message in body]}
+            self.receipt_requests.append(body["ids"])
+            return {
+                "data": {i: self.receipts[i] for i in body["ids"] if i in self.receipts}
+            }
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    @staticmethod
+    def _ticket(message: dict[str, Any]) -> dict[str, Any]:
+        if _DEAD_MARKER in message["to"]:
+            return {
+                "status": "error",
+                "message": "not registered",
+                "details": {"error": "DeviceNotRegistered"},
+            }
+        return {"status": "ok", "id": f"ticket-{message['to']}"}
+
+
+@pytest.fixture
+def stub_expo(monkeypatch: pytest.MonkeyPatch) -> Iterator[StubExpo]:
+    stub = StubExpo()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self) -> None:  # noqa: N802
+            length = int(self.headers["Content-Length"])
+            payload = json.dumps(
+                stub.handle(self.path, json.loads(self.rfile.read(length)))
+            ).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args: Any) -> None:
+            return None
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv(
+        "EXPO_PUSH_BASE_URL", f"http://127.0.0.1:{server.server_port}/--/api/v2/push"
+    )
+    reset_expo_push_client_for_tests()
+    yield stub
+    reset_expo_push_client_for_tests()
+    server.shutdown()
+    server.server_close()
+
+
+def _message(token: str) -> dict[str, Any]:
+    return ExpoPushMessage(to=token, title="t", body="b").to_payload()
+
+
+def _user_with_tokens(*tokens: str) -> uuid.UUID:
+    user = User(
+        id=uuid.uuid4(),
+        name="Push",
+        email=f"push-{uuid.uuid4()}@test.com",
+        password="hash",
+    )
+    db.session.add(user)
+    db.session.flush()
+    for token in tokens:
+        db.session.add(
+            PushSubscription(
+                user_id=user.id, transport=PushTransport.expo, endpoint=token
+            )
+        )
+    db.session.commit()
+    return user.id
+
+
+def _endpoints(user_id: uuid.UUID) -> set[str]:
+    return {
+        str(sub.endpoint)
+        for sub in PushSubscription.query.filter_by(user_id=user_id).all()
+    }
+
+
+def test_messages_are_sent_in_concurrent_batches_of_100(
+    app, stub_expo: StubExpo, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("EXPO_PUSH_MAX_WORKERS", "3")
+    stub_expo.delay_seconds = 0.05
+    messages = [_message(f"ExponentPushToken[{i}]") for i in range(250)]
+
+    with app.app_context():
+        result = deliver_push_messages(messages)
+
+    assert sorted(len(batch) for batch in stub_expo.send_batches) == [50, 100, 100]
+    assert stub_expo.max_in_flight > 1
+    assert result.sent == 250
+    assert len(result.ticket_tokens) == 250
+
+
+def test_device_not_registered_ticket_prunes_subscription(
+    app, stub_expo: StubExpo
+) -> None:
+    live, dead = "ExponentPushToken[live]", f"ExponentPushToken[{_DEAD_MARKER}]"
+    with app.app_context():
+        user_id = _user_with_tokens(live, dead)
+
+        result = deliver_push_messages([_message(live), _message(dead)])
+
+        assert (result.sent, result.failed, result.pruned) == (1, 1, 1)
+        assert _endpoints(user_id) == {live}
+        sub = PushSubscription.query.filter_by(endpoint=live).one()
+        assert sub.last_used_at is not None
+
+
+def test_receipts_prune_tokens_reported_dead(app, stub_expo: StubExpo) -> None:
+    kept, gone = "ExponentPushToken[kept]", "ExponentPushToken[gone]"
+    stub_expo.receipts = {
+        "t-kept": {"status": "ok"},
+        "t-gone": {"status": "error", "details": {"error": "DeviceNotRegistered"}},
+    }
+    with app.app_context():
+        user_id = _user_with_tokens(kept, gone)
+
+        pruned = process_push_receipts({"t-kept": kept, "t-gone": gone})
+
+        assert pruned == 1
+        assert _endpoints(user_id) == {kept}
+    assert stub_expo.receipt_requests == [["t-kept", "t-gone"]]
+
+
+def test_unreachable_expo_does_not_raise(app, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("EXPO_PUSH_BASE_URL", "http://127.0.0.1:9/--/api/v2/push")
+    monkeypatch.setenv("EXPO_PUSH_TIMEOUT_SECONDS", "1")
+    reset_expo_push_client_for_tests()
+    try:
+        with app.app_context():
+            result = send_push_batch([_message("ExponentPushToken[x]")])
+    finally:
+        reset_expo_push_client_for_tests()
+
+    assert result == {"sent": 0, "failed": 1, "pruned": 0}
+
+
+def test_push_buffer_enqueues_one_job_per_full_batch() -> None:
+    queue = MagicMock()
+    buffer = ExpoPushBuffer(queue)
+
+    for user in range(70):
+        buffer.add([_message(f"ExponentPushToken[{user}-{i}]") for i in range(3)])
+    assert [
+        len(call.kwargs["messages"]) for call in queue.enqueue_push_batch.call_args_list
+    ] == [100, 100]
+
+    buffer.flush()
+    buffer.flush()
+    assert [
+        len(call.kwargs["messages"]) for call in queue.enqueue_push_batch.call_args_list
+    ] == [100, 100, 10]
+    assert buffer.enqueued_batches == 3
+
+
+class TestRQPushEnqueue:
+    def _queue(self) -> tuple[RQOutboundQueue, MagicMock]:
+        queue = RQOutboundQueue.__new__(RQOutboundQueue)
+        rq_queue = MagicMock()
+        queue._queue = rq_queue
+        return queue, rq_queue
+
+    def test_push_batch_is_one_job(self) -> None:
+        queue, rq_queue = self._queue()
+        rq_queue.enqueue.return_value.id = "job-1"
+        messages = [_message("ExponentPushToken[a]"), _message("ExponentPushToken[b]")]
+
+        assert queue.enqueue_push_batch(messages=messages) == "job-1"
+        args = rq_queue.enqueue.call_args.args
+        assert args == ("app.jobs.push_jobs.send_push_batch", messages)
+
+    def test_receipt_check_is_delayed(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("EXPO_RECEIPT_DELAY_SECONDS", "600")
+        queue, rq_queue = self._queue()
+        rq_queue.enqueue_in.return_value.id = "job-2"
+
+        assert queue.enqueue_push_receipts_check(ticket_tokens={"t": "tok"}) == "job-2"
+        delay, func, tickets = rq_queue.enqueue_in.call_args.args
+        assert delay.total_seconds() == 600
+        assert func == "app.jobs.push_jobs.check_push_receipts"
+        assert tickets == {"t": "tok"}
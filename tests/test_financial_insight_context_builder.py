@@ -9,6 +9,8 @@ from decimal import Decimal
 from inspect import getsource
 from typing import Any
 
+from sqlalchemy import event
+
 from app.extensions.database import db
 from app.models.budget import Budget
 from app.models.credit_card import CreditCard
@@ -562,6 +564,40 @@ class TestFinancialInsightContextBuilderDaily:
         assert "bank_name" not in serialized
         assert snapshot["transactions"]["sample"][0]["title"] == "Consulta CPF [cpf]"
 
+    def test_daily_snapshot_loads_transactions_once_for_all_windows(self, app) -> None:
+        with app.app_context():
+            user_id = _make_user()
+            anchor = date(2026, 5, 17)
+            for due_date in (anchor, date(2026, 4, 17), date(2025, 5, 17)):
+                _make_transaction(
+                    user_id,
+                    title="Mercado",
+                    amount="10.00",
+                    tx_type=TransactionType.EXPENSE,
+                    status=TransactionStatus.PAID,
+                    due_date=due_date,
+                )
+            statements: list[str] = []
+
+            def _capture(_conn, _cursor, statement, *_args) -> None:
+                if "FROM transactions" in statement:
+                    statements.append(statement)
+
+            event.listen(db.engine, "before_cursor_execute", _capture)
+            try:
+                snapshot = FinancialInsightContextBuilder().build_daily(
+                    user_id=user_id,
+                    anchor_date=anchor,
+                )
+            finally:
+                event.remove(db.engine, "before_cursor_execute", _capture)
+
+        comparisons = snapshot["comparisons"]
+        assert len(statements) == 2
+        assert comparisons["same_day_previous_month"]["transaction_count"] == 1
+        assert comparisons["same_day_previous_year"]["transaction_count"] == 1
+        assert comparisons["month_to_date"]["transaction_count"] == 1
+
     def test_email_redaction_does_not_use_backtracking_regex(self) -> None:
         source = getsource(financial_insight_context_builder)
 
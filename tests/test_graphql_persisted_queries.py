@@ -0,0 +1,92 @@
+"""Parsed-document cache and Automatic Persisted Queries on /graphql."""
+
+from __future__ import annotations
+
+import hashlib
+from unittest.mock import patch
+
+import pytest
+
+from app.graphql import document_cache
+from app.graphql.document_cache import GraphQLDocumentCache
+
+_QUERY = "query Ping { __typename }"
+_HASH = hashlib.sha256(_QUERY.encode("utf-8")).hexdigest()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_document_cache():
+    document_cache.reset_document_cache_for_tests()
+    yield
+    document_cache.reset_document_cache_for_tests()
+
+
+def _persisted(sha256: str) -> dict[str, object]:
+    return {"persistedQuery": {"version": 1, "sha256Hash": sha256}}
+
+
+def test_repeated_documents_are_parsed_once(client) -> None:
+    with patch.object(document_cache, "parse", wraps=document_cache.parse) as parse:
+        for _ in range(3):
+            response = client.post("/graphql", json={"query": _QUERY})
+            assert response.status_code == 200
+            assert response.get_json()["data"] == {"__typename": "Query"}
+
+    assert parse.call_count == 1
+
+
+def test_validation_errors_are_cached_and_returned(client) -> None:
+    for _ in range(2):
+        response = client.post(
+            "/graphql", json={"query": "query { __typename { name } }"}
+        )
+        assert response.status_code == 400
+        assert "__typename" in response.get_json()["errors"][0]["message"]
+
+
+def test_apq_handshake_registers_then_serves_hash_only_requests(client) -> None:
+    miss = client.post("/graphql", json={"extensions": _persisted(_HASH)})
+    assert miss.status_code == 200
+    assert miss.get_json()["errors"][0]["message"] == "PersistedQueryNotFound"
+
+    register = client.post(
+        "/graphql", json={"query": _QUERY, "extensions": _persisted(_HASH)}
+    )
+    assert register.status_code == 200
+
+    hit = client.post(
+        "/graphql",
+        json={"operationName": "Ping", "extensions": _persisted(_HASH)},
+    )
+    assert hit.status_code == 200
+    assert hit.get_json()["data"] == {"__typename": "Query"}
+
+
+def test_apq_rejects_hash_mismatch(client) -> None:
+    response = client.post(
+        "/graphql",
+        json={"query": _QUERY, "extensions": _persisted("0" * 64)},
+    )
+    assert response.status_code == 400
+    error = response.get_json()["errors"][0]
+    assert error["extensions"]["code"] == "PERSISTED_QUERY_HASH_MISMATCH"
+
+
+def test_apq_rejects_malformed_extension(client) -> None:
+    response = client.post(
+        "/graphql",
+        json={"extensions": {"persistedQuery": {"version": 2, "sha256Hash": _HASH}}},
+    )
+    assert response.status_code == 400
+
+
+def test_document_cache_evicts_least_recently_used() -> None:
+    cache = GraphQLDocumentCache(max_entries=2)
+    first = cache.get_or_parse("{ a }")
+    cache.get_or_parse("{ b }")
+    assert cache.get_or_parse("{ a }") is first
+    cache.get_or_parse("{ c }")
+
+    assert len(cache) == 2
+    assert cache.get(first.sha256) is first
+    assert cache.get(hashlib.sha256(b"{ b }").hexdigest()) is None
@@ -26,27 +26,93 @@ class FakeRedis:
     """Minimal in-memory Redis stub sufficient for middleware tests."""
 
     def __init__(self) -> None:
-        self._store: dict[str, bytes] = {}
-        self._lock = threading.Lock()
+        self._store: dict[str, Any] = {}
+        self.ttls: dict[str, int] = {}
+        self._lock = threading.RLock()
 
     def ping(self) -> bool:
         return True
 
     def get(self, key: str) -> bytes | None:
         with self._lock:
-            return self._store.get(key)
+            value = self._store.get(key)
+            return value if isinstance(value, bytes) else None
 
-    def set(self, key: str, value: Any, ex: int | None = None) -> None:
+    def set(
+        self, key: str, value: Any, ex: int | None = None, nx: bool = False
+    ) -> bool:
         with self._lock:
+            if nx and key in self._store:
+                return False
             self._store[key] = (
                 value if isinstance(value, bytes) else str(value).encode()
             )
+            return True
+
+    def exists(self, key: str) -> int:
+        with self._lock:
+            return int(key in self._store)
+
+    def delete(self, key: str) -> int:
+        with self._lock:
+            return int(self._store.pop(key, None) is not None)
+
+    def eval(self, script: str, numkeys: int, key: str, expected: str) -> int:
+        """Compare-and-delete, the only script the middleware runs."""
+        with self._lock:
+            if self._store.get(key) != expected.encode():
+                return 0
+            del self._store[key]
+            return 1
+
+    def hgetall(self, key: str) -> dict[bytes, bytes]:
+        with self._lock:
+            return dict(self._store.get(key) or {})
+
+    def hset(self, key: str, mapping: dict[str, Any]) -> int:
+        with self._lock:
+            stored = self._store.setdefault(key, {})
+            for field, value in mapping.items():
+                stored[field.encode()] = (
+                    value if isinstance(value, bytes) else str(value).encode()
+                )
+            return len(mapping)
+
+    def expire(self, key: str, seconds: int) -> bool:
+        with self._lock:
+            self.ttls[key] = seconds
+            return key in self._store
+
+    def pipeline(self) -> FakePipeline:
+        return FakePipeline(self)
 
     def reset(self) -> None:
         with self._lock:
             self._store.clear()
 
 
+class FakePipeline:
+    """Queues calls and applies them under the store lock, like MULTI/EXEC."""
+
+    def __init__(self, redis: FakeRedis) -> None:
+        self._redis = redis
+        self._calls: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        def _queue(*args: Any, **kwargs: Any) -> FakePipeline:
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return _queue
+
+    def execute(self) -> list[Any]:
+        with self._redis._lock:
+            return [
+                getattr(self._redis, name)(*args, **kwargs)
+                for name, args, kwargs in self._calls
+            ]
+
+
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
@@ -94,6 +160,26 @@ def minimal_app(fake_redis: FakeRedis) -> Flask:
     def login() -> Any:
         return jsonify({"token": "jwt_xyz"}), 200
 
+    app.config["SLOW_STARTED"] = threading.Event()
+    app.config["SLOW_RELEASE"] = threading.Event()
+    app.config["HANDLER_CALLS"] = []
+
+    @app.route("/slow", methods=["POST"])
+    def slow() -> Any:
+        app.config["HANDLER_CALLS"].append("slow")
+        app.config["SLOW_STARTED"].set()
+        app.config["SLOW_RELEASE"].wait(5)
+        return jsonify({"charged": True}), 201
+
+    @app.route("/big", methods=["POST"])
+    def big() -> Any:
+        return jsonify({"items": [{"n": i, "label": "item"} for i in range(500)]})
+
+    @app.route("/boom", methods=["POST"])
+    def boom() -> Any:
+        app.config["HANDLER_CALLS"].append("boom")
+        return jsonify({"error": "provider down"}), 502
+
     return app
 
 
@@ -248,3 +334,136 @@ class TestRedisUnavailable:
                 assert "X-Idempotency-Replayed" not in r2.headers
         finally:
             mid_module._try_get_redis = original  # type: ignore[assignment]
+
+
+class TestInFlightLock:
+    """A duplicate never runs the handler while the first request is running."""
+
+    def _start_first(self, minimal_app: Flask, key: str) -> threading.Thread:
+        def _run() -> None:
+            with minimal_app.test_client() as c:
+                _post(c, "/slow", {"amount": 1}, key=key)
+
+        thread = threading.Thread(target=_run)
+        thread.start()
+        assert minimal_app.config["SLOW_STARTED"].wait(5)
+        return thread
+
+    def test_concurrent_duplicate_gets_409_processing(
+        self, minimal_app: Flask, client: Any, monkeypatch: Any
+    ) -> None:
+        monkeypatch.setenv("IDEMPOTENCY_WAIT_MS", "0")
+        first = self._start_first(minimal_app, "inflight-key")
+        try:
+            duplicate = _post(client, "/slow", {"amount": 1}, key="inflight-key")
+        finally:
+            minimal_app.config["SLOW_RELEASE"].set()
+            first.join(5)
+
+        assert duplicate.status_code == 409
+        assert duplicate.get_json()["error"] == "IDEMPOTENCY_PROCESSING"
+        assert duplicate.headers["Retry-After"] == "1"
+        assert minimal_app.config["HANDLER_CALLS"] == ["slow"]
+
+    def test_concurrent_duplicate_waits_for_the_response(
+        self, minimal_app: Flask, client: Any, monkeypatch: Any
+    ) -> None:
+        monkeypatch.setenv("IDEMPOTENCY_WAIT_MS", "3000")
+        first = self._start_first(minimal_app, "wait-key")
+        threading.Timer(0.2, minimal_app.config["SLOW_RELEASE"].set).start()
+
+        duplicate = _post(client, "/slow", {"amount": 1}, key="wait-key")
+        first.join(5)
+
+        assert duplicate.status_code == 201
+        assert duplicate.headers.get("X-Idempotency-Replayed") == "true"
+        assert minimal_app.config["HANDLER_CALLS"] == ["slow"]
+
+    def test_concurrent_duplicate_with_other_body_conflicts(
+        self, minimal_app: Flask, client: Any
+    ) -> None:
+        first = self._start_first(minimal_app, "inflight-conflict")
+        try:
+            duplicate = _post(client, "/slow", {"amount": 2}, key="inflight-conflict")
+        finally:
+            minimal_app.config["SLOW_RELEASE"].set()
+            first.join(5)
+
+        assert duplicate.status_code == 409
+        assert duplicate.get_json()["error"] == "IDEMPOTENCY_CONFLICT"
+
+    def test_server_errors_are_not_cached(
+        self, minimal_app: Flask, client: Any, fake_redis: FakeRedis
+    ) -> None:
+        first = _post(client, "/boom", {}, key="boom-key")
+        retry = _post(client, "/boom", {}, key="boom-key")
+
+        assert first.status_code == retry.status_code == 502
+        assert "X-Idempotency-Replayed" not in retry.headers
+        assert minimal_app.config["HANDLER_CALLS"] == ["boom", "boom"]
+        assert not any(key.endswith(":lock") for key in fake_redis._store)
+
+
+class TestStoredResponses:
+    def test_large_bodies_are_stored_compressed(
+        self, client: Any, fake_redis: FakeRedis
+    ) -> None:
+        first = _post(client, "/big", {}, key="big-key")
+        (stored,) = [v for v in fake_redis._store.values() if isinstance(v, dict)]
+        replay = _post(client, "/big", {}, key="big-key")
+
+        assert stored[b"encoding"] == b"zlib"
+        assert len(stored[b"body"]) < len(first.get_data())
+        assert replay.get_data() == first.get_data()
+        assert replay.headers.get("X-Idempotency-Replayed") == "true"
+
+    def test_ttl_follows_the_longest_matching_prefix(
+        self, client: Any, fake_redis: FakeRedis, monkeypatch: Any
+    ) -> None:
+        monkeypatch.setenv("IDEMPOTENCY_PREFIX_TTLS", "/pay=120,/payments=600")
+
+        _post(client, "/payments/checkout", {"amount": 1}, key="ttl-key")
+        _post(client, "/things", {"name": "A"}, key="ttl-default")
+
+        ttls = sorted(fake_redis.ttls.values())
+        assert ttls == [600, 86_400]
+
+
+class TestLockOwnership:
+    def test_response_stored_before_the_lock_is_replayed(
+        self, client: Any, fake_redis: FakeRedis
+    ) -> None:
+        first = _post(client, "/things", {"name": "A"}, key="race-key")
+        original_hgetall = fake_redis.hgetall
+        reads: list[str] = []
+
+        def _miss_first_read(key: str) -> dict[bytes, bytes]:
+            # Simulate the first request finishing right after our first read.
+            reads.append(key)
+            return {} if len(reads) == 1 else original_hgetall(key)
+
+        fake_redis.hgetall = _miss_first_read  # type: ignore[method-assign]
+        duplicate = _post(client, "/things", {"name": "A"}, key="race-key")
+
+        assert duplicate.get_data() == first.get_data()
+        assert duplicate.headers.get("X-Idempotency-Replayed") == "true"
+        assert not any(key.endswith(":lock") for key in fake_redis._store)
+
+    def test_expired_lock_does_not_release_the_successor_lock(
+        self, minimal_app: Flask, client: Any, fake_redis: FakeRedis
+    ) -> None:
+        first = threading.Thread(
+            target=lambda: _post(
+                minimal_app.test_client(), "/slow", {"amount": 1}, key="expiry-key"
+            )
+        )
+        first.start()
+        assert minimal_app.config["SLOW_STARTED"].wait(5)
+        (lock_key,) = [key for key in fake_redis._store if key.endswith(":lock")]
+        # The first lock expires and a retry takes over the key.
+        fake_redis._store[lock_key] = b"successor-token:hash"
+
+        minimal_app.config["SLOW_RELEASE"].set()
+        first.join(5)
+
+        assert fake_redis._store[lock_key] == b"successor-token:hash"
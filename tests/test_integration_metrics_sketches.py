@@ -0,0 +1,223 @@
+"""Tests for latency sketches, per-thread shards and fleet aggregation."""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from typing import Any
+
+import pytest
+
+import app.extensions.integration_metrics as metrics
+from app.extensions.quantile_sketch import MAX_BINS, QuantileSketch
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[str, str]] = {}
+
+    def pipeline(self, transaction: bool = True) -> FakeRedis:
+        return self
+
+    def hset(self, key: str, field: str, value: str) -> None:
+        self.hashes.setdefault(key, {})[field] = value
+
+    def expire(self, key: str, seconds: int) -> None:
+        return None
+
+    def execute(self) -> list[Any]:
+        return []
+
+    def hgetall(self, key: str) -> dict[str, str]:
+        return dict(self.hashes.get(key, {}))
+
+    def hdel(self, key: str, *fields: str) -> None:
+        for field in fields:
+            self.hashes.get(key, {}).pop(field, None)
+
+
+@pytest.fixture(autouse=True)
+def _reset_metrics() -> Any:
+    metrics.reset_metrics_for_tests()
+    yield
+    metrics.reset_metrics_for_tests()
+
+
+class TestQuantileSketch:
+    def test_quantiles_stay_within_relative_accuracy(self) -> None:
+        rng = random.Random(7)
+        values = [rng.lognormvariate(4, 1) for _ in range(20_000)]
+        sketch = QuantileSketch()
+        for value in values:
+            sketch.add(value)
+
+        ordered = sorted(values)
+        for q in (0.5, 0.95, 0.99):
+            exact = ordered[int(q * len(ordered)) - 1]
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.02)
+        assert sketch.count == len(values)
+        assert sketch.max == max(values)
+
+    def test_merge_matches_a_single_sketch(self) -> None:
+        left, right, combined = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for value in range(1, 1001):
+            (left if value % 2 else right).add(value)
+            combined.add(value)
+
+        left.merge(right)
+
+        assert left.to_dict() == combined.to_dict()
+
+    def test_bins_are_bounded(self) -> None:
+        sketch = QuantileSketch()
+        value = 1e-6
+        while value < 1e12:
+            sketch.add(value)
+            value *= 1.01
+
+        assert len(sketch.to_dict()["bins"]) <= MAX_BINS
+        assert sketch.quantile(1.0) == sketch.max
+
+    def test_zero_values_and_round_trip(self) -> None:
+        sketch = QuantileSketch()
+        for value in (0, 0, 5, 50):
+            sketch.add(value)
+
+        restored = QuantileSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+
+        assert restored.quantile(0.5) == 0
+        assert round(restored.quantile(1.0)) == 50
+        assert restored.count == 4
+
+
+class TestThreadShards:
+    def test_counts_from_finished_threads_are_kept(self) -> None:
+        def _work() -> None:
+            for _ in range(100):
+                metrics.increment_metric("shard.calls")
+                metrics.record_metric_sample("shard.duration_ms", 10)
+
+        threads = [threading.Thread(target=_work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        metrics.increment_metric("shard.calls")
+
+        assert metrics.snapshot_metrics(prefix="shard.") == {"shard.calls": 801}
+        sketch = metrics.snapshot_metric_sketches()["shard.duration_ms"]
+        assert sketch.count == 800
+        assert all(
+            shard.owner is None or shard.owner.is_alive() for shard in metrics._shards
+        )
+
+    def test_reset_clears_live_shards(self) -> None:
+        metrics.increment_metric("shard.calls")
+        metrics.reset_metrics()
+        metrics.increment_metric("shard.calls")
+
+        assert metrics.snapshot_metrics() == {"shard.calls": 1}
+
+
+class TestWindowRotation:
+    def test_sketches_cover_current_and_previous_bucket(self, monkeypatch: Any) -> None:
+        window = 1000
+        monkeypatch.setattr(metrics, "_current_window", lambda: window)
+        metrics.record_metric_sample("window.duration_ms", 100)
+
+        window += 1
+        metrics.record_metric_sample("window.duration_ms", 10)
+        assert metrics.snapshot_metric_sketches()["window.duration_ms"].count == 2
+
+        window += 1
+        sketch = metrics.snapshot_metric_sketches()["window.duration_ms"]
+        assert (sketch.count, round(sketch.max)) == (1, 10)
+
+        window += 5
+        assert "window.duration_ms" not in metrics.snapshot_metric_sketches()
+
+    def test_counters_stay_cumulative_across_windows(self, monkeypatch: Any) -> None:
+        window = 2000
+        monkeypatch.setattr(metrics, "_current_window", lambda: window)
+        metrics.increment_metric("window.calls", 5)
+        worker = threading.Thread(
+            target=lambda: metrics.increment_metric("window.calls", 3)
+        )
+        worker.start()
+        worker.join()
+
+        window += 10
+        metrics.increment_metric("window.calls")
+
+        assert metrics.snapshot_metrics(prefix="window.") == {"window.calls": 9}
+        payload = metrics.build_prometheus_metrics_payload()
+        assert "# TYPE auraxis_window_calls counter" in payload
+        assert "auraxis_window_calls 9" in payload
+
+    def test_dead_thread_shards_are_retired_without_a_snapshot(self) -> None:
+        for _ in range(200):
+            worker = threading.Thread(target=metrics.increment_metric, args=("t.n",))
+            worker.start()
+            worker.join()
+
+        # Only shards of threads still alive (plus the one registered last,
+        # whose thread finished after it registered) remain.
+        assert len(metrics._shards) <= threading.active_count() + 1
+        assert metrics.snapshot_metrics(prefix="t.") == {"t.n": 200}
+
+
+class TestFleetAggregation:
+    @pytest.fixture
+    def fake_redis(self, monkeypatch: Any) -> FakeRedis:
+        fake = FakeRedis()
+        monkeypatch.setenv("METRICS_REDIS_URL", "redis://metrics")
+        monkeypatch.setattr(metrics, "_get_fleet_client", lambda: fake)
+        monkeypatch.setattr(metrics, "_ensure_publisher", lambda: None)
+        return fake
+
+    def _other_worker(self, fake: FakeRedis, *, ts: float, samples: list[int]) -> None:
+        sketch = QuantileSketch()
+        for value in samples:
+            sketch.add(value)
+        fake.hset(
+            metrics._FLEET_HASH_KEY,
+            "other-host:1",
+            json.dumps(
+                {
+                    "ts": ts,
+                    "counters": {"http.request.total": len(samples)},
+                    "sketches": {
+                        "http.route.duration_ms.health.healthz": sketch.to_dict()
+                    },
+                }
+            ),
+        )
+
+    def test_latency_budget_merges_every_worker(self, fake_redis: FakeRedis) -> None:
+        for _ in range(10):
+            metrics.record_metric_sample("http.route.duration_ms.health.healthz", 10)
+        metrics.increment_metric("http.request.total", 10)
+        self._other_worker(fake_redis, ts=time.time(), samples=[500] * 10)
+
+        route = metrics.build_http_latency_budget_payload()["routes"]["health.healthz"]
+
+        assert route["samples"] == 20
+        assert route["p50_ms"] == 10
+        assert route["p95_ms"] == pytest.approx(500, rel=0.01)
+        assert route["within_budget"] is False
+        assert metrics.snapshot_metrics(prefix="http.", fleet=True) == {
+            "http.request.total": 20
+        }
+        # The local view only sees this worker.
+        assert metrics.snapshot_metrics(prefix="http.") == {"http.request.total": 10}
+
+    def test_stale_workers_are_dropped(self, fake_redis: FakeRedis) -> None:
+        metrics.record_metric_sample("http.route.duration_ms.health.healthz", 10)
+        self._other_worker(fake_redis, ts=time.time() - 3600, samples=[500])
+
+        route = metrics.build_http_latency_budget_payload()["routes"]["health.healthz"]
+
+        assert route["samples"] == 1
+        assert "other-host:1" not in fake_redis.hashes[metrics._FLEET_HASH_KEY]
@@ -234,6 +234,67 @@ def test_cache_respects_ttl_zero(monkeypatch: pytest.MonkeyPatch) -> None:
     assert mem.get("ABCD3") is None
 
 
+def test_get_market_prices_batches_cache_misses(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("BRAPI_CACHE_TTL_SECONDS", "60")
+    monkeypatch.setenv("BRAPI_QUOTE_BATCH_SIZE", "2")
+    mem = inject_memory_cache_for_tests()
+    mem.set("PETR4", 30.0, ttl_seconds=60)
+    urls: list[str] = []
+
+    def _fake_get(url: str, *args: Any, **kwargs: Any) -> _FakeResponse:
+        urls.append(url)
+        symbols = url.rsplit("/", 1)[-1].split(",")
+        return _FakeResponse(
+            {
+                "results": [
+                    {"symbol": symbol, "regularMarketPrice": 10.0}
+                    for symbol in symbols
+                    if symbol != "ITUB4"
+                ]
+            }
+        )
+
+    monkeypatch.setattr(requests, "get", _fake_get)
+
+    prices = InvestmentService.get_market_prices(
+        ["petr4", "VALE3", "bbas3", "ITUB4", "WEGE3", "bad<ticker>"]
+    )
+
+    assert prices == {
+        "petr4": 30.0,
+        "VALE3": 10.0,
+        "bbas3": 10.0,
+        "ITUB4": None,
+        "WEGE3": 10.0,
+        "bad<ticker>": None,
+    }
+    assert sorted(urls) == [
+        "https://brapi.dev/api/quote/BBAS3,ITUB4",
+        "https://brapi.dev/api/quote/VALE3,WEGE3",
+    ]
+    assert mem.get_many(["VALE3", "ITUB4"]) == {"VALE3": 10.0}
+
+
+def test_get_market_prices_served_from_cache(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("BRAPI_CACHE_TTL_SECONDS", "60")
+    mem = inject_memory_cache_for_tests()
+    mem.set_many({"PETR4": 30.0, "VALE3": 60.0}, ttl_seconds=60)
+
+    def _fail_get(*args: Any, **kwargs: Any) -> _FakeResponse:
+        raise AssertionError("provider must not be called")
+
+    monkeypatch.setattr(requests, "get", _fail_get)
+
+    assert InvestmentService.get_market_prices(["PETR4", "vale3"]) == {
+        "PETR4": 30.0,
+        "vale3": 60.0,
+    }
+
+
 def test_get_historical_prices_skips_invalid_rows(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -420,17 +420,30 @@ def test_plan_features_matrix_structure() -> None:
 def test_has_entitlement_uses_cache_on_second_call(app, mocker) -> None:
     """Second call to has_entitlement returns cached value without hitting the DB."""
     from app.services import entitlement_service
-    from app.services.cache_service import ENTITLEMENT_CACHE_TTL, RedisCacheService
+    from app.services.cache_service import (
+        ENTITLEMENT_CACHE_TTL,
+        CacheLookup,
+        RedisCacheService,
+    )
 
     user_id = uuid.uuid4()
     feature_key = "export_pdf"
+    cache_key = f"entitlement:{user_id}:v0:{feature_key}"
 
-    # Mock a cache that initially returns None then returns the cached value
+    # First call: miss → the compute callback hits the DB.
+    # Second call: hit → the callback is never invoked.
     mock_cache = mocker.MagicMock(spec=RedisCacheService)
     mock_cache.available = True
-    # First call: cache miss → DB hit
-    # Second call: cache hit → no DB hit
-    mock_cache.get.side_effect = [None, True]
+    mock_cache.versioned_key.return_value = cache_key
+    cached_values = iter([None, True])
+
+    def _get_or_compute(key, fn, *, ttl):  # noqa: ANN001, ANN202
+        cached = next(cached_values)
+        if cached is None:
+            return CacheLookup(fn(), "miss")
+        return CacheLookup(cached, "hit")
+
+    mock_cache.get_or_compute.side_effect = _get_or_compute
 
     mocker.patch.object(
         entitlement_service, "get_cache_service", return_value=mock_cache
@@ -448,18 +461,16 @@ def test_has_entitlement_uses_cache_on_second_call(app, mocker) -> None:
     )
 
     with app.app_context():
-        # First call: cache miss
         result1 = entitlement_service.has_entitlement(user_id, feature_key)
-        # Cache should have been set with False
-        mock_cache.set.assert_called_once_with(
-            f"entitlement:{user_id}:{feature_key}", False, ttl=ENTITLEMENT_CACHE_TTL
+        mock_cache.get_or_compute.assert_called_with(
+            cache_key, mocker.ANY, ttl=ENTITLEMENT_CACHE_TTL
         )
         assert result1 is False
+        assert filter_chain.first.call_count == 1
 
-        # Second call: cache hit (returns True from mock)
         result2 = entitlement_service.has_entitlement(user_id, feature_key)
         # DB should NOT have been called again
-        assert mock_cache.get.call_count == 2
+        assert filter_chain.first.call_count == 1
         assert result2 is True
 
 
@@ -488,8 +499,8 @@ def test_grant_entitlement_invalidates_cache(app, mocker) -> None:
         entitlement_service.grant_entitlement(user.id, "export_pdf", source="manual")
         db.session.commit()
 
-        # invalidate_pattern should have been called with the user's pattern
-        mock_cache.invalidate_pattern.assert_called_with(f"entitlement:{user.id}:*")
+        # Bumping the domain version orphans every cached key of the user
+        mock_cache.invalidate_domain.assert_called_with("entitlements", user.id)
 
 
 def test_revoke_entitlement_invalidates_cache(app, mocker) -> None:
@@ -517,7 +528,7 @@ def test_revoke_entitlement_invalidates_cache(app, mocker) -> None:
         entitlement_service.revoke_entitlement(user.id, "export_pdf")
         db.session.flush()
 
-        mock_cache.invalidate_pattern.assert_called_with(f"entitlement:{user.id}:*")
+        mock_cache.invalidate_domain.assert_called_with("entitlements", user.id)
 
 
 def test_has_entitlement_falls_back_to_db_when_cache_unavailable(app, mocker) -> None:
@@ -13,7 +13,7 @@ from __future__ import annotations
 
 import uuid
 from decimal import Decimal
-from typing import Dict
+from typing import Any, Dict
 
 # ---------------------------------------------------------------------------
 # Auth helpers (shared with other contract tests)
@@ -261,6 +261,85 @@ class TestIngestAsReceivables:
             assert len(docs) == 1
 
 
+class TestBulkIngestion:
+    def test_detects_formats_once_per_column(self) -> None:
+        from app.services.csv_ingestion_service import (
+            detect_amount_style,
+            detect_date_format,
+        )
+
+        assert detect_date_format(["01/02/2025", "13/02/2025"]) == "%d/%m/%Y"
+        assert detect_date_format(["02/13/2025", "02/01/2025"]) == "%m/%d/%Y"
+        assert detect_date_format(["", "nope"]) is None
+        assert detect_amount_style(["1.500", "800,50"]) == "br"
+        assert detect_amount_style(["1,500.00", "800"]) == "intl"
+
+    def test_parse_bulk_applies_column_convention(self) -> None:
+        from app.services.csv_ingestion_service import parse_csv_bulk
+
+        content = (
+            "description,amount,date\n"
+            'A,"1.500",02/01/2025\n'
+            'B,"800,50",13/01/2025\n'
+            "C,abc,2025-01-20\n"
+        )
+        result = parse_csv_bulk(content, SAMPLE_COLUMN_MAP)
+
+        assert [row.amount for row in result.rows] == [
+            Decimal("1500"),
+            Decimal("800.50"),
+        ]
+        assert result.rows[0].date.month == 1
+        assert len(result.errors) == 1
+        assert result.errors[0]["line"] == 4
+
+    def test_bulk_ingest_dedups_per_chunk_and_tracks_progress(self, app) -> None:
+        from datetime import date
+
+        from app.extensions.database import db
+        from app.models.fiscal import FiscalDocument, ReceivableEntry
+        from app.models.user import User
+        from app.services.csv_ingestion_service import (
+            ParsedRow,
+            create_import_batch,
+            ingest_receivables_bulk,
+        )
+
+        with app.app_context():
+            user_uuid = uuid.uuid4()
+            db.session.add(
+                User(
+                    id=user_uuid,
+                    name="Bulk User",
+                    email=f"bulk-{user_uuid.hex[:8]}@test.com",
+                    password="hash",
+                )
+            )
+            db.session.commit()
+            user_id = str(user_uuid)
+
+            def _row(ext_id: str | None) -> ParsedRow:
+                return ParsedRow(
+                    description="Serviço",
+                    amount=Decimal("10.00"),
+                    date=date(2025, 1, 10),
+                    external_id=ext_id,
+                )
+
+            assert ingest_receivables_bulk(user_id, [_row("EXT-0")]) == 1
+            batch = create_import_batch(user_id)
+            rows = [_row(f"EXT-{i % 4}") for i in range(6)] + [_row(None)]
+
+            created = ingest_receivables_bulk(
+                user_id, rows, import_id=str(batch.id), batch=batch, chunk_size=3
+            )
+
+            assert created == 4
+            assert batch.processed_rows == 7
+            assert FiscalDocument.query.filter_by(user_id=user_uuid).count() == 5
+            assert ReceivableEntry.query.filter_by(user_id=user_uuid).count() == 5
+
+
 # ---------------------------------------------------------------------------
 # Integration tests — HTTP endpoints
 # ---------------------------------------------------------------------------
@@ -328,6 +407,79 @@ class TestCsvConfirmEndpoint:
         assert body["imported_count"] == 3
         assert body["error_rows"] == 0
 
+    def test_confirm_async_reports_progress_on_batch(self, client, app) -> None:
+        token = _register_and_login(client, prefix="csv-async")
+
+        resp = client.post(
+            "/fiscal/csv/confirm",
+            json={
+                "content": SAMPLE_CSV,
+                "column_map": SAMPLE_COLUMN_MAP,
+                "async": True,
+            },
+            headers=_auth(token),
+        )
+
+        # Without REDIS_URL the import runs inline and returns its summary.
+        assert resp.status_code == 201
+        assert resp.get_json()["status"] == "confirmed"
+        import_id = resp.get_json()["import_id"]
+        status = client.get(f"/fiscal/csv/imports/{import_id}", headers=_auth(token))
+        assert status.status_code == 200
+        batch = status.get_json()["import"]
+        assert batch["status"] == "confirmed"
+        assert batch["processed_rows"] == batch["valid_rows"] == 3
+
+        other = _register_and_login(client, prefix="csv-async-other")
+        hidden = client.get(f"/fiscal/csv/imports/{import_id}", headers=_auth(other))
+        assert hidden.status_code == 404
+
+    def test_confirm_async_enqueues_a_staged_payload_reference(
+        self, client, app, monkeypatch, tmp_path
+    ) -> None:
+        from app.jobs.fiscal_jobs import import_receivables_csv
+        from app.services import outbound_queue
+        from app.services.export_storage import get_export_storage
+
+        class _RecordingQueue:
+            def __init__(self) -> None:
+                self.calls: list[dict[str, Any]] = []
+
+            def enqueue_csv_import(self, **kwargs: Any) -> str:
+                self.calls.append(kwargs)
+                return "job-1"
+
+        queue = _RecordingQueue()
+        monkeypatch.setenv("EXPORT_STORAGE_DIR", str(tmp_path))
+        monkeypatch.setattr(outbound_queue, "_queue_instance", queue)
+        token = _register_and_login(client, prefix="csv-queued")
+
+        resp = client.post(
+            "/fiscal/csv/confirm",
+            json={
+                "content": SAMPLE_CSV,
+                "column_map": SAMPLE_COLUMN_MAP,
+                "async": True,
+            },
+            headers=_auth(token),
+        )
+
+        assert resp.status_code == 202
+        body = resp.get_json()
+        assert body["queued"] is True and body["job_id"] == "job-1"
+        (call,) = queue.calls
+        assert call["batch_id"] == body["import_id"]
+        assert SAMPLE_CSV not in repr(call)
+        storage = get_export_storage()
+        assert storage.read(call["payload_key"]).decode("utf-8") == SAMPLE_CSV
+
+        with app.app_context():
+            summary = import_receivables_csv(
+                call["batch_id"], call["payload_key"], call["column_map"]
+            )
+        assert summary["imported_count"] == 3
+        assert not any(tmp_path.rglob("*.csv"))
+
     def test_confirm_records_visible_in_list(self, client, app) -> None:
         token = _register_and_login(client, prefix="csv-visible")
 
@@ -140,3 +140,56 @@ class TestRQOutboundQueue:
 
         assert result is None
         mock_provider.send.assert_called_once()
+
+
+class TestRQOutboundQueueBatch:
+    def _messages(self, count: int) -> list:
+        from app.services.email_provider import EmailMessage
+
+        return [
+            EmailMessage(
+                to_email=f"batch-{index}@example.com",
+                subject="Batch",
+                html="<p>b</p>",
+                text="b",
+                tag="batch_tag",
+            )
+            for index in range(count)
+        ]
+
+    def _make_rq_queue(self) -> tuple[RQOutboundQueue, MagicMock]:
+        mock_redis_lib = MagicMock()
+        mock_rq = MagicMock()
+        with patch.dict("sys.modules", {"redis": mock_redis_lib, "rq": mock_rq}):
+            queue = RQOutboundQueue("redis://localhost:6379")
+        queue._queue = MagicMock()
+        return queue, queue._queue
+
+    def test_batch_uses_a_single_enqueue_many(self):
+        queue, mock_rq_queue = self._make_rq_queue()
+        mock_rq_queue.enqueue_many.return_value = [
+            MagicMock(id="job-1"),
+            MagicMock(id="job-2"),
+        ]
+
+        result = queue.enqueue_send_email_batch(self._messages(2))
+
+        assert result == ["job-1", "job-2"]
+        mock_rq_queue.enqueue_many.assert_called_once()
+        assert mock_rq_queue.prepare_data.call_count == 2
+        mock_rq_queue.enqueue.assert_not_called()
+
+    def test_batch_falls_back_to_sync_on_exception(self, app):
+        queue, mock_rq_queue = self._make_rq_queue()
+        mock_rq_queue.enqueue_many.side_effect = Exception("Redis down")
+
+        mock_provider = MagicMock()
+        with app.app_context():
+            with patch(
+                "app.services.email_provider.get_default_email_provider",
+                return_value=mock_provider,
+            ):
+                result = queue.enqueue_send_email_batch(self._messages(3))
+
+        assert result == [None, None, None]
+        assert mock_provider.send.call_count == 3
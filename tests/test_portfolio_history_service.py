@@ -0,0 +1,127 @@
+"""Portfolio history series: column-wise valuation and granularity buckets."""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from typing import Any
+from uuid import uuid4
+
+import pytest
+
+from app.application.errors import PublicValidationError
+from app.extensions.database import db
+from app.models.investment_operation import InvestmentOperation
+from app.models.wallet import Wallet
+from app.services.investment_service import InvestmentService
+from app.services.portfolio_history_service import PortfolioHistoryService
+
+
+def _seed_portfolio(user_id: Any) -> None:
+    ticker_wallet = Wallet(
+        user_id=user_id,
+        name="PETR4",
+        ticker="PETR4",
+        asset_class="stock",
+        register_date=date(2026, 1, 1),
+        should_be_on_wallet=True,
+    )
+    db.session.add(ticker_wallet)
+    db.session.flush()
+    db.session.add(
+        InvestmentOperation(
+            wallet_id=ticker_wallet.id,
+            user_id=user_id,
+            operation_type="buy",
+            quantity=10,
+            unit_price="10.00",
+            fees="0.00",
+            executed_at=date(2026, 1, 2),
+        )
+    )
+    db.session.add(
+        Wallet(
+            user_id=user_id,
+            name="CDB",
+            asset_class="cdb",
+            value="1000.00",
+            annual_rate="10.00",
+            register_date=date(2026, 1, 1),
+            should_be_on_wallet=True,
+        )
+    )
+    db.session.commit()
+
+
+def test_history_forward_fills_closes_and_projects_fixed_income(
+    app, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # 2026-01-02 is a Friday: the weekend keeps Friday's close.
+    monkeypatch.setattr(
+        InvestmentService,
+        "get_historical_prices",
+        lambda ticker, **_: {"2026-01-02": 12.0, "2026-01-05": 13.0},
+    )
+    user_id = uuid4()
+    with app.app_context():
+        _seed_portfolio(user_id)
+        payload = PortfolioHistoryService(user_id).get_history(
+            start_date=date(2026, 1, 2), end_date=date(2026, 1, 5)
+        )
+
+    values = {
+        item["date"]: Decimal(item["total_current_value_estimate"])
+        for item in payload["items"]
+    }
+
+    def _cdb(day: int) -> Decimal:
+        growth = 1.1 ** ((day - 1) / 365)
+        return Decimal(repr(1000 * growth)).quantize(Decimal("0.01"))
+
+    assert values["2026-01-02"] == Decimal("120.00") + _cdb(2)
+    assert values["2026-01-04"] == Decimal("120.00") + _cdb(4)
+    assert values["2026-01-05"] == Decimal("130.00") + _cdb(5)
+    assert payload["summary"]["granularity"] == "daily"
+    assert payload["summary"]["total_points"] == 4
+
+
+def test_history_monthly_granularity_sums_flows_per_bucket(
+    app, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(
+        InvestmentService, "get_historical_prices", lambda ticker, **_: {}
+    )
+    user_id = uuid4()
+    with app.app_context():
+        _seed_portfolio(user_id)
+        daily = PortfolioHistoryService(user_id).get_history(
+            start_date=date(2025, 12, 20), end_date=date(2026, 2, 10)
+        )
+        monthly = PortfolioHistoryService(user_id).get_history(
+            start_date=date(2025, 12, 20),
+            end_date=date(2026, 2, 10),
+            granularity="monthly",
+        )
+
+    assert [item["date"] for item in monthly["items"]] == [
+        "2025-12-31",
+        "2026-01-31",
+        "2026-02-10",
+    ]
+    assert monthly["items"][1]["total_operations"] == 2
+    assert Decimal(monthly["items"][1]["buy_amount"]) == Decimal("1100.00")
+    assert monthly["items"][-1] == {
+        **daily["items"][-1],
+        "net_invested_amount": "0",
+        "buy_amount": "0",
+        "sell_amount": "0",
+    }
+    for field in ("total_buy_amount", "final_total_current_value_estimate"):
+        assert Decimal(monthly["summary"][field]) == Decimal(daily["summary"][field])
+
+
+def test_history_rejects_unknown_granularity(app) -> None:
+    with app.app_context(), pytest.raises(PublicValidationError):
+        PortfolioHistoryService(uuid4()).get_history(
+            start_date=None, end_date=None, granularity="hourly"
+        )
@@ -0,0 +1,183 @@
+"""Tests for the cached portfolio read model (``portfolio:valuation``).
+
+Covers:
+- Repeated valuations are served from the read model without wallet queries
+- Quote changes are applied on read without a rebuild
+- Investment operation and wallet writes invalidate the read model
+- compute_position is independent of the input order
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from sqlalchemy import event
+
+import app.services.cache_service as cache_service
+from app.extensions.database import db
+from app.services.cache_service import CacheLookup, namespace_domains
+from app.services.investment_operation_service import compute_position
+from app.services.investment_service import InvestmentService
+from tests.helpers import auth_header as _auth
+from tests.helpers import register_and_login as _register_and_login
+
+
+class FakeVersionedCache:
+    """In-memory stand-in for the Redis cache's versioned keyspace."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, Any] = {}
+        self.versions: dict[tuple[str, str], int] = {}
+
+    def versioned_key(self, namespace: str, user_id: Any, *parts: str) -> str:
+        token = ".".join(
+            str(self.versions.get((domain, str(user_id)), 0))
+            for domain in namespace_domains(namespace)
+        )
+        return ":".join((namespace, str(user_id), f"v{token}", *parts))
+
+    def invalidate_domain(self, domain: str, user_id: Any) -> None:
+        key = (domain, str(user_id))
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+    def get_or_compute(self, key: str, fn: Any, *, ttl: int, **_: Any) -> CacheLookup:
+        if key in self.values:
+            return CacheLookup(self.values[key], "hit")
+        self.values[key] = fn()
+        return CacheLookup(self.values[key], "miss")
+
+
+@pytest.fixture
+def fake_cache(monkeypatch: pytest.MonkeyPatch) -> FakeVersionedCache:
+    fake = FakeVersionedCache()
+    monkeypatch.setattr(cache_service, "_cache_instance", fake)
+    return fake
+
+
+@pytest.fixture
+def quotes(monkeypatch: pytest.MonkeyPatch) -> dict[str, float]:
+    prices: dict[str, float] = {}
+    monkeypatch.setattr(
+        InvestmentService,
+        "get_market_prices",
+        lambda tickers: {ticker: prices.get(ticker) for ticker in tickers},
+    )
+    monkeypatch.setattr(
+        InvestmentService, "get_market_price", lambda ticker: prices.get(ticker)
+    )
+    return prices
+
+
+def _create_ticker_wallet(client, token: str) -> str:
+    response = client.post(
+        "/wallet",
+        json={
+            "name": "PETR4",
+            "ticker": "PETR4",
+            "quantity": 2,
+            "register_date": "2026-02-09",
+            "should_be_on_wallet": True,
+        },
+        headers={**_auth(token), "X-API-Contract": "v2"},
+    )
+    assert response.status_code == 201
+    return str(response.get_json()["data"]["investment"]["id"])
+
+
+def _valuation(client, token: str) -> dict[str, Any]:
+    response = client.get(
+        "/wallet/valuation", headers={**_auth(token), "X-API-Contract": "v2"}
+    )
+    assert response.status_code == 200
+    return dict(response.get_json()["data"])
+
+
+def test_repeated_valuation_reads_the_read_model(
+    client, app, fake_cache: FakeVersionedCache, quotes: dict[str, float]
+) -> None:
+    token = _register_and_login(client, "portfolio-rm")
+    _create_ticker_wallet(client, token)
+    quotes["PETR4"] = 25.0
+    summary = _valuation(client, token)["summary"]
+    assert Decimal(summary["total_current_value"]) == Decimal("50")
+
+    wallet_selects: list[str] = []
+
+    def _track(conn, cursor, statement, *_args, **_kwargs) -> None:
+        if statement.lstrip().upper().startswith("SELECT") and "wallets" in statement:
+            wallet_selects.append(statement)
+
+    quotes["PETR4"] = 30.0
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", _track)
+    try:
+        payload = _valuation(client, token)
+    finally:
+        event.remove(engine, "before_cursor_execute", _track)
+
+    assert wallet_selects == []
+    assert Decimal(payload["summary"]["total_current_value"]) == Decimal("60")
+
+
+def test_operation_and_wallet_writes_invalidate_the_read_model(
+    client, fake_cache: FakeVersionedCache, quotes: dict[str, float]
+) -> None:
+    token = _register_and_login(client, "portfolio-inv")
+    headers = {**_auth(token), "X-API-Contract": "v2"}
+    wallet_id = _create_ticker_wallet(client, token)
+    quotes["PETR4"] = 10.0
+    assert _valuation(client, token)["items"][0]["quantity"] == "2"
+
+    response = client.post(
+        f"/wallet/{wallet_id}/operations",
+        json={
+            "operation_type": "buy",
+            "quantity": "5",
+            "unit_price": "8",
+            "fees": "0",
+            "executed_at": "2026-02-10",
+        },
+        headers=headers,
+    )
+    assert response.status_code == 201
+    item = _valuation(client, token)["items"][0]
+    assert Decimal(item["quantity"]) == Decimal("5")
+    assert Decimal(item["invested_amount"]) == Decimal("40")
+
+    response = client.put(
+        f"/wallet/{wallet_id}", json={"name": "Petrobras"}, headers=headers
+    )
+    assert response.status_code == 200
+    assert _valuation(client, token)["items"][0]["name"] == "Petrobras"
+
+
+def test_compute_position_is_independent_of_input_order() -> None:
+    def _op(kind: str, quantity: str, price: str, day: int) -> Any:
+        return SimpleNamespace(
+            operation_type=kind,
+            quantity=Decimal(quantity),
+            unit_price=Decimal(price),
+            fees=Decimal("0"),
+            executed_at=date(2026, 1, day),
+            created_at=None,
+            id=uuid.uuid4(),
+        )
+
+    operations = [
+        _op("buy", "10", "10", 1),
+        _op("buy", "10", "20", 2),
+        _op("sell", "5", "30", 3),
+    ]
+
+    forward = compute_position(operations)
+    backward = compute_position(reversed(operations))
+
+    assert forward == backward
+    assert Decimal(forward["current_quantity"]) == Decimal("15")
+    assert Decimal(forward["current_cost_basis"]) == Decimal("225")
@@ -90,6 +90,7 @@ OPENAPI_GAPS: set[tuple[str, str]] = {
     # Fiscal
     ("POST", "/fiscal/csv/upload"),
     ("POST", "/fiscal/csv/confirm"),
+    ("GET", "/fiscal/csv/imports/{param}"),
     ("GET", "/fiscal/receivables"),
     ("POST", "/fiscal/receivables"),
     ("PATCH", "/fiscal/receivables/{param}/receive"),
@@ -1,6 +1,13 @@
+from unittest.mock import MagicMock
+
 from flask import Flask
 
 from app.middleware.rate_limit import RateLimiterService, register_rate_limit_guard
+from app.middleware.rate_limit_storage import (
+    InMemoryRateLimitStorage,
+    RedisRateLimitStorage,
+    _build_storage_from_env,
+)
 
 
 def test_rate_limit_uses_memory_backend_by_default(monkeypatch) -> None:
@@ -91,3 +98,56 @@ def test_rate_limit_guard_uses_memory_fallback_when_degraded_mode_is_memory_fall
     response = client.get("/probe")
 
     assert response.status_code == 200
+
+
+def test_memory_storage_does_not_count_rejected_requests() -> None:
+    storage = InMemoryRateLimitStorage()
+
+    results = [
+        storage.consume(rule_name="r", key="k", limit=2, window_seconds=60)[0]
+        for _ in range(4)
+    ]
+
+    assert results == [1, 2, 3, 3]
+
+
+def test_memory_storage_evicts_least_recently_used_keys() -> None:
+    storage = InMemoryRateLimitStorage(max_keys=2)
+    storage.consume(rule_name="r", key="a", limit=1, window_seconds=60)
+    storage.consume(rule_name="r", key="b", limit=1, window_seconds=60)
+    # Touch "a" so "b" becomes the least recently used key.
+    storage.consume(rule_name="r", key="a", limit=1, window_seconds=60)
+    storage.consume(rule_name="r", key="c", limit=1, window_seconds=60)
+
+    consumed_a, _ = storage.consume(rule_name="r", key="a", limit=1, window_seconds=60)
+    consumed_b, _ = storage.consume(rule_name="r", key="b", limit=1, window_seconds=60)
+
+    assert consumed_a == 2  # still tracked, so still over the limit
+    assert consumed_b == 1  # evicted, so it starts over
+
+
+def test_memory_max_keys_is_read_from_env(monkeypatch) -> None:
+    monkeypatch.delenv("RATE_LIMIT_BACKEND", raising=False)
+    monkeypatch.setenv("RATE_LIMIT_MEMORY_MAX_KEYS", "3")
+
+    storage = _build_storage_from_env()[0]
+
+    assert isinstance(storage, InMemoryRateLimitStorage)
+    assert storage._max_keys == 3
+
+
+def test_redis_storage_consumes_with_one_script_call() -> None:
+    client = MagicMock()
+    script = client.register_script.return_value
+    script.return_value = [4, 2500]
+    storage = RedisRateLimitStorage(client, key_prefix="rl")
+
+    consumed, retry_after = storage.consume(
+        rule_name="auth", key="ip:1.2.3.4", limit=20, window_seconds=60
+    )
+
+    assert (consumed, retry_after) == (4, 3)
+    client.register_script.assert_called_once()
+    script.assert_called_once_with(keys=["rl:auth:ip:1.2.3.4"], args=[20, 60000])
+    client.incr.assert_not_called()
+    client.expire.assert_not_called()
@@ -0,0 +1,85 @@
+"""Micro-benchmark of the rate-limit guard and the per-request JWT decode memo.
+
+The benchmark times the ``before_request`` guard alone (memory backend, user
+keyed by bearer token) and reports the mean cost per request in its assertion
+message. The bound is deliberately loose so it only catches order-of-magnitude
+regressions, such as a per-request network round trip or an unbounded scan.
+Wall-clock timing is noisy on shared runners, so it only runs when
+``RUN_BENCHMARKS=1`` (``RUN_BENCHMARKS=1 pytest -m benchmark``).
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token, verify_jwt_in_request
+
+from app.extensions.jwt_manager import RequestMemoizedJWTManager
+from app.middleware.rate_limit import register_rate_limit_guard
+
+_ITERATIONS = 2000
+_MAX_MEAN_GUARD_MS = 2.0
+
+
+def _build_app(monkeypatch) -> Flask:
+    monkeypatch.setenv("RATE_LIMIT_ENABLED", "true")
+    monkeypatch.setenv("RATE_LIMIT_BACKEND", "memory")
+    monkeypatch.setenv("RATE_LIMIT_DEFAULT_LIMIT", str(_ITERATIONS * 10))
+    app = Flask(__name__)
+    app.config.update(TESTING=True, JWT_SECRET_KEY="benchmark-secret-" + "x" * 32)
+    RequestMemoizedJWTManager(app)
+
+    @app.get("/probe")
+    def _probe() -> tuple[str, int]:
+        return "ok", 200
+
+    register_rate_limit_guard(app)
+    return app
+
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(
+    os.getenv("RUN_BENCHMARKS") != "1", reason="set RUN_BENCHMARKS=1 to run"
+)
+def test_rate_limit_guard_per_request_cost(monkeypatch) -> None:
+    app = _build_app(monkeypatch)
+    guard = app.before_request_funcs[None][-1]
+    with app.app_context():
+        token = create_access_token(identity="benchmark-user")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    started = time.perf_counter()
+    for _ in range(_ITERATIONS):
+        with app.test_request_context("/probe", headers=headers):
+            assert guard() is None
+    mean_ms = (time.perf_counter() - started) * 1000 / _ITERATIONS
+
+    assert mean_ms < _MAX_MEAN_GUARD_MS, (
+        f"rate_limit_guard mean={mean_ms:.3f}ms over {_ITERATIONS} requests "
+        f"(bound {_MAX_MEAN_GUARD_MS}ms)"
+    )
+
+
+def test_bearer_token_is_decoded_once_per_request(monkeypatch) -> None:
+    app = _build_app(monkeypatch)
+    with app.app_context():
+        token = create_access_token(identity="memo-user")
+
+    with patch.object(
+        JWTManager,
+        "_decode_jwt_from_config",
+        autospec=True,
+        side_effect=JWTManager._decode_jwt_from_config,
+    ) as decode:
+        with app.test_request_context(
+            "/probe", headers={"Authorization": f"Bearer {token}"}
+        ):
+            app.preprocess_request()
+            verify_jwt_in_request()
+            verify_jwt_in_request()
+
+    assert decode.call_count == 1
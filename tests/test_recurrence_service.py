@@ -211,3 +211,126 @@ def test_generate_missing_occurrences_rolls_back_and_raises_on_db_error(
                 RecurrenceService.generate_missing_occurrences(
                     reference_date=date(2026, 3, 31)
                 )
+
+
+def _monthly_template(user_id, title: str, **overrides) -> Transaction:
+    fields = {
+        "user_id": user_id,
+        "title": title,
+        "amount": Decimal("10.00"),
+        "type": TransactionType.EXPENSE,
+        "status": TransactionStatus.PENDING,
+        "due_date": date(2026, 1, 10),
+        "is_recurring": True,
+        "start_date": date(2026, 1, 10),
+        "end_date": date(2026, 3, 10),
+        "currency": "BRL",
+    }
+    fields.update(overrides)
+    return Transaction(**fields)
+
+
+def test_generate_streams_user_chunks_and_shards(app) -> None:
+    with app.app_context():
+        users = [
+            User(name=f"rec-{i}", email=f"rec-chunk-{i}@email.com", password="x")
+            for i in range(3)
+        ]
+        db.session.add_all(users)
+        db.session.commit()
+        db.session.add_all(_monthly_template(user.id, "Plano") for user in users)
+        db.session.commit()
+
+        sharded = sum(
+            RecurrenceService.generate_missing_occurrences(
+                reference_date=date(2026, 1, 10), chunk_size=1, shard=shard, shards=2
+            )
+            for shard in range(2)
+        )
+        rerun = RecurrenceService.generate_missing_occurrences(
+            reference_date=date(2026, 1, 10), chunk_size=2
+        )
+
+        keys = {
+            row.recurrence_key
+            for row in Transaction.query.filter(Transaction.recurrence_key.isnot(None))
+        }
+
+    assert sharded == 6
+    assert rerun == 0
+    assert len(keys) == 6
+
+
+def test_generate_keeps_soft_deleted_and_legacy_occurrences(app) -> None:
+    with app.app_context():
+        user = _create_user()
+        template = _monthly_template(user.id, "Academia")
+        db.session.add(template)
+        db.session.commit()
+        # A February occurrence written before recurrence keys existed and a
+        # March occurrence the user deleted: neither may be recreated.
+        db.session.add_all(
+            [
+                _monthly_template(
+                    user.id,
+                    "Academia",
+                    due_date=date(2026, 2, 10),
+                    installment_group_id=template.id,
+                ),
+                _monthly_template(
+                    user.id,
+                    "Academia",
+                    due_date=date(2026, 3, 10),
+                    installment_group_id=template.id,
+                    recurrence_key=f"{template.id}:2026-03-10",
+                    deleted=True,
+                ),
+            ]
+        )
+        db.session.commit()
+
+        created = RecurrenceService.generate_missing_occurrences(
+            reference_date=date(2026, 1, 10)
+        )
+        live = Transaction.query.filter_by(user_id=user.id, deleted=False).count()
+
+    assert created == 0
+    assert live == 2
+
+
+def test_generated_occurrences_update_daily_rollups(app) -> None:
+    from app.models.transaction_daily_rollup import TransactionDailyRollup
+
+    with app.app_context():
+        user = _create_user()
+        db.session.add(_monthly_template(user.id, "Internet"))
+        db.session.commit()
+
+        RecurrenceService.generate_missing_occurrences(reference_date=date(2026, 1, 10))
+        days = sorted(
+            row.day for row in TransactionDailyRollup.query.filter_by(user_id=user.id)
+        )
+
+    assert days == [date(2026, 1, 10), date(2026, 2, 10), date(2026, 3, 10)]
+
+
+def test_generate_does_not_count_occurrences_lost_to_a_concurrent_run(app) -> None:
+    with app.app_context():
+        user = _create_user()
+        db.session.add(_monthly_template(user.id, "Streaming"))
+        db.session.commit()
+
+        first = RecurrenceService.generate_missing_occurrences(
+            reference_date=date(2026, 1, 10)
+        )
+        # A run that read the keys before the first one committed rebuilds the
+        # same rows; ON CONFLICT skips them and they must not be reported.
+        with patch.object(RecurrenceService, "_existing_keys", return_value=set()):
+            racing = RecurrenceService.generate_missing_occurrences(
+                reference_date=date(2026, 1, 10)
+            )
+        live = Transaction.query.filter_by(user_id=user.id, deleted=False).count()
+
+    assert first == 2
+    assert racing == 0
+    assert live == 3
@@ -58,7 +58,7 @@ def test_graphql_masks_internal_errors_in_production(
     app.config["DEBUG"] = False
     app.config["TESTING"] = False
 
-    from app.controllers import graphql_controller
+    from app.controllers.graphql import resources as graphql_resources
 
     def _fake_execute(*args: Any, **kwargs: Any) -> _FakeExecutionResult:
         error = GraphQLError(
@@ -67,13 +67,16 @@ def test_graphql_masks_internal_errors_in_production(
         )
         return _FakeExecutionResult(errors=[error], data=None)
 
-    monkeypatch.setattr(graphql_controller.schema, "execute", _fake_execute)
+    monkeypatch.setattr(graphql_resources, "execute_graphql_document", _fake_execute)
 
-    response = client.post("/graphql", json={"query": "query { __typename }"})
-    assert response.status_code == 400
-    payload = response.get_json()
-    assert payload["errors"][0]["message"] == "An unexpected error occurred."
-    assert payload["errors"][0]["extensions"]["code"] == "INTERNAL_ERROR"
+    # The second request is served from the parsed-document cache and must be
+    # sanitised exactly like the first.
+    for _ in range(2):
+        response = client.post("/graphql", json={"query": "query { __typename }"})
+        assert response.status_code == 400
+        payload = response.get_json()
+        assert payload["errors"][0]["message"] == "An unexpected error occurred."
+        assert payload["errors"][0]["extensions"]["code"] == "INTERNAL_ERROR"
 
 
 def test_graphql_keeps_public_error_with_allowlisted_code_in_production(
@@ -84,7 +87,7 @@ def test_graphql_keeps_public_error_with_allowlisted_code_in_production(
     app.config["DEBUG"] = False
     app.config["TESTING"] = False
 
-    from app.controllers import graphql_controller
+    from app.controllers.graphql import resources as graphql_resources
 
     def _fake_execute(*args: Any, **kwargs: Any) -> _FakeExecutionResult:
         error = GraphQLError(
@@ -94,7 +97,7 @@ def test_graphql_keeps_public_error_with_allowlisted_code_in_production(
         )
         return _FakeExecutionResult(errors=[error], data=None)
 
-    monkeypatch.setattr(graphql_controller.schema, "execute", _fake_execute)
+    monkeypatch.setattr(graphql_resources, "execute_graphql_document", _fake_execute)
 
     response = client.post("/graphql", json={"query": "query { __typename }"})
     assert response.status_code == 400
@@ -111,7 +114,7 @@ def test_graphql_normalizes_validation_errors_in_production(
     app.config["DEBUG"] = False
     app.config["TESTING"] = False
 
-    from app.controllers import graphql_controller
+    from app.controllers.graphql import resources as graphql_resources
 
     def _fake_execute(*args: Any, **kwargs: Any) -> _FakeExecutionResult:
         error = GraphQLError(
@@ -120,7 +123,7 @@ def test_graphql_normalizes_validation_errors_in_production(
         )
         return _FakeExecutionResult(errors=[error], data=None)
 
-    monkeypatch.setattr(graphql_controller.schema, "execute", _fake_execute)
+    monkeypatch.setattr(graphql_resources, "execute_graphql_document", _fake_execute)
 
     response = client.post(
         "/graphql",
@@ -149,7 +152,7 @@ def test_graphql_auth_backend_unavailable_never_leaks_reason(
     app.config["DEBUG"] = False
     app.config["TESTING"] = False
 
-    from app.controllers import graphql_controller
+    from app.controllers.graphql import resources as graphql_resources
 
     def _fake_execute(*args: Any, **kwargs: Any) -> _FakeExecutionResult:
         error = GraphQLError(
@@ -162,7 +165,7 @@ def test_graphql_auth_backend_unavailable_never_leaks_reason(
         )
         return _FakeExecutionResult(errors=[error], data=None)
 
-    monkeypatch.setattr(graphql_controller.schema, "execute", _fake_execute)
+    monkeypatch.setattr(graphql_resources, "execute_graphql_document", _fake_execute)
 
     response = client.post("/graphql", json={"query": "query { __typename }"})
     assert response.status_code == 400
@@ -0,0 +1,180 @@
+"""Tests for the multi-device session state cache.
+
+Covers:
+- In-process layer: cached state, denylist, TTL of 0 disables caching
+- Redis layer: pipelined lookup, denylist hit, failures degrade to a miss
+- JWT callback: the DB is read once per user and not on later requests
+- Logout and session revocation reject the access token immediately
+"""
+
+from __future__ import annotations
+
+import uuid
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import app.extensions.jwt_callbacks as _jwt_callbacks_mod
+from app.extensions.session_state_cache import (
+    SessionState,
+    SessionStateCache,
+    reset_session_state_cache_for_tests,
+)
+from tests.helpers import auth_header as _auth
+from tests.helpers import register_and_login_with_refresh as _register_and_login
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache() -> Any:
+    reset_session_state_cache_for_tests()
+    yield
+    reset_session_state_cache_for_tests()
+
+
+class TestLocalSessionStateCache:
+    def test_store_then_lookup_hits_locally(self) -> None:
+        cache = SessionStateCache()
+        cache.store("u1", SessionState(True, frozenset({"a"})))
+
+        state, denied = cache.lookup("u1", "a")
+
+        assert denied is False
+        assert state == SessionState(True, frozenset({"a"}))
+
+    def test_deny_marks_jti_and_drops_state(self) -> None:
+        cache = SessionStateCache()
+        cache.store("u1", SessionState(True, frozenset({"a", "b"})))
+
+        cache.deny("u1", ["a", None])
+
+        assert cache.lookup("u1", "a") == (None, True)
+        assert cache.lookup("u1", "b") == (None, False)
+
+    def test_add_access_jti_extends_cached_state_only(self) -> None:
+        cache = SessionStateCache()
+        cache.add_access_jti("u1", "a")
+        assert cache.lookup("u1", "a") == (None, False)
+
+        cache.store("u1", SessionState(False, frozenset()))
+        cache.add_access_jti("u1", "a")
+        assert cache.lookup("u1", "a")[0] == SessionState(True, frozenset({"a"}))
+
+    def test_zero_local_ttl_disables_state_cache(self) -> None:
+        cache = SessionStateCache(local_ttl_seconds=0)
+        cache.store("u1", SessionState(True, frozenset({"a"})))
+        assert cache.lookup("u1", "a") == (None, False)
+
+
+class TestRedisSessionStateCache:
+    def _client(self, *results: Any) -> MagicMock:
+        client = MagicMock()
+        client.pipeline.return_value.execute.return_value = list(results)
+        return client
+
+    def test_lookup_reads_state_and_denylist_in_one_round_trip(self) -> None:
+        raw = SessionState(True, frozenset({"a"})).to_json().encode()
+        client = self._client(raw, 0)
+        cache = SessionStateCache(client)
+
+        state, denied = cache.lookup("u1", "a")
+        # The second lookup is served by the in-process layer.
+        cache.lookup("u1", "a")
+
+        assert denied is False
+        assert state is not None and "a" in state.active_access_jtis
+        client.pipeline.return_value.execute.assert_called_once()
+
+    def test_lookup_reports_denied_jti(self) -> None:
+        cache = SessionStateCache(self._client(None, 1))
+        assert cache.lookup("u1", "a") == (None, True)
+
+    def test_store_and_deny_write_to_redis(self) -> None:
+        client = self._client()
+        cache = SessionStateCache(client, ttl_seconds=60, denylist_ttl_seconds=90)
+
+        cache.store("u1", SessionState(True, frozenset({"a"})))
+        cache.deny("u1", ["a"])
+
+        client.setex.assert_called_once()
+        assert client.setex.call_args.args[:2] == ("jwt:sessions:u1", 60)
+        client.delete.assert_called_once_with("jwt:sessions:u1")
+        client.pipeline.return_value.setex.assert_called_once_with(
+            "jwt:denied:a", 90, "1"
+        )
+
+    def test_redis_failure_is_a_cache_miss(self) -> None:
+        client = MagicMock()
+        client.pipeline.side_effect = ConnectionError("down")
+        cache = SessionStateCache(client)
+        assert cache.lookup("u1", "a") == (None, False)
+
+
+class TestJwtCallbackUsesSessionState:
+    def test_db_is_read_once_per_user(self) -> None:
+        user_id = str(uuid.uuid4())
+        cache = SessionStateCache()
+        loader = MagicMock(return_value=SessionState(True, frozenset({"jti-1"})))
+
+        with (
+            patch.object(
+                _jwt_callbacks_mod, "get_session_state_cache", return_value=cache
+            ),
+            patch(
+                "app.application.services.session_service.load_session_state", loader
+            ),
+        ):
+            results = [
+                _jwt_callbacks_mod._is_access_token_revoked_multi_session(
+                    user_id, "jti-1"
+                )
+                for _ in range(3)
+            ]
+            revoked = _jwt_callbacks_mod._is_access_token_revoked_multi_session(
+                user_id, "jti-unknown"
+            )
+
+        assert results == [False, False, False]
+        assert revoked is True
+        # One cold miss, one re-check for the JTI the cached state did not list.
+        assert loader.call_count == 2
+
+    def test_denied_jti_skips_the_db(self) -> None:
+        user_id = str(uuid.uuid4())
+        cache = SessionStateCache()
+        cache.deny(user_id, ["jti-1"])
+        loader = MagicMock()
+
+        with (
+            patch.object(
+                _jwt_callbacks_mod, "get_session_state_cache", return_value=cache
+            ),
+            patch(
+                "app.application.services.session_service.load_session_state", loader
+            ),
+        ):
+            revoked = _jwt_callbacks_mod._is_access_token_revoked_multi_session(
+                user_id, "jti-1"
+            )
+
+        assert revoked is True
+        loader.assert_not_called()
+
+
+class TestRevocationThroughEndpoints:
+    def test_logout_rejects_the_access_token(self, client) -> None:
+        token, _ = _register_and_login(client, "state-logout")
+        assert client.get("/auth/sessions", headers=_auth(token)).status_code == 200
+
+        assert client.post("/auth/logout", headers=_auth(token)).status_code == 200
+
+        assert client.get("/auth/sessions", headers=_auth(token)).status_code == 401
+
+    def test_revoke_all_rejects_a_cached_token(self, client) -> None:
+        token, _ = _register_and_login(client, "state-revall")
+        # Warm the cache with this token's session.
+        assert client.get("/auth/sessions", headers=_auth(token)).status_code == 200
+
+        assert client.delete("/auth/sessions", headers=_auth(token)).status_code == 200
+
+        assert client.get("/auth/sessions", headers=_auth(token)).status_code == 401
@@ -14,7 +14,7 @@ from sqlalchemy import create_engine, text
 from app.extensions import slow_query_log as slow_query_log_module
 from app.extensions.integration_metrics import (
     reset_metrics_for_tests,
-    snapshot_metric_samples,
+    snapshot_metric_sketches,
     snapshot_metrics,
 )
 from app.extensions.slow_query_log import (
@@ -188,5 +188,8 @@ class TestInstall:
 
         counters = snapshot_metrics(prefix="db.slow_query.")
         assert counters.get("db.slow_query.total") == 1
-        samples = snapshot_metric_samples(prefix="db.slow_query.")
-        assert samples.get("db.slow_query.duration_ms") == [300]
+        sketch = snapshot_metric_sketches(prefix="db.slow_query.")[
+            "db.slow_query.duration_ms"
+        ]
+        assert sketch.count == 1
+        assert sketch.max == 300
@@ -0,0 +1,218 @@
+"""Tests for the shared daily price store in front of BRAPI."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Any
+
+import pytest
+import requests
+
+from app.services.investment_service import InvestmentService
+from app.services.ticker_price_store import (
+    PriceCoverage,
+    brapi_range_for,
+    get_daily_prices,
+    load_coverage,
+    missing_from,
+)
+
+TODAY = date(2030, 3, 15)
+
+
+class _FakeProvider:
+    def __init__(self, prices: dict[date, float] | None) -> None:
+        self.prices = prices
+        self.calls: list[str] = []
+
+    def __call__(self, ticker: str, brapi_range: str) -> dict[date, float] | None:
+        self.calls.append(brapi_range)
+        return None if self.prices is None else dict(self.prices)
+
+
+def _daily(start: date, end: date, price: float = 10.0) -> dict[date, float]:
+    days = (end - start).days
+    return {start + timedelta(days=i): price + i for i in range(days + 1)}
+
+
+def test_brapi_range_for_picks_smallest_covering_range() -> None:
+    assert brapi_range_for(0) == "5d"
+    assert brapi_range_for(20) == "1mo"
+    assert brapi_range_for(400) == "2y"
+    assert brapi_range_for(100_000) == "max"
+
+
+def test_missing_from_plans_single_contiguous_fetch() -> None:
+    now = datetime(2030, 3, 15, 12, 0)
+    coverage = PriceCoverage(
+        covered_from=date(2030, 1, 1),
+        covered_to=date(2030, 3, 10),
+        refreshed_at=now,
+    )
+    kwargs: dict[str, Any] = {"today": TODAY, "now": now}
+    assert missing_from(None, start=date(2030, 2, 1), end=TODAY, **kwargs) == date(
+        2030, 2, 1
+    )
+    assert missing_from(
+        coverage, start=date(2029, 12, 1), end=date(2030, 1, 5), **kwargs
+    ) == date(2029, 12, 1)
+    assert missing_from(
+        coverage, start=date(2030, 2, 1), end=date(2030, 3, 12), **kwargs
+    ) == date(2030, 3, 11)
+    assert (
+        missing_from(coverage, start=date(2030, 2, 1), end=date(2030, 3, 1), **kwargs)
+        is None
+    )
+    # Future-only ranges never hit the provider.
+    assert (
+        missing_from(None, start=date(2031, 1, 1), end=date(2031, 2, 1), **kwargs)
+        is None
+    )
+
+
+def test_missing_from_refreshes_stale_intraday_close() -> None:
+    coverage = PriceCoverage(
+        covered_from=date(2030, 1, 1),
+        covered_to=TODAY,
+        refreshed_at=datetime(2030, 3, 15, 10, 0),
+    )
+    fresh = datetime(2030, 3, 15, 10, 5)
+    stale = datetime(2030, 3, 15, 11, 0)
+    assert (
+        missing_from(coverage, start=TODAY, end=TODAY, today=TODAY, now=fresh) is None
+    )
+    assert (
+        missing_from(coverage, start=TODAY, end=TODAY, today=TODAY, now=stale) == TODAY
+    )
+
+
+def test_lookup_fetches_once_then_reads_locally(app) -> None:
+    provider = _FakeProvider(_daily(date(2030, 2, 1), TODAY))
+    with app.app_context():
+        first = get_daily_prices(
+            "PETR4",
+            start=date(2030, 3, 1),
+            end=date(2030, 3, 5),
+            fetch=provider,
+            today=TODAY,
+        )
+        second = get_daily_prices(
+            "PETR4",
+            start=date(2030, 2, 20),
+            end=date(2030, 3, 2),
+            fetch=provider,
+            today=TODAY,
+        )
+        coverage = load_coverage("PETR4")
+
+    assert provider.calls == ["1mo"]
+    assert len(first) == 5
+    assert first["2030-03-01"] == 10.0 + 28
+    assert second["2030-02-20"] == 10.0 + 19
+    assert coverage is not None
+    assert coverage.covered_from <= date(2030, 2, 15)
+    assert coverage.covered_to == TODAY
+
+
+def test_only_missing_tail_is_fetched_on_a_later_day(app) -> None:
+    provider = _FakeProvider(_daily(date(2030, 2, 1), TODAY))
+    later = TODAY + timedelta(days=3)
+    with app.app_context():
+        get_daily_prices(
+            "VALE3", start=date(2030, 3, 1), end=TODAY, fetch=provider, today=TODAY
+        )
+        provider.prices = _daily(TODAY, later, price=50.0)
+        prices = get_daily_prices(
+            "VALE3", start=date(2030, 3, 1), end=later, fetch=provider, today=later
+        )
+
+    assert provider.calls == ["1mo", "5d"]
+    assert prices[later.isoformat()] == 53.0
+    assert prices["2030-03-01"] == 10.0 + 28
+
+
+def test_provider_failure_returns_stored_prices(app) -> None:
+    provider = _FakeProvider(_daily(date(2030, 3, 1), TODAY))
+    with app.app_context():
+        get_daily_prices(
+            "ITUB4", start=date(2030, 3, 1), end=TODAY, fetch=provider, today=TODAY
+        )
+        provider.prices = None
+        prices = get_daily_prices(
+            "ITUB4",
+            start=date(2029, 1, 1),
+            end=TODAY,
+            fetch=provider,
+            today=TODAY,
+        )
+
+    assert provider.calls == ["1mo", "2y"]
+    assert len(prices) == 15
+
+
+def test_investment_service_reads_store_inside_app_context(
+    app, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls: list[dict[str, Any]] = []
+
+    class _Response:
+        def raise_for_status(self) -> None:
+            return None
+
+        def json(self) -> dict[str, Any]:
+            return {
+                "results": [
+                    {
+                        "historicalDataPrice": [
+                            {"date": 1739059200, "close": 21.5},  # 2025-02-09
+                            {"date": 1739145600, "close": 22.0},  # 2025-02-10
+                        ]
+                    }
+                ]
+            }
+
+    def _fake_get(*args: Any, **kwargs: Any) -> _Response:
+        calls.append(kwargs.get("params") or {})
+        return _Response()
+
+    monkeypatch.setattr(requests, "get", _fake_get)
+    with app.app_context():
+        first = InvestmentService.get_historical_prices(
+            "bbas3", start_date="2025-02-09", end_date="2025-02-10"
+        )
+        second = InvestmentService.get_historical_prices(
+            "BBAS3", start_date="2025-02-10", end_date="2025-02-10"
+        )
+
+    assert first == {"2025-02-09": 21.5, "2025-02-10": 22.0}
+    assert second == {"2025-02-10": 22.0}
+    assert len(calls) == 1
+    assert calls[0]["range"] == brapi_range_for((date.today() - date(2025, 2, 9)).days)
+
+
+def test_backfill_cli_reports_rows(app, monkeypatch: pytest.MonkeyPatch) -> None:
+    provider = _FakeProvider(_daily(date.today() - timedelta(days=9), date.today()))
+    monkeypatch.setattr(InvestmentService, "_fetch_history_range", provider)
+
+    result = app.test_cli_runner().invoke(
+        args=["market", "backfill", "--ticker", "wege3", "--range", "1mo"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "ticker=wege3 rows=10" in result.output
+    assert provider.calls == ["1mo"]
+    with app.app_context():
+        assert load_coverage("WEGE3") is not None
+
+
+def test_backfill_cli_fails_when_provider_fails(
+    app, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(InvestmentService, "_fetch_history_range", _FakeProvider(None))
+
+    result = app.test_cli_runner().invoke(
+        args=["market", "backfill", "--ticker", "X1X1"]
+    )
+
+    assert result.exit_code == 1
+    assert "failed=1" in result.output
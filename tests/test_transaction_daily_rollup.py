@@ -0,0 +1,184 @@
+"""Tests for the per-user daily ledger rollup (transaction_daily_rollups)."""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import event
+
+from app.extensions.database import db
+from app.models.transaction import Transaction, TransactionStatus, TransactionType
+from app.models.transaction_daily_rollup import TransactionDailyRollup
+from app.services.transaction_analytics_service import TransactionAnalyticsService
+from app.services.transaction_rollup_service import (
+    rebuild_transaction_rollups,
+    refresh_rollup_days,
+    rollup_lock_key,
+)
+from app.services.transaction_trends import compute_dashboard_trends
+
+
+def _tx(user_id, *, amount: str, tx_type=TransactionType.EXPENSE, day=None, **kw):
+    return Transaction(
+        user_id=user_id,
+        title="Tx",
+        amount=Decimal(amount),
+        type=tx_type,
+        status=kw.pop("status", TransactionStatus.PAID),
+        due_date=day or date(2030, 6, 10),
+        **kw,
+    )
+
+
+def _rollup_rows(user_id) -> list[TransactionDailyRollup]:
+    return TransactionDailyRollup.query.filter_by(user_id=user_id).all()
+
+
+def test_insert_update_and_soft_delete_keep_rollup_in_sync(app) -> None:
+    user_id = uuid4()
+    with app.app_context():
+        tx = _tx(user_id, amount="100.00")
+        db.session.add_all([tx, _tx(user_id, amount="50.00")])
+        db.session.commit()
+
+        rows = _rollup_rows(user_id)
+        assert len(rows) == 1
+        assert rows[0].status == "paid" and rows[0].type == "expense"
+        assert rows[0].amount_total == Decimal("150.00")
+        assert rows[0].tx_count == 2
+
+        tx.due_date = date(2030, 6, 11)
+        tx.status = TransactionStatus.PENDING
+        db.session.commit()
+        by_day = {(r.day, r.status): r for r in _rollup_rows(user_id)}
+        assert by_day[(date(2030, 6, 10), "paid")].amount_total == Decimal("50.00")
+        assert by_day[(date(2030, 6, 11), "pending")].tx_count == 1
+
+        tx.deleted = True
+        db.session.commit()
+        assert [r.day for r in _rollup_rows(user_id)] == [date(2030, 6, 10)]
+
+
+def test_hard_delete_removes_rollup_bucket(app) -> None:
+    user_id = uuid4()
+    with app.app_context():
+        tx = _tx(user_id, amount="10.00")
+        db.session.add(tx)
+        db.session.commit()
+        db.session.delete(tx)
+        db.session.commit()
+        assert _rollup_rows(user_id) == []
+
+
+def test_refresh_takes_advisory_lock_per_day_on_postgres() -> None:
+    class _RecordingConnection:
+        dialect = SimpleNamespace(name="postgresql")
+
+        def __init__(self) -> None:
+            self.statements: list[tuple[str, Any]] = []
+
+        def execute(self, statement: Any, params: Any = None) -> list[Any]:
+            self.statements.append((str(statement), params))
+            return []
+
+    user_id = uuid4()
+    days = {date(2030, 6, 11), date(2030, 6, 10)}
+    connection = _RecordingConnection()
+
+    refresh_rollup_days(connection, {user_id: days})  # type: ignore[arg-type]
+
+    locks = [
+        params["key"]
+        for statement, params in connection.statements
+        if "pg_advisory_xact_lock" in statement
+    ]
+    assert locks == [rollup_lock_key(user_id, day) for day in sorted(days)]
+    first_delete = next(
+        i for i, (sql, _) in enumerate(connection.statements) if "DELETE" in sql
+    )
+    assert first_delete == len(locks)
+
+
+def test_rebuild_repairs_drift(app) -> None:
+    user_id = uuid4()
+    with app.app_context():
+        db.session.add(_tx(user_id, amount="80.00"))
+        db.session.commit()
+        TransactionDailyRollup.query.filter_by(user_id=user_id).delete()
+        db.session.commit()
+        assert _rollup_rows(user_id) == []
+
+        written = rebuild_transaction_rollups(user_id=user_id)
+
+        assert written == 1
+        assert _rollup_rows(user_id)[0].amount_total == Decimal("80.00")
+
+
+def test_rebuild_cli_reports_rows(app) -> None:
+    user_id = uuid4()
+    with app.app_context():
+        db.session.add(_tx(user_id, amount="5.00"))
+        db.session.commit()
+
+    result = app.test_cli_runner().invoke(
+        args=["analytics", "rebuild", "--user-id", str(user_id)]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "rollup_rows=1" in result.output
+
+
+def test_overview_reads_rollup_for_month(app) -> None:
+    user_id = uuid4()
+    with app.app_context():
+        db.session.add_all(
+            [
+                _tx(user_id, amount="3000.00", tx_type=TransactionType.INCOME),
+                _tx(user_id, amount="200.00", status=TransactionStatus.PENDING),
+                _tx(user_id, amount="99.00", day=date(2030, 7, 1)),
+            ]
+        )
+        db.session.commit()
+
+        overview = TransactionAnalyticsService(
+            user_id
+        ).get_dashboard_overview_coalesced(year=2030, month_number=6)
+
+    assert float(overview["income_total"]) == 3000.0
+    assert float(overview["expense_total"]) == 200.0
+    assert overview["total_transactions"] == 2
+    assert overview["status"]["paid"] == 1
+    assert overview["status"]["pending"] == 1
+
+
+def test_trends_use_single_query_for_all_months(app) -> None:
+    user_id = uuid4()
+    today = date.today()
+    with app.app_context():
+        db.session.add(
+            _tx(
+                user_id,
+                amount="42.00",
+                tx_type=TransactionType.INCOME,
+                day=today.replace(day=1),
+            )
+        )
+        db.session.commit()
+
+        statements: list[str] = []
+
+        def _count(conn, cursor, statement, *args) -> None:  # noqa: ANN001
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", _count)
+        try:
+            result = compute_dashboard_trends(user_id=user_id, months=24)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", _count)
+
+    assert len(statements) == 1
+    assert result["series"][0]["income"] == 42.0
@@ -9,6 +9,8 @@ Covers:
 - Invalid format parameter returns 400
 - Export with zero transactions returns empty CSV (headers only)
 - Streaming generator yields header then data rows without hard limit
+- Background export jobs: status, gzip CSV, resumable (Range) downloads,
+  expiry sweep and LGPD deletion of stored files
 """
 
 from __future__ import annotations
@@ -389,3 +391,185 @@ class TestExportServiceUnit:
         assert len(rows) == 5
         titles = [r.title for r in rows]
         assert sorted(titles) == [f"Batch tx {i}" for i in range(5)]
+
+
+# ---------------------------------------------------------------------------
+# Background export jobs
+# ---------------------------------------------------------------------------
+
+
+class TestExportJobs:
+    def _prepare(self, app, client, monkeypatch, tmp_path) -> tuple[str, str]:
+        monkeypatch.setenv("EXPORT_STORAGE_BACKEND", "local")
+        monkeypatch.setenv("EXPORT_STORAGE_DIR", str(tmp_path))
+        token, user_id = _register_and_login(client, prefix="export-job")
+        _grant_export_entitlement(app, user_id)
+        return token, user_id
+
+    def _download(self, client, token: str, job_id: str, **headers: str):
+        return client.get(
+            f"/transactions/export/jobs/{job_id}/download",
+            headers={**_auth(token), **headers},
+        )
+
+    def test_csv_job_completes_and_downloads_gzip(
+        self, app, client, monkeypatch, tmp_path
+    ) -> None:
+        import gzip
+
+        token, user_id = self._prepare(app, client, monkeypatch, tmp_path)
+        _create_transaction(app, user_id, title="Job row", amount="42.00")
+
+        resp = client.get("/transactions/export?async=true", headers=_auth(token))
+        assert resp.status_code == 202
+        job = resp.get_json()["job"]
+        assert job["status"] == "completed"
+        assert job["row_count"] == 1
+        assert job["filename"].endswith(".csv.gz")
+
+        status = client.get(
+            f"/transactions/export/jobs/{job['id']}", headers=_auth(token)
+        )
+        assert status.status_code == 200
+        assert status.get_json()["job"]["size_bytes"] == job["size_bytes"]
+
+        download = self._download(client, token, job["id"])
+        assert download.status_code == 200
+        assert download.headers["Accept-Ranges"] == "bytes"
+        assert download.headers["Content-Type"] == "application/gzip"
+        text = gzip.decompress(download.data).decode("utf-8-sig")
+        assert "Job row" in text
+
+    def test_download_serves_byte_ranges(
+        self, app, client, monkeypatch, tmp_path
+    ) -> None:
+        token, user_id = self._prepare(app, client, monkeypatch, tmp_path)
+        _create_transaction(app, user_id)
+        job = client.get(
+            "/transactions/export?format=pdf&async=auto", headers=_auth(token)
+        ).get_json()["job"]
+        full = self._download(client, token, job["id"]).data
+        size = len(full)
+        assert size == job["size_bytes"]
+
+        partial = self._download(client, token, job["id"], Range="bytes=10-")
+        assert partial.status_code == 206
+        assert partial.data == full[10:]
+        assert partial.headers["Content-Range"] == f"bytes 10-{size - 1}/{size}"
+
+        stale = self._download(
+            client, token, job["id"], Range="bytes=10-", **{"If-Range": '"stale"'}
+        )
+        assert stale.status_code == 200
+        assert stale.data == full
+
+        unsatisfiable = self._download(
+            client, token, job["id"], Range=f"bytes={size + 10}-"
+        )
+        assert unsatisfiable.status_code == 416
+        assert unsatisfiable.headers["Content-Range"] == f"bytes */{size}"
+
+    def test_job_belongs_to_owner(self, app, client, monkeypatch, tmp_path) -> None:
+        token, _ = self._prepare(app, client, monkeypatch, tmp_path)
+        job = client.get(
+            "/transactions/export?async=true", headers=_auth(token)
+        ).get_json()["job"]
+        other_token, other_id = _register_and_login(client, prefix="export-other")
+        _grant_export_entitlement(app, other_id)
+
+        resp = client.get(
+            f"/transactions/export/jobs/{job['id']}", headers=_auth(other_token)
+        )
+        assert resp.status_code == 404
+
+    def test_failed_job_records_error(self, app, monkeypatch, tmp_path) -> None:
+        from app.models.export_job import ExportJobStatus
+        from app.services import export_job_service
+
+        monkeypatch.setenv("EXPORT_STORAGE_DIR", str(tmp_path))
+
+        def _boom(*args, **kwargs):
+            raise RuntimeError("disk full")
+
+        monkeypatch.setattr(export_job_service, "write_csv_export", _boom)
+        with app.app_context():
+            job = export_job_service.create_export_job(user_id=uuid.uuid4(), fmt="csv")
+            assert job.status == ExportJobStatus.failed
+            assert "disk full" in (job.error or "")
+
+    def test_expired_jobs_are_hidden_and_purged_with_their_files(
+        self, app, client, monkeypatch, tmp_path
+    ) -> None:
+        from datetime import timedelta
+
+        from app.models.export_job import ExportJob
+        from app.services.export_job_service import purge_expired_export_jobs
+        from app.utils.datetime_utils import utc_now_naive
+
+        token, _ = self._prepare(app, client, monkeypatch, tmp_path)
+        job = client.get(
+            "/transactions/export?async=true", headers=_auth(token)
+        ).get_json()["job"]
+        assert job["expires_at"] is not None
+        (stored,) = list((tmp_path / "exports").rglob("*.csv.gz"))
+
+        with app.app_context():
+            row = db.session.get(ExportJob, uuid.UUID(job["id"]))
+            row.expires_at = utc_now_naive() - timedelta(minutes=1)
+            db.session.commit()
+
+        expired = client.get(
+            f"/transactions/export/jobs/{job['id']}", headers=_auth(token)
+        )
+        assert expired.status_code == 404
+
+        with app.app_context():
+            assert purge_expired_export_jobs() == 1
+            assert db.session.get(ExportJob, uuid.UUID(job["id"])) is None
+        assert not stored.exists()
+
+    def test_account_deletion_removes_stored_files(
+        self, app, client, monkeypatch, tmp_path
+    ) -> None:
+        from app.application.services.lgpd_deletion_service import (
+            delete_user_account,
+        )
+
+        token, user_id = self._prepare(app, client, monkeypatch, tmp_path)
+        client.get("/transactions/export?async=true", headers=_auth(token))
+        (stored,) = list((tmp_path / "exports").rglob("*.csv.gz"))
+
+        with app.app_context():
+            report = delete_user_account(uuid.UUID(user_id))
+
+        assert report["summary"]["deleted"]["export_jobs"] == 1
+        assert not stored.exists()
+
+    def test_invalid_async_param_returns_400(self, app, client) -> None:
+        token, user_id = _register_and_login(client, prefix="export-async")
+        _grant_export_entitlement(app, user_id)
+        resp = client.get("/transactions/export?async=maybe", headers=_auth(token))
+        assert resp.status_code == 400
+
+    def test_pdf_export_spans_pages(self, app) -> None:
+        from app.services.transaction_export_service import write_pdf_export
+
+        with app.app_context():
+            user_id = uuid.uuid4()
+            db.session.add_all(
+                Transaction(
+                    user_id=user_id,
+                    title=f"Page tx {i}",
+                    amount=Decimal("1.00"),
+                    type=TransactionType.EXPENSE,
+                    status=TransactionStatus.PAID,
+                    due_date=date(2026, 1, 1),
+                )
+                for i in range(120)
+            )
+            db.session.commit()
+            buffer = io.BytesIO()
+            rows = write_pdf_export(buffer, user_id=user_id)
+
+        assert rows == 120
+        assert buffer.getvalue().count(b"/Type /Page\n") > 1
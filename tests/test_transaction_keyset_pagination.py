@@ -0,0 +1,173 @@
+"""Keyset (cursor) pagination on the transaction list and due-range queries."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import date, timedelta
+from typing import Any
+
+_START = date(2026, 3, 1)
+
+
+def _register_and_login(client, prefix: str = "tx-keyset") -> str:
+    suffix = uuid.uuid4().hex[:8]
+    email = f"{prefix}-{suffix}@email.com"
+    password = "StrongPass@123"
+
+    register_response = client.post(
+        "/auth/register",
+        json={"name": f"{prefix}-{suffix}", "email": email, "password": password},
+    )
+    assert register_response.status_code == 201
+
+    login_response = client.post(
+        "/auth/login",
+        json={"email": email, "password": password},
+    )
+    assert login_response.status_code == 200
+    return str(login_response.get_json()["token"])
+
+
+def _auth_headers(token: str) -> dict[str, str]:
+    return {"Authorization": f"Bearer {token}", "X-API-Contract": "v2"}
+
+
+def _seed(client, token: str) -> list[str]:
+    """Seven transactions over four days, so several share a due date."""
+    ids: list[str] = []
+    for index in range(7):
+        response = client.post(
+            "/transactions",
+            headers=_auth_headers(token),
+            json={
+                "title": f"Conta {index}",
+                "amount": "10.00",
+                "type": "income" if index % 3 == 0 else "expense",
+                "due_date": (_START + timedelta(days=index % 4)).isoformat(),
+            },
+        )
+        assert response.status_code == 201
+        ids.append(response.get_json()["data"]["transaction"][0]["id"])
+    return ids
+
+
+def _walk(client, token: str, url: str) -> tuple[list[str], list[dict[str, Any]]]:
+    seen: list[str] = []
+    metas: list[dict[str, Any]] = []
+    cursor = ""
+    while True:
+        response = client.get(
+            f"{url}&per_page=3&cursor={cursor}", headers=_auth_headers(token)
+        )
+        assert response.status_code == 200, response.get_json()
+        body = response.get_json()
+        seen.extend(item["id"] for item in body["data"]["transactions"])
+        metas.append(body["meta"]["pagination"])
+        cursor = body["meta"]["pagination"]["next_cursor"]
+        if cursor is None:
+            return seen, metas
+
+
+def test_active_list_cursor_walks_every_row_once(client) -> None:
+    token = _register_and_login(client)
+    ids = _seed(client, token)
+
+    offset_ids = [
+        item["id"]
+        for item in client.get(
+            "/transactions?per_page=50", headers=_auth_headers(token)
+        ).get_json()["data"]["transactions"]
+    ]
+    seen, metas = _walk(client, token, "/transactions?include_total=false")
+
+    assert sorted(seen) == sorted(ids)
+    assert len(metas) == 3
+    assert all(meta["total"] is None for meta in metas)
+    # Same (due_date desc) order as the offset list; ties broken by id.
+    due_by_id = {tx_id: (_START + timedelta(days=i % 4)) for i, tx_id in enumerate(ids)}
+    assert [due_by_id[tx_id] for tx_id in seen] == [
+        due_by_id[tx_id] for tx_id in offset_ids
+    ]
+
+
+def test_due_range_cursor_with_single_query_counts(client) -> None:
+    token = _register_and_login(client, "tx-keyset-due")
+    ids = _seed(client, token)
+    url = (
+        f"/transactions/due-range?start_date={_START.isoformat()}"
+        f"&end_date={(_START + timedelta(days=10)).isoformat()}&order_by=date"
+    )
+
+    seen, metas = _walk(client, token, url)
+
+    assert sorted(seen) == sorted(ids)
+    assert metas[0]["total"] == 7
+    response = client.get(f"{url}&cursor=", headers=_auth_headers(token))
+    assert response.get_json()["data"]["counts"] == {
+        "total_transactions": 7,
+        "income_transactions": 3,
+        "expense_transactions": 4,
+    }
+
+    skipped = client.get(
+        f"{url}&include_total=false", headers=_auth_headers(token)
+    ).get_json()
+    assert skipped["data"]["counts"] is None
+    assert skipped["meta"]["pagination"]["pages"] is None
+
+
+def test_cursor_validation_errors(client) -> None:
+    token = _register_and_login(client, "tx-keyset-bad")
+    headers = _auth_headers(token)
+
+    bad_cursor = client.get("/transactions?cursor=not-a-cursor", headers=headers)
+    assert bad_cursor.status_code == 400
+
+    wrong_order = client.get(
+        "/transactions/due-range?end_date=2026-03-31&order_by=title&cursor=",
+        headers=headers,
+    )
+    assert wrong_order.status_code == 400
+
+    bad_flag = client.get("/transactions?include_total=maybe", headers=headers)
+    assert bad_flag.status_code == 400
+
+
+def test_graphql_due_range_cursor_without_totals(client) -> None:
+    token = _register_and_login(client, "tx-keyset-gql")
+    _seed(client, token)
+    query = """
+    query Due($cursor: String) {
+      transactionDueRange(
+        startDate: "2026-03-01", endDate: "2026-03-31", orderBy: "date",
+        perPage: 4, cursor: $cursor, includeTotal: false
+      ) {
+        items { id }
+        counts { totalTransactions }
+        pagination { total page perPage pages }
+        nextCursor
+      }
+    }
+    """
+    first = client.post(
+        "/graphql",
+        json={"query": query, "variables": {"cursor": ""}},
+        headers={"Authorization": f"Bearer {token}"},
+    ).get_json()["data"]["transactionDueRange"]
+    second = client.post(
+        "/graphql",
+        json={"query": query, "variables": {"cursor": first["nextCursor"]}},
+        headers={"Authorization": f"Bearer {token}"},
+    ).get_json()["data"]["transactionDueRange"]
+
+    # counts/pagination stay non-null; only the counted fields are null.
+    assert first["counts"] == {"totalTransactions": None}
+    assert first["pagination"] == {
+        "total": None,
+        "page": 1,
+        "perPage": 4,
+        "pages": None,
+    }
+    assert len(first["items"]) == 4
+    assert len(second["items"]) == 3
+    assert second["nextCursor"] is None
@@ -171,7 +171,7 @@ class TestDispatchDueTransactionReminders:
         assert result.sent == 0
 
     def test_dispatch_not_allowed_causes_skip(self, app) -> None:
-        """Lines 103-104: _is_dispatch_allowed returns False -> skipped."""
+        """Alert preferences block the user -> skipped."""
         import unittest.mock as mock
 
         today = date(2030, 8, 1)
@@ -197,8 +197,8 @@ class TestDispatchDueTransactionReminders:
             db.session.commit()
 
             with mock.patch(
-                "app.application.services.transaction_reminder_service._is_dispatch_allowed",
-                return_value=False,
+                "app.application.services.transaction_reminder_service._dispatch_allowed_user_ids",
+                return_value=set(),
             ):
                 result = dispatch_due_transaction_reminders(
                     days_before_due=7, today=today
@@ -229,8 +229,8 @@ class TestDispatchDueTransactionReminders:
             db.session.commit()
 
             with mock.patch(
-                "app.application.services.transaction_reminder_service._is_dispatch_allowed",
-                return_value=True,
+                "app.application.services.transaction_reminder_service._dispatch_allowed_user_ids",
+                side_effect=lambda user_ids, _category: set(user_ids),
             ):
                 result = dispatch_due_transaction_reminders(
                     days_before_due=7, today=today
@@ -239,3 +239,109 @@ class TestDispatchDueTransactionReminders:
         assert result.scanned == 1
         assert result.skipped == 1
         assert result.sent == 0
+
+
+# ---------------------------------------------------------------------------
+# Chunked, set-based dispatch
+# ---------------------------------------------------------------------------
+
+
+def _seed_reminder_users(today: date) -> dict[str, User]:
+    from app.models.alert import AlertPreference
+
+    users = {
+        name: User(
+            id=uuid.uuid4(),
+            name=name,
+            email=f"{name}-{uuid.uuid4().hex[:6]}@test.com",
+            password="hash",
+        )
+        for name in ("premium", "opted_out", "free")
+    }
+    db.session.add_all(users.values())
+    db.session.flush()
+    activate_premium(users["premium"].id, expires_at=None)
+    activate_premium(users["opted_out"].id, expires_at=None)
+    db.session.add(
+        AlertPreference(
+            user_id=users["opted_out"].id, category="due_soon", enabled=False
+        )
+    )
+    for user, count in (
+        (users["premium"], 3),
+        (users["opted_out"], 1),
+        (users["free"], 1),
+    ):
+        for index in range(count):
+            db.session.add(
+                Transaction(
+                    user_id=user.id,
+                    title=f"Conta {index}",
+                    amount=Decimal("10.00"),
+                    type=TransactionType.EXPENSE,
+                    status=TransactionStatus.PENDING,
+                    due_date=today + timedelta(days=7),
+                )
+            )
+    db.session.commit()
+    return users
+
+
+class TestChunkedDispatch:
+    def test_chunks_prefetch_per_table(self, app, monkeypatch) -> None:
+        from sqlalchemy import event
+
+        monkeypatch.setenv("REMINDER_DISPATCH_CHUNK_SIZE", "2")
+        today = date(2030, 9, 2)
+        with app.app_context():
+            users = _seed_reminder_users(today)
+            statements: list[str] = []
+
+            def _capture(_conn, _cursor, statement, *_args) -> None:
+                if statement.lstrip().upper().startswith("SELECT"):
+                    statements.append(statement)
+
+            event.listen(db.engine, "before_cursor_execute", _capture)
+            try:
+                result = dispatch_due_transaction_reminders(
+                    days_before_due=7, today=today
+                )
+            finally:
+                event.remove(db.engine, "before_cursor_execute", _capture)
+
+            alerted_users = {
+                alert.user_id
+                for alert in Alert.query.filter_by(category="due_soon_7_days")
+            }
+            premium_id = users["premium"].id
+
+        assert (result.scanned, result.sent, result.skipped) == (5, 3, 2)
+        assert alerted_users == {premium_id}
+        # Three chunks of at most five lookups each, independent of row count.
+        assert sum("FROM transactions" in stmt for stmt in statements) == 3
+        assert len(statements) <= 15
+
+    def test_async_queue_receives_one_batch_per_chunk(self, app, monkeypatch) -> None:
+        import unittest.mock as mock
+
+        today = date(2030, 9, 3)
+        queue = mock.MagicMock()
+        monkeypatch.setattr(
+            "app.application.services.transaction_reminder_service."
+            "get_default_outbound_queue",
+            lambda: queue,
+        )
+        with app.app_context():
+            _seed_reminder_users(today)
+            result = dispatch_due_transaction_reminders(days_before_due=7, today=today)
+            statuses = {
+                alert.status
+                for alert in Alert.query.filter_by(category="due_soon_7_days")
+            }
+
+        queue.enqueue_send_email_batch.assert_called_once()
+        (messages,) = queue.enqueue_send_email_batch.call_args.args
+        assert len(messages) == 3
+        assert (result.enqueued, result.sent, result.skipped) == (3, 0, 2)
+        assert statuses == {AlertStatus.SENT}
+        assert get_email_outbox() == []
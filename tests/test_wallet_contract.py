@@ -174,6 +174,68 @@ def test_wallet_detail_patch_and_history_v2_contract(client) -> None:
     assert "pagination" in history_body["meta"]
 
 
+def test_wallet_history_is_appended_and_paginated_newest_first(client) -> None:
+    token = _register_and_login(client)
+    create_response = client.post(
+        "/wallet",
+        json=_wallet_payload(),
+        headers=_auth_headers(token, "v2"),
+    )
+    assert create_response.status_code == 201
+    investment_id = create_response.get_json()["data"]["investment"]["id"]
+
+    for value in ("2000.00", "2500.00", "3000.00"):
+        response = client.patch(
+            f"/wallet/{investment_id}",
+            json={"value": value},
+            headers=_auth_headers(token, "v2"),
+        )
+        assert response.status_code == 200
+
+    first_page = client.get(
+        f"/wallet/{investment_id}/history?page=1&per_page=2",
+        headers=_auth_headers(token, "v2"),
+    ).get_json()
+    assert [item["originalValue"] for item in first_page["data"]["items"]] == [
+        2500.0,
+        2000.0,
+    ]
+    assert first_page["meta"]["pagination"]["total"] == 3
+    assert first_page["meta"]["pagination"]["has_next_page"] is True
+
+    second_page = client.get(
+        f"/wallet/{investment_id}/history?page=2&per_page=2",
+        headers=_auth_headers(token, "v2"),
+    ).get_json()
+    assert [item["originalValue"] for item in second_page["data"]["items"]] == [1500.0]
+    assert second_page["meta"]["pagination"]["has_next_page"] is False
+
+
+def test_wallet_patch_response_echoes_latest_history_newest_first(
+    client, monkeypatch
+) -> None:
+    from app.application.services import wallet_application_service
+
+    monkeypatch.setattr(wallet_application_service, "_UPDATE_RESPONSE_HISTORY_SIZE", 2)
+    token = _register_and_login(client)
+    create_response = client.post(
+        "/wallet",
+        json=_wallet_payload(),
+        headers=_auth_headers(token, "v2"),
+    )
+    investment_id = create_response.get_json()["data"]["investment"]["id"]
+
+    for value in ("2000.00", "2500.00", "3000.00"):
+        response = client.patch(
+            f"/wallet/{investment_id}",
+            json={"value": value},
+            headers=_auth_headers(token, "v2"),
+        )
+
+    history = response.get_json()["data"]["investment"]["history"]
+    assert [item["originalValue"] for item in history] == [2500.0, 2000.0]
+
+
 def test_wallet_put_alias_emits_deprecation_headers(client) -> None:
     token = _register_and_login(client)
     create_response = client.post(
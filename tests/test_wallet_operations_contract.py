@@ -266,6 +266,11 @@ def test_wallet_portfolio_and_investment_valuation_v2(client, monkeypatch) -> No
     token = _register_and_login(client, "owner-op5")
     reset_brapi_cache_for_tests()
     monkeypatch.setattr(InvestmentService, "get_market_price", lambda _ticker: 25.0)
+    monkeypatch.setattr(
+        InvestmentService,
+        "get_market_prices",
+        lambda tickers: {ticker: 25.0 for ticker in tickers},
+    )
 
     ticker_wallet_response = client.post(
         "/wallet",